@@ -0,0 +1,258 @@
+"""Content-addressed cache of finished seeded builds.
+
+``build_random_full_deck`` is deterministic for a given seed, request
+config and card data, so replaying a shared seed (permalink replay,
+reroll-to-seed, the headless random mode) used to redo the full build for an
+identical result. This cache stores the finished result (decklist, summary,
+compliance report, export paths) in SQLite under a key derived from:
+
+* the normalized request config (every argument that can change the build);
+* the seed;
+* a data fingerprint covering everything else a build reads: the result
+  schema and ``APP_VERSION``, mtime + size of ``all_cards.parquet``, the
+  commander cache, the builder source files and the config it loads
+  (``config/card_lists/*.json``, ``brackets.yml``, ``deck.json``, the theme
+  catalog and whitelist, ``random_theme_exclusions.yml``), and the
+  build-affecting env flags in ``_BUILD_ENV``.
+
+Entries written under an older fingerprint are dropped the first time a
+newer one is stored, and the table is trimmed to the most recently used
+``BUILD_RESULT_CACHE_SIZE`` rows. A hit whose CSV export no longer exists on
+disk is treated as a miss so the caller rebuilds (and re-exports) it.
+
+Public API:
+    data_fingerprint() -> str
+    cache_key(kind, config, seed, fingerprint=None) -> str
+    get(key) -> dict | None
+    put(key, payload, fingerprint=None)
+    clear()
+    stats() -> dict
+
+Env:
+    BUILD_RESULT_CACHE       0 disables the cache (default 1)
+    BUILD_RESULT_CACHE_SIZE  maximum cached builds (default 512)
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from path_util import get_commander_cards_path, get_processed_cards_path
+
+_PROJECT_ROOT = Path(__file__).resolve().parents[2]
+_DB_PATH = _PROJECT_ROOT / "data" / "build_result_cache.db"
+_CONFIG_DIR = _PROJECT_ROOT / "config"
+_CODE_DIR = _PROJECT_ROOT / "code"
+
+# Bump when the stored payload or build behaviour changes in a way the
+# inputs below would not reveal.
+_RESULT_SCHEMA = 1
+
+# Env flags read while building that change the resulting deck
+_BUILD_ENV = (
+    "BUDGET_POOL_TOLERANCE",
+    "LAND_COUNT",
+    "LAND_PROFILE",
+    "THEME_CATALOG_PATH",
+    "THEME_MATCH_MODE",
+    "USER_THEME_WEIGHT",
+)
+
+_DEFAULT_SIZE = 512
+
+_CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS build_results (
+    key         TEXT PRIMARY KEY,
+    kind        TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    payload     TEXT NOT NULL,
+    created_at  REAL NOT NULL,
+    last_used   REAL NOT NULL
+);
+"""
+_CREATE_INDEX = "CREATE INDEX IF NOT EXISTS idx_build_results_last_used ON build_results(last_used)"
+
+_lock = threading.Lock()
+_initialized_for: Optional[str] = None
+_counters: Dict[str, int] = {"hits": 0, "misses": 0, "stores": 0, "invalidated": 0, "evicted": 0}
+
+
+def enabled() -> bool:
+    return (os.getenv("BUILD_RESULT_CACHE") or "1").strip().lower() not in ("0", "false", "off", "no")
+
+
+def _max_entries() -> int:
+    try:
+        return max(1, int(os.getenv("BUILD_RESULT_CACHE_SIZE", str(_DEFAULT_SIZE))))
+    except ValueError:
+        return _DEFAULT_SIZE
+
+
+def _stat_key(path: Any) -> str:
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return f"{path}:missing"
+    return f"{path}:{st.st_mtime_ns}:{st.st_size}"
+
+
+def _input_files() -> List[Path]:
+    """Config and builder source files whose edits can change a build."""
+    files = [
+        _CONFIG_DIR / "random_theme_exclusions.yml",
+        _CONFIG_DIR / "brackets.yml",
+        _CONFIG_DIR / "deck.json",
+        _CONFIG_DIR / "themes" / "theme_list.json",
+        _CONFIG_DIR / "themes" / "theme_whitelist.yml",
+    ]
+    files.extend(sorted((_CONFIG_DIR / "card_lists").glob("*.json")))
+    files.extend(sorted((_CODE_DIR / "deck_builder").rglob("*.py")))
+    files.append(_CODE_DIR / "headless_runner.py")
+    return files
+
+
+def data_fingerprint() -> str:
+    """Identity of everything outside the request config that a build reads."""
+    parts = [f"schema:{_RESULT_SCHEMA}", f"app:{os.getenv('APP_VERSION', 'dev')}"]
+    parts.extend(f"{name}={os.getenv(name, '')}" for name in _BUILD_ENV)
+    parts.append(_stat_key(get_processed_cards_path()))
+    parts.append(_stat_key(get_commander_cards_path()))
+    parts.extend(_stat_key(path) for path in _input_files())
+    return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def cache_key(kind: str, config: Dict[str, Any], seed: Any, fingerprint: Optional[str] = None) -> str:
+    """Content address for one build: sha256 of kind, canonical config JSON, seed and data fingerprint."""
+    material = json.dumps(
+        {
+            "kind": kind,
+            "config": config,
+            "seed": seed,
+            "data": fingerprint if fingerprint is not None else data_fingerprint(),
+        },
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _open() -> sqlite3.Connection:
+    conn = sqlite3.connect(str(_DB_PATH), check_same_thread=False, timeout=10.0)
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def _connect() -> sqlite3.Connection:
+    global _initialized_for
+    if _initialized_for != str(_DB_PATH):
+        with _lock:
+            if _initialized_for != str(_DB_PATH):
+                _DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+                conn = _open()
+                try:
+                    with conn:
+                        conn.execute(_CREATE_TABLE)
+                        conn.execute(_CREATE_INDEX)
+                finally:
+                    conn.close()
+                _initialized_for = str(_DB_PATH)
+    return _open()
+
+
+def _artifacts_present(payload: Dict[str, Any]) -> bool:
+    csv_path = payload.get("csv_path")
+    return not csv_path or os.path.isfile(str(csv_path))
+
+
+def get(key: str) -> Optional[Dict[str, Any]]:
+    """Return the stored payload for ``key`` (and mark it recently used), or None."""
+    if not enabled():
+        return None
+    try:
+        conn = _connect()
+        try:
+            row = conn.execute("SELECT payload FROM build_results WHERE key = ?", (key,)).fetchone()
+            payload = json.loads(row[0]) if row else None
+            if payload is not None and not _artifacts_present(payload):
+                with conn:
+                    conn.execute("DELETE FROM build_results WHERE key = ?", (key,))
+                payload = None
+            if payload is not None:
+                with conn:
+                    conn.execute("UPDATE build_results SET last_used = ? WHERE key = ?", (time.time(), key))
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError, ValueError):
+        payload = None
+    _counters["hits" if payload is not None else "misses"] += 1
+    return payload
+
+
+def put(key: str, payload: Dict[str, Any], *, kind: str = "random_full", fingerprint: Optional[str] = None) -> None:
+    """Store ``payload`` (must be JSON-serializable); drop stale-data rows and trim to the size cap."""
+    if not enabled():
+        return
+    fp = fingerprint if fingerprint is not None else data_fingerprint()
+    try:
+        text = json.dumps(payload, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return
+    now = time.time()
+    try:
+        conn = _connect()
+        try:
+            with conn:
+                stale = conn.execute("DELETE FROM build_results WHERE fingerprint != ?", (fp,)).rowcount
+                conn.execute(
+                    "INSERT OR REPLACE INTO build_results(key, kind, fingerprint, payload, created_at, last_used) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, kind, fp, text, now, now),
+                )
+                evicted = conn.execute(
+                    "DELETE FROM build_results WHERE key NOT IN "
+                    "(SELECT key FROM build_results ORDER BY last_used DESC LIMIT ?)",
+                    (_max_entries(),),
+                ).rowcount
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError):
+        return
+    _counters["stores"] += 1
+    _counters["invalidated"] += max(0, stale)
+    _counters["evicted"] += max(0, evicted)
+
+
+def clear() -> None:
+    """Remove every cached build."""
+    try:
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM build_results")
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError):
+        pass
+
+
+def stats() -> Dict[str, Any]:
+    """Counters since process start plus the current row count."""
+    out: Dict[str, Any] = dict(_counters)
+    out["enabled"] = enabled()
+    out["max_entries"] = _max_entries()
+    try:
+        conn = _connect()
+        try:
+            out["entries"] = int(conn.execute("SELECT COUNT(*) FROM build_results").fetchone()[0])
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError):
+        out["entries"] = None
+    return out
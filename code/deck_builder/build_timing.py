@@ -0,0 +1,189 @@
+"""Per-stage build timing spans.
+
+Each ``DeckBuilder`` owns a :class:`SpanRecorder` (unless ``BUILD_TIMINGS=0``).
+Phase entry points are wrapped with :func:`timed_stage`, and ad-hoc blocks use
+``with self._timed("phase4.removal"):``. A span records wall time, thread CPU
+time, the card pool size when the stage started and how many library entries
+it added. Spans nest (``depth``), so a bulk phase and the per-category calls
+it makes are both visible.
+
+``build_deck_summary`` attaches the spans to the summary payload (and so to
+the ``.summary.json`` sidecar) and publishes any not yet published into a
+process-wide rolling window per stage. :func:`stage_stats` reports count,
+p50 and p95 per stage for the diagnostics endpoint.
+
+With the recorder disabled the builder holds ``None`` and wrapped methods
+call straight through after one attribute check.
+
+Env:
+    BUILD_TIMINGS         0 disables span recording (default 1)
+    BUILD_TIMINGS_WINDOW  builds kept per stage for p50/p95 (default 200)
+"""
+from __future__ import annotations
+
+import functools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+__all__ = [
+    "SpanRecorder",
+    "enabled",
+    "timed_stage",
+    "record_spans",
+    "stage_stats",
+    "reset_stage_stats",
+]
+
+
+def enabled() -> bool:
+    return (os.getenv("BUILD_TIMINGS") or "1").strip().lower() not in ("0", "false", "off", "no")
+
+
+def _window_size() -> int:
+    try:
+        return max(1, int(os.getenv("BUILD_TIMINGS_WINDOW", "200")))
+    except ValueError:
+        return 200
+
+
+def _pool_size(builder: Any) -> Optional[int]:
+    pool = getattr(builder, "_combined_cards_df", None)
+    if pool is None:
+        return None
+    try:
+        return int(len(pool))
+    except TypeError:
+        return None
+
+
+def _library_size(builder: Any) -> int:
+    try:
+        return len(getattr(builder, "card_library", None) or ())
+    except TypeError:
+        return 0
+
+
+class SpanRecorder:
+    """Ordered list of finished spans for one build."""
+
+    __slots__ = ("spans", "_depth", "_published")
+
+    def __init__(self) -> None:
+        self.spans: List[Dict[str, Any]] = []
+        self._depth = 0
+        self._published = 0
+
+    def begin(self, name: str, builder: Any = None) -> Tuple[str, float, float, Optional[int], int, int]:
+        """Start a span; pass the returned token to :meth:`end`."""
+        token = (name, time.perf_counter(), time.thread_time(), _pool_size(builder), _library_size(builder), self._depth)
+        self._depth += 1
+        return token
+
+    def end(self, token: Tuple[str, float, float, Optional[int], int, int], builder: Any = None) -> None:
+        name, wall0, cpu0, pool, lib0, depth = token
+        wall = time.perf_counter() - wall0
+        cpu = time.thread_time() - cpu0
+        self._depth = depth
+        self.spans.append({
+            "name": name,
+            "wall_ms": round(wall * 1000.0, 3),
+            "cpu_ms": round(cpu * 1000.0, 3),
+            "pool_size": pool,
+            "cards_added": _library_size(builder) - lib0 if builder is not None else None,
+            "depth": depth,
+        })
+
+    @contextmanager
+    def span(self, name: str, builder: Any = None) -> Iterator[None]:
+        token = self.begin(name, builder)
+        try:
+            yield
+        finally:
+            self.end(token, builder)
+
+    def as_list(self) -> List[Dict[str, Any]]:
+        return [dict(s) for s in self.spans]
+
+    def publish(self) -> None:
+        """Feed spans finished since the last call into the rolling per-stage windows."""
+        new = self.spans[self._published:]
+        self._published = len(self.spans)
+        if new:
+            record_spans(new)
+
+
+def timed_stage(name: str) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator for builder methods: record the call as span ``name`` when timing is on."""
+
+    def decorator(fn: Callable[..., Any]) -> Callable[..., Any]:
+        @functools.wraps(fn)
+        def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+            recorder = getattr(self, "_timings", None)
+            if recorder is None:
+                return fn(self, *args, **kwargs)
+            token = recorder.begin(name, self)
+            try:
+                return fn(self, *args, **kwargs)
+            finally:
+                recorder.end(token, self)
+
+        return wrapper
+
+    return decorator
+
+
+# ---------------------------------------------------------------------------
+# Rolling per-stage aggregates
+# ---------------------------------------------------------------------------
+
+_WINDOWS: Dict[str, Deque[Tuple[float, float]]] = {}
+_LOCK = threading.Lock()
+
+
+def record_spans(spans: List[Dict[str, Any]]) -> None:
+    size = _window_size()
+    with _LOCK:
+        for span in spans:
+            window = _WINDOWS.get(span["name"])
+            if window is None or window.maxlen != size:
+                window = _WINDOWS[span["name"]] = deque(window or (), maxlen=size)
+            window.append((float(span["wall_ms"]), float(span["cpu_ms"])))
+
+
+def _percentile(sorted_vals: List[float], pct: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    k = (len(sorted_vals) - 1) * pct
+    f = int(k)
+    c = min(f + 1, len(sorted_vals) - 1)
+    if f == c:
+        return sorted_vals[f]
+    return sorted_vals[f] * (c - k) + sorted_vals[c] * (k - f)
+
+
+def stage_stats() -> Dict[str, Dict[str, Any]]:
+    """Per stage: sample count and p50/p95 wall and CPU milliseconds over the rolling window."""
+    with _LOCK:
+        snapshot = {name: list(window) for name, window in _WINDOWS.items()}
+    out: Dict[str, Dict[str, Any]] = {}
+    for name in sorted(snapshot):
+        samples = snapshot[name]
+        wall = sorted(w for w, _ in samples)
+        cpu = sorted(c for _, c in samples)
+        out[name] = {
+            "count": len(samples),
+            "wall_p50_ms": round(_percentile(wall, 0.50), 3),
+            "wall_p95_ms": round(_percentile(wall, 0.95), 3),
+            "cpu_p50_ms": round(_percentile(cpu, 0.50), 3),
+            "cpu_p95_ms": round(_percentile(cpu, 0.95), 3),
+        }
+    return out
+
+
+def reset_stage_stats() -> None:
+    with _LOCK:
+        _WINDOWS.clear()
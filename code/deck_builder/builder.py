@@ -3,6 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass, field
 from typing import Optional, List, Dict, Any, Callable, Tuple, Set
 import pandas as pd
+import contextlib
 import math
 import random
 import re
@@ -24,6 +25,9 @@ from .include_exclude_utils import (
     validate_list_sizes,
     collapse_duplicates
 )
+from .name_resolution import NameResolutionContext
+from .build_timing import SpanRecorder, timed_stage
+from . import build_timing
 from .phases.phase1_commander import CommanderSelectionMixin
 from .phases.phase2_lands_analysis import LandAnalysisMixin
 from .phases.phase2_lands_basics import LandBasicsMixin
@@ -57,9 +61,9 @@ from file_setup.setup import initial_setup
 logger = logging_util.logging.getLogger(__name__)
 logger.setLevel(logging_util.LOG_LEVEL)
 # Avoid duplicate handler attachment if reloaded (defensive; get_logger already guards but we mirror tagger.py approach)
-if not any(isinstance(h, logging_util.logging.FileHandler) and getattr(h, 'baseFilename', '').endswith('deck_builder.log') for h in logger.handlers):
+if logging_util.file_handler not in logger.handlers:
     logger.addHandler(logging_util.file_handler)
-if not any(isinstance(h, logging_util.logging.StreamHandler) for h in logger.handlers):
+if logging_util.stream_handler not in logger.handlers:
     logger.addHandler(logging_util.stream_handler)
 
 ## Phase 0 extraction note: fuzzy helpers & BRACKET_DEFINITIONS imported above
@@ -434,6 +438,10 @@ class DeckBuilder(
     _commander_df: Optional[pd.DataFrame] = None
     _combined_cards_df: Optional[pd.DataFrame] = None
     _full_cards_df: Optional[pd.DataFrame] = None  # immutable snapshot of original combined pool
+    # O(1) pool/exclude/owned lookups for add_card (rebuilt when its sources change)
+    _name_context: Optional[NameResolutionContext] = field(default=None, init=False, repr=False)
+    # Per-stage timing spans (None when BUILD_TIMINGS=0)
+    _timings: Optional[SpanRecorder] = field(default=None, init=False, repr=False)
     # Owned-cards mode
     use_owned_only: bool = False
     owned_card_names: set[str] = field(default_factory=set)
@@ -521,6 +529,18 @@ class DeckBuilder(
                 self._original_output_func(msg)
 
             self.output_func = _wrapped
+        if build_timing.enabled():
+            self._timings = SpanRecorder()
+
+    def _timed(self, name: str):
+        """Context manager recording the enclosed block as timing span ``name``."""
+        if self._timings is None:
+            return contextlib.nullcontext()
+        return self._timings.span(name, self)
+
+    def timing_spans(self) -> List[Dict[str, Any]]:
+        """Finished timing spans for this build, in completion order."""
+        return self._timings.as_list() if self._timings is not None else []
 
     def _run_land_build_steps(self):
         """Run all land build steps (1-8) in order, logging progress."""
@@ -539,6 +559,7 @@ class DeckBuilder(
         """Land Step 9 (Backfill Basics): Backfill basics to target if any steps fell short."""
         self._backfill_basics_to_target()
 
+    @timed_stage("phase2.lands.backfill")
     def _backfill_basics_to_target(self) -> None:
         """Add basic lands to reach ideal_counts['lands'] if the build fell short.
 
@@ -601,6 +622,7 @@ class DeckBuilder(
                     break  # No removable non-land found; stop backfilling
         self.output_func(f"  Land Count Now : {self._current_land_count()} / {land_target} ({added} added)")
 
+    @timed_stage("phase4.creature_floor")
     def _backfill_creature_floor(self) -> None:
         """Add on-theme creatures to reach ideal_counts['creatures_min'] if the build fell short.
 
@@ -1289,6 +1311,7 @@ class DeckBuilder(
             self.active_rulebreakers = []
         return full, load_files
 
+    @timed_stage("phase0.pool_setup")
     def setup_dataframes(self) -> pd.DataFrame:
         """Load cards from all_cards.parquet and filter by current color identity.
 
@@ -1520,8 +1543,21 @@ class DeckBuilder(
         # Note: This snapshot should also exclude filtered cards to prevent them from being accessible
         if self._full_cards_df is None:
             self._full_cards_df = combined.copy()
+        self._invalidate_name_context()
+        self._name_resolution_context()
         return combined
 
+    def _name_resolution_context(self) -> NameResolutionContext:
+        """Return the add_card lookup context, refreshing any stale part first."""
+        pool = self._combined_cards_df if self._combined_cards_df is not None else self._full_cards_df
+        ctx = self._name_context
+        if ctx is None:
+            ctx = self._name_context = NameResolutionContext()
+        return ctx.sync(pool, self.exclude_cards, getattr(self, 'owned_card_names', None))
+
+    def _invalidate_name_context(self) -> None:
+        self._name_context = None
+
     def apply_budget_pool_filter(self) -> None:
         """M4: Remove cards priced above the per-card ceiling × (1 + tolerance) from the pool.
 
@@ -1587,6 +1623,7 @@ class DeckBuilder(
     # ---------------------------
     # Include/Exclude Processing (M1: Config + Validation + Persistence)
     # ---------------------------
+    @timed_stage("phase2.includes")
     def _inject_includes_after_lands(self) -> None:
         """
         M2: Inject valid include cards after land selection, before creature/spell fill.
@@ -1880,6 +1917,7 @@ class DeckBuilder(
 
         # Update processed lists
         self.include_cards = final_includes
+        self._invalidate_name_context()
 
         # Store diagnostics for later use
         self.include_exclude_diagnostics = diagnostics.__dict__
@@ -2011,24 +2049,25 @@ class DeckBuilder(
         Stores minimal metadata; duplicates increment Count. Basic lands allowed unlimited.
         M2: Prevents re-entry of excluded cards via downstream heuristics.
         """
+        # Exclude/owned/pool checks share one per-build lookup context instead of
+        # re-normalizing the lists and scanning the pool on every call.
+        try:
+            ctx = self._name_resolution_context()
+        except Exception:
+            ctx = None
+
         # M2: Exclude re-entry prevention - check if card is in exclude list
-        if not is_commander and hasattr(self, 'exclude_cards') and self.exclude_cards:
-            from .include_exclude_utils import normalize_punctuation
-            
-            # Normalize the card name for comparison (with punctuation normalization)
-            normalized_card = normalize_punctuation(card_name)
-            normalized_excludes = {normalize_punctuation(exc): exc for exc in self.exclude_cards}
-            
-            if normalized_card in normalized_excludes:
+        if not is_commander and ctx is not None and self.exclude_cards:
+            pattern = ctx.excluded_pattern(card_name)
+            if pattern is not None:
                 # Log the prevention but don't output to avoid spam
-                logger.info(f"EXCLUDE_REENTRY_PREVENTED: Blocked re-addition of excluded card '{card_name}' (pattern: '{normalized_excludes[normalized_card]}')")
+                logger.info(f"EXCLUDE_REENTRY_PREVENTED: Blocked re-addition of excluded card '{card_name}' (pattern: '{pattern}')")
                 return
         
         # In owned-only mode, block adding cards not in owned list (except the commander itself)
         try:
-            if getattr(self, 'use_owned_only', False) and not is_commander:
-                owned = getattr(self, 'owned_card_names', set()) or set()
-                if owned and card_name.lower() not in {n.lower() for n in owned}:
+            if getattr(self, 'use_owned_only', False) and not is_commander and ctx is not None:
+                if not ctx.owned_allows(card_name):
                     # Silently skip non-owned additions
                     return
         except Exception:
@@ -2038,7 +2077,7 @@ class DeckBuilder(
         # current dataframes snapshot (which is filtered by color identity), skip it.
         # Allow the commander to bypass this check.
         try:
-            if not is_commander:
+            if not is_commander and ctx is not None:
                 # Permit basic lands even if they aren't present in the current CSV pool.
                 # Some distributions may omit basics from the per-color card CSVs, but they are
                 # always legal within color identity. We therefore bypass pool filtering for
@@ -2048,18 +2087,15 @@ class DeckBuilder(
                 except Exception:
                     basic_names = set()
 
-                if str(card_name) not in basic_names:
-                    # Use filtered pool (_combined_cards_df) instead of unfiltered (_full_cards_df)
-                    # This ensures exclude filtering is respected during card addition
-                    df_src = self._combined_cards_df if self._combined_cards_df is not None else self._full_cards_df
-                    if df_src is not None and not df_src.empty and 'name' in df_src.columns:
-                        if df_src[df_src['name'].astype(str).str.lower() == str(card_name).lower()].empty:
-                            # Not in the legal pool (likely off-color or unavailable)
-                            try:
-                                self.output_func(f"Skipped illegal/off-pool card: {card_name}")
-                            except Exception:
-                                pass
-                            return
+                # The context indexes the filtered pool (_combined_cards_df) when present so
+                # exclude filtering is respected during card addition
+                if str(card_name) not in basic_names and not ctx.in_pool(card_name):
+                    # Not in the legal pool (likely off-color or unavailable)
+                    try:
+                        self.output_func(f"Skipped illegal/off-pool card: {card_name}")
+                    except Exception:
+                        pass
+                    return
         except Exception:
             # If any unexpected error occurs, fall through (do not block legitimate adds)
             pass
@@ -2218,6 +2254,9 @@ class DeckBuilder(
             self._combined_cards_df = df[df['name'] != card_name]
         elif 'Card Name' in df.columns:
             self._combined_cards_df = df[df['Card Name'] != card_name]
+        ctx = self._name_context
+        if ctx is not None and ctx.pool is df:
+            ctx.remove_from_pool(card_name, self._combined_cards_df)
 
     # (Power bracket summary/printing now provided by mixin; _format_limits retained locally for reuse)
 
@@ -2722,6 +2761,7 @@ class DeckBuilder(
                 self.output_func(f"  {n.ljust(width)} : 1")
         self.output_func(f"  Land Count Now : {self._current_land_count()} / {land_target}")
 
+    @timed_stage("phase2.lands.triples")
     def run_land_step6(self, requested_count: Optional[int] = None):
         self.add_triple_lands(requested_count=requested_count)
         self._enforce_land_cap(step_label="Triples (Step 6)")
@@ -1,14 +1,16 @@
 from __future__ import annotations
 
+import os
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Any, Dict, Generic, Iterable, List, Optional, Sequence, Tuple, TypeVar
 
 from tagging.combo_schema import (
     load_and_validate_combos,
     load_and_validate_synergies,
-    CombosListModel,
-    SynergiesListModel,
+    ComboPairModel,
+    SynergyPairModel,
 )
 
 
@@ -21,6 +23,10 @@ def _canonicalize(name: str) -> str:
     return s
 
 
+def _norm(name: Any) -> str:
+    return _canonicalize(name).casefold()
+
+
 @dataclass(frozen=True)
 class DetectedCombo:
     a: str
@@ -37,53 +43,150 @@ class DetectedSynergy:
     tags: Optional[List[str]] = None
 
 
-def _detect_combos_from_model(names_norm: set[str], combos: CombosListModel) -> List[DetectedCombo]:
-    out: List[DetectedCombo] = []
-    for p in combos.pairs:
-        a = _canonicalize(p.a).casefold()
-        b = _canonicalize(p.b).casefold()
-        if a in names_norm and b in names_norm:
-            out.append(
-                DetectedCombo(
-                    a=p.a,
-                    b=p.b,
-                    cheap_early=bool(p.cheap_early),
-                    setup_dependent=bool(p.setup_dependent),
-                    tags=list(p.tags or []),
-                )
-            )
-    return out
+@dataclass(frozen=True)
+class ComboCompletion:
+    """A card that would complete a curated combo with a card already in the deck."""
 
+    card: str
+    partner: str
+    combo: DetectedCombo
 
-def detect_combos(names: Iterable[str], combos_path: str | Path = "config/card_lists/combos.json") -> List[DetectedCombo]:
-    names_norm = set()
-    for n in names:
-        c = _canonicalize(n).casefold()
-        if not c:
-            continue
-        names_norm.add(c)
 
-    if not names_norm:
-        return []
+PairT = TypeVar("PairT", ComboPairModel, SynergyPairModel)
+
+
+class PairIndex(Generic[PairT]):
+    """Per-card adjacency over a validated combos/synergies list.
+
+    ``adjacency[canonical name]`` lists ``(partner canonical name, pair
+    position)`` for every pair the card is part of, so detection walks the
+    deck's cards and their partners instead of every pair in the file.
+    Pair positions keep results in file order, matching the old full scan.
+    """
+
+    __slots__ = ("pairs", "adjacency")
+
+    def __init__(self, pairs: Sequence[PairT]) -> None:
+        self.pairs: List[PairT] = list(pairs)
+        self.adjacency: Dict[str, List[Tuple[str, int]]] = {}
+        for pos, p in enumerate(self.pairs):
+            a, b = _norm(p.a), _norm(p.b)
+            self.adjacency.setdefault(a, []).append((b, pos))
+            if b != a:
+                self.adjacency.setdefault(b, []).append((a, pos))
+
+    def present_pairs(self, names_norm: set[str]) -> List[PairT]:
+        """Pairs with both cards in `names_norm`, in file order."""
+        hits: set[int] = set()
+        adjacency = self.adjacency
+        for name in names_norm:
+            for partner, pos in adjacency.get(name, ()):
+                if partner in names_norm:
+                    hits.add(pos)
+        return [self.pairs[pos] for pos in sorted(hits)]
+
+    def missing_partners(self, names_norm: set[str]) -> List[Tuple[int, str]]:
+        """``(pair position, name in deck)`` for pairs with exactly one card in `names_norm`."""
+        hits: set[Tuple[int, str]] = set()
+        adjacency = self.adjacency
+        for name in names_norm:
+            for partner, pos in adjacency.get(name, ()):
+                if partner not in names_norm:
+                    hits.add((pos, name))
+        return sorted(hits)
+
+
+_INDEX_CACHE: Dict[Tuple[str, str], Tuple[Optional[int], PairIndex]] = {}
+_index_lock = threading.Lock()
+
+
+def _mtime_ns(path: str | Path) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
 
-    combos = load_and_validate_combos(combos_path)
-    return _detect_combos_from_model(names_norm, combos)
 
+def _pair_index(kind: str, path: str | Path) -> PairIndex:
+    """Compiled index for `path`, rebuilt when the file's mtime changes.
 
-def _detect_synergies_from_model(names_norm: set[str], syn: SynergiesListModel) -> List[DetectedSynergy]:
-    out: List[DetectedSynergy] = []
-    for p in syn.pairs:
-        a = _canonicalize(p.a).casefold()
-        b = _canonicalize(p.b).casefold()
-        if a in names_norm and b in names_norm:
-            out.append(DetectedSynergy(a=p.a, b=p.b, tags=list(p.tags or [])))
+    The list is read through `combo_schema`'s validating loaders, bypassing
+    their path-keyed cache so an edited file is picked up.
+    """
+    key = (kind, str(path))
+    mtime = _mtime_ns(path)
+    with _index_lock:
+        cached = _INDEX_CACHE.get(key)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    loader = load_and_validate_combos if kind == "combos" else load_and_validate_synergies
+    model = loader.__wrapped__(path)
+    index: PairIndex = PairIndex(model.pairs)
+    with _index_lock:
+        _INDEX_CACHE[key] = (mtime, index)
+    return index
+
+
+def combo_index(combos_path: str | Path = "config/card_lists/combos.json") -> PairIndex[ComboPairModel]:
+    return _pair_index("combos", combos_path)
+
+
+def synergy_index(synergies_path: str | Path = "config/card_lists/synergies.json") -> PairIndex[SynergyPairModel]:
+    return _pair_index("synergies", synergies_path)
+
+
+def _to_detected_combo(p: ComboPairModel) -> DetectedCombo:
+    return DetectedCombo(
+        a=p.a,
+        b=p.b,
+        cheap_early=bool(p.cheap_early),
+        setup_dependent=bool(p.setup_dependent),
+        tags=list(p.tags or []),
+    )
+
+
+def _names_norm(names: Iterable[str]) -> set[str]:
+    out = set()
+    for n in names:
+        c = _norm(n)
+        if c:
+            out.add(c)
     return out
 
 
-def detect_synergies(names: Iterable[str], synergies_path: str | Path = "config/card_lists/synergies.json") -> List[DetectedSynergy]:
-    names_norm = {_canonicalize(n).casefold() for n in names if str(n).strip()}
+def detect_combos(names: Iterable[str], combos_path: str | Path = "config/card_lists/combos.json") -> List[DetectedCombo]:
+    names_norm = _names_norm(names)
     if not names_norm:
         return []
-    syn = load_and_validate_synergies(synergies_path)
-    return _detect_synergies_from_model(names_norm, syn)
+    return [_to_detected_combo(p) for p in combo_index(combos_path).present_pairs(names_norm)]
+
 
+def detect_synergies(names: Iterable[str], synergies_path: str | Path = "config/card_lists/synergies.json") -> List[DetectedSynergy]:
+    names_norm = _names_norm(names)
+    if not names_norm:
+        return []
+    return [
+        DetectedSynergy(a=p.a, b=p.b, tags=list(p.tags or []))
+        for p in synergy_index(synergies_path).present_pairs(names_norm)
+    ]
+
+
+def find_combo_completions(
+    names: Iterable[str],
+    combos_path: str | Path = "config/card_lists/combos.json",
+) -> List[ComboCompletion]:
+    """Cards that would complete a curated combo with a card already in `names`.
+
+    One entry per (combo, missing card), in combos.json order; ``card`` and
+    ``partner`` use the spelling from the combos list.
+    """
+    names_norm = _names_norm(names)
+    if not names_norm:
+        return []
+    index = combo_index(combos_path)
+    out: List[ComboCompletion] = []
+    for pos, present in index.missing_partners(names_norm):
+        p = index.pairs[pos]
+        card, partner = (p.b, p.a) if _norm(p.a) == present else (p.a, p.b)
+        out.append(ComboCompletion(card=card, partner=partner, combo=_to_detected_combo(p)))
+    return out
@@ -0,0 +1,127 @@
+"""Per-build name lookups used by ``DeckBuilder.add_card``.
+
+``add_card`` runs hundreds of times per build and used to re-normalize the
+exclude list, lowercase the owned set and scan the whole card pool on every
+call. :class:`NameResolutionContext` keeps those three lookups as hash tables
+for the current pool snapshot so each check is O(1).
+
+The context remembers what it was built from (the pool DataFrame object, the
+exclude list contents and the owned-name set) and rebuilds only the stale part
+when any of them is replaced, so direct attribute assignments made by the web
+orchestrator stay safe.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from .include_exclude_utils import normalize_punctuation
+
+__all__ = ["NameResolutionContext"]
+
+_UNSET: Any = object()
+
+
+@dataclass
+class NameResolutionContext:
+    """Lowercase pool index, normalized exclude set and lowercased owned set.
+
+    ``positions`` maps a lowercase card name to row positions in the pool
+    snapshot the index was built from; ``names`` holds the exact names of that
+    snapshot. Removals made through :meth:`remove_from_pool` keep the index in
+    step with the builder's shrinking pool without rescanning it.
+    """
+
+    pool: Optional[pd.DataFrame] = None
+    positions: Dict[str, List[int]] = field(default_factory=dict)
+    names: List[str] = field(default_factory=list)
+    excluded: FrozenSet[str] = frozenset()
+    exclude_patterns: Dict[str, str] = field(default_factory=dict)
+    owned_lower: FrozenSet[str] = frozenset()
+    _exclude_source: Optional[Tuple[str, ...]] = field(default=None, repr=False)
+    _owned_source: Any = field(default=_UNSET, repr=False)
+    _owned_size: int = field(default=-1, repr=False)
+
+    # ------------------------------------------------------------------
+    # Building / refreshing
+    # ------------------------------------------------------------------
+    def sync(
+        self,
+        pool: Optional[pd.DataFrame],
+        exclude_cards: Optional[Iterable[str]],
+        owned_names: Optional[Iterable[str]],
+    ) -> "NameResolutionContext":
+        """Rebuild whichever lookup no longer matches its source; return self."""
+        if pool is not self.pool:
+            self._index_pool(pool)
+        excludes = tuple(exclude_cards or ())
+        if excludes != self._exclude_source:
+            self._index_excludes(excludes)
+        owned = owned_names or ()
+        if owned is not self._owned_source or len(owned) != self._owned_size:  # type: ignore[arg-type]
+            self._index_owned(owned)
+        return self
+
+    def _index_pool(self, pool: Optional[pd.DataFrame]) -> None:
+        self.pool = pool
+        self.positions = {}
+        self.names = []
+        if pool is None or 'name' not in getattr(pool, 'columns', ()):
+            return
+        self.names = pool['name'].astype(str).tolist()
+        for pos, name in enumerate(self.names):
+            self.positions.setdefault(name.lower(), []).append(pos)
+
+    def _index_excludes(self, excludes: Tuple[str, ...]) -> None:
+        self._exclude_source = excludes
+        self.exclude_patterns = {normalize_punctuation(exc): exc for exc in excludes}
+        self.excluded = frozenset(self.exclude_patterns)
+
+    def _index_owned(self, owned: Iterable[str]) -> None:
+        self._owned_source = owned
+        self._owned_size = len(owned)  # type: ignore[arg-type]
+        self.owned_lower = frozenset(str(n).lower() for n in owned)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+    def excluded_pattern(self, card_name: str) -> Optional[str]:
+        """Return the exclude entry that blocks ``card_name``, if any."""
+        if not self.excluded:
+            return None
+        normalized = normalize_punctuation(card_name)
+        if normalized in self.excluded:
+            return self.exclude_patterns[normalized]
+        return None
+
+    def owned_allows(self, card_name: str) -> bool:
+        """True unless an owned list is set and ``card_name`` is not on it."""
+        return not self.owned_lower or card_name.lower() in self.owned_lower
+
+    def in_pool(self, card_name: str) -> bool:
+        """True when the pool holds ``card_name`` (case-insensitive).
+
+        A missing, empty or unnamed pool cannot be checked and allows every name.
+        """
+        pool = self.pool
+        if pool is None or pool.empty or 'name' not in pool.columns:
+            return True
+        return str(card_name).lower() in self.positions
+
+    # ------------------------------------------------------------------
+    # Pool maintenance
+    # ------------------------------------------------------------------
+    def remove_from_pool(self, card_name: str, new_pool: Optional[pd.DataFrame]) -> None:
+        """Drop rows named exactly ``card_name`` and adopt ``new_pool`` as the snapshot."""
+        key = str(card_name).lower()
+        rows = self.positions.get(key)
+        if rows:
+            kept = [pos for pos in rows if self.names[pos] != card_name]
+            if kept:
+                self.positions[key] = kept
+            else:
+                del self.positions[key]
+        self.pool = new_pool
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import Dict, Optional
 from .. import builder_constants as bc
+from ..build_timing import timed_stage
 import os
 
 """Phase 2 (part 1): Basic land addition logic (Land Step 1).
@@ -146,6 +147,7 @@ class LandBasicsMixin:
             self.output_func(f"  {name.ljust(width)} : {cnt}")
         self.output_func(f"  Total Basics : {sum(allocation.values())} (Target {target_basics}, Min {basic_min})")
 
+    @timed_stage("phase2.lands.basics")
     def run_land_step1(self):
         """Public wrapper to execute land building step 1 (basics)."""
         self.add_basic_lands()
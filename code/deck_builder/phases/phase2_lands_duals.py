@@ -2,6 +2,7 @@ from __future__ import annotations
 from typing import List, Dict
 import random
 from .. import builder_constants as bc
+from ..build_timing import timed_stage
 
 """Phase 2 (part 5): Dual typed lands (Land Step 5).
 
@@ -214,6 +215,7 @@ class LandDualsMixin:
                 self.output_func(f"  {n.ljust(width)} : 1")
         self.output_func(f"  Land Count Now : {self._current_land_count()} / {land_target}")
 
+    @timed_stage("phase2.lands.duals")
     def run_land_step5(self, requested_count: int | None = None):
         self.add_dual_lands(requested_count=requested_count)
         self._enforce_land_cap(step_label="Duals (Step 5)")
@@ -3,6 +3,7 @@ from typing import List
 import random
 from .. import builder_constants as bc
 from .. import builder_utils as bu
+from ..build_timing import timed_stage
 
 """Phase 2 (part 4): Fetch lands (Land Step 4).
 
@@ -155,6 +156,7 @@ class LandFetchMixin:
                 self.output_func(f"  {n.ljust(width)} : 1  ({note})")
         self.output_func(f"  Land Count Now : {self._current_land_count()} / {land_target}")
 
+    @timed_stage("phase2.lands.fetch")
     def run_land_step4(self, requested_count: int | None = None):
         """Public wrapper to add fetch lands.
 
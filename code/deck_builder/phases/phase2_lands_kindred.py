@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import List, Dict
 from .. import builder_constants as bc
+from ..build_timing import timed_stage
 
 """Phase 2 (part 3): Kindred / tribal land additions (Land Step 3).
 
@@ -141,6 +142,7 @@ class LandKindredMixin:
                 self.output_func(f"  {n.ljust(width)} : 1  ({reasons.get(n,'')})")
         self.output_func(f"  Land Count Now : {self._current_land_count()} / {land_target}")
 
+    @timed_stage("phase2.lands.kindred")
     def run_land_step3(self):
         """Public wrapper to add kindred-focused lands."""
         self.add_kindred_lands()
@@ -6,6 +6,7 @@ import csv
 
 from .. import builder_constants as bc
 from .. import builder_utils as bu
+from ..build_timing import timed_stage
 
 
 class LandMiscUtilityMixin:
@@ -312,6 +313,7 @@ class LandMiscUtilityMixin:
         if getattr(self, 'show_diagnostics', False) and filtered_out:
             self.output_func(f"  (Mono-color excluded candidates: {', '.join(filtered_out)})")
 
+    @timed_stage("phase2.lands.misc")
     def run_land_step7(self, requested_count: Optional[int] = None):
         self.add_misc_utility_lands(requested_count=requested_count)
         self._enforce_land_cap(step_label="Utility (Step 7)")
@@ -4,6 +4,7 @@ from typing import List
 
 from .. import builder_constants as bc
 from .. import builder_utils as bu
+from ..build_timing import timed_stage
 
 
 class LandOptimizationMixin:
@@ -150,6 +151,7 @@ class LandOptimizationMixin:
                 new_tapped += 1
         self.output_func(f"  Tapped Lands After : {new_tapped} (threshold {threshold})")
 
+    @timed_stage("phase2.lands.optimize")
     def run_land_step8(self):
         self.optimize_tapped_lands()
         self._enforce_land_cap(step_label="Tapped Opt (Step 8)")
@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import List, Dict
 from .. import builder_constants as bc
+from ..build_timing import timed_stage
 
 """Phase 2 (part 2): Staple nonbasic lands (Land Step 2).
 
@@ -139,6 +140,7 @@ class LandStaplesMixin:
                 self.output_func(f"  {n.ljust(width)} : 1  {('(' + reason + ')') if reason else ''}")
         self.output_func(f"  Land Count Now : {self._current_land_count()} / {land_target}")
 
+    @timed_stage("phase2.lands.staples")
     def run_land_step2(self):
         """Public wrapper for adding generic staple nonbasic lands (excluding kindred)."""
         self.add_staple_lands()
@@ -6,6 +6,7 @@ from typing import List, Dict
 from .. import builder_constants as bc
 from .. import builder_utils as bu
 from ..theme_context import annotate_theme_matches
+from ..build_timing import timed_stage
 import logging_util
 
 logger = logging_util.logging.getLogger(__name__)
@@ -20,6 +21,7 @@ class CreatureAdditionMixin:
       - Avoid duplicating the commander
       - Deterministic weighted sampling via builder_utils helper
     """
+    @timed_stage("phase3.creatures")
     def add_creatures(self):
         """Add creatures to the deck based on selected themes and allocation weights.
         Applies kindred/tribal multipliers, prioritizes multi-theme matches, and avoids commander duplication.
@@ -325,6 +327,7 @@ class CreatureAdditionMixin:
                 self.output_func(f"  {label} '{tag}': 0")
         self.output_func(f"  Total {total_added}/{desired_total}{' (dataset shortfall)' if total_added < desired_total else ''}")
 
+    @timed_stage("phase3.creatures_phase")
     def add_creatures_phase(self):
         """Public method for orchestration: delegates to add_creatures.
         Use this as the main entry point for the creature addition phase in deck building.
@@ -628,18 +631,23 @@ class CreatureAdditionMixin:
             self.output_func(f"Fill pass added {added} extra creatures (shortfall compensation).")
 
     # Public stage entry points (web orchestrator looks for these)
+    @timed_stage("phase3.creatures_primary")
     def add_creatures_primary_phase(self):
         return self._add_creatures_for_role('primary')
 
+    @timed_stage("phase3.creatures_secondary")
     def add_creatures_secondary_phase(self):
         return self._add_creatures_for_role('secondary')
 
+    @timed_stage("phase3.creatures_tertiary")
     def add_creatures_tertiary_phase(self):
         return self._add_creatures_for_role('tertiary')
 
+    @timed_stage("phase3.creatures_fill")
     def add_creatures_fill_phase(self):
         return self._add_creatures_fill()
 
+    @timed_stage("phase3.creatures_all_theme")
     def add_creatures_all_theme_phase(self):
         """Staged pre-pass: when AND mode and 2+ tags, add creatures matching all selected themes first."""
         combine_mode = getattr(self, 'tag_mode', 'AND')
@@ -7,6 +7,7 @@ import os
 from .. import builder_utils as bu
 from .. import builder_constants as bc
 from ..theme_context import annotate_theme_matches
+from ..build_timing import timed_stage
 import logging_util
 
 logger = logging_util.logging.getLogger(__name__)
@@ -114,6 +115,7 @@ class SpellAdditionMixin:
     # ---------------------------
     # Ramp
     # ---------------------------
+    @timed_stage("phase4.ramp")
     def add_ramp(self):  # noqa: C901
         """Add ramp pieces in three phases: mana rocks (~1/3), mana dorks (~1/4), then general/other.
 
@@ -264,6 +266,7 @@ class SpellAdditionMixin:
     # ---------------------------
     # Removal
     # ---------------------------
+    @timed_stage("phase4.removal")
     def add_removal(self):
         """Add spot removal spells to the deck, avoiding board wipes and lands.
         Selects cards tagged as 'removal' or 'spot removal', prioritizing by EDHREC rank and mana value.
@@ -351,6 +354,7 @@ class SpellAdditionMixin:
     # ---------------------------
     # Board Wipes
     # ---------------------------
+    @timed_stage("phase4.wipes")
     def add_board_wipes(self):
         """Add board wipe spells to the deck.
         Selects cards tagged as 'board wipe' or 'mass removal', prioritizing by EDHREC rank and mana value.
@@ -434,6 +438,7 @@ class SpellAdditionMixin:
     # ---------------------------
     # Card Advantage
     # ---------------------------
+    @timed_stage("phase4.card_advantage")
     def add_card_advantage(self):
         """Add card advantage spells to the deck.
         Selects cards tagged as 'draw' or 'card advantage', splits between conditional and unconditional draw.
@@ -562,6 +567,7 @@ class SpellAdditionMixin:
     # ---------------------------
     # Protection
     # ---------------------------
+    @timed_stage("phase4.protection")
     def add_protection(self):
         """Add protection spells to the deck.
         Selects cards tagged as 'protection', prioritizing by EDHREC rank and mana value.
@@ -762,6 +768,7 @@ class SpellAdditionMixin:
     # ---------------------------
     # Theme Spell Filler to 100
     # ---------------------------
+    @timed_stage("phase4.theme_fill")
     def fill_remaining_theme_spells(self):
         """Fill remaining deck slots with theme spells to reach the deck-size target.
         Uses primary, secondary, and tertiary tags to select spells matching deck themes.
@@ -1073,6 +1080,7 @@ class SpellAdditionMixin:
     # ---------------------------
     # Orchestrator
     # ---------------------------
+    @timed_stage("phase4.non_creature_spells")
     def add_non_creature_spells(self):
         """Orchestrate addition of all non-creature spell categories and theme filler.
         Calls ramp, removal, board wipes, card advantage, protection, and theme filler methods in order.
@@ -1086,6 +1094,7 @@ class SpellAdditionMixin:
         self.fill_remaining_theme_spells()
         self.print_type_summary()
     
+    @timed_stage("phase4.spells_phase")
     def add_spells_phase(self):
         """Public method for orchestration: delegates to add_non_creature_spells.
         Use this as the main entry point for the spell addition phase in deck building.
@@ -4,6 +4,7 @@ from typing import Dict, Optional, List
 import logging_util
 from .. import builder_utils as bu
 from .. import builder_constants as bc  # noqa: F401 (future use / constants reference)
+from ..build_timing import timed_stage
 
 logger = logging_util.logging.getLogger(__name__)
 
@@ -60,6 +61,7 @@ class ColorBalanceMixin:
     # ---------------------------
     # Post-spell land adjustment & basic rebalance
     # ---------------------------
+    @timed_stage("phase5.land_adjust")
     def post_spell_land_adjust(
         self,
         pip_weights: Optional[Dict[str, float]] = None,
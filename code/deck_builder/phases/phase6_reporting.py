@@ -10,6 +10,7 @@ import logging_util
 from ..summary_telemetry import record_land_summary, record_theme_summary, record_partner_summary
 from ..color_identity_utils import normalize_colors, canon_color_code, color_label_from_code
 from ..shared_copy import build_land_headline, dfc_card_note
+from ..build_timing import timed_stage
 
 logger = logging_util.logging.getLogger(__name__)
 
@@ -19,6 +20,7 @@ except Exception:  # pragma: no cover
     PrettyTable = None  # type: ignore
 
 class ReportingMixin:
+    @timed_stage("phase6.reporting")
     def run_reporting_phase(self):
         """Public method for orchestration: delegates to print_type_summary and print_card_library.
             def export_decklist_text(self, directory: str = 'deck_files', filename: str | None = None, suppress_output: bool = False) -> str:
@@ -168,6 +170,7 @@ class ReportingMixin:
         return metadata
     """Phase 6: Reporting, summaries, and export helpers."""
 
+    @timed_stage("phase6.enforcement")
     def enforce_and_reexport(self, base_stem: str | None = None, mode: str = "prompt", deck_dir: str = "deck_files") -> dict:
         """Run bracket enforcement, then re-export CSV/TXT and recompute compliance.
 
@@ -286,6 +289,7 @@ class ReportingMixin:
             pass
         return report
 
+    @timed_stage("phase6.compliance")
     def compute_and_print_compliance(self, base_stem: str | None = None, deck_dir: str = "deck_files") -> dict:
         """Compute bracket compliance, print a compact summary, and optionally write a JSON report.
 
@@ -823,7 +827,12 @@ class ReportingMixin:
                 record_theme_summary(theme_payload)
         except Exception:  # pragma: no cover - diagnostics only
             logger.debug("Failed to record theme telemetry", exc_info=True)
+        recorder = getattr(self, '_timings', None)
+        if recorder is not None and recorder.spans:
+            summary_payload['timings'] = recorder.as_list()
+            recorder.publish()
         return summary_payload
+    @timed_stage("phase6.export_csv")
     def export_decklist_csv(
         self,
         directory: str = 'deck_files',
@@ -1139,9 +1148,20 @@ class ReportingMixin:
                     w.writerow(summary_row)
 
         self.output_func(f"Deck exported to {fname}")
+        self._note_deck_catalog(fname)
         # Auto-generate matching plaintext list (best-effort; ignore failures)
         return fname
 
+    @staticmethod
+    def _note_deck_catalog(path: str) -> None:
+        """Record an export in the web deck catalog (no-op outside the web install)."""
+        try:
+            from code.web.services.deck_catalog import note_deck_written
+        except Exception:
+            return
+        note_deck_written(path)
+
+    @timed_stage("phase6.export_txt")
     def export_decklist_text(self, directory: str = 'deck_files', filename: str | None = None, suppress_output: bool = False) -> str:
         """Export a simple plaintext list: one line per unique card -> "[Count] [Card Name]".
         Naming mirrors CSV export (same stem, .txt extension). Sorting follows same precedence.
@@ -1300,6 +1320,7 @@ class ReportingMixin:
                 f.write(line + "\n")
         if not suppress_output:
             self.output_func(f"Plaintext deck list exported to {path}")
+        self._note_deck_catalog(path)
         return path
 
     def print_card_library(self, table: bool = True):
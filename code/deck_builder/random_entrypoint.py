@@ -1,13 +1,15 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, fields
+from dataclasses import asdict, dataclass, fields
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional
 
+import os
 import time
 import pandas as pd
 import yaml
 
+from deck_builder import build_result_cache
 from deck_builder import builder_constants as bc
 from random_util import get_random, generate_seed
 
@@ -1288,6 +1290,11 @@ class RandomFullBuildResult(RandomBuildResult):
     compliance: Dict[str, Any] | None = None
 
 
+def _owned_only_headless() -> bool:
+    """Owned-only headless builds depend on the owned-card files, so they are never cached."""
+    return (os.getenv("HEADLESS_USE_OWNED_ONLY") or "").strip().lower() in ("1", "true", "yes", "on", "y")
+
+
 def build_random_full_deck(
     theme: Optional[str] = None,
     constraints: Optional[Dict[str, Any]] = None,
@@ -1314,6 +1321,9 @@ def build_random_full_deck(
     user's profile preference; CLI callers keep the "private" default).
 
     Returns a compact result including the seed, commander, and a summarized decklist.
+
+    Seeded builds are served from ``build_result_cache`` when the same request
+    was built before against the same card data.
     """
     t0 = time.time()
 
@@ -1323,6 +1333,37 @@ def build_random_full_deck(
     if primary_theme is not None and theme is None:
         theme = primary_theme
 
+    result_key: Optional[str] = None
+    data_fp: Optional[str] = None
+    if seed is not None and build_result_cache.enabled() and not _owned_only_headless():
+        data_fp = build_result_cache.data_fingerprint()
+        result_key = build_result_cache.cache_key(
+            "random_full",
+            {
+                "theme": theme,
+                "constraints": constraints or {},
+                "attempts": int(attempts),
+                "timeout_s": float(timeout_s),
+                "primary_theme": primary_theme,
+                "secondary_theme": secondary_theme,
+                "tertiary_theme": tertiary_theme,
+                "auto_fill_missing": bool(auto_fill_missing),
+                "auto_fill_secondary": auto_fill_secondary,
+                "auto_fill_tertiary": auto_fill_tertiary,
+                "strict_theme_match": bool(strict_theme_match),
+                "deck_dir": os.path.abspath(deck_dir),
+                "default_visibility": default_visibility,
+            },
+            seed,
+            data_fp,
+        )
+        cached = build_result_cache.get(result_key)
+        if cached is not None:
+            try:
+                return RandomFullBuildResult(**cached)
+            except TypeError:
+                pass  # stored by an older result schema; rebuild
+
     base = build_random_deck(
         theme=theme,
         constraints=constraints,
@@ -1741,5 +1782,9 @@ def build_random_full_deck(
         "txt_path": txt_path,
         "compliance": compliance,
     })
-    return RandomFullBuildResult(**base_kwargs)
+    result = RandomFullBuildResult(**base_kwargs)
+    # A timed-out commander search depends on wall-clock time, not just the seed
+    if result_key is not None and deck_items and not diags["timeout_hit"]:
+        build_result_cache.put(result_key, asdict(result), fingerprint=data_fp)
+    return result
 
@@ -23,6 +23,7 @@ from functools import lru_cache
 from typing import Dict, Iterable, Mapping, MutableMapping, Sequence
 
 from .combined_commander import PartnerMode
+from .partner_background_utils import analyze_partner_background
 
 __all__ = [
     "PartnerSuggestionContext",
@@ -31,6 +32,10 @@ __all__ = [
     "MODE_WEIGHTS",
     "score_partner_candidate",
     "is_noise_theme",
+    "ELIGIBILITY_ROLES",
+    "partner_eligibility",
+    "build_eligibility_buckets",
+    "eligible_candidate_roles",
 ]
 
 
@@ -660,3 +665,80 @@ def _collect_penalties(
         reasons.append(reason)
 
     return _clamp(total), reasons
+
+
+ELIGIBILITY_ROLES: tuple[str, ...] = (
+    "partner",
+    "partner_with",
+    "background",
+    "choose_background",
+    "doctor",
+    "doctors_companion",
+)
+
+
+def partner_eligibility(payload: Mapping[str, object]) -> frozenset[str]:
+    """Return the pairing roles a commander payload can fill.
+
+    Mirrors the flags ``build_combined_commander`` validates (partner payload
+    flags OR'd with theme-tag detection) but detects over the unfiltered theme
+    list, so the roles are a superset of what validation accepts: a bucket may
+    hold a commander that later fails validation, never the reverse.
+    """
+
+    meta = _partner_meta(payload)
+    detection = analyze_partner_background("", "", _sequence(payload, "themes"))
+    roles: set[str] = set()
+    if meta.get("has_partner") or meta.get("has_plain_partner") or detection.has_partner:
+        roles.add("partner")
+    if _sequence(meta, "partner_with") or detection.partner_with:
+        roles.add("partner_with")
+    if meta.get("is_background") or detection.is_background:
+        roles.add("background")
+    if meta.get("supports_backgrounds") or meta.get("choose_background") or detection.choose_background:
+        roles.add("choose_background")
+    if meta.get("is_doctor") or detection.is_doctor:
+        roles.add("doctor")
+    if meta.get("is_doctors_companion") or detection.is_doctors_companion:
+        roles.add("doctors_companion")
+    return frozenset(roles)
+
+
+def build_eligibility_buckets(commanders: Mapping[str, Mapping[str, object]]) -> Dict[str, list[str]]:
+    """Group commander keys by :func:`partner_eligibility` role (keys sorted)."""
+
+    buckets: Dict[str, list[str]] = {role: [] for role in ELIGIBILITY_ROLES}
+    for key, payload in commanders.items():
+        if not isinstance(payload, Mapping):
+            continue
+        for role in partner_eligibility(payload):
+            buckets[role].append(str(key))
+    return {role: sorted(keys) for role, keys in buckets.items()}
+
+
+def eligible_candidate_roles(
+    primary_roles: Iterable[str],
+    modes: Iterable[PartnerMode | str],
+) -> set[str]:
+    """Candidate roles that can legally pair with a primary holding ``primary_roles``.
+
+    Only candidates holding one of the returned roles can survive
+    ``build_combined_commander`` in one of ``modes``.
+    """
+
+    held = set(primary_roles)
+    wanted: set[str] = set()
+    for mode in modes:
+        value = getattr(mode, "value", mode)
+        if value == PartnerMode.PARTNER.value and "partner" in held:
+            wanted.add("partner")
+        elif value == PartnerMode.PARTNER_WITH.value and "partner_with" in held:
+            wanted.add("partner_with")
+        elif value == PartnerMode.BACKGROUND.value and "choose_background" in held:
+            wanted.add("background")
+        elif value == PartnerMode.DOCTOR_COMPANION.value:
+            if "doctor" in held:
+                wanted.add("doctors_companion")
+            if "doctors_companion" in held:
+                wanted.add("doctor")
+    return wanted
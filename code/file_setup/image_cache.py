@@ -9,7 +9,9 @@ Features:
 - Uses Scryfall bulk data API (respects rate limits and guidelines)
 - Downloads from Scryfall CDN (no rate limits on image files)
 - Progress tracking for long downloads
-- Resume capability if interrupted
+- Concurrent downloads over keep-alive connections, rate limited by a shared
+  token bucket (see image_downloader.py)
+- Resume capability if interrupted (download_manifest.json)
 - Graceful fallback to API if images missing
 
 Environment Variables:
@@ -17,6 +19,9 @@ Environment Variables:
     IMAGE_CACHE_MODE: 'default'=cache only the best-scoring printing per card
         (legacy footprint, ~3.4 GB), 'full'=cache every paper printing of
         every card (~12-16 GB). Default: 'default'.
+    IMAGE_DOWNLOAD_WORKERS: concurrent download workers (default: 4)
+    IMAGE_DOWNLOAD_RATE: image requests per second across all workers
+        (default: 40)
 
 Image Sizes:
     - small: 160px width (for list views)
@@ -39,22 +44,17 @@ import json
 import logging
 import os
 import re
-import shutil
 import sys
 import time
 from pathlib import Path
 from typing import Any, Generator, Optional
-from urllib.request import Request, urlopen
 
+from code.file_setup.image_downloader import ImageDownloader
 from code.file_setup.scryfall_bulk_data import ScryfallBulkDataClient
 from code.path_util import card_files_processed_dir
 
 logger = logging.getLogger(__name__)
 
-# Scryfall CDN (cards.scryfall.io) has no hard rate limits.
-# We use a small delay to be a polite CDN citizen.
-DOWNLOAD_DELAY = 0.025  # 25ms between image downloads (~40 req/sec)
-
 # Image sizes to cache
 IMAGE_SIZES = ["small", "normal"]
 
@@ -107,6 +107,70 @@ def sanitize_filename(card_name: str) -> str:
     return safe_name
 
 
+class _PrintingsLookup:
+    """Hash-indexed views over the printings index, built once per load.
+
+    The per-card accessors on `ImageCache` are called for every tile of a
+    card grid or deck view; each used to scan and sort the whole index.
+    Rows are grouped by lowercase `face_name` into contiguous ranges of a
+    permutation ranked by (`score` desc, `released_at` desc), with the
+    default printing, the best printing per (card, set) and the row for
+    each (card, scryfall_id) precomputed as dicts.
+    """
+
+    def __init__(self, df) -> None:
+        import numpy as np
+        import pandas as pd
+
+        self.df = df
+        n = len(df)
+        keyed = pd.DataFrame(
+            {
+                "face": df["face_name"].str.lower().fillna("").to_numpy(dtype=object),
+                "set": df["set"].str.upper().to_numpy(dtype=object),
+                "score": df["score"].to_numpy(),
+                "released_at": df["released_at"].to_numpy(),
+                "sid": df["scryfall_id"].to_numpy(dtype=object),
+                "pos": np.arange(n),
+            }
+        )
+        self.scryfall_ids = keyed["sid"].to_numpy()
+
+        # Multi-key sort_values is stable: ties keep file order
+        ranked = keyed.sort_values(
+            ["face", "score", "released_at"], ascending=[True, False, False], na_position="last"
+        )
+        self._order = ranked["pos"].to_numpy()
+        faces = ranked["face"].to_numpy()
+        starts = np.flatnonzero(np.r_[True, faces[1:] != faces[:-1]]) if n else np.zeros(0, dtype=np.int64)
+        ends = np.r_[starts[1:], n].astype(np.int64)
+        self._groups: dict[str, tuple[int, int]] = dict(zip(faces[starts], zip(starts.tolist(), ends.tolist())))
+
+        in_set = ranked[ranked["set"].notna()].drop_duplicates(["face", "set"], keep="first")
+        self.best_in_set: dict[tuple[str, str], int] = dict(
+            zip(zip(in_set["face"], in_set["set"]), in_set["pos"].tolist())
+        )
+
+        self.default_id: dict[str, str] = {}
+        if "is_default" in df.columns:
+            defaults = keyed[df["is_default"].fillna(False).astype(bool).to_numpy()]
+            defaults = defaults.sort_values(["face", "released_at"], ascending=[True, False], na_position="last")
+            defaults = defaults.drop_duplicates("face", keep="first")
+            self.default_id = {f: str(sid) for f, sid in zip(defaults["face"], defaults["sid"])}
+
+        by_id = keyed.drop_duplicates(["face", "sid"], keep="first")
+        self.by_id: dict[tuple[str, Any], int] = dict(zip(zip(by_id["face"], by_id["sid"]), by_id["pos"].tolist()))
+
+    def rows(self, card_name: str):
+        """Row positions for a card in file order (empty if unknown)."""
+        import numpy as np
+
+        span = self._groups.get(card_name.lower())
+        if span is None:
+            return self._order[:0]
+        return np.sort(self._order[span[0]:span[1]])
+
+
 class ImageCache:
     """Manages local card image cache."""
 
@@ -125,11 +189,12 @@ class ImageCache:
         self.base_dir = Path(base_dir)
         self.bulk_data_path = Path(bulk_data_path)
         self.client = ScryfallBulkDataClient()
-        self._last_download_time: float = 0.0
+        self._downloader: Optional[ImageDownloader] = None
 
         # Printings metadata index (new per-card/per-printing layout).
         self.printings_index_path = Path(card_files_processed_dir()) / "card_printings.parquet"
         self._printings_df = None  # lazily loaded pandas DataFrame
+        self._printings_lookup: Optional[_PrintingsLookup] = None  # grouped views over _printings_df
 
         # In-memory index of available images (avoids repeated filesystem checks)
         # Key: (size, sanitized_filename), Value: True if exists
@@ -227,45 +292,41 @@ class ImageCache:
         card_query = quote(card_name)
         return f"https://api.scryfall.com/cards/named?fuzzy={card_query}&format=image&version={size}"
 
-    def _rate_limit_wait(self) -> None:
-        """Wait to respect rate limits between downloads."""
-        elapsed = time.time() - self._last_download_time
-        if elapsed < DOWNLOAD_DELAY:
-            time.sleep(DOWNLOAD_DELAY - elapsed)
-        self._last_download_time = time.time()
+    def get_downloader(self) -> ImageDownloader:
+        """Shared pooled downloader (token bucket + manifest) rooted at base_dir."""
+        if self._downloader is None or self._downloader.root != self.base_dir:
+            self._downloader = ImageDownloader(self.base_dir)
+        return self._downloader
 
-    def _download_image(self, image_url: str, output_path: Path) -> bool:
+    def _download_image(self, image_url: str, output_path: Path, refresh: bool = False) -> bool:
         """
         Download single image from Scryfall CDN.
 
         Args:
             image_url: Image URL from bulk data
             output_path: Local path to save image
+            refresh: Revalidate an existing file by its recorded ETag
 
         Returns:
-            True if successful, False otherwise
+            True if successful (or unchanged on refresh), False otherwise
         """
-        self._rate_limit_wait()
-
-        try:
-            # Ensure output directory exists
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-
-            req = Request(image_url)
-            req.add_header("User-Agent", "MTG-Deckbuilder/3.0 (Image Cache)")
+        return self.get_downloader().fetch(image_url, output_path, refresh=refresh) != "failed"
 
-            with urlopen(req, timeout=30) as response:
-                with open(output_path, "wb") as f:
-                    shutil.copyfileobj(response, f, length=65536)
-
-            return True
-
-        except Exception as e:
-            logger.debug(f"Failed to download {image_url}: {e}")
-            # Clean up partial download
-            if output_path.exists():
-                output_path.unlink()
-            return False
+    def _run_downloads(self, jobs, total: int, progress_callback, refresh: bool) -> dict[str, int]:
+        if refresh:
+            def download(url, path):
+                return self._download_image(url, path, refresh=True)
+        else:
+            download = self._download_image
+        stats = self.get_downloader().run(
+            jobs,
+            download=download,
+            progress_callback=progress_callback,
+            total=total,
+            refresh=refresh,
+        )
+        stats["total"] = total
+        return stats
 
     # Frame effects that mark a non-standard treatment (showcase, extended-art, etc.).
     _SPECIAL_FRAME_EFFECTS: frozenset[str] = frozenset(
@@ -519,6 +580,7 @@ class ImageCache:
 
         df.to_parquet(dest, index=False)
         self._printings_df = None  # invalidate in-memory cache
+        self._printings_lookup = None
         logger.info(f"Wrote {len(df)} printing rows to {dest}")
         return len(df)
 
@@ -531,8 +593,19 @@ class ImageCache:
         import pandas as pd
 
         self._printings_df = pd.read_parquet(self.printings_index_path)
+        self._printings_lookup = None
         return self._printings_df
 
+    def _lookup(self) -> Optional["_PrintingsLookup"]:
+        """Grouped lookup tables over the printings index (built on first use after a load)."""
+        df = self._load_printings_df()
+        if df is None:
+            return None
+        lookup = self._printings_lookup
+        if lookup is None or lookup.df is not df:
+            lookup = self._printings_lookup = _PrintingsLookup(df)
+        return lookup
+
     def get_printings(self, card_name: str) -> list[dict[str, Any]]:
         """
         Return metadata for every known paper printing of a card (from the
@@ -542,13 +615,23 @@ class ImageCache:
         Values are plain JSON-serializable Python types (not numpy scalars),
         since this is consumed directly by JSON API responses.
         """
-        df = self._load_printings_df()
-        if df is None:
+        lookup = self._lookup()
+        if lookup is None:
             return []
-        matches = df[df["face_name"].str.lower() == card_name.lower()]
-        if matches.empty:
+        positions = lookup.rows(card_name)
+        if not len(positions):
             return []
-        return json.loads(matches.to_json(orient="records"))
+        return json.loads(lookup.df.iloc[positions].to_json(orient="records"))
+
+    def get_printing(self, card_name: str, scryfall_id: str) -> Optional[dict[str, Any]]:
+        """Return one printing's row (as `get_printings()` shapes it), or `None`."""
+        lookup = self._lookup()
+        if lookup is None:
+            return None
+        pos = lookup.by_id.get((card_name.lower(), scryfall_id))
+        if pos is None:
+            return None
+        return json.loads(lookup.df.iloc[[pos]].to_json(orient="records"))[0]
 
     def get_default_printing_id(self, card_name: str) -> Optional[str]:
         """Return the Scryfall ID of the default printing for a card.
@@ -560,14 +643,10 @@ class ImageCache:
         reprint's art is what most players expect as the default, rather
         than a decades-old original printing.
         """
-        df = self._load_printings_df()
-        if df is None:
-            return None
-        matches = df[(df["face_name"].str.lower() == card_name.lower()) & (df["is_default"])]
-        if matches.empty:
+        lookup = self._lookup()
+        if lookup is None:
             return None
-        matches = matches.sort_values("released_at", ascending=False, na_position="last")
-        return str(matches.iloc[0]["scryfall_id"])
+        return lookup.default_id.get(card_name.lower())
 
     def get_printing_id_for_set(self, card_name: str, set_code: str) -> Optional[str]:
         """Return the Scryfall ID of the card's printing within `set_code`.
@@ -578,17 +657,11 @@ class ImageCache:
         globally-best printing. Returns `None` if the card has no printing
         in that set (or the printings index hasn't been built).
         """
-        df = self._load_printings_df()
-        if df is None:
-            return None
-        matches = df[
-            (df["face_name"].str.lower() == card_name.lower())
-            & (df["set"].str.upper() == set_code.upper())
-        ]
-        if matches.empty:
+        lookup = self._lookup()
+        if lookup is None:
             return None
-        matches = matches.sort_values(["score", "released_at"], ascending=[False, False], na_position="last")
-        return str(matches.iloc[0]["scryfall_id"])
+        pos = lookup.best_in_set.get((card_name.lower(), set_code.upper()))
+        return None if pos is None else str(lookup.scryfall_ids[pos])
 
     def get_printing_meta(
         self, card_name: str, *, scryfall_id: Optional[str] = None, set_code: Optional[str] = None
@@ -602,18 +675,20 @@ class ImageCache:
         `score`, then most recent `released_at`). Returns `None` if nothing
         matches (or the printings index hasn't been built).
         """
-        df = self._load_printings_df()
-        if df is None:
+        lookup = self._lookup()
+        if lookup is None:
             return None
-        matches = df[df["face_name"].str.lower() == card_name.lower()]
+        key = card_name.lower()
         if scryfall_id:
-            matches = matches[matches["scryfall_id"] == scryfall_id]
+            pos = lookup.by_id.get((key, scryfall_id))
         elif set_code:
-            matches = matches[matches["set"].str.upper() == set_code.upper()]
-            matches = matches.sort_values(["score", "released_at"], ascending=[False, False], na_position="last")
-        if matches.empty:
+            pos = lookup.best_in_set.get((key, set_code.upper()))
+        else:
+            positions = lookup.rows(key)
+            pos = int(positions[0]) if len(positions) else None
+        if pos is None:
             return None
-        row = matches.iloc[0]
+        row = lookup.df.iloc[pos]
         return {
             "set": str(row["set"]).upper(),
             "set_name": str(row["set_name"]),
@@ -667,6 +742,7 @@ class ImageCache:
         sizes: Optional[list[str]] = None,
         progress_callback=None,
         max_rows: Optional[int] = None,
+        refresh: bool = False,
     ) -> dict[str, int]:
         """
         Download images into the new per-card/per-printing folder layout
@@ -680,6 +756,8 @@ class ImageCache:
             sizes: Image sizes to download (default: ['small', 'normal']).
             progress_callback: Optional callback(current, total, card_name).
             max_rows: Maximum printing rows to download (for testing).
+            refresh: Revalidate already-cached images by ETag instead of
+                skipping them (unchanged images cost a 304).
 
         Returns:
             Dictionary with download statistics.
@@ -719,27 +797,17 @@ class ImageCache:
         if max_rows is not None:
             df = df.head(max_rows)
 
-        stats = {"total": len(df), "downloaded": 0, "skipped": 0, "failed": 0}
+        def _jobs():
+            for row in df.itertuples(index=False):
+                card_folder = self.base_dir / sanitize_filename(row.face_name)
+                items = []
+                for size in sizes:
+                    image_url = row.image_url_small if size == "small" else row.image_url_normal
+                    if image_url:
+                        items.append((image_url, card_folder / size / f"{row.scryfall_id}.jpg"))
+                yield row.face_name, items
 
-        for i, row in enumerate(df.itertuples(index=False)):
-            card_folder = self.base_dir / sanitize_filename(row.face_name)
-            for size in sizes:
-                image_url = row.image_url_small if size == "small" else row.image_url_normal
-                if not image_url:
-                    continue
-
-                output_path = card_folder / size / f"{row.scryfall_id}.jpg"
-                if output_path.exists():
-                    stats["skipped"] += 1
-                    continue
-
-                if self._download_image(image_url, output_path):
-                    stats["downloaded"] += 1
-                else:
-                    stats["failed"] += 1
-
-            if progress_callback:
-                progress_callback(i + 1, len(df), row.face_name)
+        stats = self._run_downloads(_jobs(), len(df), progress_callback, refresh)
 
         self.invalidate_summary_cache()
         self.invalidate_index()
@@ -770,6 +838,7 @@ class ImageCache:
         sizes: Optional[list[str]] = None,
         progress_callback=None,
         max_cards: Optional[int] = None,
+        refresh: bool = False,
     ) -> dict[str, int]:
         """
         Download card images from Scryfall CDN.
@@ -778,6 +847,7 @@ class ImageCache:
             sizes: Image sizes to download (default: ['small', 'normal'])
             progress_callback: Optional callback(current, total, card_name)
             max_cards: Maximum cards to download (for testing)
+            refresh: Revalidate already-cached images by ETag instead of skipping them
 
         Returns:
             Dictionary with download statistics
@@ -810,40 +880,20 @@ class ImageCache:
         if max_cards is not None:
             total_cards = min(max_cards, total_cards) if total_cards else max_cards
 
-        stats = {
-            "total": total_cards,
-            "downloaded": 0,
-            "skipped": 0,
-            "failed": 0,
-        }
-
         # Stream bulk JSON one card at a time — never loads entire file into RAM.
-        card_index = 0
-        for face_name, image_uris in self._stream_card_image_data():
-            if max_cards is not None and card_index >= max_cards:
-                break
-
-            for size in sizes:
-                image_url = image_uris.get(size)
-                if not image_url:
-                    continue
-
+        def _jobs():
+            for card_index, (face_name, image_uris) in enumerate(self._stream_card_image_data()):
+                if max_cards is not None and card_index >= max_cards:
+                    break
                 safe_name = sanitize_filename(face_name)
-                output_path = self.base_dir / size / f"{safe_name}.jpg"
-
-                if output_path.exists():
-                    stats["skipped"] += 1
-                    continue
-
-                if self._download_image(image_url, output_path):
-                    stats["downloaded"] += 1
-                else:
-                    stats["failed"] += 1
-
-            card_index += 1
-
-            if progress_callback:
-                progress_callback(card_index, total_cards, face_name)
+                items = [
+                    (image_uris[size], self.base_dir / size / f"{safe_name}.jpg")
+                    for size in sizes
+                    if image_uris.get(size)
+                ]
+                yield face_name, items
+
+        stats = self._run_downloads(_jobs(), total_cards, progress_callback, refresh)
 
         # Invalidate cached summary and in-memory index so new images are found immediately
         self.invalidate_summary_cache()
@@ -0,0 +1,434 @@
+"""
+Concurrent, resumable image downloader for the card image cache.
+
+`ImageCache.download_images()` and `download_all_printings()` hand their
+(url, path) pairs to an `ImageDownloader`, which fetches them on a small
+pool of worker threads. Each worker keeps one keep-alive HTTP connection per
+host, and all workers draw from a shared token bucket so the aggregate
+request rate stays at IMAGE_DOWNLOAD_RATE no matter how many workers run.
+
+Progress is recorded in a JSON manifest next to the images
+(`card_files/images/download_manifest.json`): every item is pending, done
+or failed, along with the byte size and ETag of the stored file. A restarted
+backfill skips items whose file is on disk with the recorded size, retries
+failed and pending ones, and (with ``refresh=True``) revalidates existing
+files with ``If-None-Match`` so unchanged images cost a 304.
+
+Environment Variables:
+    IMAGE_DOWNLOAD_WORKERS: worker threads (default: 4)
+    IMAGE_DOWNLOAD_RATE: requests per second across all workers
+        (default: 40, i.e. the previous 25ms DOWNLOAD_DELAY)
+"""
+
+import http.client
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "MTG-Deckbuilder/3.0 (Image Cache)"
+DEFAULT_WORKERS = 4
+DEFAULT_RATE = 40.0
+MANIFEST_NAME = "download_manifest.json"
+
+# Manifest is rewritten at most this often (seconds) while a run is active
+_FLUSH_INTERVAL = 2.0
+_MAX_REDIRECTS = 3
+
+STATUS_PENDING = "pending"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return max(1, int(os.getenv(name, str(default))))
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        value = float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+    return value if value > 0 else default
+
+
+def _is_complete_image(path: Path, size: int) -> bool:
+    """Cheap completeness check for an untracked file: known image header and trailer.
+
+    JPEG must end with the EOI marker, PNG with its IEND chunk, GIF with the
+    trailer byte and WebP's RIFF length must match the file size.
+    """
+    if size < 12:
+        return False
+    try:
+        with open(path, "rb") as f:
+            head = f.read(12)
+            f.seek(max(0, size - 32))
+            tail = f.read()
+    except OSError:
+        return False
+    if head.startswith(b"\xff\xd8\xff"):
+        return tail.rstrip(b"\x00").endswith(b"\xff\xd9")
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return tail.endswith(b"IEND\xaeB`\x82")
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return tail.endswith(b"\x3b")
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return int.from_bytes(head[4:8], "little") + 8 == size
+    return False
+
+
+class TokenBucket:
+    """Thread-safe token bucket: ``rate`` tokens per second, up to ``burst`` banked."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1.0, self.rate / 10))
+        self._tokens = self.capacity
+        self._stamp = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+                self._stamp = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class DownloadManifest:
+    """Persistent record of per-file download state, keyed by path relative to the cache root."""
+
+    def __init__(self, path: Path, root: Path) -> None:
+        self.path = Path(path)
+        self.root = Path(root)
+        self._lock = threading.Lock()
+        # Serializes writers of the .tmp file; held while serializing, not _lock
+        self._flush_lock = threading.Lock()
+        self._items: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+        self._last_flush = 0.0
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            items = data.get("items", {})
+            if isinstance(items, dict):
+                self._items = items
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable download manifest {self.path}: {e}")
+
+    def key(self, output_path: Path) -> str:
+        try:
+            return Path(output_path).relative_to(self.root).as_posix()
+        except ValueError:
+            return Path(output_path).as_posix()
+
+    def get(self, output_path: Path) -> Optional[dict[str, Any]]:
+        with self._lock:
+            entry = self._items.get(self.key(output_path))
+            return dict(entry) if entry else None
+
+    def update(self, output_path: Path, **fields: Any) -> None:
+        with self._lock:
+            # Entries are replaced, never mutated, so a flush snapshot stays consistent
+            key = self.key(output_path)
+            entry = dict(self._items.get(key) or {})
+            entry.update(fields)
+            entry["updated"] = round(time.time(), 3)
+            self._items[key] = entry
+            self._dirty = True
+        self.flush(force=False)
+
+    def counts(self) -> dict[str, int]:
+        with self._lock:
+            out = {STATUS_PENDING: 0, STATUS_DONE: 0, STATUS_FAILED: 0}
+            for entry in self._items.values():
+                status = entry.get("status")
+                if status in out:
+                    out[status] += 1
+            return out
+
+    def items_with_status(self, status: str) -> list[tuple[str, dict[str, Any]]]:
+        with self._lock:
+            return [(k, dict(v)) for k, v in self._items.items() if v.get("status") == status]
+
+    def flush(self, force: bool = True) -> None:
+        """Atomically rewrite the manifest (rate-limited unless ``force``).
+
+        Only the snapshot of the items is taken under the item lock; workers
+        keep recording while it is serialized and written. A rate-limited
+        flush is skipped while another one is writing.
+        """
+        if not self._flush_lock.acquire(blocking=force):
+            return
+        try:
+            with self._lock:
+                if not self._dirty:
+                    return
+                now = time.monotonic()
+                if not force and now - self._last_flush < _FLUSH_INTERVAL:
+                    return
+                items = dict(self._items)
+                self._dirty = False
+                self._last_flush = now
+            try:
+                payload = json.dumps({"version": 1, "items": items}, separators=(",", ":"))
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+                tmp.write_text(payload, encoding="utf-8")
+                os.replace(tmp, self.path)
+            except Exception as e:
+                with self._lock:
+                    self._dirty = True
+                logger.warning(f"Could not write download manifest {self.path}: {e}")
+        finally:
+            self._flush_lock.release()
+
+
+class ImageDownloader:
+    """Pooled, rate-limited image fetcher with a resumable manifest."""
+
+    def __init__(
+        self,
+        root: Path,
+        manifest_path: Optional[Path] = None,
+        workers: Optional[int] = None,
+        rate: Optional[float] = None,
+        timeout: float = 30.0,
+    ) -> None:
+        self.root = Path(root)
+        self.workers = workers or _env_int("IMAGE_DOWNLOAD_WORKERS", DEFAULT_WORKERS)
+        self.bucket = TokenBucket(rate or _env_float("IMAGE_DOWNLOAD_RATE", DEFAULT_RATE))
+        self.manifest = DownloadManifest(manifest_path or self.root / MANIFEST_NAME, self.root)
+        self.timeout = timeout
+        self._local = threading.local()
+
+    # -- connections -----------------------------------------------------------------
+
+    def _connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        pool = getattr(self._local, "connections", None)
+        if pool is None:
+            pool = self._local.connections = {}
+        conn = pool.get((scheme, netloc))
+        if conn is None:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = pool[(scheme, netloc)] = cls(netloc, timeout=self.timeout)
+        return conn
+
+    def _drop_connection(self, scheme: str, netloc: str) -> None:
+        pool = getattr(self._local, "connections", {})
+        conn = pool.pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+
+    def close(self) -> None:
+        """Close this thread's pooled connections and flush the manifest."""
+        for key in list(getattr(self._local, "connections", {})):
+            self._drop_connection(*key)
+        self.manifest.flush()
+
+    def _request(self, url: str, headers: dict[str, str]) -> tuple[int, dict[str, str], http.client.HTTPResponse, tuple[str, str]]:
+        parts = urlsplit(url)
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        for attempt in (0, 1):
+            conn = self._connection(parts.scheme, parts.netloc)
+            try:
+                conn.request("GET", target, headers=headers)
+                response = conn.getresponse()
+                return response.status, {k.lower(): v for k, v in response.getheaders()}, response, (parts.scheme, parts.netloc)
+            except (http.client.HTTPException, ConnectionError, OSError):
+                # A pooled keep-alive socket may have been closed by the server; retry once fresh
+                self._drop_connection(parts.scheme, parts.netloc)
+                if attempt:
+                    raise
+        raise RuntimeError("unreachable")
+
+    # -- single item -----------------------------------------------------------------
+
+    def fetch(self, url: str, output_path: Path, refresh: bool = False) -> str:
+        """Download one image; returns ``"downloaded"``, ``"not_modified"`` or ``"failed"``.
+
+        With ``refresh`` and a recorded ETag for an existing file, the request
+        is conditional and a 304 leaves the file untouched.
+        """
+        output_path = Path(output_path)
+        entry = self.manifest.get(output_path) or {}
+        headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "identity"}
+        if refresh and entry.get("etag") and output_path.exists():
+            headers["If-None-Match"] = entry["etag"]
+        tmp_path = output_path.with_name(output_path.name + ".part")
+        attempts = int(entry.get("attempts", 0)) + 1
+        try:
+            target = url
+            for _ in range(_MAX_REDIRECTS + 1):
+                self.bucket.acquire()
+                status, response_headers, response, conn_key = self._request(target, headers)
+                if status in (301, 302, 303, 307, 308) and response_headers.get("location"):
+                    response.read()
+                    target = response_headers["location"]
+                    headers.pop("If-None-Match", None)
+                    continue
+                break
+            if status == 304:
+                response.read()
+                self.manifest.update(
+                    output_path, url=url, status=STATUS_DONE, size=output_path.stat().st_size,
+                    result="not_modified", attempts=0, error=None,
+                )
+                return "not_modified"
+            if status != 200:
+                response.read()
+                raise OSError(f"HTTP {status}")
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            size = 0
+            with open(tmp_path, "wb") as f:
+                while True:
+                    chunk = response.read(65536)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    size += len(chunk)
+            expected = response_headers.get("content-length")
+            if expected is not None and expected.isdigit() and int(expected) != size:
+                self._drop_connection(*conn_key)
+                raise OSError(f"short read ({size} of {expected} bytes)")
+            if response_headers.get("connection", "").lower() == "close":
+                self._drop_connection(*conn_key)
+            os.replace(tmp_path, output_path)
+            self.manifest.update(
+                output_path, url=url, status=STATUS_DONE, size=size,
+                etag=response_headers.get("etag"), result="downloaded", attempts=0, error=None,
+            )
+            return "downloaded"
+        except Exception as e:
+            logger.debug(f"Failed to download {url}: {e}")
+            if tmp_path.exists():
+                tmp_path.unlink()
+            self.manifest.update(output_path, url=url, status=STATUS_FAILED, attempts=attempts, error=str(e))
+            return "failed"
+
+    def is_current(self, output_path: Path) -> bool:
+        """True when the file exists with the size the manifest recorded for it.
+
+        Files present on disk without a manifest entry (caches written before
+        the manifest existed) are adopted as done only when they look like a
+        complete image; anything else, e.g. a file truncated by an
+        interrupted run, is downloaded again.
+        """
+        output_path = Path(output_path)
+        try:
+            size = output_path.stat().st_size
+        except OSError:
+            return False
+        entry = self.manifest.get(output_path)
+        if entry is None or entry.get("size") is None:
+            if not _is_complete_image(output_path, size):
+                return False
+            self.manifest.update(output_path, status=STATUS_DONE, size=size)
+            return True
+        return entry.get("status") == STATUS_DONE and int(entry["size"]) == size
+
+    # -- batch -----------------------------------------------------------------------
+
+    def run(
+        self,
+        jobs: Iterable[tuple[str, list[tuple[str, Path]]]],
+        download: Optional[Callable[[str, Path], Any]] = None,
+        progress_callback=None,
+        total: int = 0,
+        refresh: bool = False,
+    ) -> dict[str, int]:
+        """Download every (url, path) of every ``(label, items)`` job on the worker pool.
+
+        Items already current on disk are skipped (or revalidated by ETag when
+        ``refresh``). ``download(url, path)`` defaults to `fetch`; a truthy
+        result counts as downloaded unless the manifest recorded a 304.
+        ``progress_callback(current, total, label)`` is called once per job,
+        serialized across workers.
+
+        Returns:
+            Dictionary with total/downloaded/skipped/failed counts
+        """
+        fetch = download or (lambda url, path: self.fetch(url, path, refresh=refresh))
+        stats = {"total": total, "downloaded": 0, "skipped": 0, "failed": 0}
+        lock = threading.Lock()
+        work: "queue.Queue[Optional[tuple[str, list[tuple[str, Path]]]]]" = queue.Queue(maxsize=self.workers * 4)
+        done_jobs = 0
+
+        def _count(key: str) -> None:
+            with lock:
+                stats[key] += 1
+
+        def _handle(label: str, items: list[tuple[str, Path]]) -> None:
+            nonlocal done_jobs
+            for url, path in items:
+                if self.is_current(path) and not (refresh and (self.manifest.get(path) or {}).get("etag")):
+                    _count("skipped")
+                    continue
+                self.manifest.update(path, url=url, status=STATUS_PENDING)
+                result = fetch(url, path)
+                if not result or result == "failed":
+                    _count("failed")
+                elif result == "not_modified" or (self.manifest.get(path) or {}).get("result") == "not_modified":
+                    _count("skipped")
+                else:
+                    _count("downloaded")
+            with lock:
+                done_jobs += 1
+                if progress_callback:
+                    try:
+                        progress_callback(done_jobs, total, label)
+                    except Exception as e:
+                        logger.debug(f"Progress callback failed: {e}")
+
+        def _worker() -> None:
+            try:
+                while True:
+                    job = work.get()
+                    if job is None:
+                        return
+                    try:
+                        _handle(*job)
+                    except Exception as e:
+                        logger.warning(f"Image download job {job[0]!r} failed: {e}")
+            finally:
+                for key in list(getattr(self._local, "connections", {})):
+                    self._drop_connection(*key)
+
+        threads = [threading.Thread(target=_worker, name=f"image-download-{i}", daemon=True) for i in range(self.workers)]
+        for t in threads:
+            t.start()
+        try:
+            for job in jobs:
+                work.put(job)
+        finally:
+            for _ in threads:
+                work.put(None)
+            for t in threads:
+                t.join()
+            self.manifest.flush()
+        if not stats["total"]:
+            stats["total"] = done_jobs
+        return stats
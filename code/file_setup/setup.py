@@ -158,11 +158,125 @@ def extract_creature_types(row: pd.Series) -> str:
     return ''
 
 
+def derive_card_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Vectorized `extract_creature_types`, `is_valid_commander` and `is_background`.
+    
+    Computes the derived columns for every row with string kernels instead of
+    a per-row ``apply``; values match the row-wise helpers above.
+    
+    Args:
+        df: DataFrame with ``type``, ``text`` and ``printings`` columns
+        
+    Returns:
+        DataFrame (same index) with creatureTypes, isCommander, isBackground
+        and printingCount columns
+    """
+    index = df.index
+    type_line = _text_column(df, 'type')
+    text = _text_column(df, 'text')
+    printings = df['printings'].fillna('') if 'printings' in df.columns else pd.Series('', index=index)
+    
+    is_creature = type_line.str.contains('Creature', regex=False)
+    is_bg = type_line.str.contains('Background', regex=False)
+    subtypes = type_line.str.split('—').str[1].str.strip()
+    creature_types = subtypes.where(is_creature & subtypes.notna(), '')
+    is_commander = (
+        (type_line.str.contains('Legendary', regex=False) & is_creature)
+        | text.str.lower().str.contains('can be your commander', regex=False)
+        | is_bg
+    )
+    return pd.DataFrame({
+        'creatureTypes': creature_types,
+        'isCommander': is_commander.astype(bool),
+        'isBackground': is_bg.astype(bool),
+        # Comma-separated set codes; blank entries are not counted
+        'printingCount': printings.astype(str).str.count(r'[^,]*[^,\s]').astype('int64'),
+    }, index=index)
+
+
+def _text_column(df: pd.DataFrame, column: str) -> pd.Series:
+    if column not in df.columns:
+        return pd.Series('', index=df.index)
+    return df[column].fillna('').astype(str)
+
+
+def _scan_raw_parquet(raw_path: str) -> tuple[pd.DataFrame, set[str]]:
+    """Read the raw MTGJSON parquet with column projection and scan-time filters.
+    
+    Only ``CSV_PROCESSING_COLUMNS`` plus the ``FILTER_CONFIG`` fields are
+    read. The FILTER_CONFIG substring rules, the illegal-set check and the
+    special-type exclusions are evaluated by the pyarrow scanner batch by
+    batch, so the unfiltered ~82-column table is never materialized. Rules
+    whose column is not a plain string column are left for pandas.
+    
+    Args:
+        raw_path: Path to raw cards.parquet from MTGJSON
+        
+    Returns:
+        (DataFrame, names of filter fields still to apply in pandas)
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    
+    dataset = ds.dataset(raw_path, format="parquet")
+    schema = dataset.schema
+    
+    def _is_text(name: str) -> bool:
+        if name not in schema.names:
+            return False
+        field_type = schema.field(name).type
+        return pa.types.is_string(field_type) or pa.types.is_large_string(field_type)
+    
+    def _contains(name: str, pattern: str, *, ignore_case: bool, regex: bool = False) -> ds.Expression:
+        kernel = pc.match_substring_regex if regex else pc.match_substring
+        return kernel(ds.field(name), pattern, ignore_case=ignore_case)
+    
+    # pandas str.contains(na=False): missing values never match
+    def _has(name: str, pattern: str, *, ignore_case: bool, regex: bool = False) -> ds.Expression:
+        return ds.field(name).is_valid() & _contains(name, pattern, ignore_case=ignore_case, regex=regex)
+    
+    def _lacks(name: str, pattern: str, *, ignore_case: bool, regex: bool = False) -> ds.Expression:
+        return ds.field(name).is_null() | ~_contains(name, pattern, ignore_case=ignore_case, regex=regex)
+    
+    pending: set[str] = set()
+    predicates: list[ds.Expression] = []
+    for field, rules in FILTER_CONFIG.items():
+        if not _is_text(field):
+            pending.add(field)
+            continue
+        for rule_type, values in rules.items():
+            for value in values or []:
+                if rule_type == 'exclude':
+                    predicates.append(_lacks(field, value, ignore_case=True))
+                elif rule_type == 'require':
+                    predicates.append(_has(field, value, ignore_case=True))
+    if _is_text('printings') and _is_text('type'):
+        is_basic_land = _has('type', 'Basic Land', ignore_case=True)
+        for set_code in NON_LEGAL_SETS:
+            predicates.append(_lacks('printings', set_code, ignore_case=False, regex=True) | is_basic_land)
+    elif 'printings' in schema.names:
+        pending.add('printings')
+    if _is_text('type'):
+        for card_type in CARD_TYPES_TO_EXCLUDE:
+            predicates.append(_lacks('type', card_type, ignore_case=True, regex=True))
+    else:
+        pending.add('type')
+    
+    wanted = list(dict.fromkeys(CSV_PROCESSING_COLUMNS + list(FILTER_CONFIG)))
+    columns = [c for c in wanted if c in schema.names]
+    row_filter = None
+    for predicate in predicates:
+        row_filter = predicate if row_filter is None else row_filter & predicate
+    table = dataset.to_table(columns=columns, filter=row_filter)
+    return table.to_pandas(), pending
+
+
 def process_raw_parquet(raw_path: str, output_path: str) -> pd.DataFrame:
     """Process raw MTGJSON Parquet into processed all_cards.parquet.
     
     This function:
-    1. Loads raw Parquet (all ~82 columns)
+    1. Loads raw Parquet (projected scan; row filters applied while scanning)
     2. Filters to essential columns (CSV_PROCESSING_COLUMNS)
     3. Applies standard filtering (banned cards, illegal sets, special types)
     4. Deduplicates by faceName (keep first printing only)
@@ -182,9 +296,14 @@ def process_raw_parquet(raw_path: str, output_path: str) -> pd.DataFrame:
     """
     logger.info(f"Processing {raw_path}")
     
-    # Load raw Parquet with DataLoader
     loader = DataLoader()
-    df = loader.read_cards(raw_path)
+    if loader._detect_format(raw_path) == "parquet":
+        # Projected scan: only the processing/filter columns are read and the
+        # layout/availability/set/type filters run inside the scanner
+        df, pending = _scan_raw_parquet(raw_path)
+    else:
+        df = loader.read_cards(raw_path)
+        pending = None
     
     logger.info(f"Loaded {len(df)} cards with {len(df.columns)} columns")
     
@@ -200,6 +319,8 @@ def process_raw_parquet(raw_path: str, output_path: str) -> pd.DataFrame:
     # Step 2: Apply configuration-based filters (FILTER_CONFIG)
     logger.info("Applying configuration filters")
     for field, rules in FILTER_CONFIG.items():
+        if pending is not None and field not in pending:
+            continue  # applied during the scan
         if field not in df.columns:
             logger.warning(f"Skipping filter for missing field: {field}")
             continue
@@ -229,7 +350,7 @@ def process_raw_parquet(raw_path: str, output_path: str) -> pd.DataFrame:
     # otherwise drop these cards entirely -- exempt Basic Lands so they
     # survive, matching their Snow-Covered counterparts (never printed in
     # Un-sets) which already pass through untouched.
-    if 'printings' in df.columns:
+    if 'printings' in df.columns and (pending is None or 'printings' in pending):
         logger.info("Removing illegal sets")
         for set_code in NON_LEGAL_SETS:
             before = len(df)
@@ -270,12 +391,13 @@ def process_raw_parquet(raw_path: str, output_path: str) -> pd.DataFrame:
     # case=False: some silver-bordered/joke cards (e.g. Un-set "sAnS mERcY",
     # type "pLAnE — sECreT LaIR") use scrambled capitalization in their type
     # line, which a case-sensitive substring match would miss entirely.
-    logger.info("Removing special card types")
-    for card_type in CARD_TYPES_TO_EXCLUDE:
-        before = len(df)
-        df = df[~df['type'].str.contains(card_type, case=False, na=False)]
-        if len(df) < before:
-            logger.debug(f"Removed type {card_type}: {before - len(df)} cards")
+    if pending is None or 'type' in pending:
+        logger.info("Removing special card types")
+        for card_type in CARD_TYPES_TO_EXCLUDE:
+            before = len(df)
+            df = df[~df['type'].str.contains(card_type, case=False, na=False)]
+            if len(df) < before:
+                logger.debug(f"Removed type {card_type}: {before - len(df)} cards")
     
     # Step 6: Filter to essential columns only (reduce from ~82 to 14)
     logger.info(f"Filtering to {len(CSV_PROCESSING_COLUMNS)} essential columns")
@@ -294,22 +416,15 @@ def process_raw_parquet(raw_path: str, output_path: str) -> pd.DataFrame:
     # Step 8: Add custom columns
     logger.info("Adding custom columns: creatureTypes, themeTags, isCommander, isBackground")
     
-    # creatureTypes: extracted from type line
-    df['creatureTypes'] = df.apply(extract_creature_types, axis=1)
+    derived = derive_card_columns(df)
+    df['creatureTypes'] = derived['creatureTypes']
     
     # themeTags: empty placeholder (filled during tagging)
     df['themeTags'] = ''
     
-    # isCommander: boolean flag
-    df['isCommander'] = df.apply(is_valid_commander, axis=1)
-    
-    # isBackground: boolean flag
-    df['isBackground'] = df.apply(is_background, axis=1)
-    
-    # printingCount: number of distinct printings (derived from printings column)
-    df['printingCount'] = df['printings'].fillna('').apply(
-        lambda x: len([s for s in x.split(',') if s.strip()])
-    )
+    df['isCommander'] = derived['isCommander']
+    df['isBackground'] = derived['isBackground']
+    df['printingCount'] = derived['printingCount']
     # isReprint: True if card has been printed more than once
     df['isReprint'] = df['printingCount'] > 1
 
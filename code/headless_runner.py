@@ -1,9 +1,12 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
+import io
 import json
 import os
 import re
+import time
 from dataclasses import asdict, dataclass, field
 from functools import lru_cache
 from typing import Any, Dict, List, Optional, Tuple
@@ -22,6 +25,9 @@ from file_setup.setup import initial_setup, run_full_pipeline
 from tagging import tagger
 from exceptions import CommanderValidationError
 
+# Card data loaded once by --batch before the worker pool forks (shared copy-on-write)
+_BATCH_WARM: Dict[str, Any] = {}
+
 def _is_stale(file1: str, file2: str) -> bool:
     """Return True if file2 is missing or older than file1."""
     if not os.path.isfile(file2):
@@ -285,6 +291,9 @@ def run(
         return ""
 
     builder = DeckBuilder(input_func=scripted_input)
+    warm_commanders = _BATCH_WARM.get("commander_df")
+    if warm_commanders is not None:
+        builder._commander_df = warm_commanders
     # Optional deterministic seed for Random Modes (does not affect core when unset)
     try:
         if seed is not None:
@@ -1233,6 +1242,228 @@ def _run_random_mode(config: RandomRunConfig) -> int:
     return 0
 
 
+# ---------------------------------------------------------------------------
+# Batch mode (--batch configs.jsonl)
+# ---------------------------------------------------------------------------
+
+_BATCH_TAG_KEYS = ("primary_tag", "secondary_tag", "tertiary_tag")
+_BATCH_CHOICE_KEYS = ("primary_choice", "secondary_choice", "tertiary_choice")
+
+
+def _batch_warmup() -> None:
+    """Load the card pool and commander frame once; forked workers inherit them."""
+    from deck_builder import builder_utils as bu
+
+    bu._load_all_cards_parquet()
+    _BATCH_WARM["commander_df"] = DeckBuilder(
+        headless=True,
+        log_outputs=False,
+        output_func=lambda *_: None,
+        input_func=lambda *_: "",
+    ).load_commander_data()
+    _load_commander_name_lookup()
+
+
+def _read_batch_configs(path: str) -> Tuple[List[Tuple[int, Dict[str, Any]]], List[Dict[str, Any]]]:
+    """Return ``(jobs, errors)``: one ``(line_no, config)`` per valid line, one result per bad line."""
+    jobs: List[Tuple[int, Dict[str, Any]]] = []
+    errors: List[Dict[str, Any]] = []
+    with open(path, "r", encoding="utf-8") as fh:
+        for line_no, raw in enumerate(fh, start=1):
+            text = raw.strip()
+            if not text or text.startswith("#"):
+                continue
+            try:
+                cfg = json.loads(text)
+            except json.JSONDecodeError as exc:
+                errors.append(_batch_result(line_no, "error", error=f"Invalid JSON: {exc}"))
+                continue
+            if not isinstance(cfg, dict):
+                errors.append(_batch_result(line_no, "error", error="Config line must be a JSON object"))
+                continue
+            jobs.append((line_no, cfg))
+    return jobs, errors
+
+
+def _batch_result(line_no: int, status: str, **fields: Any) -> Dict[str, Any]:
+    result: Dict[str, Any] = {
+        "line": line_no,
+        "status": status,
+        "commander": None,
+        "csv_path": None,
+        "txt_path": None,
+        "duration_s": None,
+        "error": None,
+    }
+    result.update(fields)
+    return result
+
+
+def _batch_run_kwargs(cfg: Dict[str, Any]) -> Dict[str, Any]:
+    """Translate one config line into ``run()`` keyword arguments.
+
+    Keys are ``run()`` parameter names, plus ``commander`` (alias of
+    ``command_name``) and ``primary_tag``/``secondary_tag``/``tertiary_tag``
+    (theme names resolved to menu choices). ``null`` values keep the default.
+    """
+    import inspect
+
+    allowed = set(inspect.signature(run).parameters) - {"user_theme_resolution"}
+    kwargs: Dict[str, Any] = {}
+    unknown: List[str] = []
+    for key, value in cfg.items():
+        if key in _BATCH_TAG_KEYS:
+            continue
+        if key == "commander":
+            key = "command_name"
+        if key not in allowed:
+            unknown.append(key)
+        elif value is not None:
+            kwargs[key] = value
+    if unknown:
+        raise ValueError(f"Unknown config keys: {', '.join(sorted(unknown))}")
+    commander = str(kwargs.get("command_name") or "").strip()
+    if not commander:
+        raise ValueError("Config line is missing 'commander'")
+    kwargs["command_name"] = commander
+
+    tag_names = [cfg.get(key) or None for key in _BATCH_TAG_KEYS]
+    if any(tag_names):
+        choices = _resolve_tag_choices(
+            commander,
+            *tag_names,
+            tuple(kwargs.get(key) for key in _BATCH_CHOICE_KEYS),
+            commander_df=_BATCH_WARM.get("commander_df"),
+        )
+        for key, choice in zip(_BATCH_CHOICE_KEYS, choices):
+            if choice is not None:
+                kwargs[key] = choice
+    return kwargs
+
+
+def _batch_build(job: Tuple[int, Dict[str, Any]]) -> Dict[str, Any]:
+    """Run one batch build (in a worker) and return its result record."""
+    line_no, cfg = job
+    commander = cfg.get("commander") or cfg.get("command_name")
+    start = time.perf_counter()
+    try:
+        kwargs = _batch_run_kwargs(cfg)
+        # Builder progress output would interleave across workers; keep only the result line
+        with contextlib.redirect_stdout(io.StringIO()):
+            builder = run(**kwargs)
+        result = _batch_result(
+            line_no,
+            "ok",
+            commander=getattr(builder, "commander_name", None) or kwargs["command_name"],
+            csv_path=getattr(builder, "last_csv_path", None),
+            txt_path=getattr(builder, "last_txt_path", None),
+        )
+    except BaseException as exc:  # SystemExit from validation must not kill the worker
+        if isinstance(exc, KeyboardInterrupt):
+            raise
+        result = _batch_result(line_no, "error", commander=commander, error=f"{type(exc).__name__}: {exc}")
+    result["duration_s"] = round(time.perf_counter() - start, 3)
+    result["worker_pid"] = os.getpid()
+    try:
+        from code import logging_util
+
+        logging_util.flush()
+    except Exception:
+        pass
+    return result
+
+
+def _iter_batch_results(jobs: List[Tuple[int, Dict[str, Any]]], workers: int):
+    """Yield results as builds finish; workers fork after warm-up where the platform allows."""
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield _batch_build(job)
+        return
+    import multiprocessing
+
+    initializer = None
+    try:
+        ctx = multiprocessing.get_context("fork")
+    except ValueError:
+        # No fork (Windows): each spawned worker warms its own copy
+        ctx = multiprocessing.get_context("spawn")
+        initializer = _batch_warmup
+    with ctx.Pool(processes=workers, initializer=initializer) as pool:
+        for result in pool.imap_unordered(_batch_build, jobs, chunksize=1):
+            yield result
+
+
+def _percentile(sorted_vals: List[float], pct: float) -> float:
+    if not sorted_vals:
+        return 0.0
+    k = (len(sorted_vals) - 1) * pct
+    f = int(k)
+    c = min(f + 1, len(sorted_vals) - 1)
+    if f == c:
+        return sorted_vals[f]
+    return sorted_vals[f] * (c - k) + sorted_vals[c] * (k - f)
+
+
+def _batch_summary(results: List[Dict[str, Any]], wall_s: float, workers: int) -> Dict[str, Any]:
+    durations = sorted(r["duration_s"] for r in results if r.get("duration_s") is not None)
+    ok = sum(1 for r in results if r.get("status") == "ok")
+    return {
+        "builds": len(results),
+        "ok": ok,
+        "errors": len(results) - ok,
+        "workers": workers,
+        "wall_s": round(wall_s, 3),
+        "builds_per_s": round(len(durations) / wall_s, 3) if wall_s > 0 else 0.0,
+        "p50_s": round(_percentile(durations, 0.50), 3),
+        "p95_s": round(_percentile(durations, 0.95), 3),
+    }
+
+
+def _run_batch_mode(args: argparse.Namespace) -> int:
+    path = args.batch
+    if not os.path.isfile(path):
+        print(f"Batch file not found: {path}")
+        return 1
+    jobs, results = _read_batch_configs(path)
+    workers = args.batch_workers or _parse_opt_int(os.getenv("HEADLESS_BATCH_WORKERS")) or os.cpu_count() or 1
+    workers = max(1, min(int(workers), len(jobs) or 1))
+    out_path = args.batch_output or f"{os.path.splitext(path)[0]}.results.jsonl"
+
+    if args.dry_run:
+        print(json.dumps({"batch": path, "builds": len(jobs), "invalid_lines": len(results), "workers": workers, "output": out_path}, indent=2))
+        return 0
+
+    print(f"Batch: {len(jobs)} build(s) from {path} with {workers} worker(s)")
+    warm_start = time.perf_counter()
+    _batch_warmup()
+    print(f"Card data loaded in {time.perf_counter() - warm_start:.2f}s")
+
+    out_dir = os.path.dirname(out_path)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    start = time.perf_counter()
+    with open(out_path, "w", encoding="utf-8") as out:
+        for result in results:
+            out.write(json.dumps(result) + "\n")
+        for result in _iter_batch_results(jobs, workers):
+            results.append(result)
+            out.write(json.dumps(result) + "\n")
+            out.flush()
+            status = "ok" if result["status"] == "ok" else f"error: {result['error']}"
+            print(f"[{len(results)}] line {result['line']} {result['commander'] or '?'} ({result['duration_s']}s) {status}")
+    summary = _batch_summary(results, time.perf_counter() - start, workers)
+
+    print("")
+    print(f"Results written to {out_path}")
+    print(
+        f"Builds: {summary['builds']} ({summary['ok']} ok, {summary['errors']} failed) in {summary['wall_s']}s "
+        f"with {summary['workers']} worker(s)"
+    )
+    print(f"Throughput: {summary['builds_per_s']} builds/s | p50 {summary['p50_s']}s | p95 {summary['p95_s']}s")
+    print(json.dumps({"batch_summary": summary}))
+    return 0 if summary["errors"] == 0 else 1
+
+
 def _build_arg_parser() -> argparse.ArgumentParser:
     p = argparse.ArgumentParser(description="Headless deck builder runner")
     p.add_argument("--commander", metavar="NAME", default=None,
@@ -1445,6 +1676,30 @@ def _build_arg_parser() -> argparse.ArgumentParser:
         help="Write random build payload JSON to PATH (directory or file)",
     )
 
+    batch_group = p.add_argument_group(
+        "Batch Mode",
+        "Run one build per JSONL config line in a pool of warm worker processes",
+    )
+    batch_group.add_argument(
+        "--batch",
+        metavar="PATH",
+        default=None,
+        help="JSONL file with one build config object per line",
+    )
+    batch_group.add_argument(
+        "--batch-workers",
+        metavar="INT",
+        type=int,
+        default=None,
+        help="Worker processes (default: HEADLESS_BATCH_WORKERS or CPU count)",
+    )
+    batch_group.add_argument(
+        "--batch-output",
+        metavar="PATH",
+        default=None,
+        help="Results JSONL path (default: <batch file>.results.jsonl)",
+    )
+
     # Utility
     p.add_argument("--dry-run", action="store_true", 
                    help="Print resolved configuration and exit without building")
@@ -1517,6 +1772,79 @@ def _resolve_bool_option(
     return None
 
 
+def _resolve_tag_choices(
+    commander_name: str,
+    primary_tag_name: Optional[str],
+    secondary_tag_name: Optional[str],
+    tertiary_tag_name: Optional[str],
+    choices: Tuple[Optional[int], Optional[int], Optional[int]],
+    commander_df: Any = None,
+) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+    """Map theme tag names to the 1-based menu choices the scripted prompts expect.
+
+    Secondary/tertiary indices are relative to the list remaining after the
+    earlier picks, mirroring the interactive prompts. Unmatched names keep the
+    incoming ``choices``.
+    """
+    resolved_primary_choice, resolved_secondary_choice, resolved_tertiary_choice = choices
+    try:
+        # Load commander tags to compute indices
+        df = commander_df if commander_df is not None else DeckBuilder().load_commander_data()
+        row = df[df["name"] == commander_name]
+        if not row.empty:
+            original = list(dict.fromkeys(row.iloc[0].get("themeTags", []) or []))
+
+            # Step 1: primary from original
+            if primary_tag_name:
+                for i, t in enumerate(original, start=1):
+                    if str(t).strip().lower() == primary_tag_name.strip().lower():
+                        resolved_primary_choice = i
+                        break
+
+            # Step 2: secondary from remaining after primary
+            if secondary_tag_name:
+                if resolved_primary_choice is not None:
+                    # Create remaining list after removing primary choice
+                    remaining_1 = [t for j, t in enumerate(original, start=1) if j != resolved_primary_choice]
+                    for i2, t in enumerate(remaining_1, start=1):
+                        if str(t).strip().lower() == secondary_tag_name.strip().lower():
+                            resolved_secondary_choice = i2
+                            break
+                else:
+                    # If no primary set, secondary maps directly to original list
+                    for i, t in enumerate(original, start=1):
+                        if str(t).strip().lower() == secondary_tag_name.strip().lower():
+                            resolved_secondary_choice = i
+                            break
+
+            # Step 3: tertiary from remaining after primary+secondary
+            if tertiary_tag_name:
+                if resolved_primary_choice is not None and resolved_secondary_choice is not None:
+                    # reconstruct remaining after removing primary then secondary as displayed
+                    remaining_1 = [t for j, t in enumerate(original, start=1) if j != resolved_primary_choice]
+                    remaining_2 = [t for j, t in enumerate(remaining_1, start=1) if j != resolved_secondary_choice]
+                    for i3, t in enumerate(remaining_2, start=1):
+                        if str(t).strip().lower() == tertiary_tag_name.strip().lower():
+                            resolved_tertiary_choice = i3
+                            break
+                elif resolved_primary_choice is not None:
+                    # Only primary set, tertiary from remaining after primary
+                    remaining_1 = [t for j, t in enumerate(original, start=1) if j != resolved_primary_choice]
+                    for i, t in enumerate(remaining_1, start=1):
+                        if str(t).strip().lower() == tertiary_tag_name.strip().lower():
+                            resolved_tertiary_choice = i
+                            break
+                else:
+                    # No primary or secondary set, tertiary maps directly to original list
+                    for i, t in enumerate(original, start=1):
+                        if str(t).strip().lower() == tertiary_tag_name.strip().lower():
+                            resolved_tertiary_choice = i
+                            break
+    except Exception:
+        pass
+    return resolved_primary_choice, resolved_secondary_choice, resolved_tertiary_choice
+
+
 def _main() -> int:
     _ensure_data_ready()
     parser = _build_arg_parser()
@@ -1525,6 +1853,9 @@ def _main() -> int:
     # existing CLI > ENV > JSON > default resolver below still works unchanged.
     json_cfg: Dict[str, Any] = {}
 
+    if args.batch:
+        return _run_batch_mode(args)
+
     random_config, random_section = _resolve_random_config(args, json_cfg)
     if _should_run_random_mode(args, json_cfg, random_section):
         if args.dry_run:
@@ -1627,62 +1958,13 @@ def _main() -> int:
             # Load commander name to resolve tags
             commander_name = _resolve_value(args.commander, "DECK_COMMANDER", json_cfg, "commander", "")
             if commander_name:
-                try:
-                    # Load commander tags to compute indices
-                    tmp = DeckBuilder()
-                    df = tmp.load_commander_data()
-                    row = df[df["name"] == commander_name]
-                    if not row.empty:
-                        original = list(dict.fromkeys(row.iloc[0].get("themeTags", []) or []))
-                        
-                        # Step 1: primary from original
-                        if primary_tag_name:
-                            for i, t in enumerate(original, start=1):
-                                if str(t).strip().lower() == primary_tag_name.strip().lower():
-                                    resolved_primary_choice = i
-                                    break
-                        
-                        # Step 2: secondary from remaining after primary
-                        if secondary_tag_name:
-                            if resolved_primary_choice is not None:
-                                # Create remaining list after removing primary choice
-                                remaining_1 = [t for j, t in enumerate(original, start=1) if j != resolved_primary_choice]
-                                for i2, t in enumerate(remaining_1, start=1):
-                                    if str(t).strip().lower() == secondary_tag_name.strip().lower():
-                                        resolved_secondary_choice = i2
-                                        break
-                            else:
-                                # If no primary set, secondary maps directly to original list
-                                for i, t in enumerate(original, start=1):
-                                    if str(t).strip().lower() == secondary_tag_name.strip().lower():
-                                        resolved_secondary_choice = i
-                                        break
-                        
-                        # Step 3: tertiary from remaining after primary+secondary
-                        if tertiary_tag_name:
-                            if resolved_primary_choice is not None and resolved_secondary_choice is not None:
-                                # reconstruct remaining after removing primary then secondary as displayed
-                                remaining_1 = [t for j, t in enumerate(original, start=1) if j != resolved_primary_choice]
-                                remaining_2 = [t for j, t in enumerate(remaining_1, start=1) if j != resolved_secondary_choice]
-                                for i3, t in enumerate(remaining_2, start=1):
-                                    if str(t).strip().lower() == tertiary_tag_name.strip().lower():
-                                        resolved_tertiary_choice = i3
-                                        break
-                            elif resolved_primary_choice is not None:
-                                # Only primary set, tertiary from remaining after primary
-                                remaining_1 = [t for j, t in enumerate(original, start=1) if j != resolved_primary_choice]
-                                for i, t in enumerate(remaining_1, start=1):
-                                    if str(t).strip().lower() == tertiary_tag_name.strip().lower():
-                                        resolved_tertiary_choice = i
-                                        break
-                            else:
-                                # No primary or secondary set, tertiary maps directly to original list
-                                for i, t in enumerate(original, start=1):
-                                    if str(t).strip().lower() == tertiary_tag_name.strip().lower():
-                                        resolved_tertiary_choice = i
-                                        break
-                except Exception:
-                    pass
+                resolved_primary_choice, resolved_secondary_choice, resolved_tertiary_choice = _resolve_tag_choices(
+                    commander_name,
+                    primary_tag_name,
+                    secondary_tag_name,
+                    tertiary_tag_name,
+                    (resolved_primary_choice, resolved_secondary_choice, resolved_tertiary_choice),
+                )
     except Exception:
         pass
 
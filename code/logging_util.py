@@ -1,7 +1,13 @@
 from __future__ import annotations
 
+import atexit
+import json
 import os
 import logging
+import logging.handlers
+import queue
+import threading
+import time
 
 # Create logs directory if it doesn't exist
 if not os.path.exists('logs'):
@@ -13,6 +19,11 @@ LOG_FILE = os.path.join(LOG_DIR, 'deck_builder.log')
 LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 LOG_LEVEL = logging.INFO
 
+# LOG_JSON: 1/file = JSON lines in the log file, all = file and console
+LOG_JSON = os.getenv('LOG_JSON', '').strip().lower()
+# LOG_RATE_LIMIT: "<logger prefix>=<records/sec>,..." ("*" matches every logger)
+LOG_RATE_LIMIT = os.getenv('LOG_RATE_LIMIT', '').strip()
+
 # Create formatters and handlers
 # Create a formatter that removes double underscores
 class NoDunderFormatter(logging.Formatter):
@@ -20,13 +31,166 @@ class NoDunderFormatter(logging.Formatter):
         record.name = record.name.replace("__", "")
         return super().format(record)
 
-# File handler
-file_handler = logging.FileHandler(LOG_FILE, mode='w', encoding='utf-8')
-file_handler.setFormatter(NoDunderFormatter(LOG_FORMAT))
 
-# Stream handler
-stream_handler = logging.StreamHandler()
-stream_handler.setFormatter(NoDunderFormatter(LOG_FORMAT))
+class JsonLineFormatter(logging.Formatter):
+    """One compact JSON object per record: ts, level, logger, msg."""
+
+    def format(self, record):
+        payload = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name.replace("__", ""),
+            'msg': record.getMessage(),
+        }
+        return json.dumps(payload, separators=(',', ':'), ensure_ascii=False)
+
+
+def _parse_rate_limits(spec: str) -> dict[str, float]:
+    limits: dict[str, float] = {}
+    for part in spec.split(','):
+        prefix, sep, rate = part.partition('=')
+        if not sep or not prefix.strip():
+            continue
+        try:
+            limits[prefix.strip()] = float(rate)
+        except ValueError:
+            continue
+    return limits
+
+
+class RateLimitFilter(logging.Filter):
+    """Drop INFO/DEBUG records beyond N per second per (logger, message template).
+
+    Limits are matched by the longest logger-name prefix. Warnings and errors
+    always pass. When a window closes with drops, the next record of that
+    template notes how many were suppressed.
+    """
+
+    def __init__(self, limits: dict[str, float]):
+        super().__init__()
+        self.limits = dict(limits)
+        self._windows: dict[tuple[str, str], list] = {}
+        self._lock = threading.Lock()
+
+    def _limit_for(self, name: str) -> float:
+        best, best_len = self.limits.get('*', 0.0), 0
+        for prefix, rate in self.limits.items():
+            if prefix != '*' and (name == prefix or name.startswith(prefix + '.')) and len(prefix) > best_len:
+                best, best_len = rate, len(prefix)
+        return best
+
+    def filter(self, record):
+        # file_handler and stream_handler share this filter; decide once per record
+        decision = getattr(record, 'log_rate_ok', None)
+        if decision is None:
+            decision = self._decide(record)
+            record.log_rate_ok = decision
+        return decision
+
+    def _decide(self, record) -> bool:
+        if record.levelno >= logging.WARNING or not self.limits:
+            return True
+        limit = self._limit_for(record.name)
+        if limit <= 0:
+            return True
+        key = (record.name, str(record.msg))
+        now = time.monotonic()
+        with self._lock:
+            window = self._windows.get(key)
+            if window is None or now - window[0] >= 1.0:
+                if window and window[2]:
+                    record.log_suppressed = window[2]
+                self._windows[key] = [now, 1, 0]
+                return True
+            if window[1] < limit:
+                window[1] += 1
+                return True
+            window[2] += 1
+            return False
+
+
+class _SinkQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that tags records with the sink the listener should write them to."""
+
+    def __init__(self, log_queue, sink: str):
+        super().__init__(log_queue)
+        self.sink = sink
+
+    def prepare(self, record):
+        record = super().prepare(record)
+        record.log_sink = self.sink
+        suppressed = getattr(record, 'log_suppressed', 0)
+        if suppressed:
+            record.msg = record.message = f"{record.msg} [{suppressed} similar messages suppressed]"
+        return record
+
+
+class _SinkQueueListener(logging.handlers.QueueListener):
+    """Background writer: routes each queued record to its tagged sink handler."""
+
+    def __init__(self, log_queue, sinks: dict[str, logging.Handler]):
+        super().__init__(log_queue, *sinks.values(), respect_handler_level=True)
+        self.sinks = sinks
+
+    def handle(self, record):
+        record = self.prepare(record)
+        flushed = getattr(record, 'flush_event', None)
+        if flushed is not None:
+            flushed.set()
+            return
+        handler = self.sinks.get(getattr(record, 'log_sink', ''))
+        if handler is not None and record.levelno >= handler.level:
+            handler.handle(record)
+
+
+# Sinks (written only by the listener thread)
+_file_sink = logging.FileHandler(LOG_FILE, mode='w', encoding='utf-8')
+_file_sink.setFormatter(JsonLineFormatter() if LOG_JSON in ('1', 'true', 'file', 'all') else NoDunderFormatter(LOG_FORMAT))
+_stream_sink = logging.StreamHandler()
+_stream_sink.setFormatter(JsonLineFormatter() if LOG_JSON == 'all' else NoDunderFormatter(LOG_FORMAT))
+
+_queue: queue.SimpleQueue = queue.SimpleQueue()
+_listener = _SinkQueueListener(_queue, {'file': _file_sink, 'stream': _stream_sink})
+_listener.start()
+atexit.register(_listener.stop)
+
+rate_limit_filter = RateLimitFilter(_parse_rate_limits(LOG_RATE_LIMIT))
+
+# File handler (enqueues; the listener thread does the disk write)
+file_handler = _SinkQueueHandler(_queue, 'file')
+file_handler.addFilter(rate_limit_filter)
+
+# Stream handler (enqueues; the listener thread writes to the console)
+stream_handler = _SinkQueueHandler(_queue, 'stream')
+stream_handler.addFilter(rate_limit_filter)
+
+
+def _restart_listener_after_fork() -> None:
+    """Forked children (headless batch workers) do not inherit the writer thread; start their own."""
+    global _queue, _listener
+    _queue = queue.SimpleQueue()
+    _listener = _SinkQueueListener(_queue, {'file': _file_sink, 'stream': _stream_sink})
+    file_handler.queue = _queue
+    stream_handler.queue = _queue
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_listener_after_fork)
+
+
+def flush() -> None:
+    """Block until every record queued so far has been written."""
+    done = threading.Event()
+    record = logging.makeLogRecord({'msg': '', 'levelno': logging.CRITICAL})
+    record.log_sink = ''
+    record.flush_event = done
+    _queue.put_nowait(record)
+    done.wait(5)
+    _file_sink.flush()
+    _stream_sink.flush()
+
 
 # Root logger assembly helper (idempotent)
 def get_logger(name: str = 'deck_builder') -> logging.Logger:
@@ -35,4 +199,4 @@ def get_logger(name: str = 'deck_builder') -> logging.Logger:
         logger.setLevel(LOG_LEVEL)
         logger.addHandler(file_handler)
         logger.addHandler(stream_handler)
-    return logger
\ No newline at end of file
+    return logger
@@ -97,3 +97,11 @@ def get_batch_path(batch_id: int) -> str:
     """
     return os.path.join(card_files_processed_dir(), f"batch_{batch_id:04d}.parquet")
 
+
+def get_tag_index_artifact_dir() -> str:
+    """Get the directory holding the persisted tag index artifact.
+
+    Returns:
+        Path to card_files/processed/tag_index
+    """
+    return os.path.join(card_files_processed_dir(), "tag_index")
@@ -0,0 +1,411 @@
+"""End-to-end deck build benchmark with a regression gate.
+
+Runs a fixed matrix of commanders x themes x brackets through the headless
+runner against the small checked-in fixture pool in
+``code/tests/fixtures/benchmark_cards`` (no card download, no network). Each
+case runs in a fresh spawned process so peak RSS is per build, does
+``--warmup`` untimed builds, then ``--repeat`` timed builds. Per case the
+report has the median build wall time, median per-phase wall time (from the
+builder's timing spans) and peak RSS.
+
+    python code/scripts/benchmark_builds.py --output logs/perf/build_benchmark.json
+    python code/scripts/benchmark_builds.py --compare logs/perf/build_benchmark.json --threshold 15
+
+``--compare`` exits 1 when any case fails, or its wall time or peak RSS grows
+more than ``--threshold`` percent over the baseline (wall deltas under
+``--min-delta-ms`` are treated as noise). Baselines are machine-specific;
+record and compare on the same host.
+
+``--write-fixture`` regenerates the fixture parquet (deterministic).
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import hashlib
+import io
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+REPO_ROOT = PROJECT_ROOT.parent
+# Repo root first so ``code.*`` imports resolve to this package, not the stdlib ``code`` module
+for _path in (str(PROJECT_ROOT), str(REPO_ROOT)):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+FIXTURE_DIR = PROJECT_ROOT / "tests" / "fixtures" / "benchmark_cards"
+DEFAULT_OUTPUT = REPO_ROOT / "logs" / "perf" / "build_benchmark.json"
+
+BENCHMARK_SEED = 46
+BRACKETS: Tuple[int, ...] = (2, 4)
+# Commander -> theme selections (primary first); each selection is one case per bracket.
+COMMANDER_THEMES: Dict[str, List[Tuple[str, ...]]] = {
+    "Krenko, Mob Boss": [("Goblin Kindred",), ("Tokens Matter", "Goblin Kindred")],
+    "Meren of Clan Nel Toth": [("Graveyard Matters",), ("Sacrifice Matters", "Graveyard Matters")],
+    "Brago, King Eternal": [("Artifacts Matter",), ("Counters Matter", "Lifegain")],
+}
+
+
+def _slug(text: str) -> str:
+    out = "".join(ch if ch.isalnum() else "-" for ch in text.lower())
+    return "-".join(part for part in out.split("-") if part)
+
+
+def benchmark_cases() -> List[Dict[str, Any]]:
+    cases: List[Dict[str, Any]] = []
+    for commander, selections in COMMANDER_THEMES.items():
+        for themes in selections:
+            for bracket in BRACKETS:
+                cases.append({
+                    "id": f"{_slug(commander.split(',')[0])}/{'+'.join(_slug(t) for t in themes)}/b{bracket}",
+                    "commander": commander,
+                    "themes": list(themes),
+                    "bracket": bracket,
+                })
+    return cases
+
+
+# ---------------------------------------------------------------------------
+# Fixture pool
+# ---------------------------------------------------------------------------
+
+_BASICS = {"W": "Plains", "U": "Island", "B": "Swamp", "R": "Mountain", "G": "Forest"}
+_GUILDS = {"WU": "Azorius", "BG": "Golgari", "BR": "Rakdos", "RG": "Gruul"}
+_THEMES = [
+    "Goblin Kindred", "Tokens Matter", "Sacrifice Matters", "Graveyard Matters",
+    "Counters Matter", "Lifegain", "Artifacts Matter", "Spellslinger",
+]
+_ROLES: Dict[str, List[str]] = {
+    "ramp": ["Ramp"],
+    "removal": ["Removal", "Spot Removal"],
+    "wipe": ["Board Wipes", "Mass Removal"],
+    "draw": ["Card Draw", "Card Advantage"],
+    "conditional_draw": ["Card Draw", "Conditional Draw"],
+    "protection": ["Protection"],
+}
+_CREATURE_TYPES = ["Human", "Elf", "Zombie", "Wizard", "Soldier", "Spirit"]
+_BRACKET_SENSITIVE = [
+    ("Chrome Mox", "", "Artifact", 0, ["Ramp"]),
+    ("Grim Monolith", "", "Artifact", 2, ["Ramp"]),
+    ("Mana Vault", "", "Artifact", 1, ["Ramp"]),
+    ("Cyclonic Rift", "U", "Instant", 1, ["Removal", "Board Wipes"]),
+    ("Consecrated Sphinx", "U", "Creature — Sphinx", 5, ["Card Draw", "Card Advantage"]),
+    ("Farewell", "W", "Sorcery", 4, ["Board Wipes", "Mass Removal"]),
+    ("Enlightened Tutor", "W", "Instant", 0, ["Tutor"]),
+    ("Demonic Tutor", "B", "Sorcery", 1, ["Tutor", "Card Advantage"]),
+    ("Jeska's Will", "R", "Sorcery", 2, ["Ramp", "Card Advantage"]),
+    ("Gamble", "R", "Sorcery", 0, ["Tutor"]),
+]
+
+
+def _card(name: str, identity: str, type_line: str, mana_value: int, tags: List[str], **extra: Any) -> Dict[str, Any]:
+    colors = ", ".join(identity)
+    row = {
+        "name": name,
+        "faceName": name,
+        "edhrecRank": extra.pop("rank", None),
+        "colorIdentity": colors,
+        "colors": colors,
+        "manaCost": "{%d}" % mana_value + "".join("{%s}" % c for c in identity) if mana_value or identity else "",
+        "manaValue": float(mana_value + len(identity)),
+        "type": type_line,
+        "creatureTypes": [],
+        "text": "",
+        "power": None,
+        "toughness": None,
+        "loyalty": None,
+        "keywords": [],
+        "themeTags": tags,
+        "layout": "normal",
+        "side": None,
+        "isCommander": False,
+        "isBackground": False,
+    }
+    row.update(extra)
+    return row
+
+
+def build_fixture_frame(seed: int = BENCHMARK_SEED) -> pd.DataFrame:
+    """Deterministic synthetic card pool sized for full builds of the benchmark commanders."""
+    rng = random.Random(seed)
+    rows: List[Dict[str, Any]] = []
+    for color, basic in _BASICS.items():
+        rows.append(_card(basic, "", f"Basic Land — {basic}", 0, [], colorIdentity=color))
+    for name in ("Command Tower", "Reliquary Tower", "Exotic Orchard", "War Room", "Evolving Wilds", "Terramorphic Expanse"):
+        rows.append(_card(name, "", "Land", 0, []))
+    for serial in range(1, 13):
+        rows.append(_card(f"Benchmark Utility Land {serial:02d}", "", "Land", 0, [_THEMES[serial % len(_THEMES)]]))
+    for pair, guild in _GUILDS.items():
+        rows.append(_card(f"{guild} Benchmark Dual", pair, f"Land — {_BASICS[pair[0]]} {_BASICS[pair[1]]}", 0, [], manaCost="", manaValue=0.0))
+    rows.append(_card("Sol Ring", "", "Artifact", 1, ["Ramp"], rank=1))
+    rows.append(_card("Arcane Signet", "", "Artifact", 2, ["Ramp"], rank=2))
+    # Real game changers / tutors so bracket limits change the build
+    for rank, (name, identity, type_line, mana_value, tags) in enumerate(_BRACKET_SENSITIVE, start=3):
+        bracket_tags = ["Bracket:GameChanger"] + (["Bracket:TutorNonland"] if "Tutor" in tags else [])
+        rows.append(_card(name, identity, type_line, mana_value, tags + bracket_tags, rank=rank))
+
+    role_names = list(_ROLES) + [None] * 4
+    serial = 0
+    pools = [(c, 160) for c in _BASICS] + [(pair, 70) for pair in _GUILDS] + [("", 80)]
+    for identity, count in pools:
+        for _ in range(count):
+            serial += 1
+            role = rng.choice(role_names)
+            tags = rng.sample(_THEMES, 2) + (_ROLES[role] if role else [])
+            rank = rng.randint(100, 20000)
+            mana_value = rng.randint(0, 5)
+            label = identity or "C"
+            if rng.random() < 0.6 and role not in ("wipe", "removal"):
+                subtype = "Goblin" if "Goblin Kindred" in tags else rng.choice(_CREATURE_TYPES)
+                rows.append(_card(
+                    f"Benchmark {label} {subtype} {serial:04d}", identity, f"Creature — {subtype}", mana_value, tags,
+                    rank=rank, creatureTypes=[subtype], power=str(rng.randint(1, 5)), toughness=str(rng.randint(1, 5)),
+                ))
+            else:
+                kind = "Artifact" if not identity else rng.choice(["Instant", "Sorcery", "Enchantment", "Artifact"])
+                rows.append(_card(f"Benchmark {label} {kind} {serial:04d}", identity, kind, mana_value, tags, rank=rank))
+
+    commanders = [
+        ("Krenko, Mob Boss", "R", "Goblin Warrior", ["Goblin Kindred", "Tokens Matter", "Aggro"], ("3", "3")),
+        ("Meren of Clan Nel Toth", "BG", "Human Shaman", ["Graveyard Matters", "Sacrifice Matters", "Aristocrats"], ("3", "4")),
+        ("Brago, King Eternal", "WU", "Spirit Noble", ["Artifacts Matter", "Counters Matter", "Lifegain"], ("2", "4")),
+    ]
+    for name, identity, subtypes, tags, (power, toughness) in commanders:
+        rows.append(_card(
+            name, identity, f"Legendary Creature — {subtypes}", 2, tags, rank=50, isCommander=True,
+            creatureTypes=subtypes.split(), power=power, toughness=toughness,
+        ))
+    frame = pd.DataFrame(rows)
+    frame["edhrecRank"] = frame["edhrecRank"].astype("float64")
+    return frame
+
+
+def write_fixture(directory: Path = FIXTURE_DIR) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / "all_cards.parquet"
+    build_fixture_frame().to_parquet(path, index=False)
+    return path
+
+
+def _fixture_digest(directory: Path) -> Optional[str]:
+    try:
+        return hashlib.sha256((directory / "all_cards.parquet").read_bytes()).hexdigest()[:16]
+    except OSError:
+        return None
+
+
+# ---------------------------------------------------------------------------
+# Running cases
+# ---------------------------------------------------------------------------
+
+def _peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def _remove_exports(builder: Any) -> None:
+    for attr in ("last_csv_path", "last_txt_path"):
+        path = getattr(builder, attr, None)
+        if not path:
+            continue
+        stem = os.path.splitext(path)[0]
+        for candidate in (path, stem + ".summary.json", stem + "_compliance.json"):
+            with contextlib.suppress(OSError):
+                os.remove(candidate)
+
+
+def run_case(case: Dict[str, Any], fixture_dir: str, repeat: int = 3, warmup: int = 1, verbose: bool = False) -> Dict[str, Any]:
+    """Build one case ``warmup + repeat`` times in this process and return its record."""
+    overrides = {
+        "CARD_FILES_PROCESSED_DIR": str(fixture_dir),
+        "BUILD_TIMINGS": "1",
+        "HEADLESS_USE_OWNED_ONLY": "0",
+    }
+    saved = {key: os.environ.get(key) for key in overrides}
+    os.environ.update(overrides)
+    if not verbose:
+        logging.disable(logging.INFO)
+    record: Dict[str, Any] = {"id": case["id"], "status": "ok", "error": None}
+    walls: List[float] = []
+    phases: Dict[str, List[float]] = {}
+    try:
+        import headless_runner as hr
+
+        cfg = {"commander": case["commander"], "bracket_level": case["bracket"], "seed": BENCHMARK_SEED}
+        cfg.update(zip(("primary_tag", "secondary_tag", "tertiary_tag"), case["themes"]))
+        for attempt in range(warmup + repeat):
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                builder = hr.run(**hr._batch_run_kwargs(cfg))
+                elapsed = (time.perf_counter() - start) * 1000.0
+            _remove_exports(builder)
+            if attempt < warmup:
+                continue
+            walls.append(elapsed)
+            per_phase: Dict[str, float] = {}
+            for span in builder.timing_spans():
+                per_phase[span["name"]] = per_phase.get(span["name"], 0.0) + float(span["wall_ms"])
+            for name, wall in per_phase.items():
+                phases.setdefault(name, []).append(wall)
+            record["cards"] = sum(int(entry.get("Count", 1)) for entry in builder.card_library.values())
+    except Exception as exc:  # report, keep benchmarking the other cases
+        record.update(status="error", error=f"{type(exc).__name__}: {exc}")
+    finally:
+        if not verbose:
+            logging.disable(logging.NOTSET)
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+    record["wall_ms"] = round(statistics.median(walls), 3) if walls else None
+    record["wall_ms_runs"] = [round(w, 3) for w in walls]
+    record["phases"] = {name: round(statistics.median(vals), 3) for name, vals in sorted(phases.items())}
+    record["peak_rss_mb"] = _peak_rss_mb()
+    return record
+
+
+def run_benchmark(
+    cases: Sequence[Dict[str, Any]],
+    fixture_dir: Path = FIXTURE_DIR,
+    repeat: int = 3,
+    warmup: int = 1,
+    isolate: bool = True,
+    verbose: bool = False,
+) -> Dict[str, Any]:
+    if repeat <= 0:
+        raise ValueError("repeat must be a positive integer")
+    results: Dict[str, Dict[str, Any]] = {}
+    for case in cases:
+        if isolate:
+            with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+                record = pool.submit(run_case, case, str(fixture_dir), repeat, warmup, verbose).result()
+        else:
+            record = run_case(case, str(fixture_dir), repeat, warmup, verbose)
+        results[case["id"]] = record
+        wall = f"{record['wall_ms']:.1f}ms" if record["wall_ms"] is not None else record["error"]
+        print(f"{case['id']}: {wall} rss={record['peak_rss_mb']}MB", flush=True)
+    return {
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "fixture": _fixture_digest(fixture_dir),
+        "seed": BENCHMARK_SEED,
+        "repeat": repeat,
+        "warmup": warmup,
+        "isolated": isolate,
+        "cases": results,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Baseline comparison
+# ---------------------------------------------------------------------------
+
+def compare(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold_pct: float = 15.0,
+    min_delta_ms: float = 5.0,
+) -> List[Dict[str, Any]]:
+    """Return one finding per failed, regressed or new case (``regression`` marks the gating ones)."""
+    findings: List[Dict[str, Any]] = []
+    base_cases = baseline.get("cases") or {}
+    limit = 1.0 + threshold_pct / 100.0
+    for case_id, cur in (current.get("cases") or {}).items():
+        if cur.get("status") != "ok":
+            findings.append({"id": case_id, "metric": "status", "regression": True, "detail": cur.get("error")})
+            continue
+        base = base_cases.get(case_id)
+        if not base or base.get("status") != "ok":
+            findings.append({"id": case_id, "metric": "new", "regression": False, "detail": "no baseline"})
+            continue
+        checks = (("wall_ms", min_delta_ms), ("peak_rss_mb", 0.0))
+        for metric, floor in checks:
+            old, new = base.get(metric), cur.get(metric)
+            if not old or new is None:
+                continue
+            if new > old * limit and new - old > floor:
+                findings.append({
+                    "id": case_id,
+                    "metric": metric,
+                    "regression": True,
+                    "baseline": old,
+                    "current": new,
+                    "change_pct": round((new / old - 1.0) * 100.0, 1),
+                })
+    return findings
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark full deck builds against the fixture card pool")
+    parser.add_argument("--output", type=Path, help=f"Write results JSON here (default {DEFAULT_OUTPUT.relative_to(REPO_ROOT)} unless --compare)")
+    parser.add_argument("--compare", type=Path, help="Baseline JSON to gate against; exit 1 on regression")
+    parser.add_argument("--threshold", type=float, default=15.0, help="Allowed percent growth of wall time / peak RSS (default 15)")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="Ignore wall-time growth below this many ms (default 5)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed builds per case; the median is reported (default 3)")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed builds per case before timing (default 1)")
+    parser.add_argument("--case", action="append", default=[], help="Only run cases whose id contains this text (repeatable)")
+    parser.add_argument("--fixture-dir", type=Path, default=FIXTURE_DIR, help="Directory holding the fixture all_cards.parquet")
+    parser.add_argument("--in-process", action="store_true", help="Run cases in this process (faster; peak RSS is cumulative)")
+    parser.add_argument("--verbose", action="store_true", help="Keep builder INFO logging")
+    parser.add_argument("--write-fixture", action="store_true", help="Regenerate the fixture parquet and exit")
+    args = parser.parse_args(argv)
+
+    if args.write_fixture:
+        print(f"Wrote {write_fixture(args.fixture_dir)}")
+        return 0
+
+    cases = [c for c in benchmark_cases() if not args.case or any(token in c["id"] for token in args.case)]
+    if not cases:
+        print("No benchmark cases match --case", file=sys.stderr)
+        return 2
+    results = run_benchmark(cases, args.fixture_dir, args.repeat, args.warmup, not args.in_process, args.verbose)
+
+    output = args.output or (None if args.compare else DEFAULT_OUTPUT)
+    if output:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        print(f"Wrote {output}")
+
+    failed = any(r["status"] != "ok" for r in results["cases"].values())
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if baseline.get("fixture") != results["fixture"]:
+            print("warning: fixture differs from the baseline's; timings may not be comparable", file=sys.stderr)
+        findings = compare(baseline, results, args.threshold, args.min_delta_ms)
+        for finding in findings:
+            if finding["metric"] in ("status", "new"):
+                print(f"{finding['id']}: {finding['metric']} ({finding['detail']})")
+            else:
+                print(
+                    f"{finding['id']}: {finding['metric']} {finding['baseline']} -> {finding['current']} "
+                    f"(+{finding['change_pct']}%, threshold {args.threshold}%)"
+                )
+        failed = failed or any(f["regression"] for f in findings)
+        print("REGRESSION" if failed else "OK: no case regressed beyond the threshold")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,6 +8,9 @@ consume when ranking partner/background pairings. The output is written to
 * Commander index with color identity, theme tags, and partner/background flags.
 * Theme reverse index plus deck tag co-occurrence statistics.
 * Observed partner/background pairings derived from deck export sidecars.
+* Per-role eligibility buckets (partner, partner with, background, choose a
+  background, doctor, doctor's companion) so the web service only scores
+  commanders that can legally pair with the selected primary.
 
 The script is intentionally light-weight so it can run as part of CI or ad-hoc
 refresh workflows. All collections are sorted before serialization to guarantee
@@ -33,6 +36,7 @@ if str(ROOT) not in sys.path:
 import pandas as pd  # noqa: E402
 
 from code.deck_builder.partner_background_utils import analyze_partner_background  # noqa: E402
+from code.deck_builder.suggestions import build_eligibility_buckets  # noqa: E402
 
 try:  # Soft import to allow tests to override CSV path without settings.
     from code.deck_builder import builder_constants as _bc
@@ -724,6 +728,7 @@ def build_partner_suggestions(
             "deck_exports_with_pairs": decks_with_pairs,
         },
         "commanders": commanders_payload,
+        "eligibility": build_eligibility_buckets(commanders_payload),
         "themes": themes_payload,
         "pairings": {
             "records": pairing_records,
@@ -285,11 +285,11 @@ def _primary_secondary(theme: str, freqs: Dict[str, Dict[str, int]]):
 def infer_synergies(anchor: str, curated: List[str], enforced: List[str], analytics: dict, pmi_min: float = 0.0, co_min: int = 5) -> List[str]:
     if anchor not in analytics['co_map'] or analytics['total_rows'] <= 0:
         return []
-    scored = cooccurrence_scores_for(anchor, analytics['co_map'], analytics['tag_counts'], analytics['total_rows'])
+    scored = cooccurrence_scores_for(
+        anchor, analytics['co_map'], analytics['tag_counts'], analytics['total_rows'], min_pmi=pmi_min, min_co=co_min
+    )
     out: List[str] = []
-    for other, score, co_count in scored:
-        if score <= pmi_min or co_count < co_min:
-            continue
+    for other, _score, _co_count in scored:
         if other == anchor or other in curated or other in enforced or other in out:
             continue
         out.append(other)
@@ -986,7 +986,10 @@ def main():  # pragma: no cover
     parser.add_argument('--backfill-yaml', action='store_true', help='Write auto-generated description & popularity_bucket back into YAML files (fills missing only)')
     parser.add_argument('--force-backfill-yaml', action='store_true', help='Force overwrite existing description/popularity_bucket in YAML when backfilling')
     parser.add_argument('--output', type=str, default=str(OUTPUT_JSON), help='Output path for theme_list.json (tests can override)')
+    parser.add_argument('--legacy-cooccurrence', action='store_true', help='Count theme co-occurrence with the original nested loops instead of the sparse matrix (same as THEME_COOCCURRENCE_LEGACY=1)')
     args = parser.parse_args()
+    if args.legacy_cooccurrence:
+        os.environ['THEME_COOCCURRENCE_LEGACY'] = '1'
     if args.schema:
         # Lazy import to avoid circular dependency: replicate minimal schema inline from models file if present
         try:
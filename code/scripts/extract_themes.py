@@ -3,7 +3,8 @@ import json
 import re
 import sys
 from collections import Counter
-from typing import Dict, List, Set, Any
+from collections.abc import Mapping
+from typing import Dict, List, Optional, Set, Any
 
 import pandas as pd
 import numpy as np
@@ -200,14 +201,158 @@ def gather_theme_tag_rows() -> List[List[str]]:
     return rows
 
 
-def compute_cooccurrence(rows: List[List[str]]):
+def _legacy_cooccurrence_requested() -> bool:
+    return (os.environ.get('THEME_COOCCURRENCE_LEGACY') or '0').strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+class ThemeCooccurrence(Mapping):
+    """Sparse theme co-occurrence built from a card x theme incidence matrix.
+
+    Rows are cards and columns are the sorted distinct theme tags, stored as
+    CSR (`card_indptr`/`card_indices`, each row's theme ids ascending). The
+    theme x theme co-occurrence matrix is the off-diagonal of X^T X; for a
+    0/1 matrix that is the count of every (a, b) pair within a row, so it is
+    accumulated by grouping rows by tag count, expanding each group's pairs
+    with one fancy-index and counting them with `np.unique`. The result is
+    kept symmetric in CSR (`co_indptr`/`co_indices`/`co_data`).
+
+    Reads like the legacy `Dict[str, Counter]` (``tag in co``, ``co[tag]``,
+    iteration over tags that co-occur with anything) so existing callers
+    keep working; `scores_for` computes PMI, thresholds and ordering over a
+    theme's row with NumPy.
+    """
+
+    def __init__(self, rows: List[List[str]]) -> None:
+        self.total_rows = len(rows)
+        flat = [t for tags in rows for t in tags if isinstance(t, str) and t]
+        lengths = np.fromiter(
+            (sum(1 for t in tags if isinstance(t, str) and t) for tags in rows), dtype=np.int64, count=len(rows)
+        )
+        # Hash-factorize, then renumber so theme ids follow sorted name order.
+        codes, uniques = pd.factorize(np.array(flat, dtype=object))
+        by_name = np.argsort(uniques.astype(object), kind='stable')
+        rank = np.empty(len(uniques), dtype=np.int64)
+        rank[by_name] = np.arange(len(uniques))
+        codes = rank[codes] if len(codes) else codes.astype(np.int64)
+        themes = uniques.astype(object)[by_name]
+        self.themes: List[str] = [str(t) for t in themes]
+        self.index: Dict[str, int] = {t: i for i, t in enumerate(self.themes)}
+        n_themes = len(self.themes)
+
+        # X: one entry per distinct (card, theme), ordered by card then theme id.
+        keys = np.unique(np.repeat(np.arange(len(rows), dtype=np.int64), lengths) * max(1, n_themes) + codes)
+        card_rows = keys // max(1, n_themes)
+        self.card_indices = (keys % max(1, n_themes)).astype(np.int64)
+        self.card_indptr = np.zeros(len(rows) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(card_rows, minlength=len(rows)), out=self.card_indptr[1:])
+        self.counts = np.bincount(self.card_indices, minlength=n_themes).astype(np.int64)
+
+        # X^T X off-diagonal, upper triangle first.
+        row_len = np.diff(self.card_indptr)
+        pair_keys = []
+        for k in np.unique(row_len[row_len >= 2]):
+            starts = self.card_indptr[:-1][row_len == k]
+            block = self.card_indices[starts[:, None] + np.arange(k)]
+            iu, ju = np.triu_indices(int(k), 1)
+            pair_keys.append((block[:, iu] * n_themes + block[:, ju]).ravel())
+        if pair_keys and n_themes * n_themes <= 1 << 22:
+            dense = np.bincount(np.concatenate(pair_keys), minlength=n_themes * n_themes)
+            upper = np.flatnonzero(dense)
+            upper_counts = dense[upper]
+        elif pair_keys:
+            upper, upper_counts = np.unique(np.concatenate(pair_keys), return_counts=True)
+        else:
+            upper, upper_counts = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        a, b = upper // max(1, n_themes), upper % max(1, n_themes)
+        rows_all = np.concatenate([a, b])
+        cols_all = np.concatenate([b, a])
+        data_all = np.concatenate([upper_counts, upper_counts]).astype(np.int64)
+        order = np.lexsort((cols_all, rows_all))
+        self.co_indices = cols_all[order]
+        self.co_data = data_all[order]
+        self.co_indptr = np.zeros(n_themes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows_all, minlength=n_themes), out=self.co_indptr[1:])
+
+    # -- Mapping[str, Counter] view (legacy shape) -------------------------
+
+    def _row(self, tag: str) -> tuple:
+        i = self.index.get(tag)
+        if i is None:
+            return None, None
+        start, end = self.co_indptr[i], self.co_indptr[i + 1]
+        if start == end:
+            return None, None
+        return self.co_indices[start:end], self.co_data[start:end]
+
+    def __getitem__(self, tag: str) -> Counter:
+        others, data = self._row(tag)
+        if others is None:
+            raise KeyError(tag)
+        return Counter({self.themes[o]: int(c) for o, c in zip(others.tolist(), data.tolist())})
+
+    def __contains__(self, tag: object) -> bool:
+        return isinstance(tag, str) and self._row(tag)[0] is not None
+
+    def __iter__(self):
+        nonempty = np.flatnonzero(np.diff(self.co_indptr))
+        return (self.themes[i] for i in nonempty.tolist())
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(np.diff(self.co_indptr)))
+
+    def tag_counts(self) -> Counter:
+        return Counter({t: int(c) for t, c in zip(self.themes, self.counts.tolist()) if c})
+
+    # -- Scoring --------------------------------------------------------------
+
+    def scores_for(
+        self,
+        anchor: str,
+        min_pmi: Optional[float] = None,
+        min_co: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[tuple[str, float, int]]:
+        """`cooccurrence_scores_for` over the sparse row: PMI per partner,
+        keep ``pmi > min_pmi`` and ``co >= min_co``, order by PMI desc, count
+        desc, name, and return at most `limit` entries."""
+        others, co = self._row(anchor)
+        if others is None:
+            return []
+        count_a = max(1, int(self.counts[self.index[anchor]]))
+        count_b = np.maximum(1, self.counts[others])
+        ratio = (co * max(1, self.total_rows)) / (count_a * count_b)
+        # math.log2 per value so scores match the legacy path bit for bit.
+        pmi = np.fromiter(map(math.log2, ratio.tolist()), dtype=np.float64, count=len(ratio))
+        keep = co > 0
+        if min_pmi is not None:
+            keep &= pmi > min_pmi
+        if min_co:
+            keep &= co >= min_co
+        others, co, pmi = others[keep], co[keep], pmi[keep]
+        # Theme ids follow sorted name order, so the id is the name tie-break.
+        order = np.lexsort((others, -co, -pmi))
+        if limit is not None:
+            order = order[:limit]
+        return [(self.themes[o], p, c) for o, p, c in zip(others[order].tolist(), pmi[order].tolist(), co[order].tolist())]
+
+
+def compute_cooccurrence(rows: List[List[str]], legacy: Optional[bool] = None):
     """Compute co-occurrence counts between tags.
 
     Returns:
-      - co: dict[tag] -> Counter(other_tag -> co_count)
+      - co: tag -> Counter(other_tag -> co_count); a `ThemeCooccurrence`
+        (sparse, same read interface) unless the legacy path is requested
       - counts: Counter[tag] overall occurrence counts
       - total_rows: int number of rows (cards considered)
+
+    ``legacy=True`` (or env ``THEME_COOCCURRENCE_LEGACY=1``) keeps the
+    original nested-loop counting, which tests compare against exactly.
     """
+    if legacy is None:
+        legacy = _legacy_cooccurrence_requested()
+    if not legacy:
+        sparse = ThemeCooccurrence(rows)
+        return sparse, sparse.tag_counts(), sparse.total_rows
     co: Dict[str, Counter] = {}
     counts: Counter = Counter()
     for tags in rows:
@@ -220,11 +365,21 @@ def compute_cooccurrence(rows: List[List[str]]):
     return co, counts, len(rows)
 
 
-def cooccurrence_scores_for(anchor: str, co: Dict[str, Counter], counts: Counter, total_rows: int) -> List[tuple[str, float, int]]:
+def cooccurrence_scores_for(
+    anchor: str,
+    co: Mapping,
+    counts: Counter,
+    total_rows: int,
+    min_pmi: Optional[float] = None,
+    min_co: int = 0,
+) -> List[tuple[str, float, int]]:
     """Return list of (other_tag, score, co_count) sorted by score desc.
 
     Score uses PMI: log2( (co_count * total_rows) / (count_a * count_b) ).
+    `min_pmi` (exclusive) and `min_co` (inclusive) drop weak pairs.
     """
+    if isinstance(co, ThemeCooccurrence):
+        return co.scores_for(anchor, min_pmi=min_pmi, min_co=min_co)
     results: List[tuple[str, float, int]] = []
     if anchor not in co:
         return results
@@ -236,6 +391,8 @@ def cooccurrence_scores_for(anchor: str, co: Dict[str, Counter], counts: Counter
             continue
         # PMI
         pmi = math.log2((co_count * max(1, total_rows)) / (count_a * count_b))
+        if (min_pmi is not None and pmi <= min_pmi) or co_count < min_co:
+            continue
         results.append((other, pmi, co_count))
     results.sort(key=lambda x: (-x[1], -x[2], x[0]))
     return results
@@ -491,9 +648,8 @@ def main() -> None:
                 '-1/-1 Counters': ['Counters Matter', 'Infect', 'Proliferate', 'Wither', 'Persist'],
             }
             # Compute PMI scores and filter
-            scored = cooccurrence_scores_for(t, co_map, tag_counts, total_rows)
             # Keep only positive PMI and co-occurrence >= 5 (tunable)
-            filtered = [(o, s, c) for (o, s, c) in scored if s > 0 and c >= 5]
+            filtered = cooccurrence_scores_for(t, co_map, tag_counts, total_rows, min_pmi=0.0, min_co=5)
             # If focused tags exist, ensure they bubble up first when present
             preferred = focus.get(t, [])
             if preferred:
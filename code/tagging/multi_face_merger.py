@@ -3,6 +3,12 @@
 This module groups card DataFrame rows that represent multiple faces of the same
 card (transform, split, adventure, modal DFC, etc.) and collapses them into a
 single canonical record with merged tags.
+
+:func:`group_faces` does the grouping for a whole frame at once: faces are
+ordered with one stable sort, list columns are exploded, de-duplicated per
+group and re-aggregated in a single groupby. Tagging
+(:func:`merge_multi_face_rows`) and the manual deck builder's card pool both
+collapse faces through it.
 """
 
 from __future__ import annotations
@@ -10,10 +16,13 @@ from __future__ import annotations
 import ast
 import json
 import math
+from dataclasses import dataclass
 from datetime import UTC, datetime
+from itertools import chain
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, List, Sequence, Set
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Sequence, Set
 
+import numpy as np
 import pandas as pd
 
 # Layouts that indicate a card has multiple faces represented as separate rows.
@@ -73,29 +82,135 @@ def load_merge_summary() -> Dict[str, Any]:
     return {"updated_at": None, "colors": {}}
 
 
-def _merge_tag_columns(work_df: pd.DataFrame, group_sorted: pd.DataFrame, primary_idx: int) -> None:
-    """Merge list columns (themeTags, roleTags) into union values.
-    
+@dataclass
+class FaceGroups:
+    """Rows of a frame that collapse into one card per group.
+
+    ``order`` holds the row positions of every grouped face, group by group in
+    first-appearance order and with each group's primary face first;
+    ``bounds[g]:bounds[g + 1]`` slices group ``g`` out of it. ``unions`` maps a
+    list column to its merged value for each group.
+    """
+
+    order: np.ndarray
+    bounds: np.ndarray
+    unions: Dict[str, List[List[str]]]
+
+    def __len__(self) -> int:
+        return len(self.bounds) - 1
+
+    @property
+    def primary(self) -> np.ndarray:
+        return self.order[self.bounds[:-1]]
+
+    @property
+    def dropped(self) -> np.ndarray:
+        secondary = np.ones(len(self.order), dtype=bool)
+        secondary[self.bounds[:-1]] = False
+        return self.order[secondary]
+
+    def collapse(self, df: pd.DataFrame, values: Mapping[str, Sequence[Any]]) -> pd.DataFrame:
+        """Drop non-primary faces and write one value per group onto each primary row.
+
+        ``None`` entries leave the primary row untouched. Missing columns are
+        created; the index of the surviving rows is preserved.
+        """
+        keep = np.ones(len(df), dtype=bool)
+        keep[self.dropped] = False
+        out = df.take(np.flatnonzero(keep))
+        rows = (np.cumsum(keep) - 1)[self.primary]
+        for column, per_group in values.items():
+            updates = [(row, value) for row, value in zip(rows, per_group) if value is not None]
+            if not updates:
+                continue
+            current = out[column] if column in out.columns else None
+            cells = (
+                current.to_numpy(dtype=object, copy=True)
+                if current is not None
+                else np.full(len(out), np.nan, dtype=object)
+            )
+            for row, value in updates:
+                cells[row] = value
+            dtype = None
+            if current is not None:
+                keeps_dtype = current.dtype != object and all(isinstance(v, str) for _, v in updates)
+                dtype = current.dtype if keeps_dtype else object
+            out[column] = pd.Series(cells, index=out.index, dtype=dtype)
+        return out
+
+
+def group_faces(
+    df: pd.DataFrame,
+    keys: pd.Series,
+    eligible: pd.Series,
+    *,
+    face_order: Sequence[pd.Series] = (),
+    union_columns: Mapping[str, Callable[[Any], Iterable[str]]] | None = None,
+    sort_unions: bool = True,
+) -> FaceGroups:
+    """Group eligible rows sharing a key and union their list columns.
+
     Args:
-        work_df: Working DataFrame to update
-        group_sorted: Sorted group of faces for a multi-face card
-        primary_idx: Index of primary face to update
+        df: Card rows.
+        keys: Group key per row (usually the combined card name); missing keys never group.
+        eligible: Boolean mask of rows that may be merged.
+        face_order: Sort keys choosing the primary face; ties keep row order.
+        union_columns: List column -> parser returning the tags of one cell.
+        sort_unions: Sort merged values; otherwise keep first-seen row order.
+
+    Returns:
+        :class:`FaceGroups` for every key shared by two or more eligible rows.
     """
-    for column in _LIST_UNION_COLUMNS:
-        if column in group_sorted.columns:
-            union_values = _merge_object_lists(group_sorted[column])
-            work_df.at[primary_idx, column] = union_values
-    
-    if "keywords" in group_sorted.columns:
-        keyword_union = _merge_keywords(group_sorted["keywords"])
-        work_df.at[primary_idx, "keywords"] = _join_keywords(keyword_union)
+    positions = np.flatnonzero(eligible.to_numpy(dtype=bool))
+    codes, _ = pd.factorize(keys.iloc[positions])
+    counts = np.bincount(codes[codes >= 0], minlength=1)
+    grouped = codes >= 0
+    grouped[grouped] = counts[codes[grouped]] > 1
+    positions = positions[grouped]
+    _, codes = np.unique(codes[grouped], return_inverse=True)
+    group_count = int(codes.max()) + 1 if len(codes) else 0
+
+    sort_frame = pd.DataFrame({"group": codes, "position": positions})
+    order_keys = []
+    for i, key in enumerate(face_order):
+        sort_frame[f"key{i}"] = np.asarray(key)[positions]
+        order_keys.append(f"key{i}")
+    sort_frame = sort_frame.sort_values(["group", *order_keys, "position"], kind="mergesort")
+    order = sort_frame["position"].to_numpy()
+    bounds = np.searchsorted(sort_frame["group"].to_numpy(), np.arange(group_count + 1))
+
+    unions: Dict[str, List[List[str]]] = {}
+    for column, parse in (union_columns or {}).items():
+        if column not in df.columns:
+            continue
+        parsed = [list(parse(cell)) for cell in df[column].to_numpy(dtype=object)[positions]]
+        exploded = pd.DataFrame({
+            "group": np.repeat(codes, [len(tags) for tags in parsed]),
+            "value": pd.Series(list(chain.from_iterable(parsed)), dtype=object),
+        }).drop_duplicates()
+        exploded = exploded.sort_values(["group", "value"] if sort_unions else ["group"], kind="mergesort")
+        merged: List[List[str]] = [[] for _ in range(group_count)]
+        for group, values in exploded.groupby("group", sort=False)["value"]:
+            merged[group] = values.tolist()
+        unions[column] = merged
+    return FaceGroups(order=order, bounds=bounds, unions=unions)
+
+
+def _face_priority(df: pd.DataFrame) -> List[pd.Series]:
+    """Sort keys for tagging: front side first, then face name."""
+    side_series = df.get("side", pd.Series(["" for _ in range(len(df))], index=df.index))
+    priority = side_series.fillna("").astype(str).str.lower().map(_SIDE_PRIORITY).fillna(3)
+    keys = [priority]
+    if "faceName" in df.columns:
+        keys.append(df["faceName"])
+    return keys
 
 
-def _build_face_payload(face_row: pd.Series) -> Dict[str, Any]:
+def _build_face_payload(face_row: Mapping[str, Any]) -> Dict[str, Any]:
     """Build face metadata payload from a single face row.
     
     Args:
-        face_row: Single face row from grouped DataFrame
+        face_row: Single face record from the grouped DataFrame
         
     Returns:
         Dictionary containing face metadata
@@ -131,7 +246,7 @@ def _build_face_payload(face_row: pd.Series) -> Dict[str, Any]:
     }
 
 
-def _build_merge_detail(name: str, group_sorted: pd.DataFrame, faces_payload: List[Dict[str, Any]]) -> Dict[str, Any]:
+def _build_merge_detail(name: str, group_sorted: Sequence[Mapping[str, Any]], faces_payload: List[Dict[str, Any]]) -> Dict[str, Any]:
     """Build detailed merge information for a multi-face card group.
     
     Args:
@@ -225,40 +340,42 @@ def merge_multi_face_rows(
     if not multi_mask.any():
         return work_df
 
-    drop_indices: List[int] = []
-    merged_count = 0
+    groups = group_faces(
+        work_df,
+        work_df["name"],
+        multi_mask,
+        face_order=_face_priority(work_df),
+        union_columns={
+            **{column: _coerce_list for column in _LIST_UNION_COLUMNS},
+            "keywords": _split_keywords,
+        },
+    )
+    merged_count = len(groups)
+    drop_count = len(groups.dropped)
     merge_details: List[Dict[str, Any]] = []
+    back_types: List[str | None] = []
 
-    for name, group in work_df.loc[multi_mask].groupby("name", sort=False):
-        if len(group) <= 1:
-            continue
-
-        group_sorted = _sort_faces(group)
-        primary_idx = group_sorted.index[0]
-
-        _merge_tag_columns(work_df, group_sorted, primary_idx)
-
-        faces_payload = [_build_face_payload(row) for _, row in group_sorted.iterrows()]
+    face_records = work_df.iloc[groups.order].to_dict("records")
+    for group in range(merged_count):
+        faces = face_records[groups.bounds[group]:groups.bounds[group + 1]]
+        faces_payload = [_build_face_payload(face) for face in faces]
+        merge_details.append(_build_merge_detail(faces[0].get("name"), faces, faces_payload))
 
         # M9: Capture back face type for MDFC land detection
-        if len(group_sorted) >= 2 and "type" in group_sorted.columns:
-            back_face_row = group_sorted.iloc[1]
-            back_type = str(back_face_row.get("type", "") or "")
-            if back_type:
-                work_df.at[primary_idx, "backType"] = back_type
+        back_type = str(faces[1].get("type", "") or "") if "type" in work_df.columns else ""
+        back_types.append(back_type or None)
 
-        drop_indices.extend(group_sorted.index[1:])
-        
-        merged_count += 1
-        merge_details.append(_build_merge_detail(name, group_sorted, faces_payload))
-
-    if drop_indices:
-        work_df = work_df.drop(index=drop_indices)
+    updates: Dict[str, Sequence[Any]] = dict(groups.unions)
+    if "keywords" in updates:
+        updates["keywords"] = [", ".join(values) for values in updates["keywords"]]
+    updates["backType"] = back_types
+    if merged_count:
+        work_df = groups.collapse(work_df, updates)
 
     summary_payload = {
         "color": color,
         "group_count": merged_count,
-        "faces_dropped": len(drop_indices),
+        "faces_dropped": drop_count,
         "multi_face_rows": int(multi_mask.sum()),
         "entries": merge_details,
     }
@@ -273,7 +390,7 @@ def merge_multi_face_rows(
                 logger.warning("Failed to record DFC merge summary for %s: %s", color, exc)
 
     if logger is not None:
-        _log_merge_summary(color, merged_count, len(drop_indices), int(multi_mask.sum()), logger)
+        _log_merge_summary(color, merged_count, drop_count, int(multi_mask.sum()), logger)
 
     _persist_merge_summary(color, summary_payload, logger)
 
@@ -300,14 +417,6 @@ def _persist_merge_summary(color: str, summary_payload: Dict[str, Any], logger=N
             logger.warning("Failed to persist DFC merge summary: %s", exc)
 
 
-def _sort_faces(group: pd.DataFrame) -> pd.DataFrame:
-    side_series = group.get("side", pd.Series(["" for _ in range(len(group))], index=group.index))
-    priority = side_series.fillna("").astype(str).str.lower().map(_SIDE_PRIORITY).fillna(3)
-    return group.assign(__face_order=priority).sort_values(
-        by=["__face_order", "faceName"], kind="mergesort"
-    ).drop(columns=["__face_order"], errors="ignore")
-
-
 def _merge_object_lists(values: Iterable[Any]) -> List[str]:
     merged: Set[str] = set()
     for value in values:
@@ -315,19 +424,6 @@ def _merge_object_lists(values: Iterable[Any]) -> List[str]:
     return sorted(merged)
 
 
-def _merge_keywords(values: Iterable[Any]) -> Set[str]:
-    merged: Set[str] = set()
-    for value in values:
-        merged.update(_split_keywords(value))
-    return merged
-
-
-def _join_keywords(keywords: Set[str]) -> str:
-    if not keywords:
-        return ""
-    return ", ".join(sorted(keywords))
-
-
 def _coerce_list(value: Any) -> List[str]:
     if isinstance(value, list):
         return [str(v) for v in value if str(v)]
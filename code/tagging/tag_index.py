@@ -31,6 +31,11 @@ from typing import Dict, List, Set, Optional
 
 from code.logging_util import get_logger
 from code.services.all_cards_loader import AllCardsLoader
+from code.tagging.tag_index_artifact import (
+    TagIndexArtifact,
+    build_tag_index_artifact,
+    load_tag_index_artifact,
+)
 
 logger = get_logger(__name__)
 
@@ -78,7 +83,8 @@ class TagIndex:
         """Build the tag index from all_cards.
         
         Loads all_cards and creates reverse index. If a cached index exists
-        and is up-to-date, loads from cache instead.
+        and is up-to-date, loads from cache instead. The tag index artifact
+        written at tagging time takes precedence over both.
         
         Args:
             force_rebuild: If True, rebuild even if cache is valid
@@ -86,53 +92,37 @@ class TagIndex:
         Returns:
             IndexStats with build metrics
         """
-        # Check if we can use cached index
-        if not force_rebuild and self._try_load_from_cache():
-            logger.info(f"Loaded tag index from cache: {self._stats.total_cards} cards, {self._stats.total_tags} tags")
-            return self._stats
-        
-        logger.info("Building tag index from all_cards...")
         start_time = time.perf_counter()
         
-        # Load all cards
-        df = self._loader.load()
-        
-        if "themeTags" not in df.columns:
-            logger.warning("themeTags column not found in all_cards")
-            self._stats = IndexStats(
-                total_cards=0,
-                total_tags=0,
-                total_mappings=0,
-                build_time_seconds=0,
-                indexed_at=time.time(),
-                all_cards_mtime=0
-            )
-            return self._stats
+        # Prefer the artifact written at tagging time (no per-row work)
+        artifact = None if force_rebuild else load_tag_index_artifact(
+            source_path=Path(self._loader.file_path)
+        )
+        from_artifact = artifact is not None
         
-        # Clear existing indexes
-        self._tag_to_cards.clear()
-        self._card_to_tags.clear()
+        # Otherwise check if we can use cached index
+        if not from_artifact and not force_rebuild and self._try_load_from_cache():
+            logger.info(f"Loaded tag index from cache: {self._stats.total_cards} cards, {self._stats.total_tags} tags")
+            return self._stats
         
-        # Build indexes
-        total_mappings = 0
-        for _, row in df.iterrows():
-            name = row.get("name")
-            if not name:
-                continue
+        if artifact is None:
+            logger.info("Building tag index from all_cards...")
+            df = self._loader.load()
             
-            tags = self._normalize_tags(row.get("themeTags", []))
-            if not tags:
-                continue
-            
-            # Store forward mapping (card → tags)
-            self._card_to_tags[name] = tags
-            
-            # Build reverse mapping (tag → cards)
-            for tag in tags:
-                if tag not in self._tag_to_cards:
-                    self._tag_to_cards[tag] = set()
-                self._tag_to_cards[tag].add(name)
-                total_mappings += 1
+            if "themeTags" not in df.columns:
+                logger.warning("themeTags column not found in all_cards")
+                self._stats = IndexStats(
+                    total_cards=0,
+                    total_tags=0,
+                    total_mappings=0,
+                    build_time_seconds=0,
+                    indexed_at=time.time(),
+                    all_cards_mtime=0
+                )
+                return self._stats
+            artifact = build_tag_index_artifact(df)
+        
+        total_mappings = self._load_artifact(artifact)
         
         build_time = time.perf_counter() - start_time
         
@@ -156,11 +146,32 @@ class TagIndex:
             f"{self._stats.total_mappings} mappings in {build_time:.2f}s"
         )
         
-        # Save to cache
-        self._save_to_cache()
+        # Save to cache (the artifact already is one)
+        if not from_artifact:
+            self._save_to_cache()
         
         return self._stats
     
+    def _load_artifact(self, artifact: TagIndexArtifact) -> int:
+        """Fill both indexes from a tag index artifact; returns mapping count."""
+        self._tag_to_cards.clear()
+        self._card_to_tags.clear()
+        
+        names = artifact.cards["name"].to_numpy()
+        for tag in artifact.tags:
+            rows = artifact.card_ids_for_tag(tag)
+            self._tag_to_cards[tag] = {n for n in names[rows].tolist() if n}
+        
+        total_mappings = 0
+        for row in artifact.tagged_rows().tolist():
+            name = names[row]
+            if not name:
+                continue
+            tags = artifact.tags_for_card(row)
+            self._card_to_tags[name] = tags
+            total_mappings += len(tags)
+        return total_mappings
+    
     def _normalize_tags(self, tags: object) -> List[str]:
         """Normalize tags from various formats to list of strings.
         
@@ -0,0 +1,365 @@
+"""Persistent tag index artifact emitted at the end of tagging.
+
+The web tier needs the same tag → cards mapping in three places
+(``web/services/card_index``, the card browser theme filter and
+``tagging/tag_index.TagIndex``). Rather than each of them walking
+``all_cards.parquet`` row by row in every worker process, tagging writes one
+compact artifact next to the processed parquet:
+
+    card_files/processed/tag_index/
+        meta.json          vocabulary, row count, source stamp + digest
+        tag_offsets.npy    CSR offsets (len = n_tags + 1) into tag_cards
+        tag_cards.npy      card row ids (positions in all_cards.parquet)
+        card_offsets.npy   CSR offsets (len = n_rows + 1) into card_tags
+        card_tags.npy      tag ids per card, in the card's original tag order
+        cards.parquet      slim per-card records (name, identity, cost, ...)
+
+The ``.npy`` arrays are opened with ``mmap_mode='r'`` so every worker shares
+the same pages. Row ids are positions in ``all_cards.parquet`` as written,
+which is also the order every loader in the repo reads it back in.
+
+Usage:
+    artifact = load_tag_index_artifact()          # None when missing/stale
+    if artifact is None:
+        artifact = build_tag_index_artifact(df)    # in-memory fallback
+    rows = artifact.card_ids_for_tag("Tokens Matter")
+"""
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from itertools import chain
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from code.logging_util import get_logger
+
+logger = get_logger(__name__)
+
+ARTIFACT_VERSION = 1
+META_FILE = "meta.json"
+CARDS_FILE = "cards.parquet"
+_ARRAY_FILES = ("tag_offsets", "tag_cards", "card_offsets", "card_tags")
+
+# Columns read from all_cards.parquet to build the artifact
+SOURCE_COLUMNS = ["name", "faceName", "themeTags", "colorIdentity", "manaCost", "rarity", "type"]
+# Slim per-card record columns stored in cards.parquet
+CARD_COLUMNS = ["name", "colorIdentity", "manaCost", "rarity", "type"]
+
+
+def default_artifact_dir() -> Path:
+    """Return the artifact directory (card_files/processed/tag_index)."""
+    from code.path_util import get_tag_index_artifact_dir
+    return Path(get_tag_index_artifact_dir())
+
+
+def _default_source_path() -> Path:
+    from code.path_util import get_processed_cards_path
+    return Path(get_processed_cards_path())
+
+
+def coerce_tag_list(value: object) -> List[str]:
+    """Normalize a themeTags cell (list, ndarray, list-repr or CSV string) to stripped strings."""
+    if value is None:
+        return []
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
+    if isinstance(value, (list, tuple)):
+        return [s for s in (str(t).strip() for t in value if t is not None) if s]
+    if isinstance(value, str):
+        text = value.strip()
+        if not text or text == "[]":
+            return []
+        if text.startswith("["):
+            try:
+                parsed = ast.literal_eval(text)
+                if isinstance(parsed, list):
+                    return [s for s in (str(t).strip() for t in parsed) if s]
+            except (ValueError, SyntaxError):
+                pass
+        return [t.strip() for t in text.split(",") if t.strip()]
+    return []
+
+
+def _dedupe(tags: List[str]) -> List[str]:
+    return list(dict.fromkeys(tags)) if len(tags) > 1 else tags
+
+
+def _names_from_frame(df: pd.DataFrame) -> pd.Series:
+    """Card display name per row: ``name``, falling back to ``faceName``."""
+    if "name" in df.columns:
+        names = df["name"].fillna("").astype(str)
+    else:
+        names = pd.Series([""] * len(df), index=df.index, dtype=object)
+    if "faceName" in df.columns:
+        face = df["faceName"].fillna("").astype(str)
+        names = names.where(names != "", face)
+    return names.reset_index(drop=True)
+
+
+def _content_digest(names: pd.Series, tag_lists: List[List[str]]) -> str:
+    """Order-sensitive digest over card names and their tags.
+
+    Lets a loader accept an artifact after a rewrite of all_cards.parquet that
+    did not touch names or tags (e.g. the price refresh).
+    """
+    h = hashlib.sha1()
+    h.update("\x1f".join(names.tolist()).encode("utf-8"))
+    h.update(b"\x00")
+    h.update("\x1e".join("|".join(tags) for tags in tag_lists).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _source_stamp(source_path: Path) -> Dict[str, int]:
+    st = source_path.stat()
+    return {"mtime_ns": int(st.st_mtime_ns), "size": int(st.st_size)}
+
+
+@dataclass
+class TagIndexArtifact:
+    """Tag vocabulary plus forward/reverse CSR arrays over card row ids."""
+
+    tags: List[str]
+    tag_offsets: np.ndarray
+    tag_cards: np.ndarray
+    card_offsets: np.ndarray
+    card_tags: np.ndarray
+    cards: pd.DataFrame
+    meta: Dict[str, Any] = field(default_factory=dict)
+    _tag_ids: Dict[str, int] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._tag_ids = {tag: i for i, tag in enumerate(self.tags)}
+
+    @property
+    def num_cards(self) -> int:
+        return len(self.card_offsets) - 1
+
+    def tag_id(self, tag: str) -> Optional[int]:
+        return self._tag_ids.get(tag)
+
+    def card_ids_for_tag(self, tag: str) -> np.ndarray:
+        """Row ids (ascending) of cards carrying ``tag``; empty when unknown."""
+        tid = self._tag_ids.get(tag)
+        if tid is None:
+            return self.tag_cards[0:0]
+        return self.tag_cards[self.tag_offsets[tid]:self.tag_offsets[tid + 1]]
+
+    def tag_ids_for_card(self, row: int) -> np.ndarray:
+        return self.card_tags[self.card_offsets[row]:self.card_offsets[row + 1]]
+
+    def tags_for_card(self, row: int) -> List[str]:
+        """Tags for a card row in the card's original order."""
+        return [self.tags[t] for t in self.tag_ids_for_card(row).tolist()]
+
+    def tag_counts(self) -> np.ndarray:
+        return np.diff(self.tag_offsets)
+
+    def tagged_rows(self) -> np.ndarray:
+        """Row ids of cards with at least one tag."""
+        return np.flatnonzero(np.diff(self.card_offsets) > 0)
+
+
+def build_tag_index_artifact(df: pd.DataFrame) -> TagIndexArtifact:
+    """Build the artifact in memory from an all_cards frame (row order preserved)."""
+    n = len(df)
+    if "themeTags" in df.columns:
+        tag_lists = [_dedupe(coerce_tag_list(v)) for v in df["themeTags"].tolist()]
+    else:
+        tag_lists = [[] for _ in range(n)]
+    names = _names_from_frame(df)
+
+    lengths = np.fromiter((len(t) for t in tag_lists), dtype=np.int64, count=n)
+    flat = list(chain.from_iterable(tag_lists))
+    row_ids = np.repeat(np.arange(n, dtype=np.int32), lengths)
+
+    if flat:
+        codes, vocab = pd.factorize(pd.Series(flat, dtype=object), sort=True)
+        codes = codes.astype(np.int32)
+        tags = [str(t) for t in vocab]
+    else:
+        codes = np.zeros(0, dtype=np.int32)
+        tags = []
+
+    card_offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(lengths, out=card_offsets[1:])
+
+    # Reverse CSR: stable sort by tag id keeps row ids ascending per tag
+    order = np.argsort(codes, kind="stable")
+    tag_cards = row_ids[order]
+    tag_offsets = np.zeros(len(tags) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=len(tags)), out=tag_offsets[1:])
+
+    cards = pd.DataFrame({"name": names})
+    for col in CARD_COLUMNS[1:]:
+        if col in df.columns:
+            cards[col] = df[col].fillna("").astype(str).str.strip().reset_index(drop=True)
+        else:
+            cards[col] = ""
+
+    meta = {
+        "version": ARTIFACT_VERSION,
+        "num_cards": n,
+        "num_tags": len(tags),
+        "num_mappings": int(len(flat)),
+        "digest": _content_digest(names, tag_lists),
+        "tags": tags,
+    }
+    return TagIndexArtifact(
+        tags=tags,
+        tag_offsets=tag_offsets,
+        tag_cards=tag_cards,
+        card_offsets=card_offsets,
+        card_tags=codes,
+        cards=cards,
+        meta=meta,
+    )
+
+
+def _write_json_atomic(path: Path, payload: Dict[str, Any]) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def write_tag_index_artifact(
+    artifact: TagIndexArtifact,
+    directory: Optional[Path] = None,
+    source_path: Optional[Path] = None,
+) -> Path:
+    """Persist ``artifact`` and stamp it against ``source_path``.
+
+    Arrays and records are written to temp names and swapped in; meta.json is
+    written last so readers never see a half-written artifact as valid.
+    """
+    directory = Path(directory) if directory is not None else default_artifact_dir()
+    source_path = Path(source_path) if source_path is not None else _default_source_path()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    meta_path = directory / META_FILE
+    if meta_path.exists():
+        meta_path.unlink()
+
+    for name in _ARRAY_FILES:
+        tmp = directory / f"{name}.tmp.npy"
+        np.save(tmp, np.ascontiguousarray(getattr(artifact, name)))
+        os.replace(tmp, directory / f"{name}.npy")
+    tmp_cards = directory / (CARDS_FILE + ".tmp")
+    artifact.cards.to_parquet(tmp_cards, engine="pyarrow", index=False)
+    os.replace(tmp_cards, directory / CARDS_FILE)
+
+    meta = dict(artifact.meta)
+    if source_path.exists():
+        meta["source"] = _source_stamp(source_path)
+    _write_json_atomic(meta_path, meta)
+    artifact.meta = meta
+    logger.info(
+        f"Wrote tag index artifact to {directory}: {meta['num_cards']} cards, "
+        f"{meta['num_tags']} tags, {meta['num_mappings']} mappings"
+    )
+    return directory
+
+
+def _source_matches(meta: Dict[str, Any], directory: Path, source_path: Path) -> bool:
+    """True when the artifact still describes ``source_path``.
+
+    Fast path compares the file stamp. When only the stamp moved (another
+    pipeline step rewrote the parquet) the row count and name/tag digest are
+    checked instead, and the stamp is refreshed so later loads are fast again.
+    """
+    if not source_path.exists():
+        return False
+    stamp = _source_stamp(source_path)
+    if meta.get("source") == stamp:
+        return True
+    try:
+        import pyarrow.parquet as pq
+        pf = pq.ParquetFile(source_path)
+        if pf.metadata.num_rows != meta.get("num_cards"):
+            return False
+        cols = [c for c in ("name", "faceName", "themeTags") if c in pf.schema_arrow.names]
+        df = pf.read(columns=cols).to_pandas()
+    except Exception as e:
+        logger.debug(f"Tag index artifact revalidation failed: {e}")
+        return False
+    if "themeTags" in df.columns:
+        tag_lists = [_dedupe(coerce_tag_list(v)) for v in df["themeTags"].tolist()]
+    else:
+        tag_lists = [[] for _ in range(len(df))]
+    if _content_digest(_names_from_frame(df), tag_lists) != meta.get("digest"):
+        return False
+    try:
+        meta["source"] = stamp
+        _write_json_atomic(directory / META_FILE, meta)
+    except Exception:
+        pass
+    return True
+
+
+def load_tag_index_artifact(
+    directory: Optional[Path] = None,
+    source_path: Optional[Path] = None,
+) -> Optional[TagIndexArtifact]:
+    """Memory-map a persisted artifact; None when missing, corrupt or stale."""
+    directory = Path(directory) if directory is not None else default_artifact_dir()
+    source_path = Path(source_path) if source_path is not None else _default_source_path()
+    meta_path = directory / META_FILE
+    if not meta_path.exists():
+        return None
+    try:
+        with meta_path.open("r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != ARTIFACT_VERSION:
+            return None
+        if not _source_matches(meta, directory, source_path):
+            logger.info("Tag index artifact is stale; falling back to in-memory build")
+            return None
+        arrays = {
+            name: np.load(directory / f"{name}.npy", mmap_mode="r")
+            for name in _ARRAY_FILES
+        }
+        cards = pd.read_parquet(directory / CARDS_FILE, engine="pyarrow")
+        tags = list(meta.get("tags") or [])
+        if (
+            len(arrays["tag_offsets"]) != len(tags) + 1
+            or len(arrays["card_offsets"]) != meta.get("num_cards", -1) + 1
+            or len(cards) != meta.get("num_cards")
+        ):
+            logger.warning("Tag index artifact arrays do not match meta.json; ignoring")
+            return None
+        return TagIndexArtifact(tags=tags, cards=cards, meta=meta, **arrays)
+    except Exception as e:
+        logger.warning(f"Failed to load tag index artifact from {directory}: {e}")
+        return None
+
+
+def emit_tag_index_artifact(
+    source_path: Optional[Path] = None,
+    directory: Optional[Path] = None,
+) -> Optional[Path]:
+    """Build the artifact from the processed parquet and write it (tagging hook)."""
+    source_path = Path(source_path) if source_path is not None else _default_source_path()
+    if not source_path.exists():
+        logger.warning(f"Cannot emit tag index artifact; {source_path} not found")
+        return None
+    import pyarrow.parquet as pq
+    available = pq.ParquetFile(source_path).schema_arrow.names
+    cols = [c for c in SOURCE_COLUMNS if c in available]
+    df = pd.read_parquet(source_path, columns=cols, engine="pyarrow")
+    artifact = build_tag_index_artifact(df)
+    return write_tag_index_artifact(artifact, directory=directory, source_path=source_path)
+
+
+def get_tag_index_artifact(source_df: Optional[pd.DataFrame] = None) -> Optional[TagIndexArtifact]:
+    """Persisted artifact if fresh, else an in-memory build from ``source_df``."""
+    artifact = load_tag_index_artifact()
+    if artifact is None and source_df is not None:
+        artifact = build_tag_index_artifact(source_df)
+    return artifact
@@ -7594,6 +7594,21 @@ def run_tagging(parallel: bool = False, max_workers: int | None = None):
         logger.error(f"Theme stripping failed: {e}")
         logger.warning("Continuing without theme stripping")
 
+    # Emit the tag index artifact last so it reflects stripped themes.
+    # Web workers memory-map it instead of re-indexing all_cards per process.
+    try:
+        from tagging.tag_index_artifact import emit_tag_index_artifact
+        emit_tag_index_artifact()
+    except Exception as e:
+        logger.warning(f"Failed to write tag index artifact (non-fatal): {e}")
+
+    # Prebuilt commander catalog (records + search columns) for the web tier
+    try:
+        from web.services.commander_catalog_loader import emit_commander_catalog_artifact
+        emit_commander_catalog_artifact()
+    except Exception as e:
+        logger.warning(f"Failed to write commander catalog artifact (non-fatal): {e}")
+
 
 
 
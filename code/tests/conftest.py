@@ -15,14 +15,21 @@ for p in (ROOT, CODE_DIR):
         sys.path.insert(0, p)
 
 
+@pytest.fixture(scope="session")
+def _owned_cards_dir(tmp_path_factory):
+    return tmp_path_factory.mktemp("owned_cards")
+
+
 @pytest.fixture(autouse=True)
-def ensure_test_environment():
+def ensure_test_environment(_owned_cards_dir):
     """Automatically ensure test environment is set up correctly for all tests."""
     # Save original environment
     original_env = os.environ.copy()
     
     # Set up test-friendly environment variables
     os.environ['ALLOW_MUST_HAVES'] = '1'  # Enable feature for tests
+    os.environ['BUILD_RESULT_CACHE'] = '0'  # Seeded builds must not replay results from other tests
+    os.environ['OWNED_CARDS_DIR'] = str(_owned_cards_dir)  # Owned-card databases never land in the working tree
     
     yield
     
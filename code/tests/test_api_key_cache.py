@@ -0,0 +1,156 @@
+"""Tests for cached API-key verification and batched last_used writes (user_db).
+
+Uses an isolated user DB so no real data/users.db is touched.
+"""
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+import code.web.services.user_db as user_db
+
+
+@pytest.fixture(autouse=True)
+def _isolated_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(user_db, "_DATA_DIR", tmp_path)
+    monkeypatch.setattr(user_db, "_DB_PATH", tmp_path / "users.db")
+    monkeypatch.setenv("API_KEY_CACHE_TTL", "60")
+    user_db.clear_api_key_cache()
+    user_db.init_db()
+    yield
+    user_db.flush_last_used()
+    user_db.clear_api_key_cache()
+
+
+class _CountingConnection:
+    """Wraps the pooled connection and counts queries touching api_keys."""
+
+    def __init__(self, conn):
+        self._conn = conn
+        self.queries = 0
+
+    def execute(self, sql, *args):
+        if "api_keys" in sql:
+            self.queries += 1
+        return self._conn.execute(sql, *args)
+
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return self._conn.__exit__(*exc)
+
+
+@pytest.fixture
+def counting(monkeypatch):
+    conn = _CountingConnection(user_db._connect())
+    monkeypatch.setattr(user_db, "_connect", lambda: conn)
+    return conn
+
+
+def _last_used(key_id):
+    with sqlite3.connect(str(user_db._DB_PATH)) as conn:
+        return conn.execute("SELECT last_used FROM api_keys WHERE id = ?", (key_id,)).fetchone()[0]
+
+
+def test_connections_are_pooled_per_thread_and_path(tmp_path, monkeypatch):
+    first = user_db._connect()
+    assert user_db._connect() is first
+    monkeypatch.setattr(user_db, "_DB_PATH", tmp_path / "other.db")
+    assert user_db._connect() is not first
+
+
+def test_repeat_verification_served_from_cache(counting):
+    user = user_db.create_user("alice", "alice@example.com", "hunter2")
+    key_plain, _ = user_db.create_api_key(user["id"])
+    counting.queries = 0
+    assert user_db.verify_api_key(key_plain)["id"] == user["id"]
+    assert counting.queries == 1
+    for _ in range(20):
+        assert user_db.verify_api_key(key_plain)["id"] == user["id"]
+    assert counting.queries == 1
+
+
+def test_cache_disabled_with_zero_ttl(counting, monkeypatch):
+    monkeypatch.setenv("API_KEY_CACHE_TTL", "0")
+    user = user_db.create_user("alice", "alice@example.com", "hunter2")
+    key_plain, _ = user_db.create_api_key(user["id"])
+    counting.queries = 0
+    for _ in range(3):
+        assert user_db.verify_api_key(key_plain)
+    assert counting.queries == 3
+
+
+@pytest.mark.parametrize("action", ["revoke", "revoke_plain", "deactivate"])
+def test_invalidation_rejects_key_immediately(action):
+    user = user_db.create_user("alice", "alice@example.com", "hunter2")
+    key_plain, api_key = user_db.create_api_key(user["id"])
+    assert user_db.verify_api_key(key_plain)
+    if action == "revoke":
+        user_db.revoke_api_key(api_key["id"], user["id"])
+    elif action == "revoke_plain":
+        assert user_db.revoke_api_key_by_plain(key_plain)
+    else:
+        user_db.set_user_active(user["id"], False)
+    assert user_db.verify_api_key(key_plain) is None
+
+
+def test_user_changes_refresh_cached_user():
+    user = user_db.create_user("alice", "alice@example.com", "hunter2")
+    key_plain, _ = user_db.create_api_key(user["id"])
+    assert user_db.verify_api_key(key_plain)["is_admin"] is False
+    user_db.set_user_admin(user["id"], True)
+    assert user_db.verify_api_key(key_plain)["is_admin"] is True
+
+
+def test_last_used_writes_are_batched(monkeypatch):
+    monkeypatch.setattr(user_db, "_LAST_USED_FLUSH_INTERVAL", 3600.0)
+    user_db.flush_last_used()
+    user = user_db.create_user("alice", "alice@example.com", "hunter2")
+    key_plain, api_key = user_db.create_api_key(user["id"])
+    for _ in range(5):
+        user_db.verify_api_key(key_plain)
+    assert _last_used(api_key["id"]) is None
+    # Listing keys flushes so the account page never shows stale values
+    listed = user_db.list_api_keys(user["id"])
+    assert listed[0]["last_used"] is not None
+    assert _last_used(api_key["id"]) == listed[0]["last_used"]
+
+
+def test_last_used_flushed_when_interval_elapses(monkeypatch):
+    monkeypatch.setattr(user_db, "_LAST_USED_FLUSH_INTERVAL", 0.0)
+    user = user_db.create_user("alice", "alice@example.com", "hunter2")
+    key_plain, api_key = user_db.create_api_key(user["id"])
+    user_db.verify_api_key(key_plain)
+    assert _last_used(api_key["id"]) is not None
+
+
+def test_revoke_during_lookup_is_not_cached(monkeypatch):
+    user = user_db.create_user("alice", "alice@example.com", "hunter2")
+    key_plain, _ = user_db.create_api_key(user["id"])
+    row_to_user = user_db._row_to_user
+
+    def _revoke_mid_lookup(row):
+        # Runs after verify's SELECT and before it writes the cache entry
+        monkeypatch.setattr(user_db, "_row_to_user", row_to_user)
+        assert user_db.revoke_api_key_by_plain(key_plain)
+        return row_to_user(row)
+
+    monkeypatch.setattr(user_db, "_row_to_user", _revoke_mid_lookup)
+    assert user_db.verify_api_key(key_plain)
+    assert user_db.verify_api_key(key_plain) is None
+
+
+def test_cached_user_is_returned_as_copy():
+    user = user_db.create_user("alice", "alice@example.com", "hunter2")
+    key_plain, _ = user_db.create_api_key(user["id"])
+    first = user_db.verify_api_key(key_plain)
+    first["is_admin"] = True
+    cached = user_db.verify_api_key(key_plain)
+    cached["username"] = "mallory"
+    assert user_db.verify_api_key(key_plain)["username"] == "alice"
+    assert user_db.verify_api_key(key_plain)["is_admin"] is False
@@ -0,0 +1,68 @@
+"""Tests for the end-to-end build benchmark harness (code/scripts/benchmark_builds.py)."""
+from __future__ import annotations
+
+import json
+
+import pandas as pd
+import pytest
+
+import code.scripts.benchmark_builds as bench
+from deck_builder import builder_utils as bu
+
+
+def _payload(**cases):
+    return {"fixture": "abc", "cases": cases}
+
+
+def _ok(wall, rss=160.0):
+    return {"status": "ok", "wall_ms": wall, "peak_rss_mb": rss}
+
+
+def test_checked_in_fixture_matches_generator():
+    stored = pd.read_parquet(bench.FIXTURE_DIR / "all_cards.parquet")
+    fresh = bench.build_fixture_frame()
+    assert stored["name"].tolist() == fresh["name"].tolist()
+    assert [list(tags) for tags in stored["themeTags"]] == fresh["themeTags"].tolist()
+    assert set(stored.loc[stored["isCommander"], "name"]) == set(bench.COMMANDER_THEMES)
+
+
+def test_case_matrix_ids_are_unique():
+    cases = bench.benchmark_cases()
+    assert len(cases) == len({c["id"] for c in cases}) == 12
+    assert "krenko/tokens-matter+goblin-kindred/b4" in {c["id"] for c in cases}
+
+
+def test_run_case_builds_fixture_deck(monkeypatch):
+    monkeypatch.setattr(bu, "_ALL_CARDS_CACHE", {"df": None, "mtime": None})
+    case = next(c for c in bench.benchmark_cases() if c["id"] == "krenko/goblin-kindred/b2")
+    record = bench.run_case(case, str(bench.FIXTURE_DIR), repeat=1, warmup=0)
+    assert record["status"] == "ok", record["error"]
+    assert record["cards"] >= 60
+    assert record["wall_ms"] > 0 and len(record["wall_ms_runs"]) == 1
+    assert {"phase3.creatures", "phase6.export_csv"} <= set(record["phases"])
+
+
+def test_compare_gates_wall_rss_and_failures():
+    baseline = _payload(a=_ok(100.0), b=_ok(100.0), c=_ok(100.0), d=_ok(2.0), e=_ok(100.0, rss=100.0))
+    current = _payload(
+        a=_ok(110.0),                      # within 15%
+        b=_ok(130.0),                      # wall regression
+        c={"status": "error", "error": "RuntimeError: boom", "wall_ms": None, "peak_rss_mb": None},
+        d=_ok(4.0),                        # +100% but under the 5ms noise floor
+        e=_ok(100.0, rss=130.0),           # RSS regression
+        f=_ok(50.0),                       # not in baseline
+    )
+    findings = {(f["id"], f["metric"]): f for f in bench.compare(baseline, current, threshold_pct=15.0)}
+    assert set(findings) == {("b", "wall_ms"), ("c", "status"), ("e", "peak_rss_mb"), ("f", "new")}
+    assert findings[("b", "wall_ms")]["change_pct"] == 30.0
+    assert findings[("f", "new")]["regression"] is False
+
+
+@pytest.mark.parametrize("wall,expected", [(105.0, 0), (140.0, 1)])
+def test_main_compare_exit_code(tmp_path, monkeypatch, capsys, wall, expected):
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(_payload(**{"krenko/goblin-kindred/b2": _ok(100.0)})), encoding="utf-8")
+    monkeypatch.setattr(bench, "run_benchmark", lambda *a, **k: _payload(**{"krenko/goblin-kindred/b2": _ok(wall)}))
+    assert bench.main(["--compare", str(baseline), "--case", "krenko/goblin-kindred/b2"]) == expected
+    assert ("REGRESSION" in capsys.readouterr().out) is bool(expected)
+    assert not (tmp_path / "build_benchmark.json").exists()
@@ -0,0 +1,151 @@
+"""Tests for the seeded build result cache used by build_random_full_deck."""
+from __future__ import annotations
+
+import importlib
+import json
+import os
+from dataclasses import asdict
+
+import pandas as pd
+import pytest
+
+from deck_builder import build_result_cache
+from deck_builder import random_entrypoint as re_mod
+from deck_builder.random_entrypoint import RandomBuildResult
+
+
+class _FakeBuilder:
+    def __init__(self, deck_dir: str, seed: int) -> None:
+        self.commander_name = "Krenko, Mob Boss"
+        self.card_library = {
+            "Krenko, Mob Boss": {"Count": 1},
+            "Goblin Guide": {"Count": 1},
+            "Mountain": {"Count": 30 + seed % 5},
+        }
+        self.last_csv_path = os.path.join(deck_dir, "Krenko_goblins.csv")
+        self.last_txt_path = os.path.join(deck_dir, "Krenko_goblins.txt")
+        for path in (self.last_csv_path, self.last_txt_path):
+            with open(path, "w", encoding="utf-8") as fh:
+                fh.write("Name,Count\n")
+
+    def build_deck_summary(self):
+        return {"mana_curve": {"1": 4, "6+": 2, "total_spells": 6}, "type_breakdown": {"total": 32}}
+
+    def compute_and_print_compliance(self, base_stem, deck_dir):
+        return {"overall": "PASS", "bracket": "core"}
+
+
+@pytest.fixture
+def cache_env(tmp_path, monkeypatch):
+    processed = tmp_path / "processed"
+    processed.mkdir()
+    (processed / "all_cards.parquet").write_bytes(b"v1")
+    deck_dir = tmp_path / "decks"
+    deck_dir.mkdir()
+    monkeypatch.setenv("BUILD_RESULT_CACHE", "1")
+    monkeypatch.setenv("CARD_FILES_PROCESSED_DIR", str(processed))
+    monkeypatch.setattr(build_result_cache, "_DB_PATH", tmp_path / "build_result_cache.db")
+    monkeypatch.setattr(build_result_cache, "_initialized_for", None)
+    config = tmp_path / "config"
+    (config / "card_lists").mkdir(parents=True)
+    (config / "card_lists" / "game_changers.json").write_text('{"cards": []}', encoding="utf-8")
+    (config / "brackets.yml").write_text("core: {}\n", encoding="utf-8")
+    monkeypatch.setattr(build_result_cache, "_CONFIG_DIR", config)
+
+    def _fake_random_deck(**kwargs):
+        return RandomBuildResult(
+            seed=int(kwargs["seed"]),
+            commander="Krenko, Mob Boss",
+            theme=kwargs.get("theme"),
+            constraints=kwargs.get("constraints") or {},
+            primary_theme=kwargs.get("primary_theme"),
+            resolved_themes=[kwargs.get("primary_theme") or "Goblin Kindred"],
+            attempts_tried=1,
+        )
+
+    runs = []
+
+    def _fake_run(**kwargs):
+        runs.append(kwargs)
+        return _FakeBuilder(str(deck_dir), int(kwargs["seed"]))
+
+    headless = importlib.import_module("headless_runner")
+    monkeypatch.setattr(re_mod, "build_random_deck", _fake_random_deck)
+    monkeypatch.setattr(re_mod, "_load_commanders_df", lambda: pd.DataFrame())
+    monkeypatch.setattr(headless, "run", _fake_run)
+    return {"processed": processed, "config": config, "deck_dir": str(deck_dir), "runs": runs}
+
+
+def _build(env, seed=42, **kwargs):
+    return re_mod.build_random_full_deck(seed=seed, primary_theme="Goblin Kindred", deck_dir=env["deck_dir"], **kwargs)
+
+
+def _bytes(result) -> str:
+    return json.dumps(asdict(result), sort_keys=True)
+
+
+def test_cache_hit_is_identical_to_fresh_build(cache_env):
+    fresh = _build(cache_env)
+    assert len(cache_env["runs"]) == 1
+    hit = _build(cache_env)
+    assert len(cache_env["runs"]) == 1
+    assert _bytes(hit) == _bytes(fresh)
+    assert hit.decklist == fresh.decklist and hit.compliance == {"overall": "PASS", "bracket": "core"}
+
+    # Different seed or config is a different address
+    _build(cache_env, seed=43)
+    _build(cache_env, strict_theme_match=True)
+    assert len(cache_env["runs"]) == 3
+    assert build_result_cache.stats()["entries"] == 3
+
+
+def test_data_refresh_invalidates_old_entries(cache_env):
+    _build(cache_env)
+    _build(cache_env, seed=7)
+    cards = cache_env["processed"] / "all_cards.parquet"
+    cards.write_bytes(b"v2 - retagged")
+    st = cards.stat()
+    os.utime(cards, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+
+    _build(cache_env)
+    assert len(cache_env["runs"]) == 3
+    stats = build_result_cache.stats()
+    assert stats["entries"] == 1
+    assert stats["invalidated"] >= 2
+
+
+@pytest.mark.parametrize("change", ["card_list", "brackets", "app_version", "build_env"])
+def test_config_version_and_env_changes_miss(cache_env, monkeypatch, change):
+    _build(cache_env)
+    if change in ("card_list", "brackets"):
+        path = cache_env["config"] / ("card_lists/game_changers.json" if change == "card_list" else "brackets.yml")
+        path.write_text(path.read_text(encoding="utf-8") + "\n", encoding="utf-8")
+    elif change == "app_version":
+        monkeypatch.setenv("APP_VERSION", "v999.0.0")
+    else:
+        monkeypatch.setenv("LAND_COUNT", "40")
+    _build(cache_env)
+    assert len(cache_env["runs"]) == 2
+
+
+def test_missing_export_and_disabled_cache_rebuild(cache_env, monkeypatch):
+    first = _build(cache_env)
+    os.remove(first.csv_path)
+    _build(cache_env)
+    assert len(cache_env["runs"]) == 2
+
+    monkeypatch.setenv("BUILD_RESULT_CACHE", "0")
+    _build(cache_env)
+    _build(cache_env)
+    assert len(cache_env["runs"]) == 4
+
+
+def test_lru_trim(cache_env, monkeypatch):
+    monkeypatch.setenv("BUILD_RESULT_CACHE_SIZE", "2")
+    for seed in (1, 2, 3):
+        _build(cache_env, seed=seed)
+    assert build_result_cache.stats()["entries"] == 2
+    _build(cache_env, seed=3)
+    assert len(cache_env["runs"]) == 3
+    _build(cache_env, seed=1)
+    assert len(cache_env["runs"]) == 4
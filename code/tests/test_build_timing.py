@@ -0,0 +1,113 @@
+"""Tests for DeckBuilder per-stage timing spans and the rolling stage stats."""
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from deck_builder import build_timing
+from deck_builder.build_timing import SpanRecorder, timed_stage
+from deck_builder.builder import DeckBuilder
+
+
+def _builder() -> DeckBuilder:
+    builder = DeckBuilder(output_func=lambda *_: None, input_func=lambda *_: "", log_outputs=False)
+    builder._combined_cards_df = pd.DataFrame({"name": ["Sol Ring", "Arcane Signet", "Command Tower"]})
+    return builder
+
+
+class _Stages:
+    def __init__(self, builder: DeckBuilder) -> None:
+        self._timings = builder._timings
+        self._combined_cards_df = builder._combined_cards_df
+        self.card_library = builder.card_library
+
+    @timed_stage("phase4.ramp")
+    def add_ramp(self):
+        self.card_library["Sol Ring"] = {"Count": 1}
+        self.add_signets()
+
+    @timed_stage("phase4.signets")
+    def add_signets(self):
+        self.card_library["Arcane Signet"] = {"Count": 1}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_stats():
+    build_timing.reset_stage_stats()
+    yield
+    build_timing.reset_stage_stats()
+
+
+def test_spans_record_wall_cpu_pool_and_nesting():
+    builder = _builder()
+    with builder._timed("phase0.custom"):
+        sum(range(1000))
+    _Stages(builder).add_ramp()
+
+    spans = builder.timing_spans()
+    assert [s["name"] for s in spans] == ["phase0.custom", "phase4.signets", "phase4.ramp"]
+    inner, outer = spans[1], spans[2]
+    assert (outer["depth"], inner["depth"]) == (0, 1)
+    assert (outer["cards_added"], inner["cards_added"]) == (2, 1)
+    assert all(s["pool_size"] == 3 for s in spans)
+    assert outer["wall_ms"] >= inner["wall_ms"] >= 0
+    assert all(s["cpu_ms"] >= 0 for s in spans)
+
+
+def test_disabled_recorder_is_absent(monkeypatch):
+    monkeypatch.setenv("BUILD_TIMINGS", "0")
+    builder = _builder()
+    assert builder._timings is None
+    with builder._timed("phase0.custom"):
+        pass
+    _Stages(builder).add_ramp()
+    assert builder.timing_spans() == []
+    assert builder.card_library.keys() == {"Sol Ring", "Arcane Signet"}
+
+
+def test_summary_carries_spans_and_publishes_once():
+    builder = _builder()
+    _Stages(builder).add_ramp()
+    summary = builder.build_deck_summary()
+    assert [s["name"] for s in summary["timings"]] == ["phase4.signets", "phase4.ramp"]
+    builder.build_deck_summary()
+    stats = build_timing.stage_stats()
+    assert stats["phase4.ramp"]["count"] == 1
+
+
+def test_stage_stats_percentiles(monkeypatch):
+    monkeypatch.setenv("BUILD_TIMINGS_WINDOW", "4")
+    for wall in (50.0, 10.0, 40.0, 20.0, 30.0):
+        build_timing.record_spans([{"name": "phase4.removal", "wall_ms": wall, "cpu_ms": wall / 2}])
+    stats = build_timing.stage_stats()["phase4.removal"]
+    # Window keeps the last four samples: 10, 40, 20, 30
+    assert stats["count"] == 4
+    assert stats["wall_p50_ms"] == 25.0
+    assert stats["wall_p95_ms"] == pytest.approx(38.5)
+    assert stats["cpu_p50_ms"] == 12.5
+
+
+def test_recorder_publish_is_incremental():
+    rec = SpanRecorder()
+    with rec.span("a"):
+        pass
+    rec.publish()
+    with rec.span("a"):
+        pass
+    rec.publish()
+    rec.publish()
+    assert build_timing.stage_stats()["a"]["count"] == 2
+
+
+def test_diagnostics_endpoint(monkeypatch):
+    from starlette.testclient import TestClient
+    import code.web.app as app_module
+
+    build_timing.record_spans([{"name": "phase6.export_csv", "wall_ms": 12.0, "cpu_ms": 3.0}])
+    client = TestClient(app_module.app)
+    monkeypatch.setattr(app_module, "SHOW_DIAGNOSTICS", False)
+    assert client.get("/status/build_stage_timings").status_code == 404
+    monkeypatch.setattr(app_module, "SHOW_DIAGNOSTICS", True)
+    payload = client.get("/status/build_stage_timings").json()
+    assert payload["ok"] is True
+    assert payload["stages"]["phase6.export_csv"]["wall_p95_ms"] == 12.0
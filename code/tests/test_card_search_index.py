@@ -0,0 +1,117 @@
+"""Parity tests for the vectorized search path in code/web/services/card_search.py.
+
+Every query must return exactly the rows the per-row path returns; frames
+registered with `register_search_frame` (and subsets derived from them) take
+the vectorized path, plain frames the per-row one.
+"""
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from code.web.services.card_search import (
+    apply_extra_clauses,
+    apply_parsed_search,
+    color_subset_mask,
+    parse_search_query,
+)
+from code.web.services.card_search_index import register_search_frame, resolve_search_positions
+
+
+def _df() -> pd.DataFrame:
+    return pd.DataFrame({
+        "name": [
+            "Sol Ring", "Llanowar Elves", "Counterspell", "Lightning Helix", "Tarmogoyf",
+            "Jace, the Mind Sculptor", "Kenrith", "Fireball", "Boros Guildgate", "Mystery",
+        ],
+        "type": [
+            "Artifact", "Creature — Elf Druid", "Instant", "Instant", "Creature — Lhurgoyf",
+            "Legendary Planeswalker — Jace", "Legendary Creature — Human Noble", "Sorcery",
+            "Land — Gate", "Creature",
+        ],
+        "text": [
+            "{T}: Add {C}{C}.", "{T}: Add {G}.", "Counter target spell.",
+            "Lightning Helix deals 3 damage to any target and you gain 3 life.",
+            "Tarmogoyf's power is equal to the number of card types among cards in all graveyards",
+            "+2: Look at the top card of target player's library.", "{R}: Trample and haste.",
+            "Fireball deals X damage divided evenly", "Boros Guildgate enters tapped.", "",
+        ],
+        "colors": ["", "G", "U", "R, W", "G", "U", "B, G, R, U, W", "R", "", np.nan],
+        "colorIdentity": ["Colorless", "G", "U", "R, W", "G", "U", "B, G, R, U, W", "R", "R, W", np.nan],
+        "manaCost": [
+            "{1}", "{G}", "{U}{U}", "{R}{W}", "{1}{G}", "{2}{U}{U}", "{4}{W}{U}{B}{R}{G}", "{X}{R}", "",
+            np.nan,
+        ],
+        "manaValue": [1, 1, 2, 2, 2, 4, 9, 1, 0, np.nan],
+        "power": [np.nan, "1", np.nan, np.nan, "*", np.nan, "5", np.nan, np.nan, "1+*"],
+        "toughness": [np.nan, "1", np.nan, np.nan, "1+*", np.nan, "5", np.nan, np.nan, "3"],
+        "loyalty": [np.nan, np.nan, np.nan, np.nan, np.nan, "3", np.nan, np.nan, np.nan, np.nan],
+        "rarity": ["Uncommon", "common", "common", "uncommon", "mythic", "mythic", "rare", "common", "common", ""],
+        "printings": ["LEA, C21", "LEA, M19", "LEA", "RAV, C21", "FUT", "WWK", "ELD", "LEA, M21", "RNA", ""],
+        "themeTags": [
+            ["Ramp", "Artifacts Matter"], ["Ramp", "Elves"], ["Counters Spells"], ["Burn", "Lifegain"],
+            "['Big Creatures']", ["Planeswalkers"], ["Ramp", "Big-Creatures"], ["Burn", "X Spells"], [],
+            np.nan,
+        ],
+        "artTags": [["artifact"], ["elf"], [], ["lightning"], [], ["jace"], [], ["fire"], ["gate"], []],
+        "metadataTags": [[], [], [], [], [], [], [], [], [], ["Test Card"]],
+        "isNew": [False, False, False, True, False, False, True, False, False, True],
+    })
+
+
+QUERIES = [
+    "c:g", "c:rw", "c=rw", "c:m", "c:c", "c<=ur", "c>=w", "c:2", "id<=rw", "id:c", "id=wubrg", "-c:g",
+    "pow>=1", "pow>tou", "pow!=1", "tou<3", "loy=3", "cmc<=1", "mv>2", "mv=0",
+    "m:{G}", "m:UU", "m=2UU", "m>={R}", "m<=1G", "m:x",
+    "tag:ramp", "-tag:ramp", "tag:\"big creatures\"", "tag:ramp tag:elves", "art:elf", "-art:fire",
+    "atag:gate", "mtag:\"test card\"", "set:lea", "-set:lea", "set:c21 c:w", "r:common", "r:uncommon",
+    "is:new", "t:creature c:g", "o:damage c:r", "light c:rw", "c:g pow>=1 tag:ramp -set:fut",
+]
+
+
+def _run(df: pd.DataFrame, q: str) -> list:
+    parsed = parse_search_query(q)
+    return apply_extra_clauses(apply_parsed_search(df, parsed), parsed)["name"].tolist()
+
+
+@pytest.mark.parametrize("q", QUERIES)
+def test_registered_frame_matches_per_row_path(q):
+    legacy = _run(_df(), q)
+    base = _df()
+    register_search_frame(base)
+    assert resolve_search_positions(base) is not None
+    assert _run(base, q) == legacy
+    subset = base[base["manaValue"].fillna(0) <= 2].copy()
+    assert resolve_search_positions(subset) is not None
+    assert _run(subset, q) == [n for n in legacy if n in set(subset["name"])]
+
+
+def test_color_subset_mask_parity():
+    base = _df()
+    register_search_frame(base)
+    plain = _df()
+    for letters in ({"R", "W"}, {"G"}, set()):
+        for allow in (True, False):
+            fast = color_subset_mask(base, "colorIdentity", letters, allow)
+            slow = color_subset_mask(plain, "colorIdentity", letters, allow)
+            assert np.array_equal(np.asarray(fast, dtype=bool), np.asarray(slow, dtype=bool))
+
+
+def test_derived_pool_resolves_to_its_own_registration():
+    base = _df()
+    register_search_frame(base)
+    pool = base[base["name"] != "Fireball"].copy()
+    pool.loc[pool["name"] == "Sol Ring", "themeTags"] = pd.Series([["Tokens"]], index=pool.index[:1])
+    register_search_frame(pool)
+    assert _run(pool, "tag:tokens") == ["Sol Ring"]
+    assert _run(base, "tag:tokens") == []
+
+
+def test_misaligned_frame_falls_back():
+    base = _df()
+    register_search_frame(base)
+    renamed = base.copy()
+    renamed["name"] = renamed["name"].str.upper()
+    assert resolve_search_positions(renamed) is None
+    assert _run(renamed, "c:g") == ["LLANOWAR ELVES", "TARMOGOYF", "KENRITH"]
@@ -16,11 +16,12 @@ Total: 11 tests organized into 3 sections:
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
 
 import pytest
 
-from deck_builder.combos import detect_combos, detect_synergies
+from deck_builder.combos import detect_combos, detect_synergies, find_combo_completions
 from tagging.combo_schema import (
     load_and_validate_combos,
     load_and_validate_synergies,
@@ -115,6 +116,34 @@ def test_detect_more_new_pairs():
     assert ("Grand Architect", "Pili-Pala") in pairs
 
 
+def test_pair_index_order_reload_and_completions(tmp_path: Path):
+    cpath = tmp_path / "config/card_lists/combos.json"
+    _write_json(cpath, {
+        "list_version": "0.1.0",
+        "pairs": [
+            {"a": "Thassa’s Oracle", "b": "Demonic Consultation", "cheap_early": True, "tags": ["wincon"]},
+            {"a": "Kiki-Jiki, Mirror Breaker", "b": "Zealous Conscripts"},
+            {"a": "Thassa's Oracle", "b": "Tainted Pact"},
+        ],
+    })
+    deck = ["Tainted Pact", "Demonic Consultation", "thassa's  oracle", "Kiki-Jiki, Mirror Breaker"]
+
+    # File order, curly/straight quote and whitespace/case folding like the old full scan
+    assert [(c.a, c.b) for c in detect_combos(deck, combos_path=str(cpath))] == [
+        ("Thassa’s Oracle", "Demonic Consultation"),
+        ("Thassa's Oracle", "Tainted Pact"),
+    ]
+    missing = find_combo_completions(deck, combos_path=str(cpath))
+    assert [(m.card, m.partner) for m in missing] == [("Zealous Conscripts", "Kiki-Jiki, Mirror Breaker")]
+
+    # Editing the list (new mtime) rebuilds the index for the same path
+    _write_json(cpath, {"list_version": "0.2.0", "pairs": [{"a": "Tainted Pact", "b": "Kiki-Jiki, Mirror Breaker"}]})
+    st = cpath.stat()
+    os.utime(cpath, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    assert [(c.a, c.b) for c in detect_combos(deck, combos_path=str(cpath))] == [("Tainted Pact", "Kiki-Jiki, Mirror Breaker")]
+    assert find_combo_completions(deck, combos_path=str(cpath)) == []
+
+
 # ============================================================================
 # Section 2: Schema Validation Tests
 # ============================================================================
@@ -0,0 +1,138 @@
+"""Tests for the persisted commander catalog artifact and column-based filtering.
+
+`_reference_filter` is the previous record-by-record `_filter_commanders`;
+the column-based filter must return the same records in the same order.
+"""
+from __future__ import annotations
+
+import os
+
+import pandas as pd
+import pytest
+
+from code.web.app import app  # noqa: F401  (import order: routes import the app module)
+from code.web.routes import commanders
+from code.web.services import commander_catalog_loader as loader
+
+
+def _frame() -> pd.DataFrame:
+    rows = [
+        ("Krenko, Mob Boss", None, "R", "Legendary Creature — Goblin Warrior", "{T}: Create X 1/1 red Goblin tokens.", ["Goblin Kindred", "Tokens Matter", "Aggro"]),
+        ("Krenko, Tin Street Kingpin", None, "R", "Legendary Creature — Goblin", "Whenever Krenko attacks...", ["Goblin Kindred", "Tokens Matter"]),
+        ("Atraxa, Praetors' Voice", None, "W, U, B, G", "Legendary Creature — Phyrexian Angel Horror", "Flying, vigilance, deathtouch, lifelink", ["+1/+1 Counters", "Proliferate", "Superfriends"]),
+        ("Kodama of the East Tree", None, "G", "Legendary Creature — Spirit", "Partner", ["Ramp", "Landfall"]),
+        ("Karn, Legacy Reforged", None, "", "Legendary Artifact Creature — Golem", "Karn's power...", ["Artifacts Matter", "Ramp"]),
+        ("Wilson, Refined Grizzly", None, "G", "Legendary Creature — Bear Warrior", "Choose a Background", []),
+        ("Avatar Aang // Aang, Master of Elements", "Avatar Aang", "W, U, R, G", "Legendary Creature — Human Avatar", "Flying", ["Elemental"]),
+        ("Avatar Aang // Aang, Master of Elements", "Aang, Master of Elements", "W, U, R, G", "Legendary Creature — Avatar", "", ["Elemental", "Aggro"]),
+        ("Krenko, Mob Boss", None, "R", "Legendary Creature — Goblin Warrior", "Reprint row", ["Aggro"]),
+    ]
+    records = []
+    for i, (name, face, ci, typ, text, themes) in enumerate(rows):
+        records.append({
+            "name": name, "faceName": face, "side": "b" if face and "Master" in face else None,
+            "colorIdentity": ci, "colors": ci, "manaCost": "{2}{R}", "manaValue": 3.0, "type": typ,
+            "creatureTypes": ["Goblin"] if "Goblin" in typ else [], "text": text, "power": "1",
+            "toughness": "1", "keywords": "Flying" if "Flying" in text else None, "themeTags": themes,
+            "edhrecRank": float(100 + i), "layout": "normal", "isCommander": True,
+        })
+    records.append({**records[0], "name": "Goblin Token Maker", "isCommander": False})
+    return pd.DataFrame(records)
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    from deck_builder import builder_utils as bu
+
+    path = tmp_path / "all_cards.parquet"
+    _frame().to_parquet(path, index=False)
+    monkeypatch.setattr(bu, "_load_all_cards_parquet", lambda *a, **k: pd.read_parquet(path))
+    loader.clear_commander_catalog_cache()
+    yield path
+    loader.clear_commander_catalog_cache()
+
+
+def _no_row_parsing(monkeypatch):
+    def _boom(*args, **kwargs):
+        raise AssertionError("artifact load should not parse rows")
+
+    monkeypatch.setattr(loader, "_row_to_record", _boom)
+
+
+def test_catalog_round_trips_through_artifact(source, monkeypatch):
+    built = loader.load_commander_catalog(source)
+    artifact = source.with_name(loader.ARTIFACT_FILE)
+    assert artifact.exists()
+    assert len(built.entries) == 9
+    assert [r.slug for r in built.entries][:2] == ["krenko-mob-boss", "krenko-tin-street-kingpin"]
+    assert built.entries[-1].slug == "krenko-mob-boss-2"
+
+    loader.clear_commander_catalog_cache()
+    _no_row_parsing(monkeypatch)
+    loaded = loader.load_commander_catalog(source)
+    assert loaded.entries == built.entries
+    assert loaded.etag == built.etag
+    assert loaded.columns.theme_options == built.columns.theme_options
+    assert loaded.columns.name_candidates == built.columns.name_candidates
+    assert list(loaded.columns.color_codes) == list(built.columns.color_codes)
+    assert loader.commander_columns(loaded.entries) is loaded.columns
+
+
+def test_stale_artifact_is_rebuilt(source, monkeypatch):
+    loader.load_commander_catalog(source)
+    st = source.stat()
+    os.utime(source, ns=(st.st_atime_ns, st.st_mtime_ns + 5_000_000_000))
+    calls = []
+    original = loader._row_to_record
+    monkeypatch.setattr(loader, "_row_to_record", lambda *a: calls.append(1) or original(*a))
+    loader.load_commander_catalog(source, force_reload=True)
+    assert len(calls) == 9
+
+
+def test_emit_matches_loader(source, monkeypatch):
+    built = loader.load_commander_catalog(source)
+    source.with_name(loader.ARTIFACT_FILE).unlink()
+    assert loader.emit_commander_catalog_artifact(source) == source.with_name(loader.ARTIFACT_FILE)
+    loader.clear_commander_catalog_cache()
+    _no_row_parsing(monkeypatch)
+    assert loader.load_commander_catalog(source).entries == built.entries
+
+
+def _reference_filter(records, q, color, theme):
+    items = list(records)
+    color_code = commanders._canon_color_code(color)
+    if color_code:
+        items = [rec for rec in items if commanders._record_color_code(rec) == color_code]
+    normalized_query = commanders._normalize_search_text(q)
+    if normalized_query and items:
+        scored = [(commanders._commander_name_match_score(normalized_query, rec), rec) for rec in items]
+        scored = [pair for pair in scored if pair[0] >= commanders._MIN_NAME_MATCH_SCORE]
+        scored.sort(key=lambda pair: (-pair[0], pair[1].display_name.lower()))
+        items = [rec for _, rec in scored]
+    normalized_theme = commanders._normalize_search_text(theme)
+    if normalized_theme and items:
+        tokens = tuple(normalized_theme.split())
+        scored = [(commanders._best_theme_match_score(normalized_theme, tokens, rec), rec) for rec in items]
+        scored = [pair for pair in scored if pair[0] >= commanders._THEME_MATCH_THRESHOLD]
+        scored.sort(key=lambda pair: (-pair[0], pair[1].display_name.lower()))
+        items = [rec for _, rec in scored]
+    return items
+
+
+@pytest.mark.parametrize("q", [None, "krenko", "Aang Avatar", "atraxa voice", "zzz"])
+@pytest.mark.parametrize("color", [None, "R", "wubg", "C"])
+@pytest.mark.parametrize("theme", [None, "goblin", "Aggo", "counters", "ramp"])
+def test_column_filter_matches_reference(source, q, color, theme):
+    catalog = loader.load_commander_catalog(source)
+    expected = _reference_filter(catalog.entries, q, color, theme)
+    assert list(commanders._filter_commanders(catalog.entries, q, color, theme, columns=catalog.columns)) == expected
+    assert list(commanders._filter_commanders(list(catalog.entries), q, color, theme)) == expected
+
+
+def test_color_and_theme_options_from_columns(source):
+    catalog = loader.load_commander_catalog(source)
+    commanders._ensure_catalog_caches(catalog.etag + "-options")
+    options = commanders._color_options_for_catalog(catalog.entries, etag=catalog.etag)
+    assert [code for code, _ in options] == ["R", "G", "C", "WUBG", "WURG"]
+    themes = commanders._theme_options_for_catalog(catalog.entries, etag=catalog.etag)
+    assert themes == tuple(sorted({t for r in catalog.entries for t in r.themes}, key=str.lower))
@@ -0,0 +1,137 @@
+"""Tests for the SQLite deck catalog behind the deck listings and past-build signal."""
+from __future__ import annotations
+
+import json
+import os
+import time
+
+import pytest
+
+from code.web.services import deck_catalog
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    deck_root = tmp_path / "deck_files"
+    deck_root.mkdir()
+    monkeypatch.setenv("DECK_EXPORTS", str(deck_root))
+    monkeypatch.setattr(deck_catalog, "_DB_PATH", tmp_path / "deck_catalog.db")
+    monkeypatch.setattr(deck_catalog, "_initialized_for", None)
+    monkeypatch.setattr(deck_catalog, "_last_full_reconcile", {})
+    return deck_root.resolve()
+
+
+def _write_deck(directory, stem, meta=None, txt=False, cards=(("Sol Ring", 1), ("Forest", 30))):
+    directory.mkdir(parents=True, exist_ok=True)
+    csv_path = directory / f"{stem}.csv"
+    rows = ["Name,Count,Type"] + [f"{n},{c},Artifact" for n, c in cards] + ["Total,,"]
+    csv_path.write_text("\n".join(rows) + "\n", encoding="utf-8")
+    if meta is not None:
+        payload = {"meta": meta, "summary": {}}
+        csv_path.with_suffix(".summary.json").write_text(json.dumps(payload), encoding="utf-8")
+    if txt:
+        csv_path.with_suffix(".txt").write_text("1 Sol Ring\n", encoding="utf-8")
+    return csv_path
+
+
+_BASE = time.time()
+
+
+def _age(*paths, seconds=3600):
+    """Backdate files/dirs so they fall outside the catalog's racy window."""
+    ts = _BASE - seconds
+    for p in paths:
+        os.utime(p, (ts, ts))
+
+
+def test_list_dir_shapes_rows_like_directory_scan(root):
+    user = root / "u1"
+    _write_deck(user, "Atraxa_Counters_Tokens_20250101", txt=True)
+    meta = {
+        "commander": "Krenko, Mob Boss",
+        "tags": ["Goblins", "Tokens"],
+        "name": "Goblin Party",
+        "visibility": "public",
+        "budget_config": {"total": 150, "mode": "hard"},
+    }
+    _write_deck(user, "Krenko_Goblins_20250102", meta=meta, cards=(("Krenko, Mob Boss", 1), ("Mountain", 35)))
+
+    items = {i["name"]: i for i in deck_catalog.list_dir(user)}
+    fallback = items["Atraxa_Counters_Tokens_20250101.csv"]
+    assert fallback["commander"] == "Atraxa"
+    assert fallback["tags"] == ["Counters", "Tokens"]
+    assert fallback["visibility"] == "private"
+    assert fallback["txt_name"] == "Atraxa_Counters_Tokens_20250101.txt"
+    assert fallback["card_count"] == 31
+
+    krenko = items["Krenko_Goblins_20250102.csv"]
+    assert krenko["commander"] == "Krenko, Mob Boss"
+    assert krenko["tags"] == ["Goblins", "Tokens"]
+    assert krenko["display"] == "Goblin Party"
+    assert krenko["visibility"] == "public"
+    assert krenko["card_count"] == 36
+    assert (krenko["budget_total"], krenko["budget_mode"]) == (150.0, "hard")
+    assert "txt_name" not in krenko
+
+
+def test_out_of_band_changes_are_reconciled(root):
+    user = root / "u1"
+    first = _write_deck(user, "A_x_1", meta={"commander": "A", "tags": ["x"]})
+    _age(first, first.with_suffix(".summary.json"), user)
+    assert [i["name"] for i in deck_catalog.list_dir(user)] == ["A_x_1.csv"]
+
+    # A file dropped into the directory moves its mtime -> seen on next read
+    _write_deck(user, "B_y_2", meta={"commander": "B", "tags": ["y"]})
+    assert {i["name"] for i in deck_catalog.list_dir(user)} == {"A_x_1.csv", "B_y_2.csv"}
+
+    # An in-place sidecar edit leaves the directory mtime alone; the
+    # reconcile job (or an exporter's note_deck_written) picks it up.
+    for p in user.iterdir():
+        _age(p)
+    _age(user)
+    deck_catalog.list_dir(user)
+    sidecar = first.with_suffix(".summary.json")
+    sidecar.write_text(json.dumps({"meta": {"commander": "A2", "tags": ["x"]}}), encoding="utf-8")
+    _age(sidecar, seconds=60)
+    _age(user)
+    assert {i["commander"] for i in deck_catalog.list_dir(user)} == {"A", "B"}
+    counters = deck_catalog.reconcile()
+    assert counters["parsed"] == 1
+    assert {i["commander"] for i in deck_catalog.list_dir(user)} == {"A2", "B"}
+
+    # Deleting files removes the row
+    first.unlink()
+    sidecar.unlink()
+    assert [i["name"] for i in deck_catalog.list_dir(user)] == ["B_y_2.csv"]
+
+
+def test_note_deck_written_updates_in_place(root):
+    user = root / "u1"
+    csv_path = _write_deck(user, "A_x_1", meta={"commander": "A", "tags": ["x"], "visibility": "private"})
+    _age(csv_path, csv_path.with_suffix(".summary.json"), user)
+    deck_catalog.list_dir(user)
+
+    from code.web.services.deck_visibility import set_deck_visibility
+    set_deck_visibility(csv_path, "public")
+    _age(csv_path.with_suffix(".summary.json"), user)
+    assert deck_catalog.list_dir(user)[0]["visibility"] == "public"
+
+    outside = root.parent / "elsewhere"
+    deck_catalog.note_deck_written(_write_deck(outside, "C_z_3", meta={"commander": "C", "tags": ["z"]}))
+    assert deck_catalog.past_builds("C") == []
+
+
+def test_public_decks_and_past_builds(root):
+    _write_deck(root / "u1", "A_x_1", meta={"commander": "A", "tags": ["x"], "visibility": "public"})
+    _write_deck(root / "u2", "A_y_2", meta={"commander": "A", "tags": ["y"], "visibility": "private"})
+    _write_deck(root / "guest", "A_z_3", meta={"commander": "A", "tags": ["z"], "visibility": "public"})
+    _write_deck(root, "A_w_4", meta={"commander": "A", "tags": []})
+
+    public = deck_catalog.public_decks()
+    assert [(p["user_id"], p["name"]) for p in public] == [("u1", "A_x_1.csv")]
+    assert public[0]["tags"] == ["x"] and public[0]["has_txt"] is False
+
+    builds = deck_catalog.past_builds("A")
+    assert sorted(b["tags"][0] for b in builds) == ["x", "y", "z"]
+    assert all(0 <= b["age_days"] < 1 for b in builds)
+    assert deck_catalog.past_builds("Nobody") == []
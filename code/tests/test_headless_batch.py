@@ -0,0 +1,107 @@
+"""Tests for headless_runner --batch (JSONL configs -> JSONL results + throughput summary)."""
+from __future__ import annotations
+
+import functools
+import importlib
+import json
+import os
+
+import pandas as pd
+import pytest
+
+hr = importlib.import_module("code.headless_runner")
+
+
+class _FakeBuilder:
+    def __init__(self, name: str) -> None:
+        self.commander_name = name
+        self.last_csv_path = f"deck_files/{name}.csv"
+        self.last_txt_path = f"deck_files/{name}.txt"
+
+
+@pytest.fixture
+def fake_run(monkeypatch):
+    calls = []
+
+    @functools.wraps(hr.run)
+    def _run(**kwargs):
+        calls.append(kwargs)
+        print("builder chatter that batch mode should swallow")
+        if kwargs["command_name"] == "Broken":
+            raise RuntimeError("build exploded")
+        return _FakeBuilder(kwargs["command_name"])
+
+    monkeypatch.setattr(hr, "run", _run)
+    monkeypatch.setattr(hr, "_batch_warmup", lambda: None)
+    monkeypatch.setitem(hr._BATCH_WARM, "commander_df", pd.DataFrame({
+        "name": ["Krenko, Mob Boss"],
+        "themeTags": [["Goblin Kindred", "Tokens Matter", "Aggro"]],
+    }))
+    return calls
+
+
+def test_batch_run_kwargs_maps_names_and_tags(fake_run):
+    kwargs = hr._batch_run_kwargs({
+        "commander": " Krenko, Mob Boss ",
+        "primary_tag": "Tokens Matter",
+        "secondary_tag": "aggro",
+        "bracket_level": 3,
+        "seed": None,
+    })
+    assert kwargs == {
+        "command_name": "Krenko, Mob Boss",
+        "bracket_level": 3,
+        "primary_choice": 2,
+        "secondary_choice": 2,
+    }
+    with pytest.raises(ValueError, match="colour"):
+        hr._batch_run_kwargs({"commander": "Krenko, Mob Boss", "colour": "R"})
+    with pytest.raises(ValueError, match="commander"):
+        hr._batch_run_kwargs({"seed": 1})
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_batch_mode_writes_results_and_summary(tmp_path, fake_run, capsys, workers):
+    configs = tmp_path / "configs.jsonl"
+    configs.write_text("\n".join([
+        json.dumps({"commander": "Krenko, Mob Boss", "seed": 7}),
+        "",
+        "{not json",
+        json.dumps({"commander": "Broken"}),
+        json.dumps(["not", "an", "object"]),
+        json.dumps({"commander": "Atraxa, Praetors' Voice", "bracket_level": 4}),
+    ]) + "\n", encoding="utf-8")
+    args = hr._build_arg_parser().parse_args(["--batch", str(configs), "--batch-workers", str(workers)])
+
+    assert hr._run_batch_mode(args) == 1
+
+    out_path = tmp_path / "configs.results.jsonl"
+    results = {r["line"]: r for r in map(json.loads, out_path.read_text(encoding="utf-8").splitlines())}
+    assert sorted(results) == [1, 3, 4, 5, 6]
+    assert results[1]["status"] == "ok"
+    assert results[1]["csv_path"] == "deck_files/Krenko, Mob Boss.csv"
+    assert results[6]["txt_path"] == "deck_files/Atraxa, Praetors' Voice.txt"
+    assert results[4] == {**results[4], "status": "error", "commander": "Broken", "error": "RuntimeError: build exploded"}
+    assert results[3]["error"].startswith("Invalid JSON") and results[3]["duration_s"] is None
+    assert results[5]["error"] == "Config line must be a JSON object"
+    for line in (1, 4, 6):
+        assert results[line]["duration_s"] >= 0
+    if workers > 1:
+        assert any(results[line]["worker_pid"] != os.getpid() for line in (1, 4, 6))
+
+    out = capsys.readouterr().out
+    assert "builder chatter" not in out
+    summary = json.loads(out.strip().splitlines()[-1])["batch_summary"]
+    assert (summary["builds"], summary["ok"], summary["errors"]) == (5, 2, 3)
+    assert summary["workers"] == workers
+    assert summary["builds_per_s"] > 0
+
+
+def test_batch_summary_percentiles():
+    results = [{"status": "ok", "duration_s": d} for d in (4.0, 1.0, 3.0, 2.0)]
+    results.append({"status": "error", "duration_s": None})
+    summary = hr._batch_summary(results, wall_s=2.0, workers=2)
+    assert summary["builds_per_s"] == 2.0
+    assert summary["p50_s"] == 2.5
+    assert summary["p95_s"] == pytest.approx(3.85)
+    assert summary["errors"] == 1
@@ -0,0 +1,104 @@
+"""Parity tests for ImageCache's hash-indexed printings lookups.
+
+The reference functions below are the previous full-scan implementations;
+the grouped lookup must return the same answer for every card/set.
+"""
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from code.file_setup.image_cache import ImageCache
+
+
+def _ref_printings(df, name):
+    matches = df[df["face_name"].str.lower() == name.lower()]
+    return json.loads(matches.to_json(orient="records")) if not matches.empty else []
+
+
+def _ref_default(df, name):
+    matches = df[(df["face_name"].str.lower() == name.lower()) & (df["is_default"])]
+    if matches.empty:
+        return None
+    matches = matches.sort_values("released_at", ascending=False, na_position="last", kind="stable")
+    return str(matches.iloc[0]["scryfall_id"])
+
+
+def _ref_for_set(df, name, code):
+    matches = df[(df["face_name"].str.lower() == name.lower()) & (df["set"].str.upper() == code.upper())]
+    if matches.empty:
+        return None
+    matches = matches.sort_values(["score", "released_at"], ascending=[False, False], na_position="last")
+    return str(matches.iloc[0]["scryfall_id"])
+
+
+def _ref_meta(df, name, scryfall_id=None, set_code=None):
+    matches = df[df["face_name"].str.lower() == name.lower()]
+    if scryfall_id:
+        matches = matches[matches["scryfall_id"] == scryfall_id]
+    elif set_code:
+        matches = matches[matches["set"].str.upper() == set_code.upper()]
+        matches = matches.sort_values(["score", "released_at"], ascending=[False, False], na_position="last")
+    if matches.empty:
+        return None
+    row = matches.iloc[0]
+    return {"set": str(row["set"]).upper(), "set_name": str(row["set_name"]), "collector_number": str(row["collector_number"])}
+
+
+def _fixture_df() -> pd.DataFrame:
+    rng = random.Random(7)
+    names = ["Sol Ring", "Lightning Bolt", "Fire", "Ice", "Counterspell", "Thought Vessel"]
+    sets = ["lea", "m21", "c21", "2xm", "khm"]
+    rows = []
+    for i in range(160):
+        name = rng.choice(names)
+        rows.append({
+            "name": "Fire // Ice" if name in ("Fire", "Ice") else name,
+            "face_name": name if i % 9 else name.upper(),
+            "scryfall_id": f"id-{i}",
+            "set": rng.choice(sets),
+            "set_name": "Set",
+            "collector_number": str(rng.randint(1, 300)),
+            "released_at": rng.choice(["2019-01-01", "2021-06-01", "2021-06-01", None]),
+            "finishes": ["nonfoil"],
+            "score": rng.choice([10, 20, 20, 30]),
+            "image_url_small": "", "image_url_normal": "",
+        })
+    df = pd.DataFrame(rows)
+    df["is_default"] = df.groupby("name")["score"].transform(lambda s: s == s.max())
+    return df
+
+
+@pytest.fixture
+def cache(tmp_path: Path):
+    c = ImageCache(base_dir=str(tmp_path / "images"))
+    c.printings_index_path = tmp_path / "card_printings.parquet"
+    _fixture_df().to_parquet(c.printings_index_path, index=False)
+    return c
+
+
+def test_lookups_match_full_scan(cache):
+    df = pd.read_parquet(cache.printings_index_path)
+    for name in ["Sol Ring", "sol ring", "FIRE", "Ice", "Counterspell", "Thought Vessel", "Nope"]:
+        assert cache.get_printings(name) == _ref_printings(df, name)
+        assert cache.get_default_printing_id(name) == _ref_default(df, name)
+        assert cache.get_printing_meta(name) == _ref_meta(df, name)
+        for code in ["LEA", "m21", "c21", "2XM", "khm", "zzz"]:
+            assert cache.get_printing_id_for_set(name, code) == _ref_for_set(df, name, code)
+            assert cache.get_printing_meta(name, set_code=code) == _ref_meta(df, name, set_code=code)
+        for sid in ["id-0", "id-5", "id-77", "missing"]:
+            assert cache.get_printing_meta(name, scryfall_id=sid) == _ref_meta(df, name, scryfall_id=sid)
+            expected = [r for r in _ref_printings(df, name) if r["scryfall_id"] == sid]
+            assert cache.get_printing(name, sid) == (expected[0] if expected else None)
+
+
+def test_rebuild_invalidates_lookup(cache, tmp_path):
+    assert cache.get_printings("Sol Ring")
+    pd.DataFrame(_fixture_df().head(0)).to_parquet(cache.printings_index_path, index=False)
+    cache._printings_df = None
+    assert cache.get_printings("Sol Ring") == []
+    assert cache.get_default_printing_id("Sol Ring") is None
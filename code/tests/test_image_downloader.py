@@ -0,0 +1,203 @@
+"""Tests for the pooled, resumable image downloader (code/file_setup/image_downloader.py).
+
+A local ThreadingHTTPServer stands in for the Scryfall CDN; it serves
+deterministic bytes with ETags, honours If-None-Match and counts requests.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from code.file_setup.image_cache import ImageCache
+from code.file_setup import image_downloader
+from code.file_setup.image_downloader import DownloadManifest, ImageDownloader, TokenBucket
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):  # keep test output quiet
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests.append(self.path)
+            server.connections.add(self.client_address)
+        if self.path.startswith("/missing"):
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = (self.path * 50).encode()
+        etag = f'"{server.version}-{len(body)}"'
+        if self.headers.get("If-None-Match") == etag:
+            with server.lock:
+                server.not_modified += 1
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "image/jpeg")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.lock = threading.Lock()
+    httpd.requests = []
+    httpd.connections = set()
+    httpd.not_modified = 0
+    httpd.version = "v1"
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _url(server, path: str) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def _jobs(server, root: Path, n: int, missing=()):
+    for i in range(n):
+        path = "/missing" if i in missing else f"/card{i}"
+        yield f"Card {i}", [
+            (_url(server, f"{path}/small.jpg"), root / f"Card {i}" / "small" / f"id{i}.jpg"),
+            (_url(server, f"{path}/normal.jpg"), root / f"Card {i}" / "normal" / f"id{i}.jpg"),
+        ]
+
+
+def test_concurrent_download_reuses_connections_and_records_manifest(server, tmp_path):
+    root = tmp_path / "images"
+    downloader = ImageDownloader(root, workers=3, rate=1000)
+    progress = []
+    stats = downloader.run(
+        _jobs(server, root, 20, missing={4}), total=20,
+        progress_callback=lambda cur, total, name: progress.append(cur),
+    )
+    assert stats == {"total": 20, "downloaded": 38, "skipped": 0, "failed": 2}
+    assert sorted(progress) == list(range(1, 21))
+    assert (root / "Card 0" / "normal" / "id0.jpg").read_bytes() == (b"/card0/normal.jpg" * 50)
+    assert not list(root.rglob("*.part"))
+    # Keep-alive: far fewer TCP connections than requests
+    assert len(server.connections) <= 3 < len(server.requests)
+
+    manifest = json.loads((root / "download_manifest.json").read_text())["items"]
+    assert manifest["Card 1/small/id1.jpg"]["status"] == "done"
+    assert manifest["Card 1/small/id1.jpg"]["etag"].startswith('"v1-')
+    assert manifest["Card 4/small/id4.jpg"]["status"] == "failed"
+    assert "404" in manifest["Card 4/small/id4.jpg"]["error"]
+
+
+def test_resume_skips_current_files_and_retries_the_rest(server, tmp_path):
+    root = tmp_path / "images"
+    ImageDownloader(root, workers=2, rate=1000).run(_jobs(server, root, 6, missing={2}))
+    # Simulate an interrupted/corrupted item: truncated file on disk
+    truncated = root / "Card 3" / "normal" / "id3.jpg"
+    truncated.write_bytes(b"partial")
+    server.requests.clear()
+
+    stats = ImageDownloader(root, workers=2, rate=1000).run(_jobs(server, root, 6))
+    assert stats["skipped"] == 9
+    assert stats["downloaded"] == 3
+    assert sorted(server.requests) == ["/card2/normal.jpg", "/card2/small.jpg", "/card3/normal.jpg"]
+    assert truncated.read_bytes() == b"/card3/normal.jpg" * 50
+
+
+def test_refresh_revalidates_by_etag(server, tmp_path):
+    root = tmp_path / "images"
+    ImageDownloader(root, workers=2, rate=1000).run(_jobs(server, root, 3))
+    stats = ImageDownloader(root, workers=2, rate=1000).run(_jobs(server, root, 3), refresh=True)
+    assert stats["skipped"] == 6 and stats["downloaded"] == 0
+    assert server.not_modified == 6
+
+    server.version = "v2"
+    stats = ImageDownloader(root, workers=2, rate=1000).run(_jobs(server, root, 3), refresh=True)
+    assert stats["downloaded"] == 6
+    manifest = json.loads((root / "download_manifest.json").read_text())["items"]
+    assert manifest["Card 0/small/id0.jpg"]["etag"].startswith('"v2-')
+
+
+def test_untracked_files_adopted_only_when_complete(tmp_path):
+    root = tmp_path / "images"
+    root.mkdir()
+    jpeg = b"\xff\xd8\xff\xe0" + b"\x00" * 64 + b"\xff\xd9"
+    png = b"\x89PNG\r\n\x1a\n" + b"\x00" * 64 + b"\x00\x00\x00\x00IEND\xaeB`\x82"
+    files = {"whole.jpg": jpeg, "whole.png": png, "cut.jpg": jpeg[:40], "empty.jpg": b"", "text.jpg": b"<html>oops</html>"}
+    for name, body in files.items():
+        (root / name).write_bytes(body)
+    downloader = ImageDownloader(root, workers=1, rate=1000)
+    adopted = {name for name in files if downloader.is_current(root / name)}
+    assert adopted == {"whole.jpg", "whole.png"}
+    assert downloader.manifest.get(root / "cut.jpg") is None
+
+
+def test_manifest_flush_serializes_outside_item_lock(tmp_path, monkeypatch):
+    manifest = DownloadManifest(tmp_path / "download_manifest.json", tmp_path)
+    for i in range(10):
+        manifest.update(tmp_path / f"img{i}.jpg", status="done", size=i)
+    real_dumps = image_downloader.json.dumps
+    recorded = []
+
+    def _dumps(obj, **kwargs):
+        # A worker recording progress while the manifest is being serialized must not block
+        worker = threading.Thread(target=lambda: recorded.append(manifest.update(tmp_path / "late.jpg", status="done", size=1)))
+        worker.start()
+        worker.join(timeout=2)
+        assert not worker.is_alive()
+        return real_dumps(obj, **kwargs)
+
+    monkeypatch.setattr(image_downloader.json, "dumps", _dumps)
+    manifest.flush()
+    monkeypatch.setattr(image_downloader.json, "dumps", real_dumps)
+    on_disk = json.loads((tmp_path / "download_manifest.json").read_text())["items"]
+    assert len(on_disk) == 10 and recorded
+    manifest.flush()
+    assert "late.jpg" in json.loads((tmp_path / "download_manifest.json").read_text())["items"]
+
+
+def test_token_bucket_caps_aggregate_rate():
+    bucket = TokenBucket(rate=50, burst=1)
+    start = time.monotonic()
+    threads = [threading.Thread(target=lambda: [bucket.acquire() for _ in range(5)]) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # 20 tokens at 50/s with a burst of 1 need at least ~0.38s
+    assert time.monotonic() - start >= 0.35
+
+
+def test_image_cache_downloads_printings_through_pool(server, tmp_path):
+    cache = ImageCache(base_dir=str(tmp_path / "images"))
+    cache.printings_index_path = tmp_path / "card_printings.parquet"
+    pd.DataFrame([
+        {
+            "name": f"Card {i}", "face_name": f"Card {i}", "scryfall_id": f"id{i}",
+            "released_at": "2024-01-01", "is_default": True,
+            "image_url_small": _url(server, f"/card{i}/small.jpg"),
+            "image_url_normal": _url(server, f"/card{i}/normal.jpg"),
+        }
+        for i in range(5)
+    ]).to_parquet(cache.printings_index_path, index=False)
+    with patch.object(cache, "is_enabled", return_value=True):
+        first = cache.download_all_printings(mode="default")
+        second = cache.download_all_printings(mode="default")
+    assert first == {"total": 5, "downloaded": 10, "skipped": 0, "failed": 0}
+    assert second == {"total": 5, "downloaded": 0, "skipped": 10, "failed": 0}
+    assert cache.get_printing_image_path("Card 2", "id2", "normal").exists()
@@ -0,0 +1,103 @@
+"""Tests for the queued logging handlers in code/logging_util.py."""
+from __future__ import annotations
+
+import io
+import json
+import logging
+import queue
+import time
+
+from code import logging_util
+
+
+def _record(name="hot.path", msg="card %s", level=logging.INFO, args=("x",)):
+    return logging.makeLogRecord({"name": name, "msg": msg, "args": args, "levelno": level, "levelname": logging.getLevelName(level)})
+
+
+def _pipeline(limits=None):
+    q = queue.SimpleQueue()
+    file_out, stream_out = io.StringIO(), io.StringIO()
+    file_sink, stream_sink = logging.StreamHandler(file_out), logging.StreamHandler(stream_out)
+    file_sink.setFormatter(logging_util.JsonLineFormatter())
+    stream_sink.setFormatter(logging.Formatter("%(name)s|%(message)s"))
+    listener = logging_util._SinkQueueListener(q, {"file": file_sink, "stream": stream_sink})
+    rate = logging_util.RateLimitFilter(limits or {})
+    handlers = []
+    for sink in ("file", "stream"):
+        h = logging_util._SinkQueueHandler(q, sink)
+        h.addFilter(rate)
+        handlers.append(h)
+    logger = logging.getLogger(f"test_logging_util.{id(q)}")
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    for h in handlers:
+        logger.addHandler(h)
+    listener.start()
+    return logger, listener, file_out, stream_out
+
+
+def test_records_route_to_each_sink_once():
+    logger, listener, file_out, stream_out = _pipeline()
+    logger.info("hello %s", "world")
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed")
+    listener.stop()
+    lines = [json.loads(line) for line in file_out.getvalue().splitlines()]
+    assert [line["msg"].splitlines()[0] for line in lines] == ["hello world", "failed"]
+    assert "ValueError: boom" in lines[1]["msg"]
+    assert lines[0]["level"] == "INFO"
+    assert stream_out.getvalue().splitlines()[0].endswith("|hello world")
+
+
+def test_logging_does_not_wait_for_slow_sink():
+    logger, listener, file_out, _ = _pipeline()
+    slow = listener.sinks["file"]
+    original = slow.emit
+    slow.emit = lambda record: (time.sleep(0.05), original(record))
+    start = time.perf_counter()
+    for i in range(20):
+        logger.info("row %d", i)
+    assert time.perf_counter() - start < 0.5
+    listener.stop()
+    assert len(file_out.getvalue().splitlines()) == 20
+
+
+def test_rate_limit_per_template_and_prefix():
+    rate = logging_util.RateLimitFilter({"hot": 3, "hot.quiet": 0})
+    passed = [rate.filter(_record()) for _ in range(10)]
+    assert passed.count(True) == 3
+    # Other templates, unlimited sub-loggers and warnings are unaffected
+    assert rate.filter(_record(msg="other %s"))
+    assert all(rate.filter(_record(name="hot.quiet")) for _ in range(10))
+    assert all(rate.filter(_record(level=logging.WARNING)) for _ in range(10))
+    assert all(logging_util.RateLimitFilter({}).filter(_record()) for _ in range(10))
+    # The next window reports what was dropped
+    rate._windows[("hot.path", "card %s")][0] -= 1.0
+    record = _record()
+    assert rate.filter(record)
+    assert record.log_suppressed == 7
+
+
+def test_suppression_note_in_output():
+    logger, listener, file_out, _ = _pipeline({"*": 1})
+    logger.info("tick")
+    logger.info("tick")
+    rate = logger.handlers[0].filters[0]
+    next(iter(rate._windows.values()))[0] -= 1.0
+    logger.info("tick")
+    listener.stop()
+    msgs = [json.loads(line)["msg"] for line in file_out.getvalue().splitlines()]
+    assert msgs == ["tick", "tick [1 similar messages suppressed]"]
+
+
+def test_parse_rate_limits():
+    assert logging_util._parse_rate_limits("card_similarity=20, web.=x,*=100,,bad") == {"card_similarity": 20.0, "*": 100.0}
+
+
+def test_get_logger_uses_queue_handlers():
+    logger = logging_util.get_logger("test_logging_util.get_logger")
+    assert logger.handlers == [logging_util.file_handler, logging_util.stream_handler]
+    logger.info("queued")
+    logging_util.flush()
@@ -11,6 +11,7 @@ from __future__ import annotations
 
 import importlib
 
+import numpy as np
 import pandas as pd
 from starlette.testclient import TestClient
 
@@ -159,6 +160,47 @@ def test_pool_dedupes_double_faced_card_rows(monkeypatch):
     assert set(matches.iloc[0]["_tags"]) == {"Aggro", "Ritual"}
 
 
+def test_pool_shared_across_sessions_with_per_session_theme_overlay(monkeypatch):
+    """Sessions with the same identity/bracket share one base pool; only the
+    theme-dependent columns differ, and a data refresh builds a new one."""
+    manual_builder_service = importlib.import_module("code.web.services.manual_builder_service")
+    monkeypatch.setattr(manual_builder_service, "_commander_tags_and_power", lambda name: (["Giants"], 0))
+    df = _sample_deck_df()
+    df.at[3, "themeTags"] = ["Giants", "Aggro"]
+    df = pd.concat([df, pd.DataFrame([
+        {"name": "Some Commander", "colorIdentity": "R, G", "type": "Legendary Creature - Giant",
+         "manaValue": 5.0, "themeTags": ["Aggro"], "edhrecRank": 50.0, "isNew": False},
+    ])], ignore_index=True)
+    builds = []
+    real_build = manual_builder_service._build_shared_pool
+    monkeypatch.setattr(
+        manual_builder_service, "_build_shared_pool", lambda *a: builds.append(1) or real_build(*a)
+    )
+
+    plain = _manual_sess(monkeypatch, manual_builder_service, df)
+    themed = dict(plain, tags=["aggro"])
+    plain_pool = manual_builder_service.get_card_pool(plain)
+    themed_pool = manual_builder_service.get_card_pool(themed)
+
+    assert len(builds) == 1
+    assert plain_pool is not themed_pool
+    assert np.shares_memory(themed_pool["_tags"].to_numpy(), plain_pool["_tags"].to_numpy())  # shared, not copied
+    beater = themed_pool[themed_pool["name"] == "Some Beater"].iloc[0]
+    assert list(beater["_theme_matches"]) == ["Aggro"] and beater["_role"] == "On-Theme"
+    beater = plain_pool[plain_pool["name"] == "Some Beater"].iloc[0]
+    assert list(beater["_theme_matches"]) == [] and beater["_role"] == "Other"
+    assert list(beater["_commander_other_matches"]) == ["Giants"]
+
+    # The shared pool is commander-agnostic; the commander is hidden at query time
+    names = {c["name"] for c in manual_builder_service.query_pool(themed)["cards"]}
+    assert "Some Commander" not in names and "Some Beater" in names
+
+    refreshed = df.copy()
+    monkeypatch.setattr(manual_builder_service, "_get_loader", lambda: type("_L", (), {"load": lambda self: refreshed})())
+    manual_builder_service.get_card_pool({"color_identity": ["R", "G"], "commander": "Some Commander"})
+    assert len(builds) == 2
+
+
 def _sample_deck_df() -> pd.DataFrame:
     return pd.DataFrame([
         {"name": "Rampant Growth", "colorIdentity": "G", "type": "Sorcery", "manaValue": 2.0,
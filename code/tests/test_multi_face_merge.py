@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+import json
+from pathlib import Path
+
 import pandas as pd
 
+from code.tagging import multi_face_merger
 from code.tagging.multi_face_merger import merge_multi_face_rows
+from code.web.services.manual_builder_service import _merge_multi_face_pool_rows
 
 
 def _build_dataframe() -> pd.DataFrame:
@@ -189,4 +194,26 @@ def test_merge_multi_face_rows_is_idempotent():
     once = merge_multi_face_rows(df, "izzet", logger=None)
     twice = merge_multi_face_rows(once, "izzet", logger=None)
 
-    pd.testing.assert_frame_equal(once, twice)
\ No newline at end of file
+    pd.testing.assert_frame_equal(once, twice)
+
+_LAYOUT_FIXTURE = Path(__file__).parent / "fixtures" / "multi_face_layouts"
+
+
+def _records(frame: pd.DataFrame) -> list:
+    return json.loads(frame.to_json(orient="records", force_ascii=False))
+
+
+def test_every_layout_matches_recorded_merge(tmp_path, monkeypatch):
+    monkeypatch.setattr(multi_face_merger, "_SUMMARY_PATH", tmp_path / "dfc_merge_summary.json")
+    cards = json.loads((_LAYOUT_FIXTURE / "cards.json").read_text(encoding="utf-8"))
+    expected = json.loads((_LAYOUT_FIXTURE / "expected.json").read_text(encoding="utf-8"))
+    assert set(multi_face_merger._MULTI_FACE_LAYOUTS) <= {card["layout"] for card in cards}
+
+    summary = {}
+    merged = merge_multi_face_rows(pd.DataFrame(cards), "fixture", recorder=summary.update)
+    assert _records(merged) == expected["tagging"]["rows"]
+    assert json.loads(json.dumps(summary)) == expected["tagging"]["summary"]
+
+    pool = _merge_multi_face_pool_rows(pd.DataFrame(cards))
+    assert pool.index.tolist() == expected["manual_pool"]["index"]
+    assert _records(pool) == expected["manual_pool"]["rows"]
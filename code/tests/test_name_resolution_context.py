@@ -0,0 +1,104 @@
+"""Parity tests for DeckBuilder.add_card's NameResolutionContext.
+
+`_reference_allows` is the previous per-call logic (normalize the exclude
+list, lowercase the owned set, scan the pool); the context must reach the
+same add/skip decision for every call, including after pool, exclude and
+owned changes made by direct attribute assignment.
+"""
+from __future__ import annotations
+
+import pandas as pd
+
+from deck_builder import builder_utils as bu
+from deck_builder.builder import DeckBuilder
+from deck_builder.include_exclude_utils import normalize_punctuation
+
+
+def _pool() -> pd.DataFrame:
+    names = [
+        "Sol Ring", "Llanowar Elves", "Krenko, Mob Boss", "Lightning Bolt",
+        "Command Tower", "Fire // Ice", "Goblin Guide", "Goblin Guide",
+    ]
+    return pd.DataFrame({"name": names, "type": ["Card"] * len(names)})
+
+
+def _builder() -> DeckBuilder:
+    builder = DeckBuilder(output_func=lambda *_: None, input_func=lambda *_: "")
+    builder._combined_cards_df = _pool()
+    builder._full_cards_df = _pool()
+    return builder
+
+
+def _reference_allows(builder: DeckBuilder, card_name: str) -> bool:
+    if builder.exclude_cards:
+        normalized = {normalize_punctuation(exc) for exc in builder.exclude_cards}
+        if normalize_punctuation(card_name) in normalized:
+            return False
+    if builder.use_owned_only:
+        owned = builder.owned_card_names or set()
+        if owned and card_name.lower() not in {n.lower() for n in owned}:
+            return False
+    if str(card_name) not in bu.basic_land_names():
+        df = builder._combined_cards_df if builder._combined_cards_df is not None else builder._full_cards_df
+        if df is not None and not df.empty and "name" in df.columns:
+            if df[df["name"].astype(str).str.lower() == str(card_name).lower()].empty:
+                return False
+    return True
+
+
+def _assert_parity(builder: DeckBuilder, names) -> None:
+    for name in names:
+        before = builder.card_library.get(name, {}).get("Count", 0)
+        expected = _reference_allows(builder, name)
+        builder.add_card(name, card_type="Basic Land" if name in bu.basic_land_names() else "Creature")
+        after = builder.card_library.get(name, {}).get("Count", 0)
+        added = after > before or (before == 0 and name in builder.card_library)
+        if not expected:
+            assert not added, name
+        elif before == 0:
+            assert added, name
+
+
+def test_add_card_decisions_match_reference_scans():
+    builder = _builder()
+    builder.exclude_cards = ["Krenko Mob Boss", "lightning bolt"]
+    _assert_parity(builder, [
+        "Sol Ring", "sol ring", "Sol Ring", "Krenko, Mob Boss", "Lightning Bolt",
+        "Forest", "Forest", "Black Lotus", "goblin guide", "Goblin Guide", "Fire // Ice",
+    ])
+
+
+def test_context_follows_direct_reassignment():
+    builder = _builder()
+    _assert_parity(builder, ["Sol Ring"])
+    # Pool replaced wholesale (budget filter, orchestrator restore)
+    builder._combined_cards_df = _pool()
+    _assert_parity(builder, ["Sol Ring", "Command Tower"])
+    # Exclude list mutated in place
+    builder.exclude_cards.append("Llanowar Elves")
+    _assert_parity(builder, ["Llanowar Elves"])
+    # Owned-only mode with a fresh owned set, then an in-place addition
+    builder.use_owned_only = True
+    builder.owned_card_names = {"fire // ice"}
+    _assert_parity(builder, ["Goblin Guide", "Fire // Ice"])
+    builder.owned_card_names.add("Goblin Guide")
+    _assert_parity(builder, ["Goblin Guide"])
+    # Emptied pool disables the pool check, as before
+    builder._combined_cards_df = _pool().iloc[0:0]
+    _assert_parity(builder, ["Totally Unknown"])
+
+
+def test_pool_indexed_once_and_kept_in_step(monkeypatch):
+    from deck_builder.name_resolution import NameResolutionContext
+
+    builder = _builder()
+    calls = []
+    original = NameResolutionContext._index_pool
+    monkeypatch.setattr(NameResolutionContext, "_index_pool", lambda self, pool: calls.append(1) or original(self, pool))
+    for name in ("Sol Ring", "Llanowar Elves", "Not In Pool", "Goblin Guide", "Sol Ring"):
+        builder.add_card(name, card_type="Creature")
+    assert calls == [1]
+    ctx = builder._name_context
+    assert ctx.pool is builder._combined_cards_df
+    assert ctx.in_pool("Sol Ring") is False
+    assert ctx.in_pool("command tower") is True
@@ -0,0 +1,150 @@
+"""Tests for the SQLite-backed owned-card store (code/web/services/owned_store.py).
+
+`_reference_enrich` is the previous row-by-row enrichment; the vectorized
+join must produce the same metadata for every card.
+"""
+from __future__ import annotations
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import code.web.services.owned_store as store
+
+
+def _cards() -> pd.DataFrame:
+    return pd.DataFrame([
+        {"name": "Sol Ring", "type": "Artifact", "colorIdentity": "", "themeTags": ["Ramp", "Mana Rock"], "manaValue": 1.0, "power": None, "toughness": None},
+        {"name": "Llanowar Elves", "type": "Creature — Elf Druid", "colorIdentity": "G", "themeTags": ["Ramp", "Elves"], "manaValue": 1.0, "power": "1", "toughness": "1"},
+        {"name": "Fire // Ice", "type": "Instant // Instant", "colorIdentity": "U, R", "themeTags": ["Burn"], "manaValue": 4.0, "power": np.nan, "toughness": "nan"},
+        {"name": "Fire // Ice", "type": "Instant", "colorIdentity": "U, R", "themeTags": ["burn", "Tapper"], "manaValue": 4.0, "power": None, "toughness": None},
+        {"name": "Urza's Saga", "type": "Enchantment Land — Urza's Saga", "colorIdentity": "", "themeTags": [], "manaValue": 0.0, "power": None, "toughness": None},
+        {"name": "Grizzlegom", "type": "Kindred Thing", "colorIdentity": "R, G", "themeTags": None, "manaValue": 5.0, "power": "X", "toughness": "5"},
+        {"name": "Blank", "type": None, "colorIdentity": None, "themeTags": ["Odd"], "manaValue": np.nan, "power": "", "toughness": None},
+    ])
+
+
+def _reference_enrich(df, target_names):
+    meta = {}
+    want = {str(n).strip().lower() for n in target_names if str(n).strip()}
+    for _, row in df[df["name"].str.lower().isin(want)].iterrows():
+        nm = str(row.get("name") or "").strip()
+        entry = meta.setdefault(nm, {"tags": [], "type": None, "colors": []})
+        tags = row.get("themeTags")
+        if tags is not None and isinstance(tags, list):
+            seen = {t.lower() for t in entry["tags"]}
+            for t in tags:
+                if str(t).strip() and str(t).strip().lower() not in seen:
+                    entry["tags"].append(str(t).strip())
+                    seen.add(str(t).strip().lower())
+        if not entry.get("type"):
+            t_raw = row.get("type")
+            t_raw = str(t_raw).strip() if isinstance(t_raw, str) else ""
+            if t_raw:
+                tline = t_raw.split("—")[0].strip()
+                prim = next((c for c in store._PRIMARY_TYPES if c.lower() in tline.lower()), None)
+                entry["type"] = prim or tline.split()[0]
+        if not entry.get("colors"):
+            colors_raw = row.get("colorIdentity")
+            colors_raw = colors_raw.strip() if isinstance(colors_raw, str) else ""
+            entry["colors"] = [c.strip() for c in colors_raw.split(",") if c.strip()]
+        if entry.get("manaValue") is None and not pd.isna(row.get("manaValue")):
+            entry["manaValue"] = float(row.get("manaValue"))
+        for col in ("power", "toughness"):
+            val = row.get(col)
+            val = str(val).strip() if isinstance(val, str) else ""
+            if not entry.get(col) and val and val.lower() not in ("nan", "none"):
+                entry[col] = val
+    return meta
+
+
+@pytest.fixture(autouse=True)
+def _isolated(tmp_path, monkeypatch):
+    from deck_builder import builder_utils as bu
+    monkeypatch.setenv("OWNED_CARDS_DIR", str(tmp_path / "owned_cards"))
+    monkeypatch.setattr(bu, "_load_all_cards_parquet", lambda *a, **k: _cards())
+    yield
+
+
+def test_vectorized_enrichment_matches_reference():
+    names = ["sol ring", "Llanowar Elves", "FIRE // ICE", "Urza's Saga", "Grizzlegom", "Blank", "Missing"]
+    got = store._enrich_from_csvs(names)
+    expected = _reference_enrich(_cards(), names)
+    assert set(got) == {k.lower() for k in expected}
+    for nm, ref in expected.items():
+        entry = got[nm.lower()]
+        assert entry["name"] == nm
+        assert entry["tags"] == ref["tags"]
+        assert entry["type"] == ref["type"]
+        assert entry["colors"] == ref["colors"]
+        assert entry["manaValue"] == ref.get("manaValue")
+        assert entry["power"] == ref.get("power")
+        assert entry["toughness"] == ref.get("toughness")
+
+
+def test_bulk_add_enrich_and_read_back():
+    added, total = store.add_and_enrich(["Sol Ring", "sol ring", " Llanowar Elves ", "Fire // Ice", "Unknown Card", ""])
+    assert (added, total) == (4, 4)
+    assert store.add_and_enrich(["SOL RING", "Grizzlegom"]) == (1, 5)
+    names, tags, types, colors = store.get_enriched()
+    assert names == ["Sol Ring", "Llanowar Elves", "Fire // Ice", "Unknown Card", "Grizzlegom"]
+    assert tags["Fire // Ice"] == ["Burn", "Tapper"]
+    assert types["Llanowar Elves"] == "Creature"
+    assert colors["Fire // Ice"] == ["U", "R"]
+    assert "Unknown Card" not in tags and "Unknown Card" not in types
+    stats = store.get_stats_map()
+    assert stats["Llanowar Elves"] == {"manaValue": 1.0, "power": "1", "toughness": "1"}
+    assert stats["Unknown Card"] == {"manaValue": None, "power": None, "toughness": None}
+    assert set(store.get_added_at_map()) == set(names)
+
+
+def test_remove_clear_and_owned_set_versioning():
+    store.add_names(["Sol Ring", "Llanowar Elves"])
+    v1 = store.owned_version()
+    first = store.get_owned_set()
+    assert first == {"sol ring", "llanowar elves"}
+    assert store.get_owned_set() is first  # reused until the collection changes
+    assert store.owned_version() == v1
+    assert store.add_names(["sol ring"]) == (0, 2)
+    assert store.owned_version() == v1
+    assert store.remove_names(["SOL RING", "nope"]) == (1, 1)
+    assert store.owned_version() > v1
+    assert store.get_owned_set() == {"llanowar elves"}
+    store.clear()
+    assert store.get_names() == [] and store.get_owned_set() == frozenset()
+
+
+def test_per_user_databases_are_separate():
+    store.add_names(["Sol Ring"], "user-a")
+    store.add_names(["Black Lotus"], "user-b")
+    assert store.get_names("user-a") == ["Sol Ring"]
+    assert store.get_owned_set("user-b") == {"black lotus"}
+
+
+def test_legacy_json_is_imported_once(tmp_path):
+    d = tmp_path / "owned_cards" / "user-a"
+    d.mkdir(parents=True)
+    (d / ".web_owned_db.json").write_text(json.dumps({
+        "names": ["Sol Ring", "Llanowar Elves", "sol ring", ""],
+        "meta": {"Sol Ring": {"added_at": 123, "tags": ["Ramp"], "type": "Artifact", "colors": []}},
+    }), encoding="utf-8")
+    assert store.get_names("user-a") == ["Sol Ring", "Llanowar Elves"]
+    assert store.get_added_at_map("user-a") == {"Sol Ring": 123}
+    assert store.get_enriched("user-a")[1] == {"Sol Ring": ["Ramp"]}
+    assert not (d / ".web_owned_db.json").exists()
+    store.add_names(["Grizzlegom"], "user-a")
+    assert store.get_names("user-a") == ["Sol Ring", "Llanowar Elves", "Grizzlegom"]
+
+
+def test_reads_do_not_create_a_database(tmp_path):
+    root = tmp_path / "owned_cards"
+    assert store.get_names() == [] and store.get_owned_set() == frozenset()
+    assert store.owned_version("user-a") == 0
+    assert store.get_enriched("user-a") == ([], {}, {}, {})
+    assert store.get_stats_map() == {} and store.get_added_at_map() == {}
+    assert not root.exists()
+    store.add_names(["Sol Ring"])
+    assert (root / ".web_owned.db").exists()
+    assert store.get_owned_set() == {"sol ring"}
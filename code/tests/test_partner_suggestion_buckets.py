@@ -0,0 +1,108 @@
+"""Eligibility buckets and memoization in the partner suggestion service.
+
+Scoring only the eligible bucket must give the same suggestions as scoring
+every commander in the dataset (the previous behaviour).
+"""
+from __future__ import annotations
+
+import json
+import os
+import random
+from pathlib import Path
+
+import pytest
+
+from code.web.services import partner_suggestions as service
+from code.web.services.partner_suggestions import configure_dataset_path, get_partner_suggestions
+from deck_builder.suggestions import build_eligibility_buckets
+
+_THEMES = ["Artifacts", "Counters", "Tokens", "Aggro", "Partner", "Legends Matter", "Background", "Doctor's Companion"]
+
+
+def _commanders(seed: int = 11) -> dict:
+    rng = random.Random(seed)
+    names = [f"Commander {i:02d}" for i in range(40)]
+    commanders = {}
+    for i, name in enumerate(names):
+        partner_with = [names[i + 1]] if i % 10 == 0 else ([names[i - 1]] if i % 10 == 1 else [])
+        commanders[name.casefold()] = {
+            "name": name,
+            "display_name": name,
+            "color_identity": rng.sample(["W", "U", "B", "R", "G"], rng.randint(0, 3)),
+            "themes": rng.sample(_THEMES, rng.randint(0, 3)),
+            "role_tags": rng.sample(["Aggro", "Value", "Control"], 1),
+            "partner": {
+                "has_partner": rng.random() < 0.4,
+                "partner_with": partner_with,
+                "supports_backgrounds": rng.random() < 0.2,
+                "is_background": rng.random() < 0.15,
+                "is_doctor": rng.random() < 0.1,
+                "is_doctors_companion": rng.random() < 0.1,
+            },
+        }
+    return commanders
+
+
+def _write(path: Path, *, with_block: bool) -> Path:
+    commanders = _commanders()
+    payload = {
+        "metadata": {"generated_at": "2025-10-06T12:00:00Z"},
+        "commanders": commanders,
+        "pairings": {"records": [
+            {"mode": "partner", "primary_canonical": "commander 03", "secondary_canonical": "commander 07", "count": 4},
+        ]},
+    }
+    if with_block:
+        payload["eligibility"] = build_eligibility_buckets(commanders)
+    path.write_text(json.dumps(payload), encoding="utf-8")
+    return path
+
+
+def _snapshot(result) -> dict:
+    return {mode: [(s["name"], s["score"], s["notes"]) for s in items] for mode, items in result.by_mode.items()}
+
+
+@pytest.mark.parametrize("with_block", [True, False])
+def test_bucketed_scoring_matches_full_scan(tmp_path, monkeypatch, with_block):
+    path = _write(tmp_path / "partner_synergy.json", with_block=with_block)
+    names = [f"Commander {i:02d}" for i in range(40)]
+    try:
+        configure_dataset_path(path)
+        with monkeypatch.context() as patched:
+            patched.setattr(
+                service.PartnerSuggestionDataset,
+                "candidates",
+                lambda self, primary, modes: [e for e in self.entries() if e.canonical != primary.canonical],
+            )
+            expected = {name: _snapshot(get_partner_suggestions(name, limit_per_mode=0, min_score=0.0)) for name in names}
+        configure_dataset_path(path)
+        got = {name: _snapshot(get_partner_suggestions(name, limit_per_mode=0, min_score=0.0)) for name in names}
+    finally:
+        configure_dataset_path(None)
+    assert got == expected
+    assert sum(len(v) for modes in got.values() for v in modes.values()) > 0
+
+
+def test_results_memoized_until_dataset_changes(tmp_path, monkeypatch):
+    path = _write(tmp_path / "partner_synergy.json", with_block=True)
+    calls = []
+    real = service.score_partner_candidate
+    monkeypatch.setattr(service, "score_partner_candidate", lambda *a, **k: calls.append(1) or real(*a, **k))
+    try:
+        configure_dataset_path(path)
+        first = get_partner_suggestions("Commander 00")
+        scored = len(calls)
+        assert get_partner_suggestions("Commander 00") is first
+        assert len(calls) == scored
+        get_partner_suggestions("Commander 00", limit_per_mode=2)
+        assert len(calls) > scored
+
+        data = json.loads(path.read_text(encoding="utf-8"))
+        data["metadata"]["generated_at"] = "2026-01-01T00:00:00Z"
+        path.write_text(json.dumps(data), encoding="utf-8")
+        os.utime(path, ns=(1, 1))
+        refreshed = get_partner_suggestions("Commander 00")
+        assert refreshed is not first
+        assert refreshed.metadata["generated_at"] == "2026-01-01T00:00:00Z"
+    finally:
+        configure_dataset_path(None)
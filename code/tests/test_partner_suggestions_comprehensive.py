@@ -294,6 +294,8 @@ def test_build_partner_suggestions_creates_dataset(tmp_path: Path) -> None:
     assert halana["partner"]["has_partner"] is True
     guild_artisan = commanders["guild artisan"]
     assert guild_artisan["partner"]["is_background"] is True
+    assert "guild artisan" in data["eligibility"]["background"]
+    assert "halana, kessig ranger" in data["eligibility"]["partner"]
 
     themes = data["themes"]
     aggro = themes["aggro"]
@@ -0,0 +1,126 @@
+"""Tests for the price-sorted tag index behind batched budget alternatives.
+
+The per-card ``find_cheaper_alternatives`` path is the reference: the
+batched path must return the same alternatives in the same order.
+"""
+from __future__ import annotations
+
+import random
+from typing import Dict, List, Optional
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from code.web.services import price_tag_index
+from code.web.services.budget_evaluator import BudgetEvaluatorService
+from code.web.services.price_service import PriceService
+
+_TAGS = ["Ramp", "Removal", "Card Draw", "Tokens", "Lifegain"]
+_TYPES = ["Artifact", "Creature — Elf", "Instant", "Sorcery", "Land", "Enchantment Creature — God", "Kindred Instant"]
+_COLORS = [[], ["W"], ["U"], ["B"], ["R"], ["G"], ["U", "B"], ["W", "U", "B", "R", "G"]]
+
+
+def _fixture(seed: int = 7):
+    rng = random.Random(seed)
+    cards = []
+    for i in range(120):
+        name = f"Card {i:03d}"
+        tags = rng.sample(_TAGS, rng.randint(1, 3))
+        cards.append({
+            "name": name,
+            "tags": tags,
+            "type_line": rng.choice(_TYPES),
+            "color_identity_list": rng.choice(_COLORS),
+        })
+    # Multi-row names (DFC faces) with different tags per row
+    cards.append({"name": "Card 000", "tags": ["Tokens"], "type_line": "Creature", "color_identity_list": ["G"]})
+    pools: Dict[str, List[dict]] = {tag: [] for tag in _TAGS}
+    for card in cards:
+        for tag in card["tags"]:
+            pools[tag].append(card)
+    rng.shuffle(pools["Removal"])
+    # Rounded-price ties and a missing price
+    prices: Dict[str, Optional[float]] = {c["name"]: round(rng.choice([0.25, 0.5, 1.0, 2.004, 2.0, 3.5, 9.99]) + rng.random() * 0.001, 4) for c in cards}
+    prices["Card 005"] = None
+    return pools, prices
+
+
+def _price_service(prices):
+    svc = MagicMock(spec=PriceService)
+    svc.get_prices_batch.side_effect = lambda names, region="usd", foil=False, printing_map=None: {n: prices.get(n) for n in names}
+    svc.get_ck_prices_batch.side_effect = lambda names: {n: (prices.get(n) or 0) * 1.1 for n in names}
+    svc.data_version.return_value = 1
+    return svc
+
+
+@pytest.fixture
+def setup():
+    pools, prices = _fixture()
+    svc = _price_service(prices)
+    price_tag_index.clear_price_tag_index()
+    with patch("code.web.services.card_index.get_tag_pool", side_effect=lambda tag: pools.get(tag, [])), \
+         patch("code.web.services.card_index.maybe_build_index"):
+        yield BudgetEvaluatorService(price_service=svc), svc, pools
+    price_tag_index.clear_price_tag_index()
+
+
+def _requests(pools):
+    rng = random.Random(3)
+    names = sorted({c["name"] for pool in pools.values() for c in pool})
+    reqs = []
+    for name in names[:40]:
+        tags = rng.sample(_TAGS, rng.randint(1, 4))
+        reqs.append({
+            "card": name if rng.random() < 0.7 else name.upper(),
+            "max_price": rng.choice([0.0, 0.5, 1.0, 2.0, 2.004, 5.0, 100.0]),
+            "tags": tags,
+            "require_type": rng.choice([None, None, "Creature", "Instant", "Land", "God"]),
+        })
+    return reqs
+
+
+@pytest.mark.parametrize("color_identity", [None, [], ["U", "B"], ["g"], ["W", "U", "B", "R", "G"]])
+def test_batch_matches_per_card_path(setup, color_identity):
+    evaluator, _, pools = setup
+    reqs = _requests(pools)
+    batch = evaluator.find_cheaper_alternatives_batch(reqs, color_identity=color_identity)
+    assert len(batch) == len(reqs)
+    non_empty = 0
+    for req, got in zip(reqs, batch):
+        expected = evaluator.find_cheaper_alternatives(
+            req["card"], req["max_price"], color_identity=color_identity,
+            tags=req["tags"], require_type=req["require_type"],
+        )
+        assert got == expected, req
+        non_empty += bool(got)
+    assert non_empty > 10
+
+
+def test_index_built_once_per_price_version(setup):
+    evaluator, svc, pools = setup
+    reqs = _requests(pools)
+    evaluator.find_cheaper_alternatives_batch(reqs[:2])
+    evaluator.find_cheaper_alternatives_batch(reqs)
+    # One price lookup per tag, however many cards are flagged
+    assert svc.get_prices_batch.call_count == len(_TAGS)
+    assert svc.get_ck_prices_batch.call_count == 2
+
+    svc.data_version.return_value = 2
+    evaluator.find_cheaper_alternatives_batch(reqs[:1])
+    assert svc.get_prices_batch.call_count == len(_TAGS) + len(set(reqs[0]["tags"]))
+
+
+def test_evaluate_deck_replacements_use_batch(setup):
+    evaluator, _, _ = setup
+    deck = ["Card 010", "Card 020", "Card 030", "Card 040"]
+    with patch.object(evaluator, "_get_card_tags", return_value=["Ramp", "Removal"]):
+        expected = {
+            name: evaluator.find_cheaper_alternatives(name, max_price=0.99 - 0.01)
+            for name in deck
+        }
+        with patch.object(evaluator, "find_cheaper_alternatives", side_effect=AssertionError("per-card path")):
+            report = evaluator.evaluate_deck(deck, budget_total=1.0, card_ceiling=0.99)
+    flagged = {e["card"] for e in report["over_budget_cards"]}
+    got = {r["original"]: r["alternatives"] for r in report["replacements_available"]}
+    assert got
+    assert got == {name: alts for name, alts in expected.items() if alts and name in flagged}
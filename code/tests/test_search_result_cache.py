@@ -0,0 +1,115 @@
+"""Tests for the card search result cache (code/web/services/search_result_cache.py)."""
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from code.web.services import search_result_cache
+from code.web.services.search_result_cache import SearchResultCache, current_version, get_search_cache
+
+
+def test_lru_eviction_and_source_identity():
+    cache = SearchResultCache("t", max_entries=2)
+    frame_a, frame_b = pd.DataFrame({"x": [1]}), pd.DataFrame({"x": [2]})
+    calls = []
+
+    def _compute(tag):
+        calls.append(tag)
+        return np.array([len(calls)])
+
+    cache.get_or_compute("k1", frame_a, lambda: _compute("k1"))
+    cache.get_or_compute("k1", frame_a, lambda: _compute("k1"))
+    # Same key computed from a different frame (loader reload) is a miss
+    cache.get_or_compute("k1", frame_b, lambda: _compute("k1b"))
+    cache.get_or_compute("k2", frame_b, lambda: _compute("k2"))
+    cache.get_or_compute("k3", frame_b, lambda: _compute("k3"))
+    assert calls == ["k1", "k1b", "k2", "k3"]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["size"], stats["evictions"]) == (1, 4, 2, 1)
+    assert cache.get("k1", frame_b) is None
+
+
+def test_data_change_clears_caches(tmp_path, monkeypatch):
+    cards = tmp_path / "all_cards.parquet"
+    cards.write_bytes(b"v1")
+    monkeypatch.setattr(search_result_cache, "card_files_processed_dir", lambda: str(tmp_path))
+    cache = get_search_cache("test_invalidation")
+    frame = pd.DataFrame({"x": [1]})
+    v1 = current_version(str(cards))
+    cache.put((v1, "q"), np.array([0]), frame)
+    assert cache.get((v1, "q"), frame) is not None
+
+    (tmp_path / "card_printings.parquet").write_bytes(b"printings")
+    v2 = current_version(str(cards))
+    assert v2 != v1
+    assert cache.stats()["size"] == 0
+
+    cards.write_bytes(b"v2 is longer")
+    os.utime(cards, ns=(1, 1))
+    assert current_version(str(cards)) != v2
+
+
+@pytest.fixture()
+def api_client(tmp_path):
+    import code.web.routes.api_v1.cards as cards_route
+    from code.services.all_cards_loader import AllCardsLoader
+    from code.web.app import app
+
+    names = [f"Card {i:02d}" for i in range(30)]
+    df = pd.DataFrame({
+        "name": names,
+        "colorIdentity": ["R" if i % 2 else "G" for i in range(30)],
+        "type": ["Instant"] * 30,
+        "manaValue": [float(i % 5) for i in range(30)],
+        "themeTags": [["Burn"] if i % 3 == 0 else [] for i in range(30)],
+        "text": [""] * 30,
+    })
+    path = tmp_path / "all_cards.parquet"
+    df.to_parquet(path, engine="pyarrow")
+    cards_route._loader = AllCardsLoader(file_path=str(path))
+    with TestClient(app) as client:
+        yield client
+    cards_route._loader = None
+
+
+def test_api_pages_slice_one_cached_result(api_client):
+    cache = get_search_cache("api_v1_cards")
+    before = cache.stats()
+    first = api_client.get("/api/v1/cards", params={"colors": "R", "page_size": 5}).json()["data"]
+    second = api_client.get("/api/v1/cards", params={"colors": "R", "page": 2, "page_size": 5}).json()["data"]
+    after = cache.stats()
+    assert first["total_count"] == second["total_count"] == 15
+    assert [c["name"] for c in first["cards"]] == [f"Card {i:02d}" for i in (1, 3, 5, 7, 9)]
+    assert [c["name"] for c in second["cards"]] == [f"Card {i:02d}" for i in (11, 13, 15, 17, 19)]
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+
+    # A different filter is its own entry
+    tagged = api_client.get("/api/v1/cards", params={"tags": "burn", "page_size": 50}).json()["data"]
+    assert tagged["total_count"] == 10
+
+
+def test_card_browser_grid_cursor_slices_cached_order(monkeypatch):
+    from unittest.mock import MagicMock
+
+    from code.web.app import app
+    import code.web.routes.card_browser as card_browser
+    from code.tests.test_card_browser_single_result_redirect import _fake_card
+
+    df = pd.DataFrame([_fake_card(f"Card {i:02d}") for i in range(45)])
+    loader_mock = MagicMock()
+    loader_mock.load.return_value = df
+    monkeypatch.setattr(card_browser, "get_loader", lambda: loader_mock)
+    cache = get_search_cache("card_browser")
+    before = cache.stats()
+    with TestClient(app) as client:
+        page = client.get("/cards/grid", params={"cursor": "Card 19"}).text
+        last = client.get("/cards/grid", params={"cursor": "Card 39"}).text
+    assert "Card 20" in page and "Card 39" in page and "Card 40" not in page and "Card 19" not in page
+    assert "Card 44" in last and "Card 39" not in last
+    after = cache.stats()
+    assert (after["misses"] - before["misses"], after["hits"] - before["hits"]) == (1, 1)
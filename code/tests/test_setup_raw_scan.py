@@ -0,0 +1,90 @@
+"""Parity tests for the projected raw-parquet scan in file_setup/setup.py.
+
+The reference run loads every column with pandas and applies all filters
+row-wise (the pre-scan path); the scan path must produce the same frame.
+"""
+from __future__ import annotations
+
+import random
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from file_setup import setup
+from file_setup.setup_constants import FILTER_CONFIG
+
+TYPES = [
+    "Legendary Creature — Elf Druid", "Creature — Goblin", "Creature — Human — Odd", "Artifact Creature",
+    "Legendary Enchantment — Background", "Basic Land — Plains", "Plane — Dominaria", "pLAnE — sECreT LaIR",
+    "Scheme", "Instant", "Legendary Planeswalker — Jace", "Enchantment Creature — Nymph", None,
+]
+TEXTS = ["", "Flying", "Grizzlegom can be your commander.", "CAN BE YOUR COMMANDER", None]
+PRINTINGS = ["LEA, M21", "UST, LEA", "UST", "", " , RNA", "PHTR", "C21,  KHM ,", None]
+
+
+def _raw_frame(seed: int = 3) -> pd.DataFrame:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(400):
+        name = f"Card {rng.randint(0, 150):03d}"
+        rows.append({
+            "name": name,
+            "faceName": rng.choice([None, name, f"{name} Back"]),
+            "edhrecRank": rng.choice([None, float(rng.randint(1, 20000))]),
+            "colorIdentity": rng.choice([None, "G", "W, U"]),
+            "colors": rng.choice([None, "G"]),
+            "manaCost": "{1}{G}",
+            "manaValue": 2.0,
+            "type": rng.choice(TYPES),
+            "layout": rng.choice(["normal", "transform", "reversible_card", None]),
+            "text": rng.choice(TEXTS),
+            "power": "1", "toughness": "1", "loyalty": None, "keywords": None,
+            "side": rng.choice([None, "a", "b"]),
+            "printings": rng.choice(PRINTINGS),
+            "availability": rng.choice(["mtgo, paper", "arena", "PAPER", None]),
+            "promoTypes": rng.choice([None, "playtest", "boosterfun"]),
+            "securityStamp": rng.choice([None, "oval", "heart", "Acorn"]),
+            "uuid": f"u-{i}", "artist": "Someone",
+        })
+    return pd.DataFrame(rows)
+
+
+@pytest.fixture
+def raw_path(tmp_path, monkeypatch):
+    monkeypatch.setattr(setup, "_load_banned_cards", lambda: ["Card 007"])
+    monkeypatch.setattr(setup, "_load_commander_illegal_cards", lambda: ["card 011 back"])
+    path = tmp_path / "cards.parquet"
+    _raw_frame().to_parquet(path, index=False, row_group_size=64)
+    return path
+
+
+def test_scan_matches_full_read(raw_path, tmp_path, monkeypatch):
+    scanned = setup.process_raw_parquet(str(raw_path), str(tmp_path / "scan" / "all_cards.parquet"))
+
+    def _full_read(path):
+        return pd.read_parquet(path), set(FILTER_CONFIG) | {"printings", "type"}
+
+    monkeypatch.setattr(setup, "_scan_raw_parquet", _full_read)
+    reference = setup.process_raw_parquet(str(raw_path), str(tmp_path / "ref" / "all_cards.parquet"))
+    assert len(scanned) > 0
+    pd.testing.assert_frame_equal(scanned.reset_index(drop=True), reference.reset_index(drop=True))
+
+
+def test_scan_projects_needed_columns(raw_path):
+    df, pending = setup._scan_raw_parquet(str(raw_path))
+    assert "uuid" not in df.columns and "artist" not in df.columns
+    assert pending == set()
+    assert not df["type"].fillna("").str.contains("Plane —", case=False).any()
+    assert df["availability"].str.contains("paper", case=False).all()
+
+
+def test_derived_columns_match_row_helpers():
+    df = _raw_frame(5)
+    df.loc[0, "type"] = np.nan
+    derived = setup.derive_card_columns(df)
+    assert derived["creatureTypes"].tolist() == df.apply(setup.extract_creature_types, axis=1).tolist()
+    assert derived["isCommander"].tolist() == df.apply(setup.is_valid_commander, axis=1).tolist()
+    assert derived["isBackground"].tolist() == df.apply(setup.is_background, axis=1).tolist()
+    expected_counts = df["printings"].fillna("").apply(lambda x: len([s for s in x.split(",") if s.strip()]))
+    assert derived["printingCount"].tolist() == expected_counts.tolist()
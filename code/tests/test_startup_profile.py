@@ -0,0 +1,79 @@
+"""Tests for the startup timeline and background warmup scheduler."""
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from code.web.services.startup_profile import StartupTimeline, WarmupScheduler
+
+
+def test_timeline_records_spans_and_failures():
+    timeline = StartupTimeline()
+    with timeline.span("import", "routes.a"):
+        pass
+    with pytest.raises(ValueError):
+        with timeline.span("warm", "boom"):
+            raise ValueError("bad")
+    snap = timeline.snapshot()
+    names = [(e["kind"], e["name"], e["ok"]) for e in snap["events"]]
+    assert names == [("import", "routes.a", True), ("warm", "boom", False)]
+    assert "ValueError" in snap["events"][1]["error"]
+    assert set(snap["totals_ms"]) == {"import", "warm"}
+
+
+def test_scheduler_runs_independent_steps_concurrently():
+    timeline = StartupTimeline()
+    scheduler = WarmupScheduler(timeline, max_workers=3)
+    barrier = threading.Barrier(3, timeout=5)
+    for name in ("a", "b", "c"):
+        scheduler.add(name, barrier.wait)
+    scheduler.start()
+    assert scheduler.wait(timeout=5)
+    snap = scheduler.snapshot()
+    assert snap["ready"] is True
+    assert {t["state"] for t in snap["tasks"].values()} == {"done"}
+
+
+def test_scheduler_honours_after_and_isolates_failures():
+    timeline = StartupTimeline()
+    scheduler = WarmupScheduler(timeline, max_workers=4)
+    order: list[str] = []
+
+    def step(name, fail=False):
+        def run():
+            time.sleep(0.01)
+            order.append(name)
+            if fail:
+                raise RuntimeError(name)
+        return run
+
+    scheduler.add("catalog", step("catalog", fail=True))
+    scheduler.add("page", step("page"), after=("catalog",))
+    scheduler.add("other", step("other"))
+    assert scheduler.ready is False
+    scheduler.run_blocking()
+    assert scheduler.ready is True
+    assert order.index("catalog") < order.index("page")
+    tasks = scheduler.snapshot()["tasks"]
+    assert tasks["catalog"]["state"] == "failed"
+    assert tasks["page"]["state"] == "done"
+    assert tasks["page"]["duration_ms"] is not None
+
+
+def test_healthz_reports_readiness_and_status_sys_timeline(monkeypatch):
+    from starlette.testclient import TestClient
+    import code.web.app as app_module
+
+    monkeypatch.setattr(app_module, "WEB_WARMUP_WORKERS", 0)
+    with TestClient(app_module.app) as client:
+        health = client.get("/healthz").json()
+        assert health["status"] == "ok"
+        assert health["ready"] is True
+        assert client.get("/healthz/ready").status_code == 200
+        startup = client.get("/status/sys").json()["startup"]
+    imports = [e["name"] for e in startup["events"] if e["kind"] == "import"]
+    assert "routes.build" in imports
+    assert startup["warmup"]["ready"] is True
+    assert "card_index" in startup["warmup"]["tasks"]
@@ -0,0 +1,119 @@
+"""Tests for the persisted tag index artifact and its web-tier consumers."""
+from __future__ import annotations
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from code.tagging.tag_index_artifact import (
+    build_tag_index_artifact,
+    emit_tag_index_artifact,
+    load_tag_index_artifact,
+    write_tag_index_artifact,
+)
+
+
+@pytest.fixture
+def cards_df():
+    return pd.DataFrame(
+        {
+            "name": ["Sol Ring", "Llanowar Elves", "Doubling Season", "Plains", "Fable"],
+            "faceName": ["", "", "", "", "Fable of the Mirror-Breaker"],
+            "themeTags": [
+                ["Ramp", "Artifacts Matter"],
+                ["Ramp", "Elves", "Ramp"],
+                ["Tokens Matter", "Counters Matter"],
+                [],
+                ["Tokens Matter"],
+            ],
+            "colorIdentity": ["", "G", "G", "W", "R"],
+            "manaCost": ["{1}", "{G}", "{4}{G}", "", "{2}{R}"],
+            "rarity": ["uncommon", "common", "rare", "common", "mythic"],
+            "type": ["Artifact", "Creature — Elf Druid", "Enchantment", "Basic Land — Plains", "Enchantment — Saga"],
+        }
+    )
+
+
+@pytest.fixture
+def source_parquet(tmp_path, cards_df):
+    path = tmp_path / "all_cards.parquet"
+    cards_df.to_parquet(path, index=False)
+    return path
+
+
+def _legacy_pools(df: pd.DataFrame) -> dict[str, list[str]]:
+    pools: dict[str, list[str]] = {}
+    for _, row in df.iterrows():
+        for tag in dict.fromkeys(row["themeTags"]):
+            pools.setdefault(tag, []).append(row["name"])
+    return pools
+
+
+def test_build_matches_row_scan(cards_df):
+    artifact = build_tag_index_artifact(cards_df)
+    names = artifact.cards["name"].tolist()
+    pools = {tag: [names[r] for r in artifact.card_ids_for_tag(tag).tolist()] for tag in artifact.tags}
+    assert pools == _legacy_pools(cards_df)
+    assert artifact.tags == sorted(artifact.tags)
+    # Forward index keeps the card's own tag order (duplicates dropped)
+    assert artifact.tags_for_card(1) == ["Ramp", "Elves"]
+    assert artifact.tags_for_card(3) == []
+    assert artifact.tagged_rows().tolist() == [0, 1, 2, 4]
+    assert len(artifact.card_ids_for_tag("Nope")) == 0
+
+
+def test_round_trip_is_memory_mapped(tmp_path, cards_df, source_parquet):
+    out = tmp_path / "tag_index"
+    write_tag_index_artifact(build_tag_index_artifact(cards_df), directory=out, source_path=source_parquet)
+    loaded = load_tag_index_artifact(directory=out, source_path=source_parquet)
+    assert loaded is not None
+    assert isinstance(loaded.tag_cards, np.memmap)
+    assert loaded.card_ids_for_tag("Tokens Matter").tolist() == [2, 4]
+    assert loaded.cards.loc[4, "name"] == "Fable"
+
+
+def test_stale_source_is_rejected(tmp_path, cards_df, source_parquet):
+    out = tmp_path / "tag_index"
+    emit_tag_index_artifact(source_path=source_parquet, directory=out)
+
+    changed = cards_df.copy()
+    changed.at[0, "themeTags"] = ["Ramp"]
+    changed.to_parquet(source_parquet, index=False)
+    os.utime(source_parquet, ns=(1, 1))
+    assert load_tag_index_artifact(directory=out, source_path=source_parquet) is None
+
+
+def test_rewrite_without_tag_changes_is_accepted(tmp_path, cards_df, source_parquet):
+    out = tmp_path / "tag_index"
+    emit_tag_index_artifact(source_path=source_parquet, directory=out)
+
+    repriced = cards_df.copy()
+    repriced["price"] = 1.0
+    repriced.to_parquet(source_parquet, index=False)
+    os.utime(source_parquet, ns=(1, 1))
+    assert load_tag_index_artifact(directory=out, source_path=source_parquet) is not None
+
+
+def test_card_index_uses_artifact(monkeypatch, tmp_path, source_parquet):
+    from code.web.services import card_index
+
+    emit_tag_index_artifact(source_path=source_parquet, directory=tmp_path / "tag_index")
+    monkeypatch.setenv("CARD_FILES_PROCESSED_DIR", str(tmp_path))
+    monkeypatch.setattr(card_index, "_ARTIFACT", None)
+    monkeypatch.setattr(card_index, "_CARD_INDEX_MTIME", None)
+    for attr in ("_CARD_INDEX", "_NAME_INDEX", "_CARD_RECORDS", "_ROW_BY_NAME"):
+        monkeypatch.setattr(card_index, attr, {})
+
+    card_index.maybe_build_index()
+    pool = card_index.get_tag_pool("Ramp")
+    assert [c["name"] for c in pool] == ["Sol Ring", "Llanowar Elves"]
+    elves = pool[1]
+    assert elves["tags"] == ["Ramp", "Elves"]
+    assert elves["color_identity_list"] == ["G"]
+    assert elves["pip_colors"] == ["G"]
+    # One shared dict per card across every tag pool
+    assert card_index.get_tag_pool("Elves")[0] is elves
+    assert card_index.lookup_card("llanowar elves") is elves
+    assert card_index.lookup_card("Plains") is None
@@ -0,0 +1,53 @@
+"""The sparse theme co-occurrence engine must reproduce the legacy nested-loop counts exactly."""
+from __future__ import annotations
+
+import math
+import random
+
+import pytest
+
+from code.scripts import extract_themes as et
+from code.scripts.build_theme_catalog import infer_synergies
+
+
+def _rows(seed: int, n: int = 600):
+    rng = random.Random(seed)
+    vocab = [f"Theme {i:02d}" for i in range(40)] + ["Zombie Kindred", "alpha", "Émigré"]
+    rows = [rng.sample(vocab, rng.choice([0, 1, 2, 3, 6, 12, 25])) for _ in range(n)]
+    # Duplicates, blanks and non-strings are ignored by both paths
+    rows.append(["Theme 01", "Theme 01", "", None, "Theme 02"])
+    return rows
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+def test_sparse_matches_legacy_counts_and_scores(seed):
+    rows = _rows(seed)
+    legacy_co, legacy_counts, legacy_total = et.compute_cooccurrence(rows, legacy=True)
+    co, counts, total = et.compute_cooccurrence(rows)
+
+    assert isinstance(co, et.ThemeCooccurrence)
+    assert (counts, total) == (legacy_counts, legacy_total)
+    assert dict(co.items()) == legacy_co
+    for anchor in list(legacy_co) + ["Missing Theme"]:
+        for kwargs in ({}, {"min_pmi": 0.0, "min_co": 5}):
+            assert et.cooccurrence_scores_for(anchor, co, counts, total, **kwargs) == \
+                et.cooccurrence_scores_for(anchor, legacy_co, legacy_counts, legacy_total, **kwargs)
+        analytics = {"co_map": co, "tag_counts": counts, "total_rows": total}
+        legacy_analytics = {"co_map": legacy_co, "tag_counts": legacy_counts, "total_rows": legacy_total}
+        assert infer_synergies(anchor, ["Theme 03"], [], analytics) == infer_synergies(anchor, ["Theme 03"], [], legacy_analytics)
+
+
+def test_scores_for_limit_and_edge_cases():
+    co, counts, total = et.compute_cooccurrence([["A", "B"], ["A", "C"], ["A", "B"], ["D"]])
+    # B and C tie on PMI with A; the higher co-occurrence count wins
+    assert co.scores_for("A", limit=1) == [("B", math.log2(4 * 2 / (3 * 2)), 2)]
+    assert "D" not in co and co.counts[co.index["D"]] == 1
+    assert len(co) == 3 and set(co) == {"A", "B", "C"}
+    empty, empty_counts, empty_total = et.compute_cooccurrence([])
+    assert (len(empty), empty_counts, empty_total) == (0, {}, 0)
+
+
+def test_legacy_flag_from_env(monkeypatch):
+    monkeypatch.setenv("THEME_COOCCURRENCE_LEGACY", "1")
+    co, _counts, _total = et.compute_cooccurrence([["A", "B"]])
+    assert type(co) is dict and co["A"] == {"B": 1}
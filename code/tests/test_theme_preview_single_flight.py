@@ -0,0 +1,263 @@
+"""Tests for precomputed theme rankings (sampling.py) and single-flight preview builds.
+
+`_reference_sample` is the previous per-card implementation of
+`sample_real_cards_for_theme`; the ranked path must return identical items.
+"""
+from __future__ import annotations
+
+import copy
+import random
+import threading
+import time
+
+import pytest
+
+from code.web.services import card_index, sampling, theme_preview
+from code.web.services.preview_cache import bust_preview_cache
+from code.web.services.theme_catalog_loader import load_index
+from code.web.services.sampling import (
+    RARITY_DIVERSITY_OVER_PENALTY,
+    ROLE_SATURATION_PENALTY,
+    SPLASH_OFF_COLOR_PENALTY,
+    _classify_role,
+    _commander_overlap_scale,
+    _deterministic_shuffle,
+    _score_card,
+    _seed_from,
+    parse_rarity_diversity_targets,
+    parse_splash_adaptive_scale,
+    rarity_weight_base,
+)
+from code.web.services.sampling_config import COMMANDER_THEME_MATCH_BONUS
+
+
+def _reference_sample(theme, limit, colors_filter, *, synergies, commander, pool, commander_card):
+    pool = copy.deepcopy(pool)
+    commander_colors = set(commander_card.get("color_identity", "")) if commander_card else set()
+    commander_tags = set(commander_card.get("tags", [])) if commander_card else set()
+    if colors_filter:
+        allowed = {c.strip().upper() for c in colors_filter.split(',') if c.strip()}
+        if allowed:
+            pool = [c for c in pool if set(c.get("color_identity", "")).issubset(allowed) or not c.get("color_identity")]
+    if commander_card and sampling.COMMANDER_COLOR_FILTER_STRICT and commander_colors:
+        allow_splash = len(commander_colors) >= 4
+        new_pool = []
+        for c in pool:
+            ci = set(c.get("color_identity", ""))
+            if not ci or ci.issubset(commander_colors):
+                new_pool.append(c)
+                continue
+            if allow_splash and len(ci - commander_colors) == 1:
+                c["_splash_off_color"] = True
+                new_pool.append(c)
+        pool = new_pool
+    seen, buckets = set(), {"payoff": [], "enabler": [], "support": [], "wildcard": []}
+    rarity_counts = {}
+    rarity_diversity = parse_rarity_diversity_targets()
+    synergy_set = set(synergies)
+    rarity_weight_cfg = rarity_weight_base()
+    splash_scale = parse_splash_adaptive_scale() if sampling.SPLASH_ADAPTIVE_ENABLED else None
+    commander_color_count = len(commander_colors) if commander_colors else 0
+    for raw in pool:
+        nm = raw.get("name")
+        if not nm or nm in seen:
+            continue
+        seen.add(nm)
+        tags = raw.get("tags", [])
+        role = _classify_role(theme, synergies, tags)
+        score = _score_card(theme, synergies, role, tags)
+        reasons = [f"role:{role}", f"synergy_overlap:{len(set(tags).intersection(synergies))}"]
+        if commander_card:
+            if theme in tags:
+                score += COMMANDER_THEME_MATCH_BONUS
+                reasons.append("commander_theme_match")
+            scaled = _commander_overlap_scale(commander_tags, tags, synergy_set)
+            if scaled:
+                score += scaled
+                reasons.append(f"commander_synergy_overlap:{len(commander_tags.intersection(synergy_set).intersection(tags))}:{round(scaled,2)}")
+            reasons.append("commander_bias")
+        rarity = raw.get("rarity") or ""
+        if rarity:
+            count_so_far = rarity_counts.get(rarity, 0)
+            inc = rarity_weight_cfg.get(rarity, 0.25) / (1 + 0.4 * count_so_far)
+            score += inc
+            rarity_counts[rarity] = count_so_far + 1
+            reasons.append(f"rarity_weight_calibrated:{rarity}:{round(inc,2)}")
+            if rarity_diversity and rarity in rarity_diversity:
+                hi = rarity_diversity[rarity][1]
+                if rarity_counts[rarity] > hi:
+                    score += RARITY_DIVERSITY_OVER_PENALTY
+                    reasons.append(f"rarity_diversity_overflow:{rarity}:{hi}:{RARITY_DIVERSITY_OVER_PENALTY}")
+        if raw.get("_splash_off_color"):
+            penalty = SPLASH_OFF_COLOR_PENALTY
+            if splash_scale and commander_color_count:
+                adaptive = round(penalty * splash_scale.get(commander_color_count, 1.0), 4)
+                score += adaptive
+                reasons.append(f"splash_off_color_penalty_adaptive:{commander_color_count}:{adaptive}")
+            else:
+                score += penalty
+                reasons.append(f"splash_off_color_penalty:{penalty}")
+        buckets[role].append({
+            "name": nm, "colors": list(raw.get("color_identity", "")), "roles": [role], "tags": tags,
+            "score": score, "reasons": reasons, "mana_cost": raw.get("mana_cost"), "rarity": rarity,
+            "color_identity_list": raw.get("color_identity_list", []), "pip_colors": raw.get("pip_colors", []),
+        })
+    seed = _seed_from(theme, commander)
+    for bucket in buckets.values():
+        _deterministic_shuffle(bucket, seed)
+        bucket.sort(key=lambda x: (-x["score"], x["name"]))
+    payoff, enabler, support, wildcard = (buckets[r] for r in ("payoff", "enabler", "support", "wildcard"))
+    t_pay = max(1, int(round(limit * 0.4)))
+    t_es = max(1, int(round(limit * 0.4)))
+    t_wild = max(0, limit - t_pay - t_es)
+    chosen = payoff[:t_pay] + (enabler + support)[:t_es] + wildcard[:t_wild]
+    for bucket in (payoff, enabler, support, wildcard):
+        for it in bucket:
+            if len(chosen) >= limit:
+                break
+            if it not in chosen:
+                chosen.append(it)
+    caps = {"payoff": 0.5, "enabler": 0.35, "support": 0.35, "wildcard": 0.25}
+    seen_roles = {k: 0 for k in caps}
+    for it in chosen:
+        r = it["roles"][0]
+        seen_roles[r] += 1
+        if seen_roles[r] > max(1, int(round(limit * caps[r]))):
+            it["score"] += ROLE_SATURATION_PENALTY
+            it["reasons"].append(f"role_saturation_penalty:{ROLE_SATURATION_PENALTY}")
+    return chosen[:limit]
+
+
+THEME = "Tokens"
+SYNERGIES = ["Tokens", "Sacrifice", "Aristocrats", "Lifegain", "Counters"]
+IDENTITIES = ["", "W", "B", "W, B", "WB", "WUBR", "WUBRG", "G", "R, G", "U"]
+
+
+def _pool(seed: int):
+    rng = random.Random(seed)
+    tags = SYNERGIES + ["Ramp", "Draw"]
+    pool = []
+    for i in range(300):
+        pool.append({
+            "name": f"Card {rng.randint(0, 220):03d}",
+            "tags": rng.sample(tags, rng.randint(0, 4)),
+            "color_identity": rng.choice(IDENTITIES),
+            "mana_cost": "{1}",
+            "rarity": rng.choice(["common", "uncommon", "rare", "mythic", ""]),
+            "color_identity_list": [],
+            "pip_colors": [],
+        })
+    return pool
+
+
+@pytest.fixture
+def indexed(monkeypatch):
+    commanders = {
+        "Four": {"name": "Four", "tags": ["Tokens", "Sacrifice", "Lifegain"], "color_identity": "WUBR"},
+        "Orzhov": {"name": "Orzhov", "tags": ["Aristocrats"], "color_identity": "WB"},
+    }
+    monkeypatch.setattr(sampling, "maybe_build_index", lambda: None)
+    monkeypatch.setattr(sampling, "lookup_commander", lambda name: commanders.get(name) if name else None)
+    monkeypatch.setattr(card_index, "_CARD_INDEX", {})
+    return commanders
+
+
+@pytest.mark.parametrize("seed", [1, 2, 3])
+@pytest.mark.parametrize("limit", [0, 1, 5, 12, 40])
+@pytest.mark.parametrize("colors", [None, "W,B", "G"])
+@pytest.mark.parametrize("commander", [None, "Four", "Orzhov"])
+def test_ranked_sampling_matches_reference(indexed, monkeypatch, seed, limit, colors, commander):
+    monkeypatch.setenv("RARITY_DIVERSITY_TARGETS", "mythic:0-1,rare:0-2")
+    monkeypatch.setattr(sampling, "SPLASH_ADAPTIVE_ENABLED", seed == 2)
+    pool = _pool(seed)
+    card_index._CARD_INDEX[THEME] = pool
+    expected = _reference_sample(
+        THEME, limit, colors, synergies=SYNERGIES, commander=commander,
+        pool=pool, commander_card=indexed.get(commander),
+    )
+    for _ in range(2):  # second call is served from the cached ranking
+        assert sampling.sample_real_cards_for_theme(THEME, limit, colors, synergies=SYNERGIES, commander=commander) == expected
+    assert not any("_splash_off_color" in c for c in pool)
+
+
+def test_ranking_rebuilt_when_pool_changes(indexed):
+    card_index._CARD_INDEX[THEME] = _pool(1)
+    first = sampling.sample_real_cards_for_theme(THEME, 12, None, synergies=SYNERGIES, commander=None)
+    card_index._CARD_INDEX[THEME] = [{"name": "Only", "tags": [THEME], "color_identity": "G", "rarity": "rare"}]
+    second = sampling.sample_real_cards_for_theme(THEME, 12, None, synergies=SYNERGIES, commander=None)
+    assert len(first) == 12
+    assert [c["name"] for c in second] == ["Only"]
+
+
+def _any_theme() -> str:
+    idx = load_index()
+    return next(iter(idx.slug_to_entry))
+
+
+def test_concurrent_misses_build_once(monkeypatch):
+    bust_preview_cache()
+    theme = _any_theme()
+    calls = []
+
+    def _slow_sample(theme, limit, colors, *, synergies, commander):
+        calls.append(theme)
+        time.sleep(0.2)
+        return []
+
+    monkeypatch.setattr(theme_preview, "sample_real_cards_for_theme", _slow_sample)
+    before = theme_preview.preview_metrics()["preview_coalesced_requests"]
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(theme_preview.get_theme_preview(theme, limit=40)))
+        for _ in range(6)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(10)
+    assert len(calls) == 1
+    assert len(results) == 6
+    assert sum(1 for r in results if not r["cache_hit"]) == 1
+    assert sum(1 for r in results if r.get("coalesced")) == 5
+    assert len({tuple(it["name"] for it in r["sample"]) for r in results}) == 1
+    assert theme_preview.preview_metrics()["preview_coalesced_requests"] - before == 5
+    assert not theme_preview._INFLIGHT
+    bust_preview_cache()
+
+
+def test_followers_build_when_leader_fails(monkeypatch):
+    bust_preview_cache()
+    theme = _any_theme()
+    entered, gate = threading.Event(), threading.Event()
+    calls = []
+
+    def _flaky_sample(theme, limit, colors, *, synergies, commander):
+        calls.append(theme)
+        if len(calls) == 1:
+            entered.set()
+            gate.wait(5)
+            raise RuntimeError("boom")
+        return []
+
+    monkeypatch.setattr(theme_preview, "sample_real_cards_for_theme", _flaky_sample)
+    errors, results = [], []
+
+    def _run():
+        try:
+            results.append(theme_preview.get_theme_preview(theme, limit=40))
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    leader = threading.Thread(target=_run)
+    leader.start()
+    assert entered.wait(5)
+    follower = threading.Thread(target=_run)
+    follower.start()
+    time.sleep(0.05)
+    gate.set()
+    leader.join(10)
+    follower.join(10)
+    assert len(errors) == 1 and len(results) == 1
+    assert results[0]["cache_hit"] is False
+    assert len(calls) == 2
+    bust_preview_cache()
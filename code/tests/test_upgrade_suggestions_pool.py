@@ -0,0 +1,154 @@
+"""Parity tests for the cached, vectorized card pool behind UpgradeSuggestionsService.
+
+The reference functions below are condensed versions of the previous
+row-wise (``apply`` / ``iterrows``) implementations; the mask-based pool must
+pick, order and score the same cards.
+"""
+from __future__ import annotations
+
+import math
+import os
+import random
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+
+from code.web.services import upgrade_suggestions_service as svc_mod
+from code.web.services.upgrade_suggestions_service import (
+    UpgradeSuggestionsService,
+    _DEFAULT_IDEAL_ROLE_TAGS,
+    _is_land_type,
+    _parse_tags,
+    _str_val,
+)
+
+_MODULE = "code.web.services.upgrade_suggestions_service"
+_TAGS = ["Ramp", "Card Draw", "Removal", "Tokens", "Lifegain", "Spellslinger", "Blink", "Board Wipes"]
+
+
+def _fixture_df(seed: int = 3) -> pd.DataFrame:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(300):
+        tags = rng.sample(_TAGS, rng.randint(0, 3))
+        rows.append({
+            "name": f"Card {i % 280:03d}",
+            "faceName": f"Face {i}" if i % 17 == 0 else None,
+            "type": rng.choice(["Creature — Elf", "Instant", "Land", "Basic Land — Forest", "Artifact"]),
+            "colorIdentity": rng.choice(["", "G", "R", "G, R", "U", "W, U, B"]),
+            "manaValue": float(rng.randint(0, 6)),
+            "themeTags": [t.lower() if i % 11 == 0 else t for t in tags],
+            "printings": rng.choice(["AAA", "AAA, BBB", ""]),
+            "isNew": rng.random() < 0.4,
+            "edhrecRank": float(i * 37 % 997) if i % 7 else float("nan"),
+            "price": rng.choice([0.5, 1.5, 3.0, 7.0, 30.0, None]),
+        })
+    return pd.DataFrame(rows)
+
+
+def _base(df, deck_names, colors):
+    df = df[~df["type"].apply(_is_land_type)]
+    allowed = set(colors)
+    df = df[df["colorIdentity"].apply(
+        lambda s: not _str_val(s) or {c.strip() for c in _str_val(s).split(",") if c.strip()} <= allowed
+    )]
+    lower = {n.lower() for n in deck_names}
+    return df[~df.apply(
+        lambda r: _str_val(r["faceName"]).lower() in lower or _str_val(r["name"]).lower() in lower, axis=1
+    )]
+
+
+def _quality(rank) -> float:
+    rank_f = 30000.0 if str(rank) == "nan" else float(rank)
+    return 1.0 / math.log10(rank_f + 10)
+
+
+def _ref_new_pool(df, colors, deck_themes, deck_names):
+    df = _base(df[df["isNew"]], deck_names, colors)
+    allowed = {t.lower() for t in deck_themes} | {t.lower() for t in _DEFAULT_IDEAL_ROLE_TAGS}
+    df = df[df["themeTags"].apply(lambda raw: len({t.lower() for t in _parse_tags(raw)} & allowed) >= 1)]
+    df = df.sort_values("edhrecRank", na_position="last", kind="stable")
+    out, seen = [], set()
+    for _, row in df.iterrows():
+        name = _str_val(row["faceName"]) or _str_val(row["name"])
+        if name in seen:
+            continue
+        seen.add(name)
+        matched = [t for t in _parse_tags(row["themeTags"]) if t.lower() in allowed]
+        out.append((name, matched, round(2.0 * len(matched) + _quality(row["edhrecRank"]), 1)))
+    return out
+
+
+def _ref_general(df, colors, deck_names, themes, role_counts):
+    df = _base(df[~df["isNew"]], deck_names, colors).copy()
+    generalized = {t.lower() for t in _DEFAULT_IDEAL_ROLE_TAGS}
+    synergy = {t.lower() for t in themes} - generalized
+    gaps = {r.lower() for r, c in role_counts.items() if c < 5 and r.lower() in generalized}
+
+    def _score(row):
+        tags = {t.lower() for t in _parse_tags(row["themeTags"])}
+        return (2.0 * len(generalized & tags) + 1.0 * len(synergy & tags)
+                + 1.5 * len(gaps & tags) + _quality(row["edhrecRank"]))
+
+    df["_score"] = df.apply(_score, axis=1)
+    df = df.sort_values("_score", ascending=False, kind="stable")
+    return [
+        (_str_val(r["faceName"]) or _str_val(r["name"]), round(r["_score"], 1))
+        for _, r in df.head(40).iterrows()
+    ]
+
+
+@pytest.fixture
+def parquet(tmp_path):
+    path = tmp_path / "all_cards.parquet"
+    _fixture_df().to_parquet(path)
+    return str(path)
+
+
+@pytest.mark.parametrize("colors", [["G"], ["G", "R"], ["W", "U", "B"], []])
+def test_new_card_pool_matches_row_wise(parquet, tmp_path, colors):
+    df = pd.read_parquet(parquet)
+    deck = {"card 010", "Face 34", "Card 100"}
+    svc = UpgradeSuggestionsService(bulk_data_path=str(tmp_path / "none.json"))
+    with patch(f"{_MODULE}.get_processed_cards_path", return_value=parquet):
+        got = svc.get_new_card_pool(colors, deck_themes=["Tokens"], deck_card_names=deck, max_pool=0)
+    expected = _ref_new_pool(df, colors, ["Tokens"], deck)
+    with patch(f"{_MODULE}.get_processed_cards_path", return_value=parquet):
+        undeduped = svc.get_new_card_pool(
+            colors, deck_themes=["Tokens"], deck_card_names=deck, max_pool=0,
+            max_per_niche_theme=1000, max_per_niche_util=1000,
+        )
+    expected_sorted = sorted(expected, key=lambda t: t[2], reverse=True)
+    assert [(c.name, c.matched_tags, c.fit_score) for c in undeduped] == expected_sorted
+    # Niche dedup keeps a fit-score-ordered subsequence of the full pool.
+    full = iter([c.name for c in undeduped])
+    assert all(name in full for name in [c.name for c in got])
+
+
+@pytest.mark.parametrize("colors", [["G"], ["G", "R"], ["W", "U", "B"]])
+def test_general_suggestions_match_row_wise(parquet, tmp_path, colors):
+    df = pd.read_parquet(parquet)
+    deck = {"Card 001", "face 51"}
+    themes, role_counts = ["Tokens", "Ramp"], {"Ramp": 9, "Card Draw": 1}
+    svc = UpgradeSuggestionsService(bulk_data_path=str(tmp_path / "none.json"))
+    with patch(f"{_MODULE}.get_processed_cards_path", return_value=parquet):
+        got = svc.get_general_suggestions(deck, colors, themes, role_counts, max_per_tier=40)
+    cards = got.get("General Upgrades", [])
+    assert [(c.name, c.fit_score) for c in cards] == _ref_general(df, colors, deck, themes, role_counts)
+
+
+def test_pool_is_cached_per_data_version(parquet, tmp_path):
+    svc = UpgradeSuggestionsService(bulk_data_path=str(tmp_path / "none.json"))
+    with patch(f"{_MODULE}.get_processed_cards_path", return_value=parquet):
+        with patch(f"{_MODULE}.pd.read_parquet", wraps=pd.read_parquet) as reads:
+            svc.get_new_card_pool(["G"], today=None)
+            svc.get_general_suggestions(set(), ["G"], [], {})
+            assert reads.call_count <= 1
+            pool = svc_mod._load_card_pool(parquet)
+
+            df = _fixture_df(seed=4).head(50)
+            df.to_parquet(parquet)
+            os.utime(parquet, ns=(1, 1))
+            assert svc_mod._load_card_pool(parquet) is not pool
+            assert svc_mod._load_card_pool(parquet).size == int((~df["type"].apply(_is_land_type)).sum())
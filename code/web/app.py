@@ -6,6 +6,7 @@ from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 import os
+import importlib
 import json as _json
 import time
 import uuid
@@ -26,6 +27,7 @@ from .services.tasks import get_session, new_sid, set_session_value
 from .services.user_db import init_db, ensure_guest_user
 from .services.audit_db import init_audit_db
 from .services.auth import AuthMiddleware
+from .services.startup_profile import StartupTimeline, WarmupScheduler
 from code.exceptions import DeckBuilderError
 from code.settings import CORS_ALLOWED_ORIGINS
 from .utils.responses import deck_builder_error_response
@@ -33,11 +35,91 @@ from .utils.responses import deck_builder_error_response
 # Logger for app-level logging
 logger = logging.getLogger(__name__)
 
+# Startup profiling: router imports + warm steps (reported on /status/sys)
+_STARTUP_TIMELINE = StartupTimeline()
+_WARMUP: Optional[WarmupScheduler] = None
+
 # Resolve template/static dirs relative to this file
 _THIS_DIR = Path(__file__).resolve().parent
 _TEMPLATES_DIR = _THIS_DIR / "templates"
 _STATIC_DIR = _THIS_DIR / "static"
 
+def _warm_card_index() -> None:
+    # Warm preview card index once (updated Phase A: moved to card_index module)
+    from .services.card_index import maybe_build_index
+    maybe_build_index()
+
+
+def _warm_card_browser_index() -> None:
+    # Warm card browser theme catalog (fast JSON read) and theme index (tag index artifact)
+    from .routes.card_browser import get_theme_catalog, get_theme_index
+    get_theme_catalog()  # Fast: just reads theme_list.json
+    get_theme_index()    # Reads the tagging-time tag index artifact when fresh
+
+
+def _warm_card_search_index() -> None:
+    # Precompute the columnar search features (color masks, mana pips, tag CSRs)
+    # for the card browser frame so the first structured search skips the build
+    from .routes.card_browser import get_loader
+    from .services.card_search import register_search_frame
+    index = register_search_frame(get_loader().load())
+    for column in ("colors", "colorIdentity"):
+        if column in index.columns:
+            index.color_bits(column)
+    if "manaCost" in index.columns:
+        index.mana()
+    if "themeTags" in index.columns:
+        index.tag_family("themeTags")
+
+
+def _warm_similarity() -> None:
+    # Warm CardSimilarity singleton (if card details enabled) - runs after theme index loads cards
+    from code.settings import ENABLE_CARD_DETAILS
+    if ENABLE_CARD_DETAILS:
+        from .routes.card_browser import get_similarity
+        get_similarity()  # Pre-initialize singleton (one-time cost: ~2-3s)
+
+
+def _warm_price_cache() -> None:
+    # Warm up price cache so first deck view request is fast
+    from .services.price_service import get_price_service as _get_ps
+    _get_ps()._ensure_loaded()
+
+
+def _warm_ck_price_cache() -> None:
+    from .services.price_service import get_price_service as _get_ps
+    _get_ps()._ensure_ck_loaded()
+
+
+def _warm_deck_catalog() -> None:
+    # Reconcile the deck catalog with deck_files/ (picks up decks added out-of-band)
+    from .services.deck_catalog import reconcile
+    reconcile()
+
+
+def _build_warmup_scheduler() -> WarmupScheduler:
+    """Register the lifespan warm steps; `after` only where one step reuses another's cache."""
+    scheduler = WarmupScheduler(_STARTUP_TIMELINE, max_workers=WEB_WARMUP_WORKERS or 1)
+    # Warm commander + theme catalogs so the first commander catalog request skips disk reads
+    scheduler.add("commander_catalog", load_commander_catalog)
+    scheduler.add("theme_index", load_index)
+    # Prewarm theme filter cache (guarded internally by env flag)
+    scheduler.add("theme_filters", prewarm_common_filters, after=("theme_index",))
+    scheduler.add(
+        "commanders_default_page",
+        lambda: commanders_routes.prewarm_default_page(),
+        after=("commander_catalog", "theme_index"),
+    )
+    scheduler.add("card_index", _warm_card_index)
+    scheduler.add("card_browser_index", _warm_card_browser_index)
+    scheduler.add("card_similarity", _warm_similarity, after=("card_browser_index",))
+    scheduler.add("card_search_index", _warm_card_search_index, after=("card_browser_index",))
+    scheduler.add("price_cache", _warm_price_cache)
+    scheduler.add("ck_price_cache", _warm_ck_price_cache)
+    scheduler.add("deck_catalog", _warm_deck_catalog)
+    return scheduler
+
+
 @asynccontextmanager
 async def _lifespan(app: FastAPI):  # pragma: no cover - simple infra glue
     """FastAPI lifespan context replacing deprecated on_event startup hooks.
@@ -45,66 +127,29 @@ async def _lifespan(app: FastAPI):  # pragma: no cover - simple infra glue
     Consolidates previous startup tasks:
       - prewarm_common_filters (optional fast filter cache priming)
       - theme preview card index warm (CSV parse avoidance for first preview)
+      - commander / theme catalogs, card browser index, similarity, price caches
+
+    Only the user DB init runs before the app accepts traffic. The warm steps
+    run on a background `WarmupScheduler` (independent steps concurrently);
+    `/healthz` reports readiness once they finish. WEB_WARMUP_WORKERS=0 keeps
+    the old behaviour of warming serially before serving.
 
     Failures in warm tasks are intentionally swallowed to avoid blocking app start.
     """
+    global _WARMUP
     # Initialise SQLite user store and ensure guest account exists
     try:
-        init_db()
-        ensure_guest_user()
-        init_audit_db()
+        with _STARTUP_TIMELINE.span("init", "user_db"):
+            init_db()
+            ensure_guest_user()
+            init_audit_db()
     except Exception:
         logger.exception("user_db: startup init failed — auth will not work")
-    # Prewarm theme filter cache (guarded internally by env flag)
-    try:
-        prewarm_common_filters()
-    except Exception:
-        pass
-    # Warm commander + theme catalogs so the first commander catalog request skips disk reads
-    try:
-        load_commander_catalog()
-    except Exception:
-        pass
-    try:
-        load_index()
-    except Exception:
-        pass
-    try:
-        commanders_routes.prewarm_default_page()
-    except Exception:
-        pass
-    # Warm preview card index once (updated Phase A: moved to card_index module)
-    try:  # local import to avoid cost if preview unused
-        from .services.card_index import maybe_build_index
-        maybe_build_index()
-    except Exception:
-        pass
-    # Warm card browser theme catalog (fast JSON read) and theme index (slower card parsing)
-    try:
-        from .routes.card_browser import get_theme_catalog, get_theme_index
-        get_theme_catalog()  # Fast: just reads theme_list.json
-        get_theme_index()    # Slower: parses cards for theme-to-card mapping
-    except Exception:
-        pass
-    # Warm CardSimilarity singleton (if card details enabled) - runs after theme index loads cards
-    try:
-        from code.settings import ENABLE_CARD_DETAILS
-        if ENABLE_CARD_DETAILS:
-            from .routes.card_browser import get_similarity
-            get_similarity()  # Pre-initialize singleton (one-time cost: ~2-3s)
-    except Exception:
-        pass
-    # Warm up price cache in background so first deck view request is fast
-    try:
-        import threading as _threading
-        from .services.price_service import get_price_service as _get_ps
-        _ps = _get_ps()
-        _t = _threading.Thread(target=_ps._ensure_loaded, daemon=True, name="price-cache-warmup")
-        _t.start()
-        _t2 = _threading.Thread(target=_ps._ensure_ck_loaded, daemon=True, name="ck-price-cache-warmup")
-        _t2.start()
-    except Exception:
-        pass
+    _WARMUP = _build_warmup_scheduler()
+    if WEB_WARMUP_WORKERS > 0:
+        _WARMUP.start()
+    else:
+        _WARMUP.run_blocking()
     # Start price auto-refresh scheduler (optional, 1 AM UTC daily)
     if PRICE_AUTO_REFRESH:
         try:
@@ -291,6 +336,8 @@ RATE_LIMIT_SUGGEST = _as_int(os.getenv("RANDOM_RATE_LIMIT_SUGGEST"), 30)
 RANDOM_STRUCTURED_LOGS = _as_bool(os.getenv("RANDOM_STRUCTURED_LOGS"), False)
 RANDOM_REROLL_THROTTLE_MS = _as_int(os.getenv("RANDOM_REROLL_THROTTLE_MS"), 350)
 USER_THEME_LIMIT = _as_int(os.getenv("USER_THEME_LIMIT"), 8)
+# Background warmup pool size; 0 warms serially before the app serves requests
+WEB_WARMUP_WORKERS = max(0, _as_int(os.getenv("WEB_WARMUP_WORKERS"), 4))
 ENABLE_PREFETCH = _as_bool(os.getenv("WEB_PREFETCH"), False)
 SHOW_NEW_BADGE = _as_bool(os.getenv("SHOW_NEW_BADGE"), True)
 ENABLE_UPGRADE_SUGGESTIONS = _as_bool(os.getenv("ENABLE_UPGRADE_SUGGESTIONS"), True)
@@ -1055,16 +1102,31 @@ async def components_library(request: Request) -> HTMLResponse:
 
 
 # Simple health check (hardened)
+# Liveness is `status`; `ready` flips once background warmup has finished.
 @app.get("/healthz")
 async def healthz():
     try:
         version = os.getenv("APP_VERSION", "dev")
         uptime_s = int(time.time() - _APP_START_TIME)
-        return {"status": "ok", "version": version, "uptime_seconds": uptime_s}
+        payload: Dict[str, Any] = {"status": "ok", "version": version, "uptime_seconds": uptime_s}
+        payload["ready"] = _WARMUP.ready if _WARMUP is not None else False
+        if _WARMUP is not None and not payload["ready"]:
+            payload["warming"] = _WARMUP.snapshot()["pending"]
+        return payload
     except Exception:
         # Avoid throwing from health
         return {"status": "degraded"}
 
+
+# Readiness probe: 503 until warm steps finish (use for load balancer gating)
+@app.get("/healthz/ready")
+async def healthz_ready():
+    ready = _WARMUP.ready if _WARMUP is not None else False
+    body = {"ready": ready}
+    if _WARMUP is not None and not ready:
+        body["warming"] = _WARMUP.snapshot()["pending"]
+    return JSONResponse(body, status_code=200 if ready else 503)
+
 # System summary endpoint for diagnostics
 @app.get("/status/sys")
 async def status_sys():
@@ -1105,6 +1167,10 @@ async def status_sys():
                 "RANDOM_RATE_LIMIT_SUGGEST": int(RATE_LIMIT_SUGGEST),
                 "RANDOM_REROLL_THROTTLE_MS": int(RANDOM_REROLL_THROTTLE_MS),
             },
+            "startup": {
+                **_STARTUP_TIMELINE.snapshot(),
+                "warmup": _WARMUP.snapshot() if _WARMUP is not None else None,
+            },
         }
     except Exception:
         return {"version": "unknown", "uptime_seconds": 0, "flags": {}}
@@ -1163,6 +1229,32 @@ async def status_theme_metrics():
         return JSONResponse({"ok": False, "error": "internal_error"}, status_code=500)
 
 
+@app.get("/status/search_cache_metrics")
+async def status_search_cache_metrics():
+    if not SHOW_DIAGNOSTICS:
+        raise HTTPException(status_code=404, detail="Not Found")
+    try:
+        from code.web.services.search_result_cache import search_cache_metrics
+
+        return JSONResponse({"ok": True, "metrics": search_cache_metrics()})
+    except Exception as exc:  # pragma: no cover - defensive log
+        logging.getLogger("web").warning("Failed to fetch search cache metrics: %s", exc, exc_info=True)
+        return JSONResponse({"ok": False, "error": "internal_error"}, status_code=500)
+
+
+@app.get("/status/build_stage_timings")
+async def status_build_stage_timings():
+    if not SHOW_DIAGNOSTICS:
+        raise HTTPException(status_code=404, detail="Not Found")
+    try:
+        from deck_builder.build_timing import enabled as timings_enabled, stage_stats
+
+        return JSONResponse({"ok": True, "enabled": timings_enabled(), "stages": stage_stats()})
+    except Exception as exc:  # pragma: no cover - defensive log
+        logging.getLogger("web").warning("Failed to fetch build stage timings: %s", exc, exc_info=True)
+        return JSONResponse({"ok": False, "error": "internal_error"}, status_code=500)
+
+
 @app.get("/status/partner_metrics")
 async def status_partner_metrics():
     if not SHOW_DIAGNOSTICS:
@@ -2481,37 +2573,44 @@ async def setup_status():
 
 
 # Routers
-from .routes import build as build_routes  # noqa: E402
-from .routes import build_validation as build_validation_routes  # noqa: E402
-from .routes import build_multicopy as build_multicopy_routes  # noqa: E402
-from .routes import build_include_exclude as build_include_exclude_routes  # noqa: E402
-from .routes import build_themes as build_themes_routes  # noqa: E402
-from .routes import build_partners as build_partners_routes  # noqa: E402
-from .routes import build_wizard as build_wizard_routes  # noqa: E402
-from .routes import build_newflow as build_newflow_routes  # noqa: E402
-from .routes import build_alternatives as build_alternatives_routes  # noqa: E402
-from .routes import build_compliance as build_compliance_routes  # noqa: E402
-from .routes import build_permalinks as build_permalinks_routes  # noqa: E402
-from .routes import manual_builder as manual_builder_routes  # noqa: E402
-from .routes import decks as decks_routes  # noqa: E402
-from .routes.decks import _deck_dir as _decks_deck_dir, _user_id as _decks_user_id  # noqa: E402
-from .routes import upgrade_suggestions as upgrade_suggestions_routes  # noqa: E402
-from .routes import setup as setup_routes  # noqa: E402
-from .routes import owned as owned_routes  # noqa: E402
-from .routes import themes as themes_routes  # noqa: E402
-from .routes import commanders as commanders_routes  # noqa: E402
-from .routes import deck_import as deck_import_routes  # noqa: E402
-from .routes import partner_suggestions as partner_suggestions_routes  # noqa: E402
-from .routes import telemetry as telemetry_routes  # noqa: E402
-from .routes import cards as cards_routes  # noqa: E402
-from .routes import card_browser as card_browser_routes  # noqa: E402
-from .routes import compare as compare_routes  # noqa: E402
-from .routes import api as api_routes  # noqa: E402
-from .routes import price as price_routes  # noqa: E402
-from .routes import docs as docs_routes  # noqa: E402
-from .routes import auth as auth_routes  # noqa: E402
-from .routes import admin as admin_routes  # noqa: E402
-from .routes.api_v1.app import api_v1_app  # noqa: E402
+# Route modules must be imported eagerly so their routes are registered; each
+# import is timed so /status/sys shows which ones dominate start-up.
+def _import_route(name: str):
+    with _STARTUP_TIMELINE.span("import", f"routes.{name}"):
+        return importlib.import_module(f".routes.{name}", __package__)
+
+
+build_routes = _import_route("build")
+build_validation_routes = _import_route("build_validation")
+build_multicopy_routes = _import_route("build_multicopy")
+build_include_exclude_routes = _import_route("build_include_exclude")
+build_themes_routes = _import_route("build_themes")
+build_partners_routes = _import_route("build_partners")
+build_wizard_routes = _import_route("build_wizard")
+build_newflow_routes = _import_route("build_newflow")
+build_alternatives_routes = _import_route("build_alternatives")
+build_compliance_routes = _import_route("build_compliance")
+build_permalinks_routes = _import_route("build_permalinks")
+manual_builder_routes = _import_route("manual_builder")
+decks_routes = _import_route("decks")
+_decks_deck_dir, _decks_user_id = decks_routes._deck_dir, decks_routes._user_id
+upgrade_suggestions_routes = _import_route("upgrade_suggestions")
+setup_routes = _import_route("setup")
+owned_routes = _import_route("owned")
+themes_routes = _import_route("themes")
+commanders_routes = _import_route("commanders")
+deck_import_routes = _import_route("deck_import")
+partner_suggestions_routes = _import_route("partner_suggestions")
+telemetry_routes = _import_route("telemetry")
+cards_routes = _import_route("cards")
+card_browser_routes = _import_route("card_browser")
+compare_routes = _import_route("compare")
+api_routes = _import_route("api")
+price_routes = _import_route("price")
+docs_routes = _import_route("docs")
+auth_routes = _import_route("auth")
+admin_routes = _import_route("admin")
+api_v1_app = _import_route("api_v1.app").api_v1_app
 app.include_router(build_routes.router)
 app.include_router(build_validation_routes.router, prefix="/build")
 app.include_router(build_multicopy_routes.router, prefix="/build")
@@ -2548,7 +2647,8 @@ app.mount("/api/v1", api_v1_app)
 
 # Warm validation cache early to reduce first-call latency in tests and dev
 try:
-    build_validation_routes.warm_validation_name_cache()
+    with _STARTUP_TIMELINE.span("warm", "validation_name_cache"):
+        build_validation_routes.warm_validation_name_cache()
 except Exception:
     pass
 
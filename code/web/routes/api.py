@@ -281,12 +281,9 @@ async def get_card_image(
             if candidate_path.exists():
                 image_path = candidate_path
             else:
-                matches = [
-                    row for row in _image_cache.get_printings(face_name)
-                    if str(row.get("scryfall_id")) == effective_printing
-                ]
-                if matches:
-                    image_url = matches[0].get(f"image_url_{size}") or matches[0].get("image_url_normal")
+                match = _image_cache.get_printing(face_name, effective_printing)
+                if match:
+                    image_url = match.get(f"image_url_{size}") or match.get("image_url_normal")
                     if image_url and _image_cache._download_image(image_url, candidate_path):
                         image_path = candidate_path
 
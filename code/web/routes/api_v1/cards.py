@@ -16,7 +16,6 @@ from __future__ import annotations
 import asyncio
 import logging
 import math
-import re
 import time
 import uuid
 from pathlib import Path
@@ -40,17 +39,22 @@ from ...services.card_search import (
     apply_mana_cost_clauses as _apply_mana_cost_clauses,
     apply_name_clauses as _apply_name_clauses,
     apply_numeric_clauses as _apply_numeric_clauses,
+    apply_set_clauses as _apply_set_clauses,
+    apply_tag_clauses as _apply_tag_clauses,
     apply_text_clauses as _apply_text_clauses,
+    color_subset_mask as _color_subset_mask,
     normalize_word_sep as _normalize_word_sep,
-    parse_color_cell as _parse_color_cell,
     parse_search_query as _parse_search_query,
     resolve_collector_number_printings as _resolve_collector_number_printings,
     get_set_scoped_collector_number_sort_map as _get_set_scoped_collector_number_sort_map,
     _collector_number_match_mask,
     _load_printings_index_df,
+    parsed_search_key as _parsed_search_key,
+    register_search_frame as _register_search_frame,
 )
 from ...services.card_similarity import CardSimilarity
 from ...services.rulings import get_rulings
+from ...services.search_result_cache import current_version as _current_version, get_search_cache as _get_search_cache
 from ...utils.api_response import err, ok
 
 logger = logging.getLogger(__name__)
@@ -273,43 +277,17 @@ def _serialize_card(
     return jsonable_encoder(data)
 
 
-@router.get("", summary="Search cards")
-async def list_cards(
-    request: Request,
-    q: str = Query(
-        "",
-        description=(
-            "Search box text. Plain words match the card name (default). "
-            "Also supports real Scryfall search keywords (see "
-            "https://scryfall.com/docs/syntax): c:/color:, id:/identity:, "
-            "t:/type:, o:/oracle:, m:/mana:, mv:/cmc:/manavalue:, pow:/power:, "
-            "tou:/toughness: -- each accepts :, =, >, <, >=, <=, or != and may be "
-            "negated with a leading -. Also supports tag:/theme: (theme tags), "
-            "art:/atag:/arttag: (Scryfall community illustration tags), "
-            "metadata:/mtag:/metatag: (internal deck-builder tags), and "
-            "set:/s:/e:/edition: (a set code like `khm` or a full set name "
-            "like `kaldheim`; ambiguous set names return a `notices` message "
-            "in the response listing alternatives). Note: bare "
-            "`id:br` matches anything playable "
-            "with a black/red identity (subset, incl. colorless), while `id=br` "
-            "matches only exact black/red; bare `color:br` matches cards including "
-            "at least black and red (superset), while `color=br` is exact-only. "
-            "e.g. `c:rg t:creature o:\"draw a card\" pow>=4`"
-        ),
-    ),
-    colors: str = Query("", description="Comma-separated colors, e.g. W,U -- cards whose color identity is a subset of these are matched; include C to also allow colorless"),
-    tags: str = Query("", description="Comma-separated theme tags (AND logic)"),
-    is_new: bool = Query(False, description="Only recently released cards"),
-    min_cmc: Optional[float] = Query(None, ge=0),
-    max_cmc: Optional[float] = Query(None, ge=0),
-    page: int = Query(1, ge=1),
-    page_size: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
-):
-    """Search/filter cards. Mirrors card_browser.py's filters, simplified for JSON I/O."""
-    df = _get_loader().load()
-
-    parsed = _parse_search_query(q) if q else ParsedSearch()
-
+def _filter_and_sort_cards(
+    df: pd.DataFrame,
+    parsed: ParsedSearch,
+    *,
+    requested_colors: set,
+    requested_tags: set,
+    is_new: bool,
+    min_cmc: Optional[float],
+    max_cmc: Optional[float],
+) -> pd.DataFrame:
+    """Every `list_cards` filter plus its default sort. May append to `parsed.notices`."""
     df = _apply_name_clauses(df, parsed.name_include, parsed.name_exclude)
     df = _apply_text_clauses(df, "type", parsed.type_include, parsed.type_exclude)
     df = _apply_text_clauses(df, "text", parsed.oracle_include, parsed.oracle_exclude)
@@ -338,52 +316,22 @@ async def list_cards(
     # Colors -- the explicit `colors` param (used by the mobile app's chip
     # filter UI) is a simple subset-match against colorIdentity, separate
     # from the id:/identity: flag syntax parsed above.
-    requested_colors = {c.strip().upper() for c in colors.split(",") if c.strip()}
     if requested_colors and "colorIdentity" in df.columns:
-        allow_colorless = "C" in requested_colors
-        color_letters = requested_colors - {"C"}
-
-        def _matches_colors(raw: Any) -> bool:
-            card_colors = _parse_color_cell(raw)
-            if not card_colors:
-                return allow_colorless
-            return card_colors.issubset(color_letters)
-
-        df = df[df["colorIdentity"].apply(_matches_colors)]
+        df = df[_color_subset_mask(df, "colorIdentity", requested_colors - {"C"}, "C" in requested_colors)]
 
     # Theme tags -- combine the explicit `tags` param with any `tag=` flags
     # parsed out of `q`; AND logic (a card must have all requested tags).
     # `-tag:`/`-theme:` flags parsed out of `q` exclude cards with any of
     # those tags (OR logic: excluded if it has at least one).
-    requested_tags = {_normalize_word_sep(t) for t in tags.split(",") if t.strip()}
-    if parsed.tags:
-        requested_tags |= parsed.tags
-    if (requested_tags or parsed.tags_exclude) and "themeTags" in df.columns:
-        # themeTags may be stored as a string, list, or numpy array depending on
-        # source (raw CSV vs. Parquet) -- parse_theme_tags() normalizes all of them.
-        card_tag_sets = df["themeTags"].apply(lambda v: {_normalize_word_sep(t) for t in parse_theme_tags(v)})
-        if requested_tags:
-            df = df[card_tag_sets.loc[df.index].apply(lambda card_tags: all(tag in card_tags for tag in requested_tags))]
-        if parsed.tags_exclude:
-            df = df[card_tag_sets.loc[df.index].apply(lambda card_tags: not any(tag in card_tags for tag in parsed.tags_exclude))]
+    df = _apply_tag_clauses(df, "themeTags", requested_tags | (parsed.tags or set()), parsed.tags_exclude)
 
     # Art tags (art:/atag:/arttag: flags in q) -- illustration tags, not exposed
     # as an explicit query param since they're a niche/advanced search only.
-    if (parsed.art_tags or parsed.art_tags_exclude) and "artTags" in df.columns:
-        art_tag_sets = df["artTags"].apply(lambda v: {_normalize_word_sep(t) for t in parse_theme_tags(v)})
-        if parsed.art_tags:
-            df = df[art_tag_sets.loc[df.index].apply(lambda card_tags: all(tag in card_tags for tag in parsed.art_tags))]
-        if parsed.art_tags_exclude:
-            df = df[art_tag_sets.loc[df.index].apply(lambda card_tags: not any(tag in card_tags for tag in parsed.art_tags_exclude))]
+    df = _apply_tag_clauses(df, "artTags", parsed.art_tags, parsed.art_tags_exclude)
 
     # Metadata tags (metadata:/mtag:/metatag: flags in q) -- internal deck-builder
     # tags, not exposed as an explicit query param (niche/advanced search only).
-    if (parsed.metadata_tags or parsed.metadata_tags_exclude) and "metadataTags" in df.columns:
-        metadata_tag_sets = df["metadataTags"].apply(lambda v: {_normalize_word_sep(t) for t in parse_theme_tags(v)})
-        if parsed.metadata_tags:
-            df = df[metadata_tag_sets.loc[df.index].apply(lambda card_tags: all(tag in card_tags for tag in parsed.metadata_tags))]
-        if parsed.metadata_tags_exclude:
-            df = df[metadata_tag_sets.loc[df.index].apply(lambda card_tags: not any(tag in card_tags for tag in parsed.metadata_tags_exclude))]
+    df = _apply_tag_clauses(df, "metadataTags", parsed.metadata_tags, parsed.metadata_tags_exclude)
 
     if min_cmc is not None and "manaValue" in df.columns:
         df = df[df["manaValue"] >= min_cmc]
@@ -395,12 +343,7 @@ async def list_cards(
     # advanced search only. This route doesn't call the shared
     # `apply_extra_clauses()`, so it needs its own mirrored block, same as
     # the tag/art_tag/metadata_tag blocks above.
-    if parsed.set_include and "printings" in df.columns:
-        for code in parsed.set_include:
-            df = df[df["printings"].astype(str).str.contains(rf"\b{re.escape(code)}\b", na=False, regex=True)]
-    if parsed.set_exclude and "printings" in df.columns:
-        for code in parsed.set_exclude:
-            df = df[~df["printings"].astype(str).str.contains(rf"\b{re.escape(code)}\b", na=False, regex=True)]
+    df = _apply_set_clauses(df, parsed.set_include, parsed.set_exclude)
 
     # Collector number (cn:/number: flags in q, requires set:/s: in the same
     # query -- a collector number alone isn't meaningful) -- not exposed as
@@ -437,9 +380,81 @@ async def list_cards(
         sort_key = sort_key.apply(lambda x: x.replace("_", " ") if isinstance(x, str) and x.startswith("_") else x)
         df = df.assign(_sort_key=sort_key).sort_values("_sort_key", key=lambda col: col.str.lower()).drop(columns="_sort_key")
 
-    total = len(df)
+    return df
+
+
+@router.get("", summary="Search cards")
+async def list_cards(
+    request: Request,
+    q: str = Query(
+        "",
+        description=(
+            "Search box text. Plain words match the card name (default). "
+            "Also supports real Scryfall search keywords (see "
+            "https://scryfall.com/docs/syntax): c:/color:, id:/identity:, "
+            "t:/type:, o:/oracle:, m:/mana:, mv:/cmc:/manavalue:, pow:/power:, "
+            "tou:/toughness: -- each accepts :, =, >, <, >=, <=, or != and may be "
+            "negated with a leading -. Also supports tag:/theme: (theme tags), "
+            "art:/atag:/arttag: (Scryfall community illustration tags), "
+            "metadata:/mtag:/metatag: (internal deck-builder tags), and "
+            "set:/s:/e:/edition: (a set code like `khm` or a full set name "
+            "like `kaldheim`; ambiguous set names return a `notices` message "
+            "in the response listing alternatives). Note: bare "
+            "`id:br` matches anything playable "
+            "with a black/red identity (subset, incl. colorless), while `id=br` "
+            "matches only exact black/red; bare `color:br` matches cards including "
+            "at least black and red (superset), while `color=br` is exact-only. "
+            "e.g. `c:rg t:creature o:\"draw a card\" pow>=4`"
+        ),
+    ),
+    colors: str = Query("", description="Comma-separated colors, e.g. W,U -- cards whose color identity is a subset of these are matched; include C to also allow colorless"),
+    tags: str = Query("", description="Comma-separated theme tags (AND logic)"),
+    is_new: bool = Query(False, description="Only recently released cards"),
+    min_cmc: Optional[float] = Query(None, ge=0),
+    max_cmc: Optional[float] = Query(None, ge=0),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+):
+    """Search/filter cards. Mirrors card_browser.py's filters, simplified for JSON I/O."""
+    base = _get_loader().load()
+    _register_search_frame(base)
+
+    parsed = _parse_search_query(q) if q else ParsedSearch()
+
+    requested_colors = {c.strip().upper() for c in colors.split(",") if c.strip()}
+    requested_tags = {_normalize_word_sep(t) for t in tags.split(",") if t.strip()}
+
+    # The filtered, sorted result is cached as row positions into `base`;
+    # paging through a search slices the cached permutation.
+    parse_notices = list(parsed.notices)
+    key = (
+        _current_version(_get_loader().file_path),
+        _parsed_search_key(parsed),
+        tuple(sorted(requested_colors)),
+        tuple(sorted(requested_tags)),
+        bool(is_new),
+        min_cmc,
+        max_cmc,
+    )
+
+    def _compute() -> Tuple[Any, Tuple[str, ...]]:
+        result = _filter_and_sort_cards(
+            base,
+            parsed,
+            requested_colors=requested_colors,
+            requested_tags=requested_tags,
+            is_new=is_new,
+            min_cmc=min_cmc,
+            max_cmc=max_cmc,
+        )
+        return base.index.get_indexer(result.index), tuple(parsed.notices[len(parse_notices):])
+
+    positions, filter_notices = _get_search_cache("api_v1_cards").get_or_compute(key, base, _compute)
+    parsed.notices = parse_notices + list(filter_notices)
+
+    total = len(positions)
     start = (page - 1) * page_size
-    page_df = df.iloc[start : start + page_size]
+    page_df = base.iloc[positions[start : start + page_size]]
 
     # Resolved-printing overlay for this page's cards (mobile/web parity):
     # a `set:` filter pins each card to its best-scored printing in that set
@@ -27,6 +27,7 @@ from code.services.all_cards_loader import AllCardsLoader
 from code.deck_builder import builder_utils as bu
 from code.type_definitions import User
 
+from ...services import deck_catalog
 from ...utils.api_response import err, ok
 from ..decks import (
     _build_csv_download_response,
@@ -450,6 +451,7 @@ async def delete_deck(filename: str, request: Request, user: User = Depends(get_
                 candidate.unlink()
         except Exception:
             pass
+    deck_catalog.forget_deck(p)
     return ok({"deleted": True}, _rid(request))
 
 
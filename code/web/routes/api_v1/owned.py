@@ -1,6 +1,6 @@
 """Owned cards endpoints for the public REST API (R28 Milestone 7).
 
-Reuses `owned_store.py` (the same per-user JSON-backed store as the HTML
+Reuses `owned_store.py` (the same per-user SQLite-backed store as the HTML
 Owned Library page) instead of duplicating parsing/persistence logic.
 Auth required for every endpoint -- scoped to the caller's own directory
 (`owned_cards/{user_id}/`).
@@ -1567,20 +1567,20 @@ async def budget_swap(
          if not e.get("is_include") and (e.get("price") is not None) and float(e.get("price") or 0.0) > 0],
         key=lambda x: -float(x.get("price") or 0.0),
     )
+    top_priced = priced[:6]
+    try:
+        alts_batch = svc.find_cheaper_alternatives_batch(
+            [{"card": e.get("card", ""), "max_price": max(0.0, float(e.get("price") or 0.0) - 0.01)} for e in top_priced],
+            region="usd",
+            color_identity=color_identity,
+        )
+    except Exception:
+        alts_batch = [[] for _ in top_priced]
     over_cards_out: list[dict] = []
-    for entry in priced[:6]:
+    for entry, alts_raw in zip(top_priced, alts_batch):
         name = entry.get("card", "")
         price = float(entry.get("price") or 0.0)
         is_include = name.lower().strip() in include_set
-        try:
-            alts_raw = svc.find_cheaper_alternatives(
-                name,
-                max_price=max(0.0, price - 0.01),
-                region="usd",
-                color_identity=color_identity,
-            )
-        except Exception:
-            alts_raw = []
         over_cards_out.append({
             "name": name,
             "price": price,
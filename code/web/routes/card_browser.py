@@ -10,8 +10,10 @@ from __future__ import annotations
 import logging
 import re
 from difflib import SequenceMatcher
+from pathlib import Path
 from typing import TYPE_CHECKING
 
+import numpy as np
 import pandas as pd
 from fastapi import APIRouter, Request, Query
 from fastapi.responses import HTMLResponse, RedirectResponse
@@ -24,6 +26,7 @@ try:
     from code.deck_builder.builder_utils import parse_theme_tags
     from code.deck_builder.color_identity_utils import color_identity_badges
     from code.settings import ENABLE_CARD_DETAILS
+    from code.tagging.tag_index_artifact import build_tag_index_artifact, load_tag_index_artifact
     from code.web.routes.api_v1.cards import _get_card_faces
     from code.web.routes.api import _image_cache
     from code.web.services.card_search import (
@@ -32,14 +35,18 @@ try:
         apply_parsed_search,
         has_structured_flags,
         parse_search_query,
+        parsed_search_key,
+        register_search_frame,
         resolve_collector_number_printings,
         get_set_scoped_collector_number_sort_map,
     )
+    from code.web.services.search_result_cache import current_version, get_search_cache
 except ImportError:
     from services.all_cards_loader import AllCardsLoader
     from deck_builder.builder_utils import parse_theme_tags
     from deck_builder.color_identity_utils import color_identity_badges
     from settings import ENABLE_CARD_DETAILS
+    from tagging.tag_index_artifact import build_tag_index_artifact, load_tag_index_artifact
     from web.routes.api_v1.cards import _get_card_faces
     from web.routes.api import _image_cache
     from web.services.card_search import (
@@ -48,9 +55,12 @@ except ImportError:
         apply_parsed_search,
         has_structured_flags,
         parse_search_query,
+        parsed_search_key,
+        register_search_frame,
         resolve_collector_number_printings,
         get_set_scoped_collector_number_sort_map,
     )
+    from web.services.search_result_cache import current_version, get_search_cache
 
 if TYPE_CHECKING:
     from code.web.services.card_similarity import CardSimilarity
@@ -334,22 +344,25 @@ def get_theme_index() -> dict[str, set[int]]:
     
     Returns dict mapping lowercase theme names to sets of card indices.
     Built once on first access and reused for all subsequent theme queries.
+    Reads the tag index artifact written at tagging time when it is fresh;
+    otherwise builds the same CSR structure from the loaded frame.
     """
     global _theme_index
     if _theme_index is None:
         logger.info("Building theme index for fast lookups...")
-        _theme_index = {}
         loader = get_loader()
-        df = loader.load()
-        
-        for idx, row in enumerate(df.itertuples()):
-            themes = parse_theme_tags(row.themeTags if hasattr(row, 'themeTags') else '')
-            for theme in themes:
-                theme_lower = theme.lower()
-                if theme_lower not in _theme_index:
-                    _theme_index[theme_lower] = set()
-                _theme_index[theme_lower].add(idx)
-        
+        artifact = load_tag_index_artifact(source_path=Path(loader.file_path))
+        if artifact is None:
+            artifact = build_tag_index_artifact(loader.load())
+        index: dict[str, set[int]] = {}
+        for tag in artifact.tags:
+            rows = artifact.card_ids_for_tag(tag).tolist()
+            bucket = index.get(tag.lower())
+            if bucket is None:
+                index[tag.lower()] = set(rows)
+            else:
+                bucket.update(rows)
+        _theme_index = index
         logger.info(f"Theme index built with {len(_theme_index)} unique themes")
     
     return _theme_index
@@ -439,6 +452,134 @@ def _apply_search_query(filtered_df: "pd.DataFrame", search: str) -> tuple["pd.D
     return filtered_df.iloc[0:0], None
 
 
+def _filter_and_sort(df: "pd.DataFrame", search: str, themes: list[str], sort: str) -> tuple["pd.DataFrame", "ParsedSearch | None"]:
+    """Search box, theme filters (AND) and sort order over a copy of `df`."""
+    filtered_df = df.copy()
+
+    filtered_df, parsed = _apply_search_query(filtered_df, search)
+
+    # Multi-select theme filtering (AND logic: card must have ALL selected themes)
+    if themes:
+        theme_index = get_theme_index()
+
+        # For each theme, get matching card indices
+        all_theme_matches = []
+        for theme in themes:
+            theme_lower = theme.lower().strip()
+
+            # Try exact match first (instant lookup)
+            if theme_lower in theme_index:
+                # Direct index lookup - O(1) instead of O(n)
+                matching_indices = theme_index[theme_lower]
+                all_theme_matches.append(matching_indices)
+            else:
+                # Fuzzy match: check all themes in index for similarity
+                matching_indices = set()
+                for indexed_theme, card_indices in theme_index.items():
+                    if _fuzzy_theme_match_score(theme, indexed_theme) >= 0.5:
+                        matching_indices.update(card_indices)
+                all_theme_matches.append(matching_indices)
+
+        # Apply AND logic: card must be in ALL theme match sets
+        if all_theme_matches:
+            # Start with first theme's matches
+            intersection = all_theme_matches[0]
+            # Intersect with all other theme matches
+            for theme_matches in all_theme_matches[1:]:
+                intersection = intersection & theme_matches
+
+            # Intersect with current filtered_df indices
+            current_indices = set(filtered_df.index)
+            valid_indices = intersection & current_indices
+            if valid_indices:
+                filtered_df = filtered_df.loc[list(valid_indices)]
+            else:
+                filtered_df = filtered_df.iloc[0:0]
+
+    # Apply sorting
+    set_cn_sort_map: dict = {}
+    if sort == "name_asc" and parsed and parsed.set_include:
+        set_cn_sort_map = get_set_scoped_collector_number_sort_map(parsed.set_include, parsed.collector_number_clauses)
+    if set_cn_sort_map:
+        # Any set:-scoped search: default to collector-number order (then
+        # set code, for multi-set queries) instead of alphabetical.
+        sort_keys = filtered_df['name'].str.lower().map(lambda n: set_cn_sort_map.get(n, (float('inf'), '')))
+        filtered_df['_cn_sort'] = sort_keys.map(lambda t: t[0])
+        filtered_df['_set_sort'] = sort_keys.map(lambda t: t[1])
+        filtered_df = filtered_df.sort_values(['_cn_sort', '_set_sort', 'name'], ascending=[True, True, True])
+        filtered_df = filtered_df.drop(['_cn_sort', '_set_sort'], axis=1)
+    elif sort == "name_desc":
+        # Name Z-A
+        filtered_df['_sort_key'] = filtered_df['name'].str.replace('"', '', regex=False).str.replace("'", '', regex=False)
+        filtered_df['_sort_key'] = filtered_df['_sort_key'].apply(
+            lambda x: x.replace('_', ' ') if x.startswith('_') else x
+        )
+        filtered_df = filtered_df.sort_values('_sort_key', key=lambda col: col.str.lower(), ascending=False)
+        filtered_df = filtered_df.drop('_sort_key', axis=1)
+    elif sort == "cmc_asc":
+        # CMC Low-High, then name
+        filtered_df = filtered_df.sort_values(['manaValue', 'name'], ascending=[True, True])
+    elif sort == "cmc_desc":
+        # CMC High-Low, then name
+        filtered_df = filtered_df.sort_values(['manaValue', 'name'], ascending=[False, True])
+    elif sort == "power_desc":
+        # Power High-Low (creatures first, then non-creatures)
+        # Convert power to numeric, NaN becomes -1 for sorting
+        filtered_df['_power_sort'] = pd.to_numeric(filtered_df['power'], errors='coerce').fillna(-1)
+        filtered_df = filtered_df.sort_values(['_power_sort', 'name'], ascending=[False, True])
+        filtered_df = filtered_df.drop('_power_sort', axis=1)
+    elif sort == "edhrec_asc":
+        # EDHREC rank (low number = popular)
+        if 'edhrecRank' in filtered_df.columns:
+            # NaN goes to end (high value)
+            filtered_df['_edhrec_sort'] = filtered_df['edhrecRank'].fillna(999999)
+            filtered_df = filtered_df.sort_values(['_edhrec_sort', 'name'], ascending=[True, True])
+            filtered_df = filtered_df.drop('_edhrec_sort', axis=1)
+        else:
+            # Fallback to name sort
+            filtered_df = filtered_df.sort_values('name')
+    else:
+        # Default: Name A-Z (name_asc)
+        filtered_df['_sort_key'] = filtered_df['name'].str.replace('"', '', regex=False).str.replace("'", '', regex=False)
+        filtered_df['_sort_key'] = filtered_df['_sort_key'].apply(
+            lambda x: x.replace('_', ' ') if x.startswith('_') else x
+        )
+        filtered_df = filtered_df.sort_values('_sort_key', key=lambda col: col.str.lower())
+        filtered_df = filtered_df.drop('_sort_key', axis=1)
+
+    return filtered_df, parsed
+
+
+def _search_result_positions(
+    df: "pd.DataFrame", search: str, themes: list[str], sort: str
+) -> tuple[np.ndarray, "ParsedSearch | None"]:
+    """Row positions of `df`, filtered and in display order, for one browser query.
+
+    Results are cached per (query, themes, sort, data version) so the grid's
+    infinite-scroll requests and repeated searches slice a cached permutation
+    instead of re-running `_filter_and_sort`.
+    """
+    parsed = parse_search_query(search) if search else None
+    if parsed is not None and has_structured_flags(parsed):
+        query_key: tuple = ("parsed", parsed_search_key(parsed))
+    else:
+        # Plain name searches use the case-insensitive fuzzy matcher
+        query_key = ("name", search.lower().strip())
+        parsed = None
+    key = (
+        current_version(get_loader().file_path),
+        query_key,
+        tuple(sorted(t.lower() for t in themes)),
+        sort,
+    )
+
+    def _compute() -> np.ndarray:
+        filtered_df, _ = _filter_and_sort(df, search, themes, sort)
+        return df.index.get_indexer(filtered_df.index)
+
+    return get_search_cache("card_browser").get_or_compute(key, df, _compute), parsed
+
+
 @router.get("/", response_class=HTMLResponse)
 async def card_browser_index(
     request: Request,
@@ -455,106 +596,15 @@ async def card_browser_index(
     try:
         loader = get_loader()
         df = loader.load()
+        register_search_frame(df)
         
-        # Apply filters
-        filtered_df = df.copy()
+        positions, parsed = _search_result_positions(df, search, themes, sort)
         
-        filtered_df, parsed = _apply_search_query(filtered_df, search)
-        
-        # Multi-select theme filtering (AND logic: card must have ALL selected themes)
-        if themes:
-            theme_index = get_theme_index()
-            
-            # For each theme, get matching card indices
-            all_theme_matches = []
-            for theme in themes:
-                theme_lower = theme.lower().strip()
-                
-                # Try exact match first (instant lookup)
-                if theme_lower in theme_index:
-                    # Direct index lookup - O(1) instead of O(n)
-                    matching_indices = theme_index[theme_lower]
-                    all_theme_matches.append(matching_indices)
-                else:
-                    # Fuzzy match: check all themes in index for similarity
-                    matching_indices = set()
-                    for indexed_theme, card_indices in theme_index.items():
-                        if _fuzzy_theme_match_score(theme, indexed_theme) >= 0.5:
-                            matching_indices.update(card_indices)
-                    all_theme_matches.append(matching_indices)
-            
-            # Apply AND logic: card must be in ALL theme match sets
-            if all_theme_matches:
-                # Start with first theme's matches
-                intersection = all_theme_matches[0]
-                # Intersect with all other theme matches
-                for theme_matches in all_theme_matches[1:]:
-                    intersection = intersection & theme_matches
-                
-                # Intersect with current filtered_df indices
-                current_indices = set(filtered_df.index)
-                valid_indices = intersection & current_indices
-                if valid_indices:
-                    filtered_df = filtered_df.loc[list(valid_indices)]
-                else:
-                    filtered_df = filtered_df.iloc[0:0]
-
-        # Apply sorting
-        set_cn_sort_map: dict = {}
-        if sort == "name_asc" and parsed and parsed.set_include:
-            set_cn_sort_map = get_set_scoped_collector_number_sort_map(parsed.set_include, parsed.collector_number_clauses)
-        if set_cn_sort_map:
-            # Any set:-scoped search: default to collector-number order (then
-            # set code, for multi-set queries) instead of alphabetical.
-            sort_keys = filtered_df['name'].str.lower().map(lambda n: set_cn_sort_map.get(n, (float('inf'), '')))
-            filtered_df['_cn_sort'] = sort_keys.map(lambda t: t[0])
-            filtered_df['_set_sort'] = sort_keys.map(lambda t: t[1])
-            filtered_df = filtered_df.sort_values(['_cn_sort', '_set_sort', 'name'], ascending=[True, True, True])
-            filtered_df = filtered_df.drop(['_cn_sort', '_set_sort'], axis=1)
-        elif sort == "name_desc":
-            # Name Z-A
-            filtered_df['_sort_key'] = filtered_df['name'].str.replace('"', '', regex=False).str.replace("'", '', regex=False)
-            filtered_df['_sort_key'] = filtered_df['_sort_key'].apply(
-                lambda x: x.replace('_', ' ') if x.startswith('_') else x
-            )
-            filtered_df = filtered_df.sort_values('_sort_key', key=lambda col: col.str.lower(), ascending=False)
-            filtered_df = filtered_df.drop('_sort_key', axis=1)
-        elif sort == "cmc_asc":
-            # CMC Low-High, then name
-            filtered_df = filtered_df.sort_values(['manaValue', 'name'], ascending=[True, True])
-        elif sort == "cmc_desc":
-            # CMC High-Low, then name
-            filtered_df = filtered_df.sort_values(['manaValue', 'name'], ascending=[False, True])
-        elif sort == "power_desc":
-            # Power High-Low (creatures first, then non-creatures)
-            # Convert power to numeric, NaN becomes -1 for sorting
-            filtered_df['_power_sort'] = pd.to_numeric(filtered_df['power'], errors='coerce').fillna(-1)
-            filtered_df = filtered_df.sort_values(['_power_sort', 'name'], ascending=[False, True])
-            filtered_df = filtered_df.drop('_power_sort', axis=1)
-        elif sort == "edhrec_asc":
-            # EDHREC rank (low number = popular)
-            if 'edhrecRank' in filtered_df.columns:
-                # NaN goes to end (high value)
-                filtered_df['_edhrec_sort'] = filtered_df['edhrecRank'].fillna(999999)
-                filtered_df = filtered_df.sort_values(['_edhrec_sort', 'name'], ascending=[True, True])
-                filtered_df = filtered_df.drop('_edhrec_sort', axis=1)
-            else:
-                # Fallback to name sort
-                filtered_df = filtered_df.sort_values('name')
-        else:
-            # Default: Name A-Z (name_asc)
-            filtered_df['_sort_key'] = filtered_df['name'].str.replace('"', '', regex=False).str.replace("'", '', regex=False)
-            filtered_df['_sort_key'] = filtered_df['_sort_key'].apply(
-                lambda x: x.replace('_', ' ') if x.startswith('_') else x
-            )
-            filtered_df = filtered_df.sort_values('_sort_key', key=lambda col: col.str.lower())
-            filtered_df = filtered_df.drop('_sort_key', axis=1)
-        
-        total_cards = len(filtered_df)
+        total_cards = len(positions)
         
         # Get first page (20 cards)
         per_page = 20
-        cards_page = filtered_df.head(per_page)
+        cards_page = df.iloc[positions[:per_page]]
         
         # Convert to list of dicts
         cards_list = cards_page.to_dict('records')
@@ -592,7 +642,7 @@ async def card_browser_index(
         
         # Calculate pagination info
         per_page = 20
-        total_filtered = len(filtered_df)
+        total_filtered = len(positions)
         total_pages = (total_filtered + per_page - 1) // per_page  # Ceiling division
         current_page = 1  # Always page 1 on initial load (cursor-based makes exact page tricky)
         
@@ -701,108 +751,21 @@ async def card_browser_grid(
     try:
         loader = get_loader()
         df = loader.load()
+        register_search_frame(df)
         
-        # Apply filters
-        filtered_df = df.copy()
-        
-        filtered_df, parsed = _apply_search_query(filtered_df, search)
-        
-        # Multi-select theme filtering (AND logic: card must have ALL selected themes)
-        if themes:
-            theme_index = get_theme_index()
-            
-            # For each theme, get matching card indices
-            all_theme_matches = []
-            for theme in themes:
-                theme_lower = theme.lower().strip()
-                
-                # Try exact match first (instant lookup)
-                if theme_lower in theme_index:
-                    # Direct index lookup - O(1) instead of O(n)
-                    matching_indices = theme_index[theme_lower]
-                    all_theme_matches.append(matching_indices)
-                else:
-                    # Fuzzy match: check all themes in index for similarity
-                    matching_indices = set()
-                    for indexed_theme, card_indices in theme_index.items():
-                        if _fuzzy_theme_match_score(theme, indexed_theme) >= 0.5:
-                            matching_indices.update(card_indices)
-                    all_theme_matches.append(matching_indices)
-            
-            # Apply AND logic: card must be in ALL theme match sets
-            if all_theme_matches:
-                # Start with first theme's matches
-                intersection = all_theme_matches[0]
-                # Intersect with all other theme matches
-                for theme_matches in all_theme_matches[1:]:
-                    intersection = intersection & theme_matches
-                
-                # Intersect with current filtered_df indices
-                current_indices = set(filtered_df.index)
-                valid_indices = intersection & current_indices
-                if valid_indices:
-                    filtered_df = filtered_df.loc[list(valid_indices)]
-                else:
-                    filtered_df = filtered_df.iloc[0:0]
-        
-        # Apply sorting (same logic as main endpoint)
-        set_cn_sort_map: dict = {}
-        if sort == "name_asc" and parsed and parsed.set_include:
-            set_cn_sort_map = get_set_scoped_collector_number_sort_map(parsed.set_include, parsed.collector_number_clauses)
-        if set_cn_sort_map:
-            sort_keys = filtered_df['name'].str.lower().map(lambda n: set_cn_sort_map.get(n, (float('inf'), '')))
-            filtered_df['_cn_sort'] = sort_keys.map(lambda t: t[0])
-            filtered_df['_set_sort'] = sort_keys.map(lambda t: t[1])
-            filtered_df = filtered_df.sort_values(['_cn_sort', '_set_sort', 'name'], ascending=[True, True, True])
-            filtered_df = filtered_df.drop(['_cn_sort', '_set_sort'], axis=1)
-        elif sort == "name_desc":
-            filtered_df['_sort_key'] = filtered_df['name'].str.replace('"', '', regex=False).str.replace("'", '', regex=False)
-            filtered_df['_sort_key'] = filtered_df['_sort_key'].apply(
-                lambda x: x.replace('_', ' ') if x.startswith('_') else x
-            )
-            filtered_df = filtered_df.sort_values('_sort_key', key=lambda col: col.str.lower(), ascending=False)
-            filtered_df = filtered_df.drop('_sort_key', axis=1)
-        elif sort == "cmc_asc":
-            filtered_df = filtered_df.sort_values(['manaValue', 'name'], ascending=[True, True])
-        elif sort == "cmc_desc":
-            filtered_df = filtered_df.sort_values(['manaValue', 'name'], ascending=[False, True])
-        elif sort == "power_desc":
-            filtered_df['_power_sort'] = pd.to_numeric(filtered_df['power'], errors='coerce').fillna(-1)
-            filtered_df = filtered_df.sort_values(['_power_sort', 'name'], ascending=[False, True])
-            filtered_df = filtered_df.drop('_power_sort', axis=1)
-        elif sort == "edhrec_asc":
-            if 'edhrecRank' in filtered_df.columns:
-                filtered_df['_edhrec_sort'] = filtered_df['edhrecRank'].fillna(999999)
-                filtered_df = filtered_df.sort_values(['_edhrec_sort', 'name'], ascending=[True, True])
-                filtered_df = filtered_df.drop('_edhrec_sort', axis=1)
-            else:
-                filtered_df = filtered_df.sort_values('name')
-        else:
-            # Default: Name A-Z
-            filtered_df['_sort_key'] = filtered_df['name'].str.replace('"', '', regex=False).str.replace("'", '', regex=False)
-            filtered_df['_sort_key'] = filtered_df['_sort_key'].apply(
-                lambda x: x.replace('_', ' ') if x.startswith('_') else x
-            )
-            filtered_df = filtered_df.sort_values('_sort_key', key=lambda col: col.str.lower())
-            filtered_df = filtered_df.drop('_sort_key', axis=1)
-        
-        # Cursor-based pagination
-        # Cursor is the card name - skip all cards until we find it, then take next batch
+        positions, parsed = _search_result_positions(df, search, themes, sort)
+
+        # Cursor-based pagination: the cursor is the last card name of the
+        # previous page; take the batch after its first occurrence.
         if cursor:
-            try:
-                # Find the position of the cursor card in the sorted dataframe
-                cursor_position = filtered_df[filtered_df['name'] == cursor].index
-                if len(cursor_position) > 0:
-                    # Get the iloc position (row number, not index label)
-                    cursor_iloc = filtered_df.index.get_loc(cursor_position[0])
-                    # Skip past the cursor card (take everything after it)
-                    filtered_df = filtered_df.iloc[cursor_iloc + 1:]
-            except (KeyError, IndexError):
-                # Cursor card not found - might have been filtered out, just proceed
-                pass
+            names = register_search_frame(df).names
+            if names is not None:
+                hit = np.flatnonzero(names[positions] == cursor)
+                if len(hit):
+                    positions = positions[hit[0] + 1:]
         
         per_page = 20
-        cards_page = filtered_df.head(per_page)
+        cards_page = df.iloc[positions[:per_page]]
         cards_list = cards_page.to_dict('records')
         
         # Parse theme tags and color identity
@@ -835,7 +798,7 @@ async def card_browser_grid(
             card['color_badges'] = color_identity_badges(card['colorIdentity'])
             card['is_owned'] = False  # TODO: Add owned card checking
         
-        has_next = len(filtered_df) > per_page
+        has_next = len(positions) > per_page
         last_card_name = cards_list[-1]['name'] if cards_list else ""
         
         printings, sid, had_cookie = _printings_context(request)
@@ -1029,6 +992,23 @@ def _fuzzy_card_name_score(query: str, card_name: str) -> float:
 
 
 
+def _rank_theme_matches(q: str, all_themes: list[str], limit: int) -> list[str]:
+    """Top `limit` catalog themes fuzzy-matching `q`, best first."""
+    # Fuzzy match themes using helper function
+    scored_themes: list[tuple[float, str]] = []
+    
+    # Only check against theme names from catalog (~575 themes)
+    for theme in all_themes:
+        score = _fuzzy_theme_match_score(q, theme)
+        # Only include if score is reasonable (0.5+ = 50%+ match)
+        if score >= 0.5:
+            scored_themes.append((score, theme))
+    
+    # Sort by score (desc), then alphabetically
+    scored_themes.sort(key=lambda x: (-x[0], x[1].lower()))
+    return [theme for _, theme in scored_themes[:limit]]
+
+
 @router.get("/theme-autocomplete", response_class=HTMLResponse)
 async def card_theme_autocomplete(
     request: Request,
@@ -1044,23 +1024,15 @@ async def card_theme_autocomplete(
         # Use cached theme catalog (loaded from CSV, not parsed from cards)
         all_themes = get_theme_catalog()
         
-        # Fuzzy match themes using helper function
-        scored_themes: list[tuple[float, str]] = []
-        
-        # Only check against theme names from catalog (~575 themes)
-        for theme in all_themes:
-            score = _fuzzy_theme_match_score(q, theme)
-            # Only include if score is reasonable (0.5+ = 50%+ match)
-            if score >= 0.5:
-                scored_themes.append((score, theme))
-        
-        # Sort by score (desc), then alphabetically
-        scored_themes.sort(key=lambda x: (-x[0], x[1].lower()))
-        top_matches = scored_themes[:limit]
+        # Keystrokes repeat (backspace, retyping): reuse ranked matches
+        key = (current_version(get_loader().file_path), q.lower(), limit)
+        top_matches = get_search_cache("theme_autocomplete").get_or_compute(
+            key, all_themes, lambda: _rank_theme_matches(q, all_themes, limit)
+        )
         
         # Generate HTML suggestions
         html_parts = []
-        for score, theme in top_matches:
+        for theme in top_matches:
             safe_theme = theme.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;').replace('"', '&quot;')
             html_parts.append(
                 f'<div class="autocomplete-item" data-value="{safe_theme}" role="option">'
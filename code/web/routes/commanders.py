@@ -6,13 +6,21 @@ from difflib import SequenceMatcher
 from math import ceil
 from typing import Dict, Iterable, Mapping, Sequence, Tuple
 from urllib.parse import urlencode
-import re
 
+import numpy as np
 from fastapi import APIRouter, Query, Request
 from fastapi.responses import HTMLResponse
 
 from ..app import templates
-from ..services.commander_catalog_loader import CommanderCatalog, CommanderRecord, load_commander_catalog
+from ..services.commander_catalog_loader import (
+    CommanderCatalog,
+    CommanderColumns,
+    CommanderRecord,
+    commander_columns,
+    commander_name_candidates,
+    load_commander_catalog,
+    normalize_search_text,
+)
 from ..services.theme_catalog_loader import load_index, slugify
 from ..services.telemetry import log_commander_page_view
 from ..services.tasks import get_session, new_sid
@@ -24,7 +32,6 @@ _THEME_MATCH_THRESHOLD = 0.52
 _THEME_RECOMMENDATION_FLOOR = 0.35
 _THEME_RECOMMENDATION_LIMIT = 6
 _MIN_NAME_MATCH_SCORE = 0.8
-_WORD_PATTERN = re.compile(r"[a-z0-9]+")
 
 _WUBRG_ORDER: tuple[str, ...] = ("W", "U", "B", "R", "G")
 _COLOR_NAMES: dict[str, str] = {
@@ -180,12 +187,15 @@ def _ensure_catalog_caches(etag: str) -> None:
     _COLOR_OPTIONS_CACHE.clear()
 
 
+def _columns_for(records: Sequence[CommanderRecord], columns: CommanderColumns | None = None) -> CommanderColumns:
+    return columns if columns is not None else commander_columns(records)
+
+
 def _theme_options_for_catalog(entries: Sequence[CommanderRecord], *, etag: str) -> Tuple[str, ...]:
     cached = _THEME_OPTIONS_CACHE.get(etag)
     if cached is not None:
         return cached
-    options = _collect_theme_names(entries)
-    result = tuple(options)
+    result = _columns_for(entries).theme_options
     _THEME_OPTIONS_CACHE[etag] = result
     return result
 
@@ -194,7 +204,7 @@ def _color_options_for_catalog(entries: Sequence[CommanderRecord], *, etag: str)
     cached = _COLOR_OPTIONS_CACHE.get(etag)
     if cached is not None:
         return cached
-    options = tuple(_build_color_options(entries))
+    options = tuple(_color_options_from_codes(_columns_for(entries).color_options))
     _COLOR_OPTIONS_CACHE[etag] = options
     return options
 
@@ -212,7 +222,9 @@ def _get_cached_filter_entry(
         _FILTER_CACHE.move_to_end(key)
         return cached
 
-    filtered = tuple(_filter_commanders(catalog.entries, query, canon_color, theme_query))
+    filtered = tuple(_filter_commanders(
+        catalog.entries, query, canon_color, theme_query, columns=getattr(catalog, "columns", None)
+    ))
     recommendations = tuple(_build_theme_recommendations(theme_query, theme_options))
     entry = CommanderFilterCacheEntry(
         records=filtered,
@@ -268,26 +280,11 @@ def _record_to_view(record: CommanderRecord, theme_info: Mapping[str, CommanderT
     )
 
 
-def _normalize_search_text(value: str | None) -> str:
-    if not value:
-        return ""
-    tokens = _WORD_PATTERN.findall(value.lower())
-    if not tokens:
-        return ""
-    return " ".join(tokens)
+_normalize_search_text = normalize_search_text
 
 
 def _commander_name_candidates(record: CommanderRecord) -> tuple[str, ...]:
-    seen: set[str] = set()
-    candidates: list[str] = []
-    for raw in (record.display_name, record.face_name, record.name):
-        normalized = _normalize_search_text(raw)
-        if not normalized:
-            continue
-        if normalized not in seen:
-            seen.add(normalized)
-            candidates.append(normalized)
-    return tuple(candidates)
+    return commander_name_candidates(record)
 
 
 def _partial_ratio(a: str, b: str) -> float:
@@ -332,12 +329,16 @@ def _token_scores(query_tokens: tuple[str, ...], candidate_tokens: tuple[str, ..
 
 
 def _commander_name_match_score(query: str, record: CommanderRecord) -> float:
+    return _name_candidates_match_score(query, _commander_name_candidates(record))
+
+
+def _name_candidates_match_score(query: str, candidates: Sequence[str]) -> float:
     normalized_query = _normalize_search_text(query)
     if not normalized_query:
         return 0.0
     query_tokens = tuple(normalized_query.split())
     best_score = 0.0
-    for candidate in _commander_name_candidates(record):
+    for candidate in candidates:
         candidate_tokens = tuple(candidate.split())
         base_score = SequenceMatcher(None, normalized_query, candidate).ratio()
         partial = _partial_ratio(normalized_query, candidate)
@@ -365,20 +366,6 @@ def _commander_name_match_score(query: str, record: CommanderRecord) -> float:
     return best_score
 
 
-def _collect_theme_names(records: Sequence[CommanderRecord]) -> tuple[str, ...]:
-    seen: set[str] = set()
-    ordered: list[str] = []
-    for rec in records:
-        for theme_name in rec.themes:
-            if not theme_name:
-                continue
-            if theme_name not in seen:
-                seen.add(theme_name)
-                ordered.append(theme_name)
-    ordered.sort(key=lambda name: name.lower())
-    return tuple(ordered)
-
-
 def _theme_match_score(normalized_query: str, query_tokens: tuple[str, ...], candidate: str) -> float:
     normalized_candidate = _normalize_search_text(candidate)
     if not normalized_candidate:
@@ -435,7 +422,24 @@ def _build_theme_recommendations(theme_query: str | None, theme_names: Sequence[
     return tuple(filtered[:_THEME_RECOMMENDATION_LIMIT])
 
 
-def _filter_commanders(records: Iterable[CommanderRecord], q: str | None, color: str | None, theme: str | None) -> Sequence[CommanderRecord]:
+def _ranked_positions(positions: np.ndarray, scores: np.ndarray, sort_names: np.ndarray, threshold: float) -> np.ndarray:
+    """Positions scoring >= threshold, ordered by (-score, lowercase display name)."""
+    keep = scores >= threshold
+    positions, scores = positions[keep], scores[keep]
+    if not len(positions):
+        return positions
+    order = sorted(range(len(positions)), key=lambda i: (-scores[i], sort_names[positions[i]]))
+    return positions[np.asarray(order, dtype=np.int64)]
+
+
+def _filter_commanders(
+    records: Iterable[CommanderRecord],
+    q: str | None,
+    color: str | None,
+    theme: str | None,
+    *,
+    columns: CommanderColumns | None = None,
+) -> Sequence[CommanderRecord]:
     items: Sequence[CommanderRecord]
     if isinstance(records, Sequence):
         items = records
@@ -443,47 +447,49 @@ def _filter_commanders(records: Iterable[CommanderRecord], q: str | None, color:
         items = tuple(records)
 
     color_code = _canon_color_code(color)
-    if color_code:
-        items = [rec for rec in items if _record_color_code(rec) == color_code]
-
     normalized_query = _normalize_search_text(q)
-    if normalized_query and items:
-        filtered: list[tuple[float, CommanderRecord]] = []
-        for rec in items:
-            score = _commander_name_match_score(normalized_query, rec)
-            if score >= _MIN_NAME_MATCH_SCORE:
-                filtered.append((score, rec))
-        if filtered:
-            filtered.sort(key=lambda pair: (-pair[0], pair[1].display_name.lower()))
-            items = [rec for _, rec in filtered]
-        else:
-            items = []
-
     normalized_theme_query = _normalize_search_text(theme)
-    if normalized_theme_query and items:
-        theme_tokens = tuple(normalized_theme_query.split())
-        filtered_by_theme: list[tuple[float, CommanderRecord]] = []
-        for rec in items:
-            score = _best_theme_match_score(normalized_theme_query, theme_tokens, rec)
-            if score >= _THEME_MATCH_THRESHOLD:
-                filtered_by_theme.append((score, rec))
-        if filtered_by_theme:
-            filtered_by_theme.sort(key=lambda pair: (-pair[0], pair[1].display_name.lower()))
-            items = [rec for _, rec in filtered_by_theme]
-        else:
-            items = []
+    if not (color_code or normalized_query or normalized_theme_query) or not items:
+        return items if isinstance(items, list) else tuple(items)
 
-    if isinstance(items, list):
-        return items
-    return tuple(items)
+    cols = _columns_for(items, columns)
+    positions = np.arange(len(items), dtype=np.int64)
+    if color_code:
+        positions = np.flatnonzero(cols.color_codes == color_code)
 
+    if normalized_query and len(positions):
+        scores = np.fromiter(
+            (_name_candidates_match_score(normalized_query, cols.name_candidates[i]) for i in positions),
+            dtype=np.float64,
+            count=len(positions),
+        )
+        positions = _ranked_positions(positions, scores, cols.sort_names, _MIN_NAME_MATCH_SCORE)
 
-def _build_color_options(records: Sequence[CommanderRecord]) -> list[tuple[str, str]]:
-    present: set[str] = set()
-    for rec in records:
-        code = _record_color_code(rec)
-        if code:
-            present.add(code)
+    if normalized_theme_query and len(positions):
+        theme_tokens = tuple(normalized_theme_query.split())
+        vocab_scores = np.fromiter(
+            (_theme_match_score(normalized_theme_query, theme_tokens, name) for name in cols.theme_vocab),
+            dtype=np.float64,
+            count=len(cols.theme_vocab),
+        )
+        starts = cols.theme_offsets[positions]
+        lengths = cols.theme_offsets[positions + 1] - starts
+        scores = np.zeros(len(positions), dtype=np.float64)
+        has_themes = lengths > 0
+        if has_themes.any():
+            # Max over each record's slice of theme ids: gather the slices, then segment-reduce
+            seg_lengths = lengths[has_themes]
+            seg_starts = np.zeros(len(seg_lengths), dtype=np.int64)
+            np.cumsum(seg_lengths[:-1], out=seg_starts[1:])
+            idx = np.repeat(starts[has_themes] - seg_starts, seg_lengths) + np.arange(seg_lengths.sum())
+            scores[has_themes] = np.maximum.reduceat(vocab_scores[cols.theme_ids[idx]], seg_starts)
+        positions = _ranked_positions(positions, scores, cols.sort_names, _THEME_MATCH_THRESHOLD)
+
+    return [items[i] for i in positions]
+
+
+def _color_options_from_codes(codes: Iterable[str]) -> list[tuple[str, str]]:
+    present = {code for code in codes if code}
     options: list[tuple[str, str]] = []
     for mono in ("W", "U", "B", "R", "G", "C"):
         if mono in present:
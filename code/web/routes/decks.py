@@ -5,7 +5,6 @@ from fastapi.responses import HTMLResponse, Response
 from pathlib import Path
 import csv
 import io
-import json
 import os
 import time
 from typing import Any, Dict, List, Optional, Tuple
@@ -17,6 +16,7 @@ from ..services.orchestrator import tags_for_commander
 from ..services.summary_utils import format_theme_label, format_theme_list, summary_ctx
 from ..services.tasks import get_session, new_sid
 from ..services.user_db import get_user_by_id, get_user_by_username
+from ..services import deck_catalog
 from ..services.deck_visibility import (
     DEFAULT_VISIBILITY,
     VALID_VISIBILITIES,
@@ -49,44 +49,12 @@ def _deck_dir(user_id: str = "guest") -> Path:
 
 
 def _list_from_dir(d: Path) -> list[dict]:
-    """Read CSV deck entries from a single directory."""
+    """Read CSV deck entries from a single directory (via the deck catalog)."""
     try:
         d.mkdir(parents=True, exist_ok=True)
     except Exception:
         pass
-    items: list[dict] = []
-    for p in sorted(d.glob("*.csv"), key=lambda x: x.stat().st_mtime, reverse=True):
-        meta: dict = {"name": p.name, "path": str(p), "mtime": p.stat().st_mtime}
-        stem = p.stem
-        txt = p.with_suffix('.txt')
-        if txt.exists():
-            meta["txt_name"] = txt.name
-            meta["txt_path"] = str(txt)
-        sidecar = p.with_suffix('.summary.json')
-        if sidecar.exists():
-            try:
-                import json as _json
-                payload = _json.loads(sidecar.read_text(encoding='utf-8'))
-                _m = payload.get('meta', {}) if isinstance(payload, dict) else {}
-                meta["commander"] = _m.get('commander') or meta.get("commander")
-                meta["tags"] = _m.get('tags') or meta.get("tags") or []
-                if _m.get('name'):
-                    meta["display"] = _m.get('name')
-                if _m.get('source'):
-                    meta["source"] = _m.get('source')
-            except Exception:
-                pass
-        meta["visibility"] = _get_deck_visibility_by_path(p)
-        if not meta.get("commander"):
-            parts = stem.split('_')
-            if len(parts) >= 3:
-                meta["commander"] = parts[0]
-                meta["tags"] = parts[1:-1]
-            else:
-                meta["commander"] = stem
-                meta["tags"] = []
-        items.append(meta)
-    return items
+    return deck_catalog.list_dir(d)
 
 
 def _list_decks(user_id: str = "guest") -> list[dict]:
@@ -159,46 +127,24 @@ _PUBLIC_DECKS_CACHE_TTL = 60.0
 
 
 def _scan_public_decks() -> List[dict]:
-    """Scan every user's deck directory for public decks. No caching here."""
+    """Query the deck catalog for public decks and attach owner usernames. No caching here."""
     root = Path(os.getenv("DECK_EXPORTS") or "deck_files").resolve()
     if not root.exists():
         return []
     items: List[dict] = []
-    for user_dir in root.iterdir():
-        if not user_dir.is_dir() or user_dir.name == "guest":
-            continue  # guest decks are always private (M1 design decision)
-        user_id = user_dir.name
-        try:
-            owner = get_user_by_id(user_id)
-        except Exception:
-            owner = None
-        username = owner.get("username") if owner else None
-        if not username:
-            continue  # can't build a shareable URL without a known username
-        for sidecar in user_dir.glob("*.summary.json"):
-            try:
-                payload = json.loads(sidecar.read_text(encoding="utf-8"))
-            except Exception:
-                continue
-            meta = payload.get("meta") if isinstance(payload, dict) else None
-            if not isinstance(meta, dict) or meta.get("visibility") != "public":
-                continue
+    usernames: Dict[str, Optional[str]] = {}
+    for item in deck_catalog.public_decks(root):
+        user_id = item["user_id"]
+        if user_id not in usernames:
             try:
-                mtime = sidecar.stat().st_mtime
+                owner = get_user_by_id(user_id)
             except Exception:
-                mtime = 0.0
-            csv_name = sidecar.name[: -len(".summary.json")] + ".csv"
-            has_txt = (user_dir / (sidecar.name[: -len(".summary.json")] + ".txt")).exists()
-            items.append({
-                "user_id": user_id,
-                "username": username,
-                "name": csv_name,
-                "commander": meta.get("commander") or "",
-                "tags": list(meta.get("tags") or []),
-                "display": meta.get("name") or "",
-                "mtime": mtime,
-                "has_txt": has_txt,
-            })
+                owner = None
+            usernames[user_id] = owner.get("username") if owner else None
+        username = usernames[user_id]
+        if not username:
+            continue  # can't build a shareable URL without a known username
+        items.append({**item, "username": username})
     return items
 
 
@@ -1288,6 +1234,7 @@ async def decks_delete(request: Request, name: str, section: str = "mine") -> Re
                 candidate.unlink()
         except Exception:
             pass
+    deck_catalog.forget_deck(p)
 
     # Return empty 200 — HTMX will swap the panel out of the DOM
     return Response("", status_code=200)
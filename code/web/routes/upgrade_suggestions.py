@@ -943,6 +943,9 @@ def _patch_summary_json(
         summary_path.write_text(_json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
     except Exception:
         pass
+    else:
+        from ..services.deck_catalog import note_deck_written
+        note_deck_written(summary_path)
 
 
 def _remove_compliance(csv_path: Path) -> None:
@@ -19,6 +19,7 @@ from typing import Any, Dict, List, Optional, Set
 
 from code.web.services.base import BaseService
 from code.web.services.price_service import PriceService, get_price_service
+from code.web.services.price_tag_index import BROAD_TYPES
 from code import logging_util
 
 logger = logging_util.logging.getLogger(__name__)
@@ -34,7 +35,7 @@ _TIER_FRACTIONS = {"S": 0.20, "M": 0.10, "L": 0.05}
 _MAX_ALTERNATIVES = 5
 
 # Ordered broad MTG card types — first match wins for type detection.
-_BROAD_TYPES = ("Land", "Creature", "Planeswalker", "Battle", "Enchantment", "Artifact", "Instant", "Sorcery")
+_BROAD_TYPES = BROAD_TYPES
 
 # M8: Build stage category order and tag patterns for category spend breakdown.
 CATEGORY_ORDER = ["Land", "Ramp", "Creature", "Card Draw", "Removal", "Wipe", "Protection", "Synergy", "Other"]
@@ -492,6 +493,82 @@ class BudgetEvaluatorService(BaseService):
         results.sort(key=lambda x: (-len(x["shared_tags"]), x["price"]))
         return results[:_MAX_ALTERNATIVES]
 
+    def find_cheaper_alternatives_batch(
+        self,
+        requests: List[Dict[str, Any]],
+        *,
+        region: str = "usd",
+        foil: bool = False,
+        color_identity: Optional[List[str]] = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """Answer :meth:`find_cheaper_alternatives` for many cards at once.
+
+        Uses the shared price-sorted tag index (``price_tag_index``), built
+        once per price-data version, so each card costs a binary search and
+        a few array filters instead of a fresh pool assembly and price lookup.
+
+        Args:
+            requests: One dict per card: ``card`` and ``max_price``, plus
+                optional ``tags`` and ``require_type`` (same meaning as the
+                single-card method).
+            region: Price region.
+            foil: If ``True``, compare foil prices.
+            color_identity: If given, filter to cards legal in this identity.
+
+        Returns:
+            One alternatives list per request, in request order, each ranked
+            and capped exactly like :meth:`find_cheaper_alternatives`.
+        """
+        if not requests:
+            return []
+        try:
+            from code.web.services.card_index import maybe_build_index
+            from code.web.services.price_tag_index import get_price_tag_index
+            maybe_build_index()
+            index = get_price_tag_index(self._price_svc, region=region, foil=foil)
+        except Exception as exc:
+            logger.warning("Card index unavailable for alternatives: %s", exc)
+            return [[] for _ in requests]
+
+        ranked: List[List[Dict[str, Any]]] = []
+        for req in requests:
+            card_name = req["card"]
+            lookup_tags = req.get("tags") or self._get_card_tags(card_name)
+            if not lookup_tags:
+                ranked.append([])
+                continue
+            source_type = req.get("require_type") or self._get_card_broad_type(card_name)
+            try:
+                ranked.append(index.query(
+                    lookup_tags,
+                    req["max_price"],
+                    exclude_name=card_name,
+                    color_identity=color_identity,
+                    require_type=source_type,
+                    limit=_MAX_ALTERNATIVES,
+                ))
+            except Exception as exc:
+                logger.warning("Alternative lookup failed for %s: %s", card_name, exc)
+                ranked.append([])
+
+        # One CK lookup for every alternative returned across the batch
+        alt_names = list(dict.fromkeys(alt["name"] for alts in ranked for alt in alts))
+        ck_prices = self._price_svc.get_ck_prices_batch(alt_names) if alt_names else {}
+        results: List[List[Dict[str, Any]]] = []
+        for alts in ranked:
+            out = []
+            for alt in alts:
+                ck_price = ck_prices.get(alt["name"])
+                out.append({
+                    "name": alt["name"],
+                    "price": alt["price"],
+                    "ck_price": round(ck_price, 2) if ck_price is not None else None,
+                    "tags": alt["tags"],
+                    "shared_tags": alt["shared_tags"],
+                })
+            results.append(out)
+        return results
+
     def calculate_tier_ceilings(self, total_budget: float) -> Dict[str, float]:
         """Compute splurge tier price ceilings from *total_budget*.
 
@@ -582,25 +659,26 @@ class BudgetEvaluatorService(BaseService):
         foil: bool,
         color_identity: Optional[List[str]],
     ) -> List[Dict[str, Any]]:
-        """Find cheaper alternatives for over-budget (non-include) cards."""
+        """Find cheaper alternatives for over-budget (non-include) cards in one batch."""
+        flagged = [e for e in over_budget_cards if e["card"].lower().strip() not in include_set]
+        batch = self.find_cheaper_alternatives_batch(
+            [
+                {
+                    "card": e["card"],
+                    "max_price": (card_ceiling - 0.01) if card_ceiling else max(0.0, e["price"] - 0.01),
+                }
+                for e in flagged
+            ],
+            region=region,
+            foil=foil,
+            color_identity=color_identity,
+        )
         results = []
-        for entry in over_budget_cards:
-            card = entry["card"]
-            price = entry["price"]
-            if card.lower().strip() in include_set:
-                continue
-            max_alt_price = (card_ceiling - 0.01) if card_ceiling else max(0.0, price - 0.01)
-            alts = self.find_cheaper_alternatives(
-                card,
-                max_price=max_alt_price,
-                region=region,
-                foil=foil,
-                color_identity=color_identity,
-            )
+        for entry, alts in zip(flagged, batch):
             if alts:
                 results.append({
-                    "original": card,
-                    "original_price": price,
+                    "original": entry["card"],
+                    "original_price": entry["price"],
                     "alternatives": alts,
                 })
         return results
@@ -622,7 +700,7 @@ class BudgetEvaluatorService(BaseService):
         # Collect all unique tags from the current deck
         deck_tags: Set[str] = set()
         try:
-            from code.web.services.card_index import maybe_build_index, _CARD_INDEX, lookup_card
+            from code.web.services.card_index import maybe_build_index, get_tag_pool, lookup_card
             maybe_build_index()
 
             for name in decklist:
@@ -640,7 +718,7 @@ class BudgetEvaluatorService(BaseService):
             # Score candidate cards not in deck by shared tags
             candidates: Dict[str, Dict[str, Any]] = {}
             for tag in deck_tags:
-                for card in _CARD_INDEX.get(tag, []):
+                for card in get_tag_pool(tag):
                     name = card.get("name", "")
                     if not name or name.lower() in deck_set:
                         continue
@@ -139,9 +139,9 @@ def step5_base_ctx(request: Request, sess: dict, *, include_name: bool = True, i
 
 
 def owned_set() -> set[str]:
-    """Return lowercase owned card names with trimming for robust matching."""
+    """Return lowercase owned card names (from the store's cached owned set)."""
     try:
-        return {str(n).strip().lower() for n in owned_store.get_names()}
+        return set(owned_store.get_owned_set())
     except Exception:
         return set()
 
@@ -587,7 +587,7 @@ def _apply_budget_review_ctx(sess: dict, res: dict, ctx: dict) -> None:
 
     Triggers when total deck cost exceeds budget_total by more than BUDGET_TOTAL_TOLERANCE.
     Shows the most expensive non-include cards (contributors to total overage) with
-    cheaper alternatives drawn from find_cheaper_alternatives().
+    cheaper alternatives drawn from find_cheaper_alternatives_batch().
     """
     budget_cfg = sess.get("budget_config") or {}
     try:
@@ -675,24 +675,31 @@ def _apply_budget_review_ctx(sess: dict, res: dict, ctx: dict) -> None:
         key=lambda x: -float(x.get("price") or 0.0),
     )
 
+    top_priced = priced[:6]
+    try:
+        # Any cheaper alternative reduces the total; use price - 0.01 as the ceiling
+        alts_batch = svc.find_cheaper_alternatives_batch(
+            [
+                {
+                    "card": e.get("card", ""),
+                    "max_price": max(0.0, float(e.get("price") or 0.0) - 0.01),
+                    "tags": card_meta.get(e.get("card", ""), {}).get("tags") or None,
+                    "require_type": card_meta.get(e.get("card", ""), {}).get("type") or None,
+                }
+                for e in top_priced
+            ],
+            region="usd",
+            color_identity=color_identity,
+        )
+    except Exception:
+        alts_batch = [[] for _ in top_priced]
+
     over_cards_out: list[dict] = []
-    for entry in priced[:6]:
+    for entry, alts_raw in zip(top_priced, alts_batch):
         name = entry.get("card", "")
         price = float(entry.get("price") or 0.0)
         is_include = name.lower().strip() in include_set
         meta = card_meta.get(name, {})
-        try:
-            # Any cheaper alternative reduces the total; use price - 0.01 as the ceiling
-            alts_raw = svc.find_cheaper_alternatives(
-                name,
-                max_price=max(0.0, price - 0.01),
-                region="usd",
-                color_identity=color_identity,
-                tags=meta.get("tags") or None,
-                require_type=meta.get("type") or None,
-            )
-        except Exception:
-            alts_raw = []
         over_cards_out.append({
             "name": name,
             "price": price,
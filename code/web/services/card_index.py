@@ -1,15 +1,18 @@
 """Card index construction & lookup (extracted from sampling / theme_preview).
 
 Phase A refactor: Provides a thin API for building and querying the in-memory
-card index keyed by tag/theme. Future enhancements may introduce a persistent
-cache layer or precomputed artifact.
+card index keyed by tag/theme.
 
 M4: Updated to load from all_cards.parquet instead of CSV shards.
+Backed by the tag index artifact written at tagging time
+(``tagging/tag_index_artifact``); falls back to an in-memory build of the
+same structure when the artifact is missing or stale.
 
 Public API:
   maybe_build_index() -> None
   get_tag_pool(tag: str) -> list[dict]
   lookup_commander(name: str) -> dict | None
+  index_generation() -> int
 
 The index is rebuilt lazily when the Parquet file mtime changes.
 """
@@ -24,11 +27,18 @@ NAME_COL = "name"
 COLOR_IDENTITY_COL = "colorIdentity"
 MANA_COST_COL = "manaCost"
 RARITY_COL = "rarity"
+TYPE_COL = "type"
 
+# Materialized tag pools (tag -> shared card dicts), filled lazily from the artifact
 _CARD_INDEX: Dict[str, List[Dict[str, Any]]] = {}
 _CARD_INDEX_MTIME: float | None = None
 # Reverse lookup: lowercase card name → card dict (first occurrence per name)
 _NAME_INDEX: Dict[str, Dict[str, Any]] = {}
+_ARTIFACT: Any = None  # TagIndexArtifact
+_ROW_BY_NAME: Dict[str, int] = {}
+_CARD_RECORDS: Dict[int, Dict[str, Any]] = {}
+# Bumped each time a new artifact is attached (derived indexes key on it)
+_INDEX_GENERATION = 0
 
 _RARITY_NORM = {
     "mythic rare": "mythic",
@@ -47,87 +57,127 @@ def _normalize_rarity(raw: str) -> str:
     return _RARITY_NORM.get(r, r)
 
 
+def _load_artifact(parquet_path: Path):
+    """Return the persisted tag index artifact, or an in-memory build as fallback."""
+    try:
+        from code.tagging.tag_index_artifact import build_tag_index_artifact, load_tag_index_artifact
+    except ImportError:  # pragma: no cover - running with code/ on sys.path
+        from tagging.tag_index_artifact import build_tag_index_artifact, load_tag_index_artifact
+    artifact = load_tag_index_artifact(source_path=parquet_path)
+    if artifact is not None:
+        return artifact
+    from deck_builder import builder_utils as bu
+    df = bu._load_all_cards_parquet()
+    if df.empty or THEME_TAGS_COL not in df.columns:
+        return None
+    return build_tag_index_artifact(df)
+
+
 def maybe_build_index() -> None:
-    """Rebuild the index if the Parquet file mtime changed.
+    """Attach the tag index artifact if the Parquet file mtime changed.
 
     M4: Loads from all_cards.parquet instead of CSV files.
+    The tag -> cards mapping comes from the artifact written at tagging time
+    (memory-mapped, no per-row work); pools and card dicts are materialized
+    lazily and shared, so a card carries one dict regardless of tag count.
     """
-    global _CARD_INDEX, _CARD_INDEX_MTIME, _NAME_INDEX
-    
+    global _ARTIFACT, _CARD_INDEX_MTIME, _ROW_BY_NAME, _INDEX_GENERATION
+
     try:
         from path_util import get_processed_cards_path
-        from deck_builder import builder_utils as bu
-        
+
         parquet_path = Path(get_processed_cards_path())
         if not parquet_path.exists():
             return
-            
+
         latest = parquet_path.stat().st_mtime
-        if _CARD_INDEX and _CARD_INDEX_MTIME and latest <= _CARD_INDEX_MTIME:
+        if _ARTIFACT is not None and _CARD_INDEX_MTIME and latest <= _CARD_INDEX_MTIME:
             return
-        
-        # Load from Parquet
-        df = bu._load_all_cards_parquet()
-        if df.empty or THEME_TAGS_COL not in df.columns:
+
+        artifact = _load_artifact(parquet_path)
+        if artifact is None:
             return
-        
-        new_index: Dict[str, List[Dict[str, Any]]] = {}
-        
-        for _, row in df.iterrows():
-            name = row.get(NAME_COL) or row.get("faceName") or ""
-            tags = row.get(THEME_TAGS_COL)
-            
-            # Handle tags (already a list after our conversion in builder_utils)
-            if not tags or not isinstance(tags, list):
-                continue
-                
-            color_id = str(row.get(COLOR_IDENTITY_COL) or "").strip()
-            mana_cost = str(row.get(MANA_COST_COL) or "").strip()
-            rarity = _normalize_rarity(str(row.get(RARITY_COL) or ""))
-            type_line = str(row.get("type") or row.get("type_line") or "").strip()
-            
-            for tg in tags:
-                if not tg:
-                    continue
-                new_index.setdefault(tg, []).append({
-                    "name": name,
-                    "color_identity": color_id,
-                    "tags": tags,
-                    "mana_cost": mana_cost,
-                    "rarity": rarity,
-                    "type_line": type_line,
-                    "color_identity_list": [c.strip() for c in color_id.split(',') if c.strip()],
-                    "pip_colors": [c for c in mana_cost if c in {"W","U","B","R","G"}],
-                })
-        
-        _CARD_INDEX = new_index
-        # Build name → card reverse index for O(1) lookups
-        new_name_index: Dict[str, Dict[str, Any]] = {}
-        for cards in new_index.values():
-            for c in cards:
-                key = c.get("name", "").lower()
-                if key and key not in new_name_index:
-                    new_name_index[key] = c
-        _NAME_INDEX = new_name_index
+
+        # Name -> row for tagged cards only (first occurrence wins)
+        names = artifact.cards[NAME_COL].str.lower().to_numpy()
+        row_by_name: Dict[str, int] = {}
+        for row in artifact.tagged_rows().tolist():
+            key = names[row]
+            if key and key not in row_by_name:
+                row_by_name[key] = row
+
+        _ARTIFACT = artifact
+        _ROW_BY_NAME = row_by_name
+        _CARD_RECORDS.clear()
+        _CARD_INDEX.clear()
+        _NAME_INDEX.clear()
         _CARD_INDEX_MTIME = latest
+        _INDEX_GENERATION += 1
     except Exception:
         # Defensive: if anything fails, leave index unchanged
         pass
 
+
+def index_generation() -> int:
+    """Counter that changes whenever the tag pools are swapped for a new artifact."""
+    return _INDEX_GENERATION
+
+
+def _card_record(row: int) -> Dict[str, Any]:
+    """Shared card dict for an artifact row (built once per row)."""
+    rec = _CARD_RECORDS.get(row)
+    if rec is not None:
+        return rec
+    cards = _ARTIFACT.cards
+    color_id = cards.at[row, COLOR_IDENTITY_COL]
+    mana_cost = cards.at[row, MANA_COST_COL]
+    rec = {
+        "name": cards.at[row, NAME_COL],
+        "color_identity": color_id,
+        "tags": _ARTIFACT.tags_for_card(row),
+        "mana_cost": mana_cost,
+        "rarity": _normalize_rarity(cards.at[row, RARITY_COL]),
+        "type_line": cards.at[row, TYPE_COL],
+        "color_identity_list": [c.strip() for c in color_id.split(',') if c.strip()],
+        "pip_colors": [c for c in mana_cost if c in {"W", "U", "B", "R", "G"}],
+    }
+    _CARD_RECORDS[row] = rec
+    return rec
+
+
 def get_tag_pool(tag: str) -> List[Dict[str, Any]]:
-    return _CARD_INDEX.get(tag, [])
+    pool = _CARD_INDEX.get(tag)
+    if pool is not None:
+        return pool
+    if _ARTIFACT is None:
+        return []
+    rows = _ARTIFACT.card_ids_for_tag(tag)
+    if not len(rows):
+        return []
+    pool = [_card_record(r) for r in rows.tolist()]
+    _CARD_INDEX[tag] = pool
+    return pool
 
 
 def lookup_card(name: str) -> Optional[Dict[str, Any]]:
     """O(1) lookup of a card dict by name. Returns None if not found."""
-    return _NAME_INDEX.get(name.lower().strip()) if name else None
+    if not name:
+        return None
+    key = name.lower().strip()
+    result = _NAME_INDEX.get(key)
+    if result is None and _ARTIFACT is not None:
+        row = _ROW_BY_NAME.get(key)
+        if row is not None:
+            result = _card_record(row)
+            _NAME_INDEX[key] = result
+    return result
 
 
 def lookup_commander(name: Optional[str]) -> Optional[Dict[str, Any]]:
     if not name:
         return None
     # Fast path via name index
-    result = _NAME_INDEX.get(name.lower().strip())
+    result = lookup_card(name)
     if result is not None:
         return result
     # Fallback: full scan (handles index not yet built)
@@ -33,10 +33,18 @@ from dataclasses import dataclass, field
 from difflib import SequenceMatcher
 from typing import Any, Dict, List, Optional, Set, Tuple
 
+import numpy as np
 import pandas as pd
 
 from code.deck_builder.builder_utils import parse_theme_tags
 from code.path_util import card_files_processed_dir
+from code.web.services.card_search_index import (
+    POPCOUNT,
+    CardSearchIndex,
+    color_letters_to_bits,
+    register_search_frame,  # noqa: F401 -- re-exported for callers that load base frames
+    resolve_search_positions,
+)
 
 
 def parse_color_cell(raw: Any) -> set:
@@ -187,6 +195,29 @@ class ParsedSearch:
     notices: List[str] = field(default_factory=list)
 
 
+def _key_value(value: Any) -> Any:
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(_key_value(v) for v in value))
+    if isinstance(value, Counter):
+        return tuple(sorted(value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_key_value(v) for v in value)
+    if hasattr(value, "__dataclass_fields__"):
+        return (type(value).__name__,) + tuple(
+            _key_value(getattr(value, name)) for name in value.__dataclass_fields__
+        )
+    return value
+
+
+def parsed_search_key(parsed: ParsedSearch) -> Tuple[Any, ...]:
+    """Hashable, order-normalized form of `parsed` (minus `notices`) for result caching."""
+    return tuple(
+        (name, _key_value(getattr(parsed, name)))
+        for name in ParsedSearch.__dataclass_fields__
+        if name != "notices"
+    )
+
+
 def _parse_color_value(value: str) -> Tuple[Set[str], Optional[int], Optional[str]]:
     """Parse a color/identity flag value into (letters, count, special).
     Only one of the three will be populated -- e.g. `c` (colorless), `m`
@@ -250,9 +281,52 @@ def _color_matches(card_letters: Set[str], clause: ColorClause) -> bool:
     return (not matched) if clause.negate else matched
 
 
+def _color_clause_mask(bits: np.ndarray, clause: ColorClause) -> np.ndarray:
+    """Vectorized `_color_matches` over 5-bit color masks."""
+    if clause.special == "colorless":
+        matched = bits == 0
+    elif clause.special == "multicolor":
+        matched = POPCOUNT[bits] >= 2
+    elif clause.count is not None:
+        matched = _compare_numeric(POPCOUNT[bits], clause.op, clause.count)
+        if not isinstance(matched, np.ndarray):
+            matched = np.zeros(len(bits), dtype=bool)
+    else:
+        req = np.uint8(color_letters_to_bits(clause.letters))
+        superset = (bits & req) == req
+        subset = (bits & ~req) == 0
+        op = clause.op
+        if op in (":", "="):
+            matched = bits == req
+        elif op == ">=":
+            matched = superset
+        elif op == "<=":
+            matched = subset
+        elif op == ">":
+            matched = superset & (bits != req)
+        elif op == "<":
+            matched = subset & (bits != req)
+        elif op == "!=":
+            matched = bits != req
+        else:
+            matched = np.zeros(len(bits), dtype=bool)
+    return ~matched if clause.negate else matched
+
+
+def _color_mask(index: CardSearchIndex, pos: np.ndarray, column: str, clauses: List[ColorClause]) -> np.ndarray:
+    bits = index.color_bits(column)[pos]
+    mask = np.ones(len(pos), dtype=bool)
+    for clause in clauses:
+        mask &= _color_clause_mask(bits, clause)
+    return mask
+
+
 def apply_color_clauses(df: "pd.DataFrame", column: str, clauses: List[ColorClause]) -> "pd.DataFrame":
     if not clauses or column not in df.columns:
         return df
+    hit = resolve_search_positions(df)
+    if hit is not None:
+        return df[_color_mask(hit[0], hit[1], column, clauses)]
 
     def _row_matches(raw: Any) -> bool:
         card_letters = parse_color_cell(raw)
@@ -261,12 +335,48 @@ def apply_color_clauses(df: "pd.DataFrame", column: str, clauses: List[ColorClau
     return df[df[column].apply(_row_matches)]
 
 
+def _numeric_mask(index: CardSearchIndex, pos: np.ndarray, column: str, clauses: List[NumericClause]) -> np.ndarray:
+    """Vectorized `apply_numeric_clauses`; NaN (non-numeric) values never
+    compare true, except under `!=` -- same as the pandas path."""
+    numeric = index.numeric(column)[pos]
+    mask = np.ones(len(pos), dtype=bool)
+    for clause in clauses:
+        other = index.numeric(clause.compare_to)[pos] if clause.compare_to else clause.value
+        clause_mask = _compare_numeric(numeric, clause.op, other)
+        if not isinstance(clause_mask, np.ndarray):
+            clause_mask = np.zeros(len(pos), dtype=bool)
+        mask &= ~clause_mask if clause.negate else clause_mask
+    return mask
+
+
+def color_subset_mask(df: "pd.DataFrame", column: str, letters: Set[str], allow_colorless: bool) -> np.ndarray:
+    """Boolean mask of rows whose `column` colors are a non-empty subset of
+    `letters` (colorless rows only when `allow_colorless`) -- the REST API's
+    explicit `colors=` chip filter."""
+    hit = resolve_search_positions(df)
+    if hit is not None:
+        bits = hit[0].color_bits(column)[hit[1]]
+        req = np.uint8(color_letters_to_bits(letters))
+        return np.where(bits == 0, allow_colorless, (bits & ~req) == 0)
+
+    def _matches(raw: Any) -> bool:
+        card_colors = parse_color_cell(raw)
+        if not card_colors:
+            return allow_colorless
+        return card_colors.issubset(letters)
+
+    return df[column].apply(_matches).to_numpy(dtype=bool)
+
+
 def apply_numeric_clauses(df: "pd.DataFrame", column: str, clauses: List[NumericClause]) -> "pd.DataFrame":
     """Filter `df` by numeric comparisons on `column`, coercing non-numeric
     values (e.g. "*" power/toughness) to NaN and excluding them. Supports
     cross-field comparisons like `pow>tou` via `compare_to`."""
     if not clauses or column not in df.columns:
         return df
+    hit = resolve_search_positions(df)
+    if hit is not None and all(not c.compare_to or c.compare_to in df.columns for c in clauses):
+        return df[_numeric_mask(hit[0], hit[1], column, clauses)]
     numeric = pd.to_numeric(df[column], errors="coerce")
     mask = pd.Series(True, index=df.index)
     for clause in clauses:
@@ -356,9 +466,52 @@ def _mana_cost_matches(cost: Any, clause: ManaCostClause) -> bool:
     return (not matched) if clause.negate else matched
 
 
+def _mana_cost_clause_table(generic: np.ndarray, pips: np.ndarray, symbols: Dict[str, int], clause: ManaCostClause) -> np.ndarray:
+    """Evaluate one clause against every unique mana cost at once."""
+    query_pips = np.zeros(len(symbols), dtype=np.int32)
+    unknown = False  # query needs a symbol no card cost has
+    for sym, count in clause.symbols.items():
+        if sym in symbols:
+            query_pips[symbols[sym]] = count
+        elif count > 0:
+            unknown = True
+    card_covers_query = (generic >= clause.generic) & np.all(pips >= query_pips, axis=1)
+    if unknown:
+        card_covers_query[:] = False
+    query_covers_card = (generic <= clause.generic) & np.all(pips <= query_pips, axis=1)
+    equal = (generic == clause.generic) & np.all(pips == query_pips, axis=1) & (not unknown)
+    op = clause.op
+    if op in (":", ">="):
+        matched = card_covers_query
+    elif op == ">":
+        matched = card_covers_query & ~equal
+    elif op == "<=":
+        matched = query_covers_card
+    elif op == "<":
+        matched = query_covers_card & ~equal
+    elif op == "=":
+        matched = equal
+    elif op == "!=":
+        matched = ~equal
+    else:
+        matched = np.zeros(len(generic), dtype=bool)
+    return ~matched if clause.negate else matched
+
+
+def _mana_cost_mask(index: CardSearchIndex, pos: np.ndarray, clauses: List[ManaCostClause]) -> np.ndarray:
+    mana = index.mana()
+    table = np.ones(len(mana.generic), dtype=bool)
+    for clause in clauses:
+        table &= _mana_cost_clause_table(mana.generic, mana.pips, mana.symbols, clause)
+    return table[mana.codes[pos]]
+
+
 def apply_mana_cost_clauses(df: "pd.DataFrame", clauses: List[ManaCostClause]) -> "pd.DataFrame":
     if not clauses or "manaCost" not in df.columns:
         return df
+    hit = resolve_search_positions(df)
+    if hit is not None:
+        return df[_mana_cost_mask(hit[0], hit[1], clauses)]
     return df[df["manaCost"].apply(lambda raw: all(_mana_cost_matches(raw, c) for c in clauses))]
 
 
@@ -533,9 +686,13 @@ def _load_printings_index_df() -> Optional["pd.DataFrame"]:
         return _PRINTINGS_INDEX_DF
     try:
         path = os.path.join(card_files_processed_dir(), "card_printings.parquet")
-        _PRINTINGS_INDEX_DF = pd.read_parquet(
+        printings = pd.read_parquet(
             path, columns=["face_name", "set", "collector_number", "scryfall_id", "score", "released_at"]
         )
+        # Precomputed once so `cn:` clauses compare columns instead of
+        # re-parsing every collector number per query.
+        printings["_cn_norm"], printings["_cn_num"] = _collector_number_columns(printings["collector_number"])
+        _PRINTINGS_INDEX_DF = printings
     except Exception:
         _PRINTINGS_INDEX_DF = None
     _PRINTINGS_INDEX_LOADED = True
@@ -556,12 +713,23 @@ def _collector_number_normalized(value: str) -> str:
     return (m.group(1) + m.group(2)) if m else s
 
 
+def _collector_number_columns(raw: "pd.Series") -> Tuple["pd.Series", "pd.Series"]:
+    """Vectorized `_collector_number_normalized` / `_collector_number_numeric_prefix`."""
+    stripped = raw.astype(str).str.strip()
+    parts = stripped.str.extract(r"^0*(\d+)(.*)$")
+    matched = parts[0].notna()
+    normalized = stripped.where(~matched, parts[0].fillna("") + parts[1].fillna(""))
+    numeric = pd.to_numeric(parts[0], errors="coerce")
+    return normalized, numeric
+
+
 def _collector_number_match_mask(subset: "pd.DataFrame", clauses: List[CollectorNumberClause]) -> "pd.Series":
     """Boolean mask over a `card_printings.parquet` slice (`subset`) marking
     rows satisfying every clause in `clauses` (ANDed)."""
-    actual_raw = subset["collector_number"].astype(str)
-    actual_norm = actual_raw.apply(_collector_number_normalized)
-    actual_num = actual_raw.apply(_collector_number_numeric_prefix)
+    if "_cn_norm" in subset.columns:
+        actual_norm, actual_num = subset["_cn_norm"], subset["_cn_num"]
+    else:
+        actual_norm, actual_num = _collector_number_columns(subset["collector_number"])
 
     mask = pd.Series(True, index=subset.index)
     for clause in clauses:
@@ -776,6 +944,29 @@ def parse_search_query(q: str) -> ParsedSearch:
     return parsed
 
 
+def _structured_mask(df: "pd.DataFrame", index: CardSearchIndex, pos: np.ndarray, parsed: ParsedSearch) -> np.ndarray:
+    """Color/identity, numeric and mana cost clauses of `parsed` as one mask."""
+    mask = np.ones(len(pos), dtype=bool)
+    for column, clauses in (("colors", parsed.color_clauses), ("colorIdentity", parsed.identity_clauses)):
+        if clauses and column in df.columns:
+            mask &= _color_mask(index, pos, column, clauses)
+    for column, clauses in (
+        ("power", parsed.power_clauses),
+        ("toughness", parsed.toughness_clauses),
+        ("loyalty", parsed.loyalty_clauses),
+        ("manaValue", parsed.cmc_clauses),
+    ):
+        if not clauses or column not in df.columns:
+            continue
+        if all(not c.compare_to or c.compare_to in df.columns for c in clauses):
+            mask &= _numeric_mask(index, pos, column, clauses)
+        else:
+            mask &= df.index.isin(apply_numeric_clauses(df, column, clauses).index)
+    if parsed.mana_cost_clauses and "manaCost" in df.columns:
+        mask &= _mana_cost_mask(index, pos, parsed.mana_cost_clauses)
+    return mask
+
+
 def apply_parsed_search(df: "pd.DataFrame", parsed: ParsedSearch) -> "pd.DataFrame":
     """Apply every clause of a `ParsedSearch` to `df` (name/type/oracle text,
     colors/identity, power/toughness/loyalty/mana value, mana cost). Does
@@ -783,6 +974,13 @@ def apply_parsed_search(df: "pd.DataFrame", parsed: ParsedSearch) -> "pd.DataFra
     those, or apply explicit query params separately (see `list_cards` in
     `api_v1/cards.py` for that pattern)."""
     df = apply_name_clauses(df, parsed.name_include, parsed.name_exclude)
+    hit = resolve_search_positions(df)
+    if hit is not None:
+        # Every non-text clause as one combined mask; the regex text clauses
+        # then only scan the surviving rows.
+        df = df[_structured_mask(df, hit[0], hit[1], parsed)]
+        df = apply_text_clauses(df, "type", parsed.type_include, parsed.type_exclude)
+        return apply_text_clauses(df, "text", parsed.oracle_include, parsed.oracle_exclude)
     df = apply_text_clauses(df, "type", parsed.type_include, parsed.type_exclude)
     df = apply_text_clauses(df, "text", parsed.oracle_include, parsed.oracle_exclude)
     df = apply_color_clauses(df, "colors", parsed.color_clauses)
@@ -795,39 +993,66 @@ def apply_parsed_search(df: "pd.DataFrame", parsed: ParsedSearch) -> "pd.DataFra
     return df
 
 
+def _family_mask(family: "Any", pos: np.ndarray, include: Optional[Set[str]], exclude: Optional[Set[str]]) -> np.ndarray:
+    """AND over `include` (card has every tag), minus any card holding an `exclude` tag."""
+    mask = np.ones(family.num_rows, dtype=bool)
+    for tag in include or ():
+        mask &= family.mask(tag)
+    for tag in exclude or ():
+        mask[family.rows_for(tag)] = False
+    return mask[pos]
+
+
+def apply_tag_clauses(
+    df: "pd.DataFrame", column: str, include: Optional[Set[str]], exclude: Optional[Set[str]]
+) -> "pd.DataFrame":
+    """Filter by normalized tag values (see `normalize_word_sep`) in a tag
+    list column (`themeTags`/`artTags`/`metadataTags`): a card must carry
+    every `include` tag and none of the `exclude` tags."""
+    if not (include or exclude) or column not in df.columns:
+        return df
+    hit = resolve_search_positions(df)
+    if hit is not None:
+        return df[_family_mask(hit[0].tag_family(column), hit[1], include, exclude)]
+    card_tag_sets = df[column].apply(lambda v: {normalize_word_sep(t) for t in parse_theme_tags(v)})
+    if include:
+        df = df[card_tag_sets.loc[df.index].apply(lambda card_tags: all(tag in card_tags for tag in include))]
+    if exclude:
+        df = df[card_tag_sets.loc[df.index].apply(lambda card_tags: not any(tag in card_tags for tag in exclude))]
+    return df
+
+
+def apply_set_clauses(df: "pd.DataFrame", include: Set[str], exclude: Set[str]) -> "pd.DataFrame":
+    """Filter by set codes appearing as whole words in the `printings` column."""
+    if not (include or exclude) or "printings" not in df.columns:
+        return df
+    hit = resolve_search_positions(df)
+    if hit is not None:
+        return df[_family_mask(hit[0].set_family(), hit[1], include, exclude)]
+    for code in include:
+        df = df[df["printings"].astype(str).str.contains(rf"\b{re.escape(code)}\b", na=False, regex=True)]
+    for code in exclude:
+        df = df[~df["printings"].astype(str).str.contains(rf"\b{re.escape(code)}\b", na=False, regex=True)]
+    return df
+
+
 def apply_extra_clauses(df: "pd.DataFrame", parsed: ParsedSearch) -> "pd.DataFrame":
     """Apply the `rarity`/`tag`/`is:new`/`set` flags parsed out of a search
     box -- separate from `apply_parsed_search` since some callers (the
     public REST API) apply their own explicit `rarity=`/`tags=`/`is_new=`
     query params instead and don't want the `q` flags double-applied."""
     if parsed.rarity and "rarity" in df.columns:
-        df = df[df["rarity"].astype(str).str.lower().isin(parsed.rarity)]
-    if (parsed.tags or parsed.tags_exclude) and "themeTags" in df.columns:
-        card_tag_sets = df["themeTags"].apply(lambda v: {normalize_word_sep(t) for t in parse_theme_tags(v)})
-        if parsed.tags:
-            df = df[card_tag_sets.loc[df.index].apply(lambda card_tags: all(tag in card_tags for tag in parsed.tags))]
-        if parsed.tags_exclude:
-            df = df[card_tag_sets.loc[df.index].apply(lambda card_tags: not any(tag in card_tags for tag in parsed.tags_exclude))]
-    if (parsed.art_tags or parsed.art_tags_exclude) and "artTags" in df.columns:
-        art_tag_sets = df["artTags"].apply(lambda v: {normalize_word_sep(t) for t in parse_theme_tags(v)})
-        if parsed.art_tags:
-            df = df[art_tag_sets.loc[df.index].apply(lambda card_tags: all(tag in card_tags for tag in parsed.art_tags))]
-        if parsed.art_tags_exclude:
-            df = df[art_tag_sets.loc[df.index].apply(lambda card_tags: not any(tag in card_tags for tag in parsed.art_tags_exclude))]
-    if (parsed.metadata_tags or parsed.metadata_tags_exclude) and "metadataTags" in df.columns:
-        metadata_tag_sets = df["metadataTags"].apply(lambda v: {normalize_word_sep(t) for t in parse_theme_tags(v)})
-        if parsed.metadata_tags:
-            df = df[metadata_tag_sets.loc[df.index].apply(lambda card_tags: all(tag in card_tags for tag in parsed.metadata_tags))]
-        if parsed.metadata_tags_exclude:
-            df = df[metadata_tag_sets.loc[df.index].apply(lambda card_tags: not any(tag in card_tags for tag in parsed.metadata_tags_exclude))]
+        hit = resolve_search_positions(df)
+        if hit is not None:
+            df = df[np.isin(hit[0].lower("rarity")[hit[1]], list(parsed.rarity))]
+        else:
+            df = df[df["rarity"].astype(str).str.lower().isin(parsed.rarity)]
+    df = apply_tag_clauses(df, "themeTags", parsed.tags, parsed.tags_exclude)
+    df = apply_tag_clauses(df, "artTags", parsed.art_tags, parsed.art_tags_exclude)
+    df = apply_tag_clauses(df, "metadataTags", parsed.metadata_tags, parsed.metadata_tags_exclude)
     if parsed.is_new is not None and "isNew" in df.columns:
         df = df[df["isNew"] == parsed.is_new]
-    if parsed.set_include and "printings" in df.columns:
-        for code in parsed.set_include:
-            df = df[df["printings"].astype(str).str.contains(rf"\b{re.escape(code)}\b", na=False, regex=True)]
-    if parsed.set_exclude and "printings" in df.columns:
-        for code in parsed.set_exclude:
-            df = df[~df["printings"].astype(str).str.contains(rf"\b{re.escape(code)}\b", na=False, regex=True)]
+    df = apply_set_clauses(df, parsed.set_include, parsed.set_exclude)
     if parsed.collector_number_clauses:
         if not parsed.set_include:
             parsed.notices.append("cn:/number: requires a set: filter and was ignored.")
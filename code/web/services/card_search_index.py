@@ -0,0 +1,305 @@
+"""Precomputed columnar features for `card_search` clause filtering.
+
+`card_search.apply_*` used to run a Python `.apply` over the frame for every
+color, mana cost and tag clause on every query. A `CardSearchIndex` derives
+the per-card features once per base frame (the card browser / REST API
+`AllCardsLoader` frame, a manual-build session's card pool):
+
+* colors / color identity as 5-bit masks (W=1 U=2 B=4 R=8 G=16);
+* numeric power / toughness / loyalty / mana value (NaN for `*`, `X`, ...);
+* mana costs factorized to unique strings, each with its generic total and
+  a per-symbol pip count matrix (W, U, B, R, G, C, hybrids, ...);
+* a tag -> rows CSR for each tag family (`themeTags`, `artTags`,
+  `metadataTags`) plus set codes from `printings`;
+* lowercased rarity.
+
+Frames are registered with `register_search_frame(df)` (cheap: features are
+built lazily, one at a time, on first use). `resolve_search_positions(df)`
+maps a frame — the registered base itself or any row subset derived from
+it, as long as its index labels and names still line up — to row positions
+in the base, so every clause compiles to a NumPy mask. Unregistered frames
+return `None` and callers keep their per-row fallback.
+
+Public API:
+    register_search_frame(df) -> CardSearchIndex
+    resolve_search_positions(df) -> (CardSearchIndex, positions) | None
+    CardSearchIndex.color_bits(column) / numeric(column) / lower(column)
+    CardSearchIndex.mana() -> ManaFeatures
+    CardSearchIndex.tag_family(column) / set_family() -> TagFamily
+"""
+from __future__ import annotations
+
+import re
+import threading
+import uuid
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+COLOR_BITS: Dict[str, int] = {"W": 1, "U": 2, "B": 4, "R": 8, "G": 16}
+POPCOUNT = np.array([bin(i).count("1") for i in range(32)], dtype=np.int8)
+
+# A handful of live bases at most: the card browser and REST API loader
+# frames plus recently searched manual-build pools.
+_MAX_BASES = 8
+
+_SET_TOKEN_RE = re.compile(r"\w+")
+
+
+def _factorize(series: pd.Series) -> Tuple[np.ndarray, List[Any]]:
+    """`pd.factorize` with a per-row fallback for unhashable cells (lists)."""
+    try:
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        return codes, list(uniques)
+    except TypeError:
+        values = series.tolist()
+        return np.arange(len(values)), values
+
+
+def color_letters_to_bits(letters: "set[str] | frozenset[str]") -> int:
+    bits = 0
+    for letter in letters:
+        bits |= COLOR_BITS.get(letter, 0)
+    return bits
+
+
+@dataclass
+class TagFamily:
+    """Inverted CSR: rows holding tag ``i`` are ``rows[offsets[i]:offsets[i+1]]``."""
+
+    ids: Dict[str, int]
+    offsets: np.ndarray
+    rows: np.ndarray
+    num_rows: int
+
+    def rows_for(self, tag: str) -> np.ndarray:
+        i = self.ids.get(tag)
+        if i is None:
+            return self.rows[:0]
+        return self.rows[self.offsets[i]:self.offsets[i + 1]]
+
+    def mask(self, tag: str) -> np.ndarray:
+        out = np.zeros(self.num_rows, dtype=bool)
+        out[self.rows_for(tag)] = True
+        return out
+
+    @classmethod
+    def from_row_sets(cls, row_sets: List[Any]) -> "TagFamily":
+        ids: Dict[str, int] = {}
+        pairs_tag: List[int] = []
+        pairs_row: List[int] = []
+        for row, tags in enumerate(row_sets):
+            for tag in tags:
+                i = ids.get(tag)
+                if i is None:
+                    i = ids[tag] = len(ids)
+                pairs_tag.append(i)
+                pairs_row.append(row)
+        tag_arr = np.asarray(pairs_tag, dtype=np.int32)
+        row_arr = np.asarray(pairs_row, dtype=np.int32)
+        order = np.argsort(tag_arr, kind="stable")  # rows stay ascending within a tag
+        counts = np.bincount(tag_arr, minlength=len(ids)) if len(ids) else np.zeros(0, dtype=np.int64)
+        offsets = np.zeros(len(ids) + 1, dtype=np.int64)
+        np.cumsum(counts, out=offsets[1:])
+        return cls(ids=ids, offsets=offsets, rows=row_arr[order], num_rows=len(row_sets))
+
+
+@dataclass
+class ManaFeatures:
+    """Mana costs factorized to unique values.
+
+    ``codes[row]`` indexes the unique-cost tables: ``generic[u]`` is the
+    generic total, ``pips[u, symbols[sym]]`` the count of each other symbol.
+    """
+
+    codes: np.ndarray
+    generic: np.ndarray
+    pips: np.ndarray
+    symbols: Dict[str, int]
+
+
+class CardSearchIndex:
+    """Lazily built columnar features over one base frame."""
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        self._frame_ref = weakref.ref(df)
+        self.num_rows = len(df)
+        self.columns = frozenset(df.columns)
+        self.names = df["name"].to_numpy(dtype=object) if "name" in df.columns else None
+        self._range_index = isinstance(df.index, pd.RangeIndex) and df.index.start == 0 and df.index.step == 1
+        self._lock = threading.Lock()
+        self._features: Dict[Tuple[str, str], Any] = {}
+
+    # -- position resolution ---------------------------------------------
+
+    def positions_for(self, df: pd.DataFrame) -> Optional[np.ndarray]:
+        """Row positions of ``df`` in the base frame, or ``None`` if ``df`` is not a subset of it."""
+        base = self._frame_ref()
+        if base is None or self.names is None or "name" not in df.columns:
+            return None
+        if df is base and len(df) == self.num_rows:
+            return np.arange(self.num_rows)
+        if len(df) > self.num_rows:
+            return None
+        if self._range_index:
+            labels = df.index.to_numpy()
+            if labels.dtype.kind not in "iu":
+                return None
+            if len(labels) and (labels.min() < 0 or labels.max() >= self.num_rows):
+                return None
+            pos = labels.astype(np.int64, copy=False)
+        else:
+            try:
+                pos = base.index.get_indexer(df.index)
+            except Exception:
+                return None
+            if (pos < 0).any():
+                return None
+        if not np.array_equal(self.names[pos], df["name"].to_numpy(dtype=object)):
+            return None
+        return pos
+
+    # -- features -----------------------------------------------------------
+
+    def _feature(self, kind: str, column: str, build: Callable[[pd.DataFrame], Any]) -> Any:
+        key = (kind, column)
+        value = self._features.get(key)
+        if value is not None:
+            return value
+        with self._lock:
+            value = self._features.get(key)
+            if value is None:
+                base = self._frame_ref()
+                if base is None:
+                    raise LookupError("search index base frame is gone")
+                value = build(base)
+                self._features[key] = value
+        return value
+
+    def color_bits(self, column: str) -> np.ndarray:
+        def _build(base: pd.DataFrame) -> np.ndarray:
+            from .card_search import parse_color_cell
+
+            codes, uniques = _factorize(base[column])
+            table = np.array([color_letters_to_bits(parse_color_cell(v)) for v in uniques] or [0], dtype=np.uint8)
+            out = np.zeros(len(base), dtype=np.uint8)
+            valid = codes >= 0
+            out[valid] = table[codes[valid]]
+            return out
+
+        return self._feature("colors", column, _build)
+
+    def numeric(self, column: str) -> np.ndarray:
+        return self._feature(
+            "numeric", column,
+            lambda base: pd.to_numeric(base[column], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan),
+        )
+
+    def lower(self, column: str) -> np.ndarray:
+        return self._feature(
+            "lower", column, lambda base: base[column].astype(str).str.lower().to_numpy(dtype=object)
+        )
+
+    def mana(self) -> ManaFeatures:
+        def _build(base: pd.DataFrame) -> ManaFeatures:
+            from .card_search import parse_mana_cost
+
+            codes, uniques = _factorize(base["manaCost"])
+            parsed = [parse_mana_cost(v) for v in uniques]
+            # NaN/missing costs parse like an empty cost: one extra table row
+            parsed.append(parse_mana_cost(""))
+            codes = np.where(codes >= 0, codes, len(parsed) - 1).astype(np.int32)
+            symbols: Dict[str, int] = {}
+            for _, counter in parsed:
+                for sym in counter:
+                    symbols.setdefault(sym, len(symbols))
+            pips = np.zeros((len(parsed), len(symbols)), dtype=np.int16)
+            generic = np.zeros(len(parsed), dtype=np.int32)
+            for u, (gen, counter) in enumerate(parsed):
+                generic[u] = gen
+                for sym, count in counter.items():
+                    pips[u, symbols[sym]] = count
+            return ManaFeatures(codes=codes, generic=generic, pips=pips, symbols=symbols)
+
+        return self._feature("mana", "manaCost", _build)
+
+    def tag_family(self, column: str) -> TagFamily:
+        def _build(base: pd.DataFrame) -> TagFamily:
+            from code.deck_builder.builder_utils import parse_theme_tags
+
+            from .card_search import normalize_word_sep
+
+            return TagFamily.from_row_sets(
+                [{normalize_word_sep(t) for t in parse_theme_tags(v)} for v in base[column].tolist()]
+            )
+
+        return self._feature("tags", column, _build)
+
+    def set_family(self) -> TagFamily:
+        return self._feature(
+            "sets", "printings",
+            lambda base: TagFamily.from_row_sets(
+                [set(_SET_TOKEN_RE.findall(str(v))) for v in base["printings"].astype(str).tolist()]
+            ),
+        )
+
+
+# Registered bases stamp a token into `DataFrame.attrs`, which pandas carries
+# over to filtered/copied frames, so a subset always resolves to the base it
+# was derived from (a manual-build pool shares labels and names with the
+# loader frame it was cut from but not its merged multi-face rows).
+ATTRS_KEY = "_card_search_index"
+
+_registry_lock = threading.RLock()
+_REGISTRY: "OrderedDict[str, Tuple[weakref.ref, CardSearchIndex]]" = OrderedDict()
+
+
+def _forget(token: str) -> None:
+    with _registry_lock:
+        _REGISTRY.pop(token, None)
+
+
+def register_search_frame(df: pd.DataFrame) -> CardSearchIndex:
+    """Register ``df`` as a base frame for vectorized search (idempotent)."""
+    with _registry_lock:
+        token = df.attrs.get(ATTRS_KEY)
+        entry = _REGISTRY.get(token) if isinstance(token, str) else None
+        if entry is not None and entry[0]() is df:
+            _REGISTRY.move_to_end(token)
+            return entry[1]
+        token = uuid.uuid4().hex
+        df.attrs[ATTRS_KEY] = token
+        index = CardSearchIndex(df)
+        _REGISTRY[token] = (weakref.ref(df, lambda _ref, t=token: _forget(t)), index)
+        while len(_REGISTRY) > _MAX_BASES:
+            _REGISTRY.popitem(last=False)
+        return index
+
+
+_last_hit = threading.local()
+
+
+def resolve_search_positions(df: pd.DataFrame) -> Optional[Tuple[CardSearchIndex, np.ndarray]]:
+    """Find the registered base ``df`` was derived from and its row positions.
+
+    The last hit per thread is remembered so the several clause helpers a
+    single query runs over the same frame only verify it once.
+    """
+    last = getattr(_last_hit, "entry", None)
+    if last is not None and last[0]() is df and last[1] is df.index and last[2]._frame_ref() is not None:
+        return last[2], last[3]
+    token = df.attrs.get(ATTRS_KEY)
+    with _registry_lock:
+        entry = _REGISTRY.get(token) if isinstance(token, str) else None
+    if entry is None or entry[0]() is None:
+        return None
+    index = entry[1]
+    pos = index.positions_for(df)
+    if pos is None:
+        return None
+    _last_hit.entry = (weakref.ref(df), df.index, index, pos)
+    return index, pos
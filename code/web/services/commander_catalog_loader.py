@@ -6,6 +6,10 @@ Responsibilities
 - Produce deterministic commander records with rich metadata (slug, colors,
   partner/background flags, theme tags, Scryfall image URLs).
 - Cache the parsed catalog and invalidate on file timestamp changes.
+- Persist the normalized catalog as a columnar artifact
+  (``commander_catalog.parquet`` next to all_cards.parquet, written at tagging
+  time) so web workers load records and search columns without re-parsing
+  every commander row.
 
 M4: Updated to load from all_cards.parquet instead of commander_cards.csv.
 The loader uses pandas to filter commanders (isCommander == True) from the
@@ -14,19 +18,27 @@ unified Parquet data source.
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from pathlib import Path
-from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 import ast
+import json
 import os
 import re
 from urllib.parse import quote
 
+import numpy as np
+
 from deck_builder.partner_background_utils import analyze_partner_background
 
 __all__ = [
     "CommanderRecord",
     "CommanderCatalog",
+    "CommanderColumns",
+    "commander_columns",
+    "commander_name_candidates",
+    "emit_commander_catalog_artifact",
+    "normalize_search_text",
     "load_commander_catalog",
     "clear_commander_catalog_cache",
     "find_commander_record",
@@ -52,6 +64,17 @@ _COLOR_ALIAS = {
 _WUBRG_ORDER: Tuple[str, ...] = ("W", "U", "B", "R", "G")
 _SCYRFALL_BASE = "https://api.scryfall.com/cards/named?format=image"
 _THEME_ESCAPE_PATTERN = re.compile(r"\\([+/\\-])")
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+ARTIFACT_VERSION = 1
+ARTIFACT_FILE = "commander_catalog.parquet"
+_ARTIFACT_META_KEY = b"commander_catalog"
+# all_cards.parquet columns read when building records
+SOURCE_COLUMNS = [
+    "name", "faceName", "side", "colorIdentity", "colors", "manaCost", "manaValue", "type",
+    "creatureTypes", "text", "power", "toughness", "keywords", "themeTags", "edhrecRank",
+    "layout", "partnerWith", "isCommander",
+]
 
 
 @dataclass(frozen=True, slots=True)
@@ -92,6 +115,29 @@ class CommanderRecord:
     search_haystack: str
 
 
+_TUPLE_FIELDS = frozenset(f.name for f in fields(CommanderRecord) if str(f.type).startswith("Tuple"))
+_RECORD_FIELDS = tuple(f.name for f in fields(CommanderRecord))
+
+
+@dataclass(frozen=True, slots=True)
+class CommanderColumns:
+    """Search fields for a catalog as arrays aligned with its entries.
+
+    ``theme_offsets``/``theme_ids`` are a CSR mapping from record position to
+    ids in ``theme_vocab`` (normalized theme text), so a theme query is scored
+    once per distinct theme instead of once per record.
+    """
+
+    color_codes: np.ndarray
+    sort_names: np.ndarray
+    name_candidates: Tuple[Tuple[str, ...], ...]
+    theme_vocab: Tuple[str, ...]
+    theme_offsets: np.ndarray
+    theme_ids: np.ndarray
+    theme_options: Tuple[str, ...]
+    color_options: Tuple[str, ...]
+
+
 @dataclass(frozen=True, slots=True)
 class CommanderCatalog:
     """Cached commander catalog with lookup helpers."""
@@ -102,12 +148,93 @@ class CommanderCatalog:
     size: int
     entries: Tuple[CommanderRecord, ...]
     by_slug: Mapping[str, CommanderRecord]
+    columns: Optional[CommanderColumns] = None
 
     def get(self, slug: str) -> Optional[CommanderRecord]:
         return self.by_slug.get(slug)
 
 
 _CACHE: Dict[str, CommanderCatalog] = {}
+# id(entries) -> (entries, columns) for catalogs assembled without columns (tests, fakes)
+_COLUMNS_CACHE: Dict[int, Tuple[Sequence[CommanderRecord], CommanderColumns]] = {}
+
+
+def normalize_search_text(value: str | None) -> str:
+    """Lowercase alphanumeric tokens joined by single spaces (commander search form)."""
+    if not value:
+        return ""
+    tokens = _WORD_PATTERN.findall(value.lower())
+    if not tokens:
+        return ""
+    return " ".join(tokens)
+
+
+def _record_color_code(record: CommanderRecord) -> str:
+    code = record.color_identity_key or ""
+    if not code and record.is_colorless:
+        return "C"
+    return code
+
+
+def commander_name_candidates(record: CommanderRecord) -> Tuple[str, ...]:
+    """Distinct normalized display/face/raw names used for commander name search."""
+    candidates: List[str] = []
+    for raw in (record.display_name, record.face_name, record.name):
+        normalized = normalize_search_text(raw)
+        if normalized and normalized not in candidates:
+            candidates.append(normalized)
+    return tuple(candidates)
+
+
+def _columns_from_parts(
+    color_codes: Sequence[str],
+    sort_names: Sequence[str],
+    name_candidates: Sequence[Sequence[str]],
+    theme_norms: Sequence[Sequence[str]],
+    theme_labels: Iterable[str],
+) -> CommanderColumns:
+    lengths = np.fromiter((len(t) for t in theme_norms), dtype=np.int64, count=len(theme_norms))
+    offsets = np.zeros(len(theme_norms) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    flat = [t for themes in theme_norms for t in themes]
+    if flat:
+        vocab, ids = np.unique(np.asarray(flat, dtype=object), return_inverse=True)
+    else:
+        vocab, ids = np.asarray([], dtype=object), np.asarray([], dtype=np.int64)
+    codes = np.asarray(list(color_codes), dtype=object)
+    labels = sorted({t for t in theme_labels if t}, key=lambda name: name.lower())
+    return CommanderColumns(
+        color_codes=codes,
+        sort_names=np.asarray(list(sort_names), dtype=object),
+        name_candidates=tuple(tuple(c) for c in name_candidates),
+        theme_vocab=tuple(str(v) for v in vocab),
+        theme_offsets=offsets,
+        theme_ids=np.asarray(ids, dtype=np.int64).reshape(-1),
+        theme_options=tuple(labels),
+        color_options=tuple(sorted({str(c) for c in codes if c})),
+    )
+
+
+def _build_columns(records: Sequence[CommanderRecord]) -> CommanderColumns:
+    return _columns_from_parts(
+        [_record_color_code(rec) for rec in records],
+        [rec.display_name.lower() for rec in records],
+        [commander_name_candidates(rec) for rec in records],
+        [tuple(n for n in (normalize_search_text(t) for t in rec.themes) if n) for rec in records],
+        (t for rec in records for t in rec.themes),
+    )
+
+
+def commander_columns(records: Sequence[CommanderRecord]) -> CommanderColumns:
+    """Return search columns for *records* (a catalog's entries), computing them once."""
+    cached = _COLUMNS_CACHE.get(id(records))
+    if cached is not None and cached[0] is records:
+        return cached[1]
+    columns = _build_columns(records)
+    if len(_COLUMNS_CACHE) >= 8:
+        _COLUMNS_CACHE.pop(next(iter(_COLUMNS_CACHE)))
+    _COLUMNS_CACHE[id(records)] = (records, columns)
+    return columns
 
 
 def normalized_restricted_labels(record: CommanderRecord | object) -> Dict[str, str]:
@@ -144,6 +271,7 @@ def clear_commander_catalog_cache() -> None:
     """Clear the in-memory commander catalog cache (testing/support)."""
 
     _CACHE.clear()
+    _COLUMNS_CACHE.clear()
 
 
 def load_commander_catalog(
@@ -220,38 +348,31 @@ def _is_cache_valid(path: Path, cached: CommanderCatalog) -> bool:
     return stat_result.st_size == cached.size
 
 
-def _build_catalog(path: Path) -> CommanderCatalog:
-    """M4: Load commanders from Parquet instead of CSV."""
-    if not path.exists():
-        raise FileNotFoundError(f"Commander Parquet not found at {path}")
-
+def _records_from_frame(df: Any) -> List[CommanderRecord]:
     entries: List[CommanderRecord] = []
     used_slugs: set[str] = set()
-
-    # Load commanders from Parquet (isCommander == True)
-    from deck_builder import builder_utils as bu
-    df = bu._load_all_cards_parquet()
-    if df.empty or 'isCommander' not in df.columns:
-        raise ValueError("Parquet missing isCommander column")
-    
-    commanders_df = df[df['isCommander']].copy()
-
-    # Convert DataFrame rows to CommanderRecords
-    for _, row in commanders_df.iterrows():
+    for row_dict in df.to_dict("records"):
         try:
-            # Convert row to dict for _row_to_record
-            row_dict = row.to_dict()
             record = _row_to_record(row_dict, used_slugs)
         except Exception:
             continue
         entries.append(record)
         used_slugs.add(record.slug)
+    return entries
 
-    stat_result = path.stat()
+
+def _assemble_catalog(
+    path: Path,
+    entries: Sequence[CommanderRecord],
+    columns: Optional[CommanderColumns],
+    stat_result: os.stat_result,
+) -> CommanderCatalog:
     mtime_ns = getattr(stat_result, "st_mtime_ns", int(stat_result.st_mtime * 1_000_000_000))
     etag = f"{stat_result.st_size}-{mtime_ns}-{len(entries)}"
     frozen_entries = tuple(entries)
     by_slug = {record.slug: record for record in frozen_entries}
+    if columns is not None:
+        _COLUMNS_CACHE[id(frozen_entries)] = (frozen_entries, columns)
     return CommanderCatalog(
         source_path=path,
         etag=etag,
@@ -259,7 +380,141 @@ def _build_catalog(path: Path) -> CommanderCatalog:
         size=stat_result.st_size,
         entries=frozen_entries,
         by_slug=by_slug,
+        columns=columns,
+    )
+
+
+def _build_catalog(path: Path) -> CommanderCatalog:
+    """M4: Load commanders from Parquet instead of CSV.
+
+    Uses the persisted catalog artifact when it is stamped against the current
+    parquet; otherwise normalizes the commander rows and (best effort) writes
+    the artifact for the next process.
+    """
+    if not path.exists():
+        raise FileNotFoundError(f"Commander Parquet not found at {path}")
+
+    stat_result = path.stat()
+    loaded = _load_catalog_artifact(_artifact_path(path), stat_result)
+    if loaded is not None:
+        entries, columns = loaded
+        return _assemble_catalog(path, entries, columns, stat_result)
+
+    # Load commanders from Parquet (isCommander == True)
+    from deck_builder import builder_utils as bu
+    df = bu._load_all_cards_parquet()
+    if df.empty or 'isCommander' not in df.columns:
+        raise ValueError("Parquet missing isCommander column")
+
+    entries = _records_from_frame(df[df['isCommander']])
+    columns = _build_columns(entries)
+    try:
+        _write_catalog_artifact(_artifact_path(path), entries, columns, stat_result)
+    except Exception:
+        pass
+    return _assemble_catalog(path, entries, columns, stat_result)
+
+
+# ---------------------------------------------------------------------------
+# Persisted artifact
+# ---------------------------------------------------------------------------
+
+
+def _artifact_path(source_path: Path) -> Path:
+    return source_path.with_name(ARTIFACT_FILE)
+
+
+def _source_stamp(stat_result: os.stat_result) -> Dict[str, int]:
+    return {"mtime_ns": int(stat_result.st_mtime_ns), "size": int(stat_result.st_size)}
+
+
+def _write_catalog_artifact(
+    artifact_path: Path,
+    entries: Sequence[CommanderRecord],
+    columns: CommanderColumns,
+    source_stat: os.stat_result,
+) -> Path:
+    """Write records plus precomputed search columns, stamped against the source parquet."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    data: Dict[str, list] = {}
+    for name in _RECORD_FIELDS:
+        values = [getattr(rec, name) for rec in entries]
+        data[name] = [list(v) for v in values] if name in _TUPLE_FIELDS else values
+    themes_norm = [
+        [columns.theme_vocab[i] for i in columns.theme_ids[columns.theme_offsets[k]:columns.theme_offsets[k + 1]]]
+        for k in range(len(entries))
+    ]
+    data["_color_code"] = list(columns.color_codes)
+    data["_sort_name"] = list(columns.sort_names)
+    data["_name_candidates"] = [list(c) for c in columns.name_candidates]
+    data["_themes_norm"] = themes_norm
+    table = pa.table(data)
+    meta = {
+        "version": ARTIFACT_VERSION,
+        "fields": list(_RECORD_FIELDS),
+        "source": _source_stamp(source_stat),
+    }
+    table = table.replace_schema_metadata({_ARTIFACT_META_KEY: json.dumps(meta).encode("utf-8")})
+    artifact_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = artifact_path.with_name(f"{artifact_path.name}.{os.getpid()}.tmp")
+    pq.write_table(table, tmp)
+    os.replace(tmp, artifact_path)
+    return artifact_path
+
+
+def _load_catalog_artifact(
+    artifact_path: Path,
+    source_stat: os.stat_result,
+) -> Optional[Tuple[List[CommanderRecord], CommanderColumns]]:
+    """Return (entries, columns) from the artifact, or None when missing/stale/incompatible."""
+    if not artifact_path.exists():
+        return None
+    try:
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(artifact_path)
+        raw_meta = (table.schema.metadata or {}).get(_ARTIFACT_META_KEY)
+        meta = json.loads(raw_meta) if raw_meta else {}
+        if (
+            meta.get("version") != ARTIFACT_VERSION
+            or meta.get("fields") != list(_RECORD_FIELDS)
+            or meta.get("source") != _source_stamp(source_stat)
+        ):
+            return None
+        cols = table.to_pydict()
+    except Exception:
+        return None
+    values = [
+        [tuple(v) if v is not None else () for v in cols[name]] if name in _TUPLE_FIELDS else cols[name]
+        for name in _RECORD_FIELDS
+    ]
+    entries = [CommanderRecord(*row) for row in zip(*values)]
+    columns = _columns_from_parts(
+        cols["_color_code"],
+        cols["_sort_name"],
+        cols["_name_candidates"],
+        cols["_themes_norm"],
+        (t for themes in cols["themes"] for t in (themes or ())),
     )
+    return entries, columns
+
+
+def emit_commander_catalog_artifact(source_path: str | os.PathLike[str] | None = None) -> Optional[Path]:
+    """Build the commander catalog from the processed parquet and persist it (tagging hook)."""
+    import pandas as pd
+    import pyarrow.parquet as pq
+
+    path = _resolve_commander_path(source_path)
+    if not path.exists():
+        return None
+    available = pq.ParquetFile(path).schema_arrow.names
+    if "isCommander" not in available:
+        return None
+    df = pd.read_parquet(path, columns=[c for c in SOURCE_COLUMNS if c in available], engine="pyarrow")
+    entries = _records_from_frame(df[df["isCommander"].fillna(False).astype(bool)])
+    return _write_catalog_artifact(_artifact_path(path), entries, _build_columns(entries), path.stat())
 
 
 def _row_to_record(row: Mapping[str, object], used_slugs: Iterable[str]) -> CommanderRecord:
@@ -345,13 +600,16 @@ def _row_to_record(row: Mapping[str, object], used_slugs: Iterable[str]) -> Comm
 
 
 def _clean_str(value: object) -> str:
-    if value is None:
+    if value is None or (isinstance(value, float) and value != value):
+        return ""
+    if type(value).__name__ == "NAType":
         return ""
     return str(value).strip()
 
 
 def _clean_multiline(value: object) -> str:
-    if value is None:
+    value = _clean_str(value) if not isinstance(value, str) else value
+    if not value:
         return ""
     text = str(value)
     if "\\r\\n" in text or "\\n" in text or "\\r" in text:
@@ -387,6 +645,8 @@ def _parse_int(value: object) -> Optional[int]:
 def _parse_literal_list(value: object) -> List[str]:
     if value is None:
         return []
+    if isinstance(value, np.ndarray):
+        value = value.tolist()
     if isinstance(value, (list, tuple, set)):
         return [str(v).strip() for v in value if str(v).strip()]
     text = str(value).strip()
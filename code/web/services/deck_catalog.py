@@ -0,0 +1,604 @@
+"""SQLite-backed catalog of saved decks.
+
+Every exported deck (`<deck root>/<owner>/<stem>.csv` plus its optional
+`.txt` and `.summary.json` sidecars) gets one row holding the fields the
+deck listings and the past-build recommendation signal need: owner,
+commander, tags, visibility, card count, budget config and mtimes. Listing
+pages and `orchestrator._recommended_scored` read the catalog with indexed
+queries instead of globbing directories and parsing every sidecar per
+request.
+
+The catalog is kept current in three ways:
+
+* the `phase6_reporting` exporters and the sidecar writers call
+  `note_deck_written(path)` right after writing;
+* reads first compare each deck directory's mtime with the value recorded at
+  its last scan and rescan (stat-only, re-parsing changed files) when it
+  moved, which catches files added or removed out-of-band;
+* `reconcile()` does a full pass over the deck root (run as a startup warm
+  step and at most every ``DECK_CATALOG_RECONCILE_SECONDS`` by readers) to
+  pick up in-place edits that do not touch the directory mtime.
+
+Public API:
+    note_deck_written(csv_path)        upsert one deck after an export
+    forget_deck(csv_path)              drop one deck after a delete
+    reconcile(root=None) -> dict       full scan; returns counters
+    list_dir(directory) -> list[dict]  decks in one directory, newest first
+    public_decks(root=None) -> list    public decks across user directories
+    past_builds(commander, root=None)  [{tags, age_days}] for one commander
+"""
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+_DATA_DIR = Path(__file__).resolve().parents[3] / "data"
+_DB_PATH = _DATA_DIR / "deck_catalog.db"
+
+_SIDECAR_SUFFIX = ".summary.json"
+_VALID_VISIBILITIES = ("public", "unlisted", "private")
+_DEFAULT_VISIBILITY = "private"
+
+# Files/directories touched this close to a scan may change again within the
+# same filesystem timestamp tick; their stamp is left blank so the next read
+# re-parses them (same idea as git's "racy clean" check).
+_RACY_WINDOW_S = 2.0
+
+try:
+    _RECONCILE_INTERVAL_S = float(os.getenv("DECK_CATALOG_RECONCILE_SECONDS", "300") or 300)
+except ValueError:
+    _RECONCILE_INTERVAL_S = 300.0
+
+_PathLike = Union[str, Path]
+
+_CREATE_DECKS_TABLE = """
+CREATE TABLE IF NOT EXISTS decks (
+    path          TEXT PRIMARY KEY,
+    root          TEXT NOT NULL,
+    dir           TEXT NOT NULL,
+    owner         TEXT NOT NULL,
+    name          TEXT NOT NULL,
+    display       TEXT,
+    commander     TEXT,
+    tags          TEXT NOT NULL DEFAULT '[]',
+    visibility    TEXT NOT NULL DEFAULT 'private',
+    source        TEXT,
+    has_sidecar   INTEGER NOT NULL DEFAULT 0,
+    has_txt       INTEGER NOT NULL DEFAULT 0,
+    card_count    INTEGER NOT NULL DEFAULT 0,
+    budget_total  REAL,
+    budget_mode   TEXT,
+    csv_mtime     REAL NOT NULL,
+    sidecar_mtime REAL,
+    stamp         TEXT NOT NULL DEFAULT '',
+    indexed_at    REAL NOT NULL
+);
+"""
+
+_CREATE_DECK_DIRS_TABLE = """
+CREATE TABLE IF NOT EXISTS deck_dirs (
+    dir           TEXT PRIMARY KEY,
+    root          TEXT NOT NULL,
+    dir_mtime_ns  INTEGER NOT NULL,
+    scanned_at    REAL NOT NULL
+);
+"""
+
+_CREATE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_decks_dir_mtime ON decks(dir, csv_mtime DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_decks_root_visibility ON decks(root, visibility, sidecar_mtime DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_decks_root_commander ON decks(root, commander)",
+)
+
+_init_lock = threading.Lock()
+_initialized_for: Optional[str] = None
+_last_full_reconcile: Dict[str, float] = {}
+_reconcile_lock = threading.Lock()
+
+
+def _connect() -> sqlite3.Connection:
+    _ensure_schema()
+    return _open()
+
+
+def _open() -> sqlite3.Connection:
+    conn = sqlite3.connect(str(_DB_PATH), check_same_thread=False, timeout=10.0)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    return conn
+
+
+def _ensure_schema() -> None:
+    global _initialized_for
+    if _initialized_for == str(_DB_PATH):
+        return
+    with _init_lock:
+        if _initialized_for == str(_DB_PATH):
+            return
+        _DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        conn = _open()
+        try:
+            with conn:
+                conn.execute(_CREATE_DECKS_TABLE)
+                conn.execute(_CREATE_DECK_DIRS_TABLE)
+                for stmt in _CREATE_INDEXES:
+                    conn.execute(stmt)
+        finally:
+            conn.close()
+        _initialized_for = str(_DB_PATH)
+
+
+def deck_root() -> Path:
+    """Return the resolved deck export root (``DECK_EXPORTS`` or ./deck_files)."""
+    return Path(os.getenv("DECK_EXPORTS") or "deck_files").resolve()
+
+
+def _owner_for(root: Path, directory: Path) -> str:
+    """'' for decks directly in the root (legacy), else the user directory name."""
+    if directory == root:
+        return ""
+    try:
+        return directory.relative_to(root).parts[0]
+    except ValueError:
+        return directory.name
+
+
+def _under_root(directory: Path, root: Path) -> bool:
+    return directory == root or root in directory.parents
+
+
+# ---------------------------------------------------------------------------
+# Parsing
+# ---------------------------------------------------------------------------
+
+def _card_count(csv_path: Path) -> int:
+    total = 0
+    try:
+        with csv_path.open("r", encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            headers = next(reader, [])
+            name_idx = headers.index("Name") if "Name" in headers else 0
+            count_idx = headers.index("Count") if "Count" in headers else 1
+            for row in reader:
+                if not row or name_idx >= len(row):
+                    continue
+                name = row[name_idx].strip()
+                raw = row[count_idx].strip() if count_idx < len(row) else ""
+                if not name or (name == "Total" and not raw):
+                    continue  # blank line / price summary row
+                try:
+                    total += int(float(raw)) if raw else 1
+                except ValueError:
+                    total += 1
+    except Exception:
+        pass
+    return total
+
+
+def _read_sidecar_meta(sidecar: Path) -> Dict[str, Any]:
+    try:
+        payload = json.loads(sidecar.read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+    meta = payload.get("meta") if isinstance(payload, dict) else None
+    return meta if isinstance(meta, dict) else {}
+
+
+def _deck_record(csv_path: Path, root: Path, names: Optional[set] = None) -> Optional[Dict[str, Any]]:
+    """Stat and parse one deck into a catalog row (``None`` if the CSV is gone)."""
+    now = time.time()
+    try:
+        st = csv_path.stat()
+    except OSError:
+        return None
+    directory = csv_path.parent
+    stem = csv_path.stem
+    sidecar = directory / (stem + _SIDECAR_SUFFIX)
+    txt = directory / (stem + ".txt")
+    present = names
+    sidecar_st = None
+    if present is None or sidecar.name in present:
+        try:
+            sidecar_st = sidecar.stat()
+        except OSError:
+            sidecar_st = None
+    has_txt = (txt.name in present) if present is not None else txt.exists()
+
+    meta = _read_sidecar_meta(sidecar) if sidecar_st is not None else {}
+    tags = meta.get("tags") or []
+    if not isinstance(tags, list):
+        tags = []
+    visibility = meta.get("visibility")
+    if visibility not in _VALID_VISIBILITIES:
+        visibility = _DEFAULT_VISIBILITY
+    budget = meta.get("budget_config")
+    budget_total = None
+    budget_mode = None
+    if isinstance(budget, dict) and budget.get("total"):
+        try:
+            budget_total = float(budget["total"])
+            budget_mode = str(budget.get("mode") or "soft")
+        except (TypeError, ValueError):
+            budget_total = None
+
+    newest = max(st.st_mtime, sidecar_st.st_mtime if sidecar_st else 0.0)
+    racy = (now - newest) < _RACY_WINDOW_S
+    stamp = "" if racy else f"{st.st_mtime_ns}:{st.st_size}:{sidecar_st.st_mtime_ns if sidecar_st else 0}:{int(has_txt)}"
+    return {
+        "path": str(csv_path),
+        "root": str(root),
+        "dir": str(directory),
+        "owner": _owner_for(root, directory),
+        "name": csv_path.name,
+        "display": meta.get("name") or None,
+        "commander": str(meta.get("commander") or "").strip() or None,
+        "tags": json.dumps([str(t) for t in tags], ensure_ascii=False),
+        "visibility": visibility,
+        "source": meta.get("source") or None,
+        "has_sidecar": int(sidecar_st is not None),
+        "has_txt": int(has_txt),
+        "card_count": _card_count(csv_path),
+        "budget_total": budget_total,
+        "budget_mode": budget_mode,
+        "csv_mtime": st.st_mtime,
+        "sidecar_mtime": sidecar_st.st_mtime if sidecar_st else None,
+        "stamp": stamp,
+        "indexed_at": now,
+    }
+
+
+def _stamp_for(entry: os.DirEntry, names: set, sidecar_ns: Dict[str, int]) -> str:
+    st = entry.stat()
+    stem = entry.name[: -len(".csv")]
+    has_txt = (stem + ".txt") in names
+    return f"{st.st_mtime_ns}:{st.st_size}:{sidecar_ns.get(stem, 0)}:{int(has_txt)}"
+
+
+_UPSERT_SQL = """
+INSERT INTO decks (path, root, dir, owner, name, display, commander, tags, visibility, source,
+                   has_sidecar, has_txt, card_count, budget_total, budget_mode,
+                   csv_mtime, sidecar_mtime, stamp, indexed_at)
+VALUES (:path, :root, :dir, :owner, :name, :display, :commander, :tags, :visibility, :source,
+        :has_sidecar, :has_txt, :card_count, :budget_total, :budget_mode,
+        :csv_mtime, :sidecar_mtime, :stamp, :indexed_at)
+ON CONFLICT(path) DO UPDATE SET
+    root=excluded.root, dir=excluded.dir, owner=excluded.owner, name=excluded.name,
+    display=excluded.display, commander=excluded.commander, tags=excluded.tags,
+    visibility=excluded.visibility, source=excluded.source, has_sidecar=excluded.has_sidecar,
+    has_txt=excluded.has_txt, card_count=excluded.card_count, budget_total=excluded.budget_total,
+    budget_mode=excluded.budget_mode, csv_mtime=excluded.csv_mtime,
+    sidecar_mtime=excluded.sidecar_mtime, stamp=excluded.stamp, indexed_at=excluded.indexed_at
+"""
+
+
+# ---------------------------------------------------------------------------
+# Writes
+# ---------------------------------------------------------------------------
+
+def _csv_for(path: _PathLike) -> Path:
+    p = Path(path).resolve()
+    name = p.name
+    if name.endswith(_SIDECAR_SUFFIX):
+        return p.with_name(name[: -len(_SIDECAR_SUFFIX)] + ".csv")
+    return p.with_suffix(".csv")
+
+
+def note_deck_written(path: _PathLike) -> None:
+    """Upsert the deck owning ``path`` (its CSV, TXT or summary sidecar).
+
+    Best-effort: catalog failures are logged and never break an export.
+    """
+    try:
+        csv_path = _csv_for(path)
+        root = deck_root()
+        if not _under_root(csv_path.parent, root):
+            return  # custom export directory; not part of the deck listings
+        record = _deck_record(csv_path, root)
+        conn = _connect()
+        try:
+            with conn:
+                if record is None:
+                    conn.execute("DELETE FROM decks WHERE path = ?", (str(csv_path),))
+                else:
+                    conn.execute(_UPSERT_SQL, record)
+        finally:
+            conn.close()
+    except Exception:
+        logger.debug("deck catalog update failed for %s", path, exc_info=True)
+
+
+def forget_deck(path: _PathLike) -> None:
+    """Remove the deck owning ``path`` from the catalog."""
+    try:
+        conn = _connect()
+        try:
+            with conn:
+                conn.execute("DELETE FROM decks WHERE path = ?", (str(_csv_for(path)),))
+        finally:
+            conn.close()
+    except Exception:
+        logger.debug("deck catalog delete failed for %s", path, exc_info=True)
+
+
+def _scan_dir(conn: sqlite3.Connection, directory: Path, root: Path) -> Dict[str, int]:
+    """Bring one directory's rows in line with the files on disk.
+
+    Only decks whose stamp (csv mtime/size, sidecar mtime, txt presence)
+    changed are re-parsed; rows for vanished CSVs are deleted.
+    """
+    counters = {"parsed": 0, "removed": 0, "unchanged": 0}
+    started = time.time()
+    try:
+        dir_mtime_ns = directory.stat().st_mtime_ns
+        entries = [e for e in os.scandir(directory) if e.is_file()]
+    except OSError:
+        cur = conn.execute("DELETE FROM decks WHERE dir = ?", (str(directory),))
+        conn.execute("DELETE FROM deck_dirs WHERE dir = ?", (str(directory),))
+        counters["removed"] = cur.rowcount or 0
+        return counters
+    names = {e.name for e in entries}
+    sidecar_ns: Dict[str, int] = {}
+    for e in entries:
+        if e.name.endswith(_SIDECAR_SUFFIX):
+            try:
+                sidecar_ns[e.name[: -len(_SIDECAR_SUFFIX)]] = e.stat().st_mtime_ns
+            except OSError:
+                continue
+    known = {
+        row["path"]: row["stamp"]
+        for row in conn.execute("SELECT path, stamp FROM decks WHERE dir = ?", (str(directory),))
+    }
+    seen: set = set()
+    for e in entries:
+        if not e.name.endswith(".csv"):
+            continue
+        path = str(directory / e.name)
+        seen.add(path)
+        try:
+            stamp = _stamp_for(e, names, sidecar_ns)
+        except OSError:
+            continue
+        if stamp and known.get(path) == stamp:
+            counters["unchanged"] += 1
+            continue
+        record = _deck_record(directory / e.name, root, names)
+        if record is None:
+            continue
+        conn.execute(_UPSERT_SQL, record)
+        counters["parsed"] += 1
+    gone = [p for p in known if p not in seen]
+    if gone:
+        conn.executemany("DELETE FROM decks WHERE path = ?", [(p,) for p in gone])
+        counters["removed"] = len(gone)
+    # A directory modified within the racy window may change again without
+    # its mtime moving; record a sentinel so the next read rescans it.
+    settled = (started - dir_mtime_ns / 1e9) >= _RACY_WINDOW_S
+    conn.execute(
+        "INSERT INTO deck_dirs (dir, root, dir_mtime_ns, scanned_at) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT(dir) DO UPDATE SET root=excluded.root, dir_mtime_ns=excluded.dir_mtime_ns, "
+        "scanned_at=excluded.scanned_at",
+        (str(directory), str(root), dir_mtime_ns if settled else -1, started),
+    )
+    return counters
+
+
+def _refresh_dirs(conn: sqlite3.Connection, directories: Iterable[Path], root: Path) -> None:
+    """Rescan the given directories whose mtime moved since their last scan."""
+    recorded = {
+        row["dir"]: row["dir_mtime_ns"]
+        for row in conn.execute("SELECT dir, dir_mtime_ns FROM deck_dirs WHERE root = ?", (str(root),))
+    }
+    for d in directories:
+        try:
+            current = d.stat().st_mtime_ns
+        except OSError:
+            current = None
+        if current is not None and recorded.get(str(d)) == current:
+            continue
+        with conn:
+            _scan_dir(conn, d, root)
+
+
+def _user_dirs(root: Path) -> List[Path]:
+    try:
+        return [Path(e.path) for e in os.scandir(root) if e.is_dir()]
+    except OSError:
+        return []
+
+
+def reconcile(root: Optional[_PathLike] = None) -> Dict[str, int]:
+    """Full pass over ``root`` and its user directories.
+
+    Picks up files added, edited or removed out-of-band and drops rows for
+    directories that no longer exist. Returns summed scan counters.
+    """
+    root_path = Path(root).resolve() if root is not None else deck_root()
+    totals = {"dirs": 0, "parsed": 0, "removed": 0, "unchanged": 0}
+    conn = _connect()
+    try:
+        dirs = [root_path] + _user_dirs(root_path) if root_path.exists() else []
+        for d in dirs:
+            with conn:
+                counters = _scan_dir(conn, d, root_path)
+            totals["dirs"] += 1
+            for k, v in counters.items():
+                totals[k] += v
+        live = {str(d) for d in dirs}
+        stale = [
+            row["dir"]
+            for row in conn.execute("SELECT dir FROM deck_dirs WHERE root = ?", (str(root_path),))
+            if row["dir"] not in live
+        ]
+        if stale:
+            with conn:
+                for d in stale:
+                    cur = conn.execute("DELETE FROM decks WHERE dir = ?", (d,))
+                    totals["removed"] += cur.rowcount or 0
+                    conn.execute("DELETE FROM deck_dirs WHERE dir = ?", (d,))
+    finally:
+        conn.close()
+    _last_full_reconcile[str(root_path)] = time.time()
+    logger.info(
+        "deck catalog reconciled %s: %d dirs, %d parsed, %d removed, %d unchanged",
+        root_path, totals["dirs"], totals["parsed"], totals["removed"], totals["unchanged"],
+    )
+    return totals
+
+
+def _maybe_full_reconcile(root: Path) -> bool:
+    """Run `reconcile` when the last full pass is older than the interval.
+
+    Returns False (caller falls back to mtime-checked refreshes) when no pass
+    is due or another thread is already running one.
+    """
+    last = _last_full_reconcile.get(str(root))
+    if last is not None and (time.time() - last) < _RECONCILE_INTERVAL_S:
+        return False
+    if not _reconcile_lock.acquire(blocking=False):
+        return False
+    try:
+        reconcile(root)
+    finally:
+        _reconcile_lock.release()
+    return True
+
+
+# ---------------------------------------------------------------------------
+# Reads
+# ---------------------------------------------------------------------------
+
+def _tags(raw: Optional[str]) -> List[str]:
+    try:
+        value = json.loads(raw or "[]")
+    except ValueError:
+        return []
+    return value if isinstance(value, list) else []
+
+
+def _listing_item(row: sqlite3.Row) -> Dict[str, Any]:
+    """Shape one row like the dicts `routes/decks._list_from_dir` has always returned."""
+    path = Path(row["path"])
+    item: Dict[str, Any] = {"name": row["name"], "path": row["path"], "mtime": row["csv_mtime"]}
+    if row["has_txt"]:
+        txt = path.with_suffix(".txt")
+        item["txt_name"] = txt.name
+        item["txt_path"] = str(txt)
+    commander = row["commander"]
+    tags = _tags(row["tags"])
+    if commander:
+        item["commander"] = commander
+        item["tags"] = tags
+    else:
+        # Fall back to the Commander_Theme_..._YYYYMMDD filename pattern
+        parts = path.stem.split("_")
+        if len(parts) >= 3:
+            item["commander"] = parts[0]
+            item["tags"] = parts[1:-1]
+        else:
+            item["commander"] = path.stem
+            item["tags"] = []
+    if row["display"]:
+        item["display"] = row["display"]
+    if row["source"]:
+        item["source"] = row["source"]
+    item["visibility"] = row["visibility"]
+    item["card_count"] = row["card_count"]
+    if row["budget_total"]:
+        item["budget_total"] = row["budget_total"]
+        item["budget_mode"] = row["budget_mode"]
+    return item
+
+
+def list_dir(directory: _PathLike) -> List[Dict[str, Any]]:
+    """Return catalog entries for the decks in ``directory``, newest first."""
+    d = Path(directory).resolve()
+    root = deck_root()
+    if not _under_root(d, root):
+        root = d.parent
+    elif _maybe_full_reconcile(root):
+        root = None  # type: ignore[assignment]
+    conn = _connect()
+    try:
+        if root is not None:
+            _refresh_dirs(conn, [d], root)
+        rows = conn.execute(
+            "SELECT * FROM decks WHERE dir = ? ORDER BY csv_mtime DESC", (str(d),)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [_listing_item(r) for r in rows]
+
+
+def _refresh_tree(conn: sqlite3.Connection, root: Path) -> None:
+    if not _maybe_full_reconcile(root) and root.exists():
+        _refresh_dirs(conn, [root] + _user_dirs(root), root)
+
+
+def public_decks(root: Optional[_PathLike] = None) -> List[Dict[str, Any]]:
+    """Return public decks from every user directory (guest and legacy excluded).
+
+    Items carry ``user_id`` (the owning directory), ``name``, ``commander``,
+    ``tags``, ``display``, ``mtime`` (sidecar mtime) and ``has_txt``; newest first.
+    """
+    root_path = Path(root).resolve() if root is not None else deck_root()
+    conn = _connect()
+    try:
+        _refresh_tree(conn, root_path)
+        rows = conn.execute(
+            "SELECT owner, name, commander, tags, display, sidecar_mtime, has_txt FROM decks "
+            "WHERE root = ? AND visibility = 'public' AND owner NOT IN ('', 'guest') "
+            "ORDER BY sidecar_mtime DESC",
+            (str(root_path),),
+        ).fetchall()
+    finally:
+        conn.close()
+    return [
+        {
+            "user_id": r["owner"],
+            "name": r["name"],
+            "commander": r["commander"] or "",
+            "tags": _tags(r["tags"]),
+            "display": r["display"] or "",
+            "mtime": r["sidecar_mtime"] or 0.0,
+            "has_txt": bool(r["has_txt"]),
+        }
+        for r in rows
+    ]
+
+
+def past_builds(commander: str, root: Optional[_PathLike] = None) -> List[Dict[str, Any]]:
+    """Return ``[{tags, age_days}]`` for every saved build of ``commander``.
+
+    Covers all owners (visibility controls who may view a deck, not whether
+    it feeds the theme-popularity signal). Builds without tags are skipped.
+    """
+    name = str(commander or "").strip()
+    if not name:
+        return []
+    root_path = Path(root).resolve() if root is not None else deck_root()
+    conn = _connect()
+    try:
+        _refresh_tree(conn, root_path)
+        rows = conn.execute(
+            "SELECT tags, sidecar_mtime FROM decks WHERE root = ? AND commander = ? AND has_sidecar = 1",
+            (str(root_path), name),
+        ).fetchall()
+    finally:
+        conn.close()
+    now = time.time()
+    out: List[Dict[str, Any]] = []
+    for r in rows:
+        tags = _tags(r["tags"])
+        if not tags:
+            continue
+        out.append({"tags": tags, "age_days": max(0.0, (now - (r["sidecar_mtime"] or now)) / 86400.0)})
+    return out
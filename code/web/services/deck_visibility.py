@@ -93,3 +93,5 @@ def set_deck_visibility(csv_path: _PathLike, visibility: str) -> None:
         payload["meta"] = meta
     meta["visibility"] = visibility
     sidecar.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    from .deck_catalog import note_deck_written
+    note_deck_written(csv_path)
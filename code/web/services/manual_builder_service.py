@@ -9,10 +9,12 @@ import csv as _csv
 import json
 import os
 import re
-from collections import Counter
+import threading
+from collections import Counter, OrderedDict
 from datetime import date as _date
 from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
 from deck_builder.builder import DeckBuilder
@@ -31,8 +33,14 @@ from deck_builder.brackets_compliance import (
     evaluate_deck,
 )
 from settings import MULTIPLE_COPY_CARDS
+from tagging.multi_face_merger import group_faces
 from code.services.all_cards_loader import AllCardsLoader
-from code.web.services.card_search import apply_extra_clauses, apply_parsed_search, parse_search_query
+from code.web.services.card_search import (
+    apply_extra_clauses,
+    apply_parsed_search,
+    parse_search_query,
+    register_search_frame,
+)
 from code.web.services.deck_visibility import resolve_visibility_for_write
 from code.web.services.upgrade_suggestions_service import _IDEAL_KEY_TO_TAGS
 from code.web.services.price_service import get_price_service
@@ -468,76 +476,124 @@ def _merge_multi_face_pool_rows(pool: pd.DataFrame) -> pd.DataFrame:
     """
     if "name" not in pool.columns:
         return pool
-    dup_mask = pool["name"].astype(str).duplicated(keep=False)
+    names = pool["name"].astype(str)
+    dup_mask = names.duplicated(keep=False)
     if not dup_mask.any():
         return pool
 
-    has_side = "side" in pool.columns
-    has_tags = "themeTags" in pool.columns
-    keep_idx = []
-    merged_tags: Dict[Any, List[str]] = {}
-    grouped = pool[dup_mask].groupby(pool.loc[dup_mask, "name"].astype(str), sort=False)
-    for _name, group in grouped:
-        primary_idx = group.index[0]
-        if has_side:
-            front = group[group["side"].astype(str).str.lower() == "a"]
-            if not front.empty:
-                primary_idx = front.index[0]
-        keep_idx.append(primary_idx)
-        if has_tags:
-            combined: List[str] = []
-            seen: set = set()
-            for tags in group["themeTags"]:
-                for t in parse_theme_tags(tags):
-                    if t not in seen:
-                        seen.add(t)
-                        combined.append(t)
-            merged_tags[primary_idx] = combined
-
-    drop_idx = set(pool.index[dup_mask]) - set(keep_idx)
-    out = pool.drop(index=list(drop_idx)).copy()
-    for idx, tags in merged_tags.items():
-        out.at[idx, "themeTags"] = tags
-    return out
-
+    face_order = [pool["side"].astype(str).str.lower() != "a"] if "side" in pool.columns else []
+    union_columns = {"themeTags": parse_theme_tags} if "themeTags" in pool.columns else {}
+    groups = group_faces(pool, names, dup_mask, face_order=face_order, union_columns=union_columns, sort_unions=False)
+    return groups.collapse(pool, groups.unions)
 
-def get_card_pool(sess: Dict[str, Any]) -> pd.DataFrame:
-    """Return (and cache in `sess`) the commander's full color-legal card pool.
 
-    Cards fully banned at the session's bracket (e.g. Game Changers at
-    Bracket 1/2) are excluded outright, mirroring the color-identity filter.
-    Cards allowed up to a positive cap (e.g. up to 3 Game Changers at
-    Bracket 3) stay in the pool with a `_bracket_tags` label for the UI.
+# ---------------------------------------------------------------------------
+# Shared color-identity pools
+# ---------------------------------------------------------------------------
+# Everything in the pool that depends only on (color identity, bracket,
+# rulebreakers, card data) lives in one process-wide frame per key, shared
+# by every session with that identity. A session's `_pool_df` is a shallow
+# copy of it (column data shared, copy-on-write) plus the three columns that
+# depend on the session's selected themes/commander: `_theme_matches`,
+# `_commander_other_matches` and `_role` (creatures/planeswalkers flip
+# between "Other" and "On-Theme"). The commander itself and cards already in
+# the deck are excluded at query time (`_exclude_in_deck`), not baked in.
 
-    Cached under a private session key since a manual-build session's
-    commander/color identity/bracket never change after creation.
-    """
-    cached = sess.get("_pool_df")
-    if cached is not None:
-        return cached
+_NO_MATCHES: tuple = ()
 
-    identity = set(sess.get("color_identity") or [])
-    commander = sess.get("commander")
-    bracket = str(sess.get("bracket") or 2)
 
-    df = _get_loader().load()
-    active_rulebreakers = _active_rulebreakers(sess)
+def _shared_pool_cache_size() -> int:
+    try:
+        return max(1, int(os.getenv("MANUAL_POOL_CACHE_SIZE", "16")))
+    except ValueError:
+        return 16
+
+
+class _SharedPool:
+    """One immutable color-identity pool plus the arrays session overlays read."""
+
+    __slots__ = ("frame", "on_theme_capable", "tag_rows", "tag_names", "tag_lower", "source")
+
+    def __init__(self, frame: pd.DataFrame, source: Any) -> None:
+        self.frame = frame
+        # Keeps the source frame alive so an id()-based data version can't be reused.
+        self.source = source
+        self.on_theme_capable = np.array([
+            role == "Other" and ("creature" in tl or "planeswalker" in tl)
+            for role, tl in zip(frame["_role"], frame.get("type", pd.Series("", index=frame.index)).astype(str).str.lower())
+        ], dtype=bool)
+        # Flattened (row, tag) pairs in row order, so per-session theme
+        # matching is one `np.isin` over the tags instead of a Python pass.
+        lengths = np.fromiter((len(t) for t in frame["_tags"]), dtype=np.int64, count=len(frame))
+        self.tag_rows = np.repeat(np.arange(len(frame)), lengths)
+        self.tag_names = np.array([t for tags in frame["_tags"] for t in tags], dtype=object)
+        self.tag_lower = np.array([t.lower() for t in self.tag_names], dtype=object)
+
+    def rows_matching(self, wanted_lower: set) -> tuple:
+        """``(row positions, original tag names)`` of every tag in `wanted_lower`, in row order."""
+        if not wanted_lower or not len(self.tag_lower):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=object)
+        hit = np.isin(self.tag_lower, list(wanted_lower))
+        return self.tag_rows[hit], self.tag_names[hit]
+
+
+_SHARED_POOLS: "OrderedDict[tuple, _SharedPool]" = OrderedDict()
+_IDENTITY_CODES: Dict[str, Any] = {"version": None, "codes": None, "uniques": None}
+_shared_pools_lock = threading.Lock()
+
+
+def clear_shared_pools() -> None:
+    """Drop every shared pool (e.g. after a card data refresh)."""
+    with _shared_pools_lock:
+        _SHARED_POOLS.clear()
+        _IDENTITY_CODES.update(version=None, codes=None, uniques=None)
+
+
+def _data_version(loader: Any, df: pd.DataFrame) -> tuple:
+    """Identify the loaded card data: file path + mtime for the real loader,
+    the frame's identity for anything else (test loaders)."""
+    path = getattr(loader, "file_path", None)
+    mtime = getattr(loader, "_file_mtime", None)
+    if path and mtime:
+        return ("file", str(path), float(mtime))
+    return ("frame", id(df))
+
+
+def _identity_codes(version: tuple, series: pd.Series) -> tuple:
+    """Factorized `colorIdentity` column, computed once per data version."""
+    with _shared_pools_lock:
+        if _IDENTITY_CODES["version"] == version:
+            return _IDENTITY_CODES["codes"], _IDENTITY_CODES["uniques"]
+    values = series.map(lambda v: tuple(v) if isinstance(v, (list, np.ndarray)) else v)
+    codes, uniques = pd.factorize(values, use_na_sentinel=True)
+    with _shared_pools_lock:
+        _IDENTITY_CODES.update(version=version, codes=codes, uniques=list(uniques))
+    return codes, list(uniques)
+
+
+def _identity_mask(version: tuple, df: pd.DataFrame, identity: set) -> np.ndarray:
+    """Vectorized `_color_identity_subset` over the whole frame: each distinct
+    colorIdentity value is checked once, missing values are legal."""
+    codes, uniques = _identity_codes(version, df["colorIdentity"])
+    legal = np.fromiter((_color_identity_subset(u, identity) for u in uniques), dtype=bool, count=len(uniques))
+    return np.where(codes < 0, True, legal[np.maximum(codes, 0)] if len(legal) else True)
+
+
+def _build_shared_pool(
+    df: pd.DataFrame,
+    version: tuple,
+    identity: set,
+    bracket: str,
+    active_rulebreakers: List[dict],
+    extra_color: Optional[str],
+) -> _SharedPool:
+    mask = _identity_mask(version, df, identity)
     if active_rulebreakers:
         from deck_builder.rulebreaker_rules import card_pool_exception
 
-        extra_color = (sess.get("rulebreaker_extra_color") or None)
-
-        def _identity_ok(row: Any) -> bool:
-            if _color_identity_subset(row.get("colorIdentity"), identity):
-                return True
-            return card_pool_exception(row, active_rulebreakers, extra_color)
-
-        mask = df.apply(_identity_ok, axis=1)
-    else:
-        mask = df["colorIdentity"].apply(lambda c: _color_identity_subset(c, identity))
+        for pos in np.flatnonzero(~mask):
+            mask[pos] = card_pool_exception(df.iloc[pos], active_rulebreakers, extra_color)
     pool = df[mask].copy()
-    if commander:
-        pool = pool[pool["name"].astype(str) != str(commander)]
     pool = _merge_multi_face_pool_rows(pool)
 
     # Fetch lands are colorless (no colorIdentity pips), so the plain
@@ -576,19 +632,92 @@ def get_card_pool(sess: Dict[str, Any]) -> pd.DataFrame:
     pool["_bracket_tags"] = pool["name"].astype(str).str.lower().map(
         lambda n: name_to_capped_tags.get(n, [])
     )
-
-    selected_themes = {t.lower() for t in (sess.get("tags") or [])}
-    if selected_themes:
-        pool["_theme_matches"] = pool["_tags"].apply(
-            lambda tags: [t for t in tags if t.lower() in selected_themes]
-        )
-    else:
-        pool["_theme_matches"] = [[] for _ in range(len(pool))]
-
+    # Role without a theme match; overlays promote `on_theme_capable` rows.
     pool["_role"] = [
-        _card_role(t, tags, bool(tm), meta)
-        for t, tags, tm, meta in zip(pool.get("type", ""), pool["_tags"], pool["_theme_matches"], pool["_metadata_tags"])
+        _card_role(t, tags, False, meta)
+        for t, tags, meta in zip(pool.get("type", ""), pool["_tags"], pool["_metadata_tags"])
     ]
+    pool["_type_category"] = [
+        _type_category(t, tags) for t, tags in zip(pool.get("type", ""), pool["_tags"])
+    ]
+    register_search_frame(pool)
+    return _SharedPool(pool, df)
+
+
+def _shared_pool(sess: Dict[str, Any]) -> _SharedPool:
+    """The process-wide pool for the session's identity/bracket/rulebreakers,
+    built on first use and kept in a small LRU (`MANUAL_POOL_CACHE_SIZE`)."""
+    identity = set(sess.get("color_identity") or [])
+    bracket = str(sess.get("bracket") or 2)
+    active_rulebreakers = _active_rulebreakers(sess)
+    extra_color = (sess.get("rulebreaker_extra_color") or None) if active_rulebreakers else None
+
+    loader = _get_loader()
+    df = loader.load()
+    version = _data_version(loader, df)
+    key = (
+        tuple(sorted(identity)),
+        bracket,
+        tuple(str(meta.get("id")) for meta in active_rulebreakers),
+        extra_color,
+        version,
+    )
+    with _shared_pools_lock:
+        entry = _SHARED_POOLS.get(key)
+        if entry is not None:
+            _SHARED_POOLS.move_to_end(key)
+            return entry
+
+    entry = _build_shared_pool(df, version, identity, bracket, active_rulebreakers, extra_color)
+    with _shared_pools_lock:
+        for stale in [k for k in _SHARED_POOLS if k[-1] != version]:
+            del _SHARED_POOLS[stale]
+        entry = _SHARED_POOLS.setdefault(key, entry)
+        _SHARED_POOLS.move_to_end(key)
+        while len(_SHARED_POOLS) > _shared_pool_cache_size():
+            _SHARED_POOLS.popitem(last=False)
+    return entry
+
+
+def _matches_by_row(n: int, rows: np.ndarray, names: np.ndarray) -> List[Any]:
+    """Per-row lists of `names` grouped by `rows` (sorted); rows without any
+    match share one empty tuple instead of each holding its own list."""
+    out: List[Any] = [_NO_MATCHES] * n
+    if len(rows):
+        starts = np.flatnonzero(np.r_[True, rows[1:] != rows[:-1]])
+        for row, chunk in zip(rows[starts], np.split(names, starts[1:])):
+            out[row] = list(chunk)
+    return out
+
+
+def get_card_pool(sess: Dict[str, Any]) -> pd.DataFrame:
+    """Return (and cache in `sess`) the commander's full color-legal card pool.
+
+    Cards fully banned at the session's bracket (e.g. Game Changers at
+    Bracket 1/2) are excluded outright, mirroring the color-identity filter.
+    Cards allowed up to a positive cap (e.g. up to 3 Game Changers at
+    Bracket 3) stay in the pool with a `_bracket_tags` label for the UI.
+
+    The heavy part is shared across sessions (see `_shared_pool`); the
+    session only adds its theme-dependent columns on top. Cached under a
+    private session key since a manual-build session's commander/color
+    identity/bracket never change after creation. The commander's own row
+    is still present - `_exclude_in_deck` drops it along with deck cards.
+    """
+    cached = sess.get("_pool_df")
+    if cached is not None:
+        return cached
+
+    shared = _shared_pool(sess)
+    base = shared.frame
+    n = len(base)
+    commander = sess.get("commander")
+
+    selected_themes = {t.lower() for t in (sess.get("tags") or [])}
+    rows, names = shared.rows_matching(selected_themes)
+    theme_matches = _matches_by_row(n, rows, names)
+    has_match = np.zeros(n, dtype=bool)
+    has_match[rows] = True
 
     # Milestone 11 "Related Synergy": whichever of the commander's OWN
     # themeTags the user did NOT select during setup (e.g. commander has
@@ -596,28 +725,41 @@ def get_card_pool(sess: Dict[str, Any]) -> pd.DataFrame:
     # Matters -> the other two are candidates here).
     commander_tags, _ = _commander_tags_and_power(str(commander or ""))
     other_commander_tags = [t for t in commander_tags if t.lower() not in selected_themes]
+    other_matches: List[Any] = [_NO_MATCHES] * n
     if other_commander_tags:
-        other_lower = {t.lower() for t in other_commander_tags}
-        pool["_commander_other_matches"] = pool["_tags"].apply(
-            lambda tags: [t for t in other_commander_tags if t.lower() in other_lower and t.lower() in {x.lower() for x in tags}]
-        )
-    else:
-        pool["_commander_other_matches"] = [[] for _ in range(len(pool))]
-
-    pool["_type_category"] = [
-        _type_category(t, tags) for t, tags in zip(pool.get("type", ""), pool["_tags"])
-    ]
-
+        other_rows, other_names = shared.rows_matching({t.lower() for t in other_commander_tags})
+        for row, hits in enumerate(_matches_by_row(n, other_rows, other_names)):
+            if hits:
+                hit_lower = {h.lower() for h in hits}
+                other_matches[row] = [t for t in other_commander_tags if t.lower() in hit_lower]
+
+    pool = base.copy(deep=False)
+    pool["_theme_matches"] = theme_matches
+    pool["_commander_other_matches"] = other_matches
+    if has_match.any():
+        pool["_role"] = np.where(shared.on_theme_capable & has_match, "On-Theme", base["_role"].to_numpy(dtype=object))
     sess["_pool_df"] = pool
     return pool
 
 
+def _exclude_commander(sess: Dict[str, Any], pool: pd.DataFrame) -> pd.DataFrame:
+    """Drop the session's commander from a (shared, so commander-agnostic) pool."""
+    commander = str(sess.get("commander") or "").strip().lower()
+    if not commander:
+        return pool
+    return pool[pool["name"].astype(str).str.lower() != commander]
+
+
 def _exclude_in_deck(sess: Dict[str, Any], pool: pd.DataFrame) -> pd.DataFrame:
-    """Filter out cards already in the deck (pool exclusivity), except basic
-    lands and the singleton exceptions in `is_unlimited_copy_card`.
+    """Filter out the commander and cards already in the deck (pool
+    exclusivity), except basic lands and the singleton exceptions in
+    `is_unlimited_copy_card`.
     """
     deck_cards = sess.get("deck_cards") or []
     in_deck_lower = {c.strip().lower() for c in deck_cards if not is_unlimited_copy_card(c)}
+    commander = str(sess.get("commander") or "").strip().lower()
+    if commander:
+        in_deck_lower.add(commander)
     if in_deck_lower:
         return pool[~pool["name"].astype(str).str.lower().isin(in_deck_lower)]
     return pool
@@ -833,7 +975,10 @@ def query_category(
     if category not in CATEGORY_LABELS:
         raise ValueError(f"Unknown pool category: {category}")
 
-    filtered = _full_pool if _full_pool is not None else _ensure_computed_columns(get_card_pool(sess))
+    if _full_pool is not None:
+        filtered = _full_pool
+    else:
+        filtered = _exclude_commander(sess, _ensure_computed_columns(get_card_pool(sess)))
 
     if category == "new":
         filtered = filtered[filtered["isNew"].fillna(False).astype(bool)]
@@ -920,7 +1065,7 @@ def categorize_pool(sess: Dict[str, Any], search: str = "") -> Dict[str, Dict[st
     cards (safety net for a future card type the precedence rules in
     `_type_category` don't cover).
     """
-    pool = _ensure_computed_columns(get_card_pool(sess))
+    pool = _exclude_commander(sess, _ensure_computed_columns(get_card_pool(sess)))
     result: Dict[str, Dict[str, Any]] = {}
     for key in CATEGORY_KEYS:
         cat = query_category(sess, key, search=search, _full_pool=pool)
@@ -1440,6 +1585,7 @@ def hover_suggestions(sess: Dict[str, Any], card_name: str, limit: int = 5) -> L
     role = row.get("_role")
     cmc = float(row.get("manaValue") or 0)
     deck_lower = {c.lower() for c in (sess.get("deck_cards") or [])}
+    deck_lower.add(str(sess.get("commander") or "").strip().lower())
 
     pool = get_card_pool(sess)
     candidates = pool[
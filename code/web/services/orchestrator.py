@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict, Any, List, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 import copy
 from deck_builder.builder import DeckBuilder
 from deck_builder.phases.phase0_core import BRACKET_DEFINITIONS
@@ -11,7 +11,6 @@ import json
 from datetime import datetime as _dt
 import re
 import unicodedata
-from glob import glob
 import subprocess
 import sys
 from pathlib import Path
@@ -21,9 +20,6 @@ from exceptions import CommanderPartnerError
 # M7: Cache for commander DataFrame to avoid repeated Parquet loads
 _COMMANDER_DF_CACHE: Dict[str, Any] = {"df": None, "mtime": None}
 
-# M7: Cache for past builds summary to avoid repeated file scans
-_PAST_BUILDS_CACHE: Dict[str, Any] = {"index": None, "mtime": None}
-
 _TAG_ACRONYM_KEEP = {"EDH", "ETB", "ETBs", "CMC", "ET", "OTK"}
 _REASON_SOURCE_OVERRIDES = {
     "creature_all_theme": "Theme Match",
@@ -715,85 +711,24 @@ def _get_cached_commander_df():
     return _COMMANDER_DF_CACHE["df"]
 
 
-def _get_past_builds_index() -> Dict[str, List[Dict[str, Any]]]:
-    """M7: Return cached index of past builds: commander_name -> list of {tags, age_days}.
+def _past_builds_for(commander: str) -> List[Dict[str, Any]]:
+    """M7: Return past builds of ``commander`` as a list of {tags, age_days}.
 
-    Scans every user's deck directory (not just the shared root/legacy area),
-    since this theme-popularity signal should reflect all past builds
-    regardless of who built them. Deck visibility controls who can *view* a
-    deck, not whether it contributes to this recommendation.
+    Backed by the deck catalog, which covers every user's deck directory (not
+    just the shared root/legacy area), since this theme-popularity signal
+    should reflect all past builds regardless of who built them. Deck
+    visibility controls who can *view* a deck, not whether it contributes to
+    this recommendation.
     """
-    global _PAST_BUILDS_CACHE
-
-    deck_files_dir = os.getenv("DECK_EXPORTS") or 'deck_files'
-    need_rebuild = _PAST_BUILDS_CACHE["index"] is None
-
-    def _current_signature() -> float:
-        """Max mtime across the root dir and every immediate subdirectory (per-user folders)."""
-        latest = 0.0
-        try:
-            if os.path.exists(deck_files_dir):
-                latest = os.path.getmtime(deck_files_dir)
-                for entry in os.scandir(deck_files_dir):
-                    if entry.is_dir():
-                        try:
-                            latest = max(latest, entry.stat().st_mtime)
-                        except OSError:
-                            continue
-        except Exception:
-            pass
-        return latest
-
-    if not need_rebuild:
-        try:
-            current_mtime = _current_signature()
-            cached_mtime = _PAST_BUILDS_CACHE.get("mtime")
-            if cached_mtime is None or current_mtime > cached_mtime:
-                need_rebuild = True
-        except Exception:
-            pass
-
-    if need_rebuild:
-        index: Dict[str, List[Dict[str, Any]]] = {}
-        try:
-            pattern = os.path.join(deck_files_dir, '**', '*.summary.json')
-            for path in glob(pattern, recursive=True):
-                try:
-                    st = os.stat(path)
-                    age_days = max(0, (time.time() - st.st_mtime) / 86400.0)
-                    with open(path, 'r', encoding='utf-8') as f:
-                        data = json.load(f) or {}
-                    meta = data.get('meta') or {}
-                    commander = str(meta.get('commander', '')).strip()
-                    if not commander:
-                        continue
-                    tags_list = meta.get('tags') or []
-                    if not tags_list:
-                        continue
-                    
-                    if commander not in index:
-                        index[commander] = []
-                    index[commander].append({
-                        'tags': tags_list,
-                        'age_days': age_days
-                    })
-                except Exception:
-                    continue
-            
-            _PAST_BUILDS_CACHE["index"] = index
-            _PAST_BUILDS_CACHE["mtime"] = _current_signature()
-        except Exception:
-            _PAST_BUILDS_CACHE["index"] = {}
-            _PAST_BUILDS_CACHE["mtime"] = None
-    
-    return _PAST_BUILDS_CACHE["index"] or {}
+    from .deck_catalog import past_builds
+    return past_builds(commander)
 
 
-def invalidate_past_builds_cache():
-    """M7: Force rebuild of past builds cache on next access (call after saving new builds)."""
-    global _PAST_BUILDS_CACHE
-    _PAST_BUILDS_CACHE["index"] = None
-    _PAST_BUILDS_CACHE["mtime"] = None
+def invalidate_past_builds_cache(csv_path: Optional[str] = None) -> None:
+    """M7: Record a newly saved build in the deck catalog so it shows up in recommendations."""
+    if csv_path:
+        from .deck_catalog import note_deck_written
+        note_deck_written(csv_path)
 
 
 def tags_for_commander(name: str) -> List[str]:
@@ -952,10 +887,9 @@ def _recommended_scored(name: str, max_items: int = 5) -> List[Tuple[str, int, L
             if len(reasons[orig]) < 3 and cr not in reasons[orig]:
                 reasons[orig].append(cr)
 
-    # Past builds history - M7: Use cached index instead of scanning files
+    # Past builds history - M7: indexed deck catalog query instead of scanning files
     try:
-        past_builds_index = _get_past_builds_index()
-        builds_for_commander = past_builds_index.get(str(name).strip(), [])
+        builds_for_commander = _past_builds_for(str(name).strip())
         for build in builds_for_commander:
             age_days = build.get('age_days', 999)
             tags_list = build.get('tags', [])
@@ -2132,7 +2066,7 @@ def run_build(commander: str, tags: List[str], bracket: int, ideals: Dict[str, i
                 with open(sidecar, 'w', encoding='utf-8') as f:
                     _json.dump(payload, f, ensure_ascii=False, indent=2)
                 # M7: Invalidate past builds cache so new build appears in recommendations
-                invalidate_past_builds_cache()
+                invalidate_past_builds_cache(csv_path)
         except Exception:
             pass
         # Success return
@@ -3034,7 +2968,7 @@ def run_stage(ctx: Dict[str, Any], rerun: bool = False, show_skipped: bool = Fal
                 with open(sidecar, 'w', encoding='utf-8') as f:
                     _json.dump(payload, f, ensure_ascii=False, indent=2)
                 # M7: Invalidate past builds cache so new build appears in recommendations
-                invalidate_past_builds_cache()
+                invalidate_past_builds_cache(csv_path)
         except Exception:
             pass
         return {
@@ -3122,6 +3056,8 @@ def run_stage(ctx: Dict[str, Any], rerun: bool = False, show_skipped: bool = Fal
 
         # Run the stage and capture logs delta
         start_log = len(logs)
+        timings = getattr(b, '_timings', None)
+        stage_span = timings.begin(f"web.stage.{stage_id}", b) if timings is not None else None
         fn = getattr(b, runner_name, None)
         if runner_name == '__add_multi_copy__':
             try:
@@ -3406,6 +3342,8 @@ def run_stage(ctx: Dict[str, Any], rerun: bool = False, show_skipped: bool = Fal
                 logs.append(f"Stage '{label}' failed: {e}")
         else:
             logs.append(f"Runner not available: {runner_name}")
+        if stage_span is not None:
+            timings.end(stage_span, b)
         delta_log = "\n".join(logs[start_log:])
 
         # Enforce locks immediately after the stage runs so they appear in added list
@@ -3892,7 +3830,7 @@ def run_stage(ctx: Dict[str, Any], rerun: bool = False, show_skipped: bool = Fal
             with open(sidecar, 'w', encoding='utf-8') as f:
                 _json.dump(payload, f, ensure_ascii=False, indent=2)
             # M7: Invalidate past builds cache so new build appears in recommendations
-            invalidate_past_builds_cache()
+            invalidate_past_builds_cache(csv_path)
     except Exception:
         pass
     # Final progress
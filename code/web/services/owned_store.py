@@ -1,11 +1,27 @@
+"""Per-user owned-card collections.
+
+Each collection is a small SQLite database (``.web_owned.db``) in the user's
+owned-cards directory: one row per card with its added_at stamp and cached
+tags/type/colors/stats. The database is created on the first write; reading
+a collection that doesn't exist yet returns empty results without touching
+disk. A pre-SQLite ``.web_owned_db.json`` is imported on first use. The
+owned-name set is cached in memory per database and reused until the
+collection's version stamp changes.
+"""
 from __future__ import annotations
 
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterable, List, Tuple, Dict
+from typing import Iterable, Iterator, List, Optional, Tuple, Dict
 import json
 import os
+import sqlite3
+import threading
 import time
 
+import numpy as np
+import pandas as pd
+
 
 def _owned_dir(user_id: str | None = None) -> Path:
     """Resolve the owned cards directory.
@@ -34,178 +50,284 @@ def _owned_dir(user_id: str | None = None) -> Path:
     return Path("owned_cards").resolve()
 
 
-def _db_path(user_id: str | None = None) -> Path:
-    d = _owned_dir(user_id)
-    try:
-        d.mkdir(parents=True, exist_ok=True)
-    except Exception:
-        pass
-    return (d / ".web_owned_db.json").resolve()
+_LEGACY_JSON = ".web_owned_db.json"
+_DB_NAME = ".web_owned.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS owned (
+    name_key    TEXT PRIMARY KEY,
+    name        TEXT NOT NULL,
+    added_at    INTEGER,
+    tags        TEXT,
+    type        TEXT,
+    colors      TEXT,
+    mana_value  REAL,
+    power       TEXT,
+    toughness   TEXT
+);
+CREATE TABLE IF NOT EXISTS owned_meta (
+    key   TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO owned_meta (key, value) VALUES ('version', 0);
+"""
+
+_PRIMARY_TYPES = ['Creature', 'Instant', 'Sorcery', 'Artifact', 'Enchantment', 'Planeswalker', 'Land', 'Battle']
+
+_READY: set[str] = set()
+# db path -> (version, names in insertion order, lowercase name set)
+_NAMES_CACHE: Dict[str, Tuple[int, List[str], frozenset]] = {}
+_LOCK = threading.Lock()
 
 
-def _load_raw(user_id: str | None = None) -> dict:
-    p = _db_path(user_id)
-    if p.exists():
-        try:
-            with p.open("r", encoding="utf-8") as f:
-                data = json.load(f)
-            if isinstance(data, dict):
-                # Back-compat defaults
-                if "names" not in data or not isinstance(data.get("names"), list):
-                    data["names"] = []
-                if "meta" not in data or not isinstance(data.get("meta"), dict):
-                    data["meta"] = {}
-                return data
-        except Exception:
-            return {"names": [], "meta": {}}
-    return {"names": [], "meta": {}}
+def _db_path(user_id: str | None = None) -> Path:
+    return (_owned_dir(user_id) / _DB_NAME).resolve()
 
 
-def _save_raw(data: dict, user_id: str | None = None) -> None:
-    p = _db_path(user_id)
+def _load_legacy_json(p: Path) -> dict:
     try:
-        with p.open("w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with p.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _migrate_legacy_json(conn: sqlite3.Connection, db_file: Path) -> None:
+    """Import a pre-SQLite ``.web_owned_db.json`` next to *db_file* once, then rename it."""
+    legacy = db_file.with_name(_LEGACY_JSON)
+    if not legacy.exists():
+        return
+    data = _load_legacy_json(legacy)
+    names = data.get("names") if isinstance(data.get("names"), list) else []
+    meta = data.get("meta") if isinstance(data.get("meta"), dict) else {}
+    rows = []
+    for raw in names:
+        nm = str(raw).strip()
+        if not nm:
+            continue
+        info = meta.get(nm) if isinstance(meta.get(nm), dict) else {}
+        rows.append({
+            "name": nm,
+            "added_at": info.get("added_at") if isinstance(info.get("added_at"), (int, float)) else None,
+            "tags": info.get("tags") or [],
+            "type": info.get("type") or None,
+            "colors": info.get("colors") or [],
+            "manaValue": info.get("manaValue"),
+            "power": info.get("power"),
+            "toughness": info.get("toughness"),
+        })
+    _insert_rows(conn, rows)
+    try:
+        legacy.rename(legacy.with_name(_LEGACY_JSON + ".migrated"))
     except Exception:
         pass
 
 
-def get_names(user_id: str | None = None) -> List[str]:
-    data = _load_raw(user_id)
-    names = data.get("names") or []
-    if not isinstance(names, list):
-        return []
-    # Normalize and dedupe while preserving stable ordering
+@contextmanager
+def _connect(user_id: str | None = None) -> Iterator[sqlite3.Connection]:
+    """Open the collection's database, creating it (and migrating legacy JSON) on first use."""
+    db_file = _db_path(user_id)
+    key = str(db_file)
+    if not db_file.exists():
+        _READY.discard(key)
+        try:
+            db_file.parent.mkdir(parents=True, exist_ok=True)
+        except Exception:
+            pass
+    conn = sqlite3.connect(key, timeout=10)
+    try:
+        if key not in _READY:
+            with _LOCK:
+                with conn:
+                    conn.executescript(_SCHEMA)
+                    _migrate_legacy_json(conn, db_file)
+                    _bump_version(conn)
+                _READY.add(key)
+        yield conn
+    finally:
+        conn.close()
+
+
+@contextmanager
+def _connect_existing(user_id: str | None = None) -> Iterator[Optional[sqlite3.Connection]]:
+    """Like :func:`_connect` for read paths, but yields ``None`` when there is no
+    collection yet (no database and no legacy JSON), so reads never create one."""
+    db_file = _db_path(user_id)
+    if not db_file.exists() and not db_file.with_name(_LEGACY_JSON).exists():
+        yield None
+        return
+    with _connect(user_id) as conn:
+        yield conn
+
+
+def _bump_version(conn: sqlite3.Connection) -> None:
+    conn.execute("UPDATE owned_meta SET value = value + 1 WHERE key = 'version'")
+
+
+def _insert_rows(conn: sqlite3.Connection, rows: List[Dict[str, object]]) -> int:
+    """Insert rows whose name isn't owned yet (case-insensitive); returns how many were new."""
+    before = conn.total_changes
+    conn.executemany(
+        "INSERT INTO owned (name_key, name, added_at, tags, type, colors, mana_value, power, toughness)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(name_key) DO NOTHING",
+        [
+            (
+                str(r["name"]).lower(), r["name"], r.get("added_at"),
+                json.dumps(r.get("tags") or [], ensure_ascii=False), r.get("type"),
+                json.dumps(r.get("colors") or []), r.get("manaValue"), r.get("power"), r.get("toughness"),
+            )
+            for r in rows
+        ],
+    )
+    return conn.total_changes - before
+
+
+def _clean_names(names: Iterable[str]) -> List[str]:
+    """Trim and dedupe (case-insensitively) while preserving order."""
     seen = set()
     out: List[str] = []
-    for n in names:
-        s = str(n).strip()
-        if not s:
+    for raw in names or []:
+        try:
+            s = str(raw).strip()
+        except Exception:
             continue
-        key = s.lower()
-        if key in seen:
+        if not s or s.lower() in seen:
             continue
-        seen.add(key)
+        seen.add(s.lower())
         out.append(s)
     return out
 
 
+def owned_version(user_id: str | None = None) -> int:
+    """Return the collection's version stamp; it changes on every add/remove/clear."""
+    with _connect_existing(user_id) as conn:
+        if conn is None:
+            return 0
+        row = conn.execute("SELECT value FROM owned_meta WHERE key = 'version'").fetchone()
+    return int(row[0]) if row else 0
+
+
+def _cached_names(user_id: str | None = None) -> Tuple[int, List[str], frozenset]:
+    key = str(_db_path(user_id))
+    with _connect_existing(user_id) as conn:
+        if conn is None:
+            return 0, [], frozenset()
+        version = int(conn.execute("SELECT value FROM owned_meta WHERE key = 'version'").fetchone()[0])
+        cached = _NAMES_CACHE.get(key)
+        if cached is not None and cached[0] == version:
+            return cached
+        names = [r[0] for r in conn.execute("SELECT name FROM owned ORDER BY rowid")]
+    entry = (version, names, frozenset(n.lower() for n in names))
+    with _LOCK:
+        _NAMES_CACHE[key] = entry
+    return entry
+
+
+def get_names(user_id: str | None = None) -> List[str]:
+    return list(_cached_names(user_id)[1])
+
+
+def get_owned_set(user_id: str | None = None) -> frozenset:
+    """Lowercase owned names, shared across callers until the collection changes."""
+    return _cached_names(user_id)[2]
+
+
 def clear(user_id: str | None = None) -> None:
-    _save_raw({"names": [], "meta": {}}, user_id)
+    with _connect(user_id) as conn:
+        with conn:
+            conn.execute("DELETE FROM owned")
+            _bump_version(conn)
 
 
 def add_names(names: Iterable[str], user_id: str | None = None) -> Tuple[int, int]:
     """Add a batch of names; returns (added_count, total_after)."""
-    data = _load_raw(user_id)
-    cur = [str(x).strip() for x in (data.get("names") or []) if str(x).strip()]
-    cur_set = {n.lower() for n in cur}
-    added = 0
-    for raw in names:
-        try:
-            s = str(raw).strip()
-            if not s:
-                continue
-            key = s.lower()
-            if key in cur_set:
-                continue
-            cur.append(s)
-            cur_set.add(key)
-            added += 1
-        except Exception:
-            continue
-    data["names"] = cur
-    if "meta" not in data or not isinstance(data.get("meta"), dict):
-        data["meta"] = {}
-    meta = data["meta"]
     now = int(time.time())
-    # Ensure newly added names have an added_at
-    for s in cur:
-        info = meta.get(s)
-        if not info:
-            meta[s] = {"added_at": now}
-        else:
-            if "added_at" not in info:
-                info["added_at"] = now
-    _save_raw(data, user_id)
-    return added, len(cur)
+    rows = [{"name": nm, "added_at": now} for nm in _clean_names(names)]
+    with _connect(user_id) as conn:
+        with conn:
+            added = _insert_rows(conn, rows)
+            if added:
+                _bump_version(conn)
+        total = conn.execute("SELECT COUNT(*) FROM owned").fetchone()[0]
+    return added, int(total)
+
+
+def _card_rows(target_names: Iterable[str]) -> "pd.DataFrame":
+    """all_cards.parquet rows whose lowercase name is in *target_names*, with a ``_key`` column."""
+    want = {str(n).strip().lower() for n in target_names if str(n).strip()}
+    if not want:
+        return pd.DataFrame()
+    from deck_builder import builder_utils as bu
+    df = bu._load_all_cards_parquet()
+    if df.empty or 'name' not in df.columns:
+        return pd.DataFrame()
+    keys = df['name'].astype(str).str.strip().str.lower()
+    mask = keys.isin(want)
+    out = df.loc[mask].copy()
+    out['_key'] = keys[mask]
+    return out
+
+
+def _text_or_none(series: "pd.Series") -> "pd.Series":
+    text = series.astype('string').str.strip()
+    return text.mask(text.isna() | text.str.lower().isin(['', 'nan', 'none']))
 
 
 def _enrich_from_csvs(target_names: Iterable[str]) -> Dict[str, Dict[str, object]]:
-    """Return metadata for target names by scanning all_cards.parquet (M4).
-    Output: { Name: { 'tags': [..], 'type': str|None, 'colors': [..] } }
+    """Return metadata for target names with one vectorized pass over all_cards.parquet (M4).
+    Output: { lowercase name: { 'name', 'tags': [..], 'type': str|None, 'colors': [..],
+    'manaValue', 'power', 'toughness' } }; multi-row cards merge tags and take the
+    first non-empty value of the other fields.
     """
     meta: Dict[str, Dict[str, object]] = {}
-    want = {str(n).strip().lower() for n in target_names if str(n).strip()}
-    if not want:
-        return meta
-
     try:
-        from deck_builder import builder_utils as bu
-        df = bu._load_all_cards_parquet()
+        df = _card_rows(target_names)
         if df.empty:
             return meta
-
-        # Filter to cards we care about
-        df['name_lower'] = df['name'].str.lower()
-        df_filtered = df[df['name_lower'].isin(want)].copy()
-
-        for _, row in df_filtered.iterrows():
-            nm = str(row.get('name') or '').strip()
-            if not nm:
-                continue
-
-            entry = meta.setdefault(nm, {"tags": [], "type": None, "colors": []})
-
-            # Tags (already a list after our conversion in builder_utils)
-            tags = row.get('themeTags')
-            if tags and isinstance(tags, list):
-                existing = entry.get('tags') or []
-                seen = {str(t).lower() for t in existing}
-                for t in tags:
-                    t_str = str(t).strip()
-                    if t_str and t_str.lower() not in seen:
-                        existing.append(t_str)
-                        seen.add(t_str.lower())
-                entry['tags'] = existing
-
-            # Type
-            if not entry.get('type'):
-                t_raw = str(row.get('type') or '').strip()
-                if t_raw:
-                    tline = t_raw.split('—')[0].strip() if '—' in t_raw else t_raw
-                    prim = None
-                    for cand in ['Creature','Instant','Sorcery','Artifact','Enchantment','Planeswalker','Land','Battle']:
-                        if cand.lower() in tline.lower():
-                            prim = cand
-                            break
-                    if not prim and tline:
-                        prim = tline.split()[0]
-                    if prim:
-                        entry['type'] = prim
-
-            # Colors
-            if not entry.get('colors'):
-                colors_raw = str(row.get('colorIdentity') or '').strip()
-                if colors_raw:
-                    parts = [c.strip() for c in colors_raw.split(',') if c.strip()]
-                    entry['colors'] = parts
-
-            # Numeric stats (manaValue, power, toughness)
-            if entry.get('manaValue') is None:
-                mv_raw = row.get('manaValue')
-                try:
-                    entry['manaValue'] = float(mv_raw) if mv_raw is not None else None
-                except (ValueError, TypeError):
-                    pass
-            if not entry.get('power'):
-                pw = str(row.get('power') or '').strip()
-                if pw and pw.lower() not in ('nan', 'none', ''):
-                    entry['power'] = pw
-            if not entry.get('toughness'):
-                th = str(row.get('toughness') or '').strip()
-                if th and th.lower() not in ('nan', 'none', ''):
-                    entry['toughness'] = th
-
+        df = df.reset_index(drop=True)
+        n = len(df)
+
+        # Primary type: first known type word in the front half of the type line, else its first word
+        tline = _text_or_none(df['type'] if 'type' in df.columns else pd.Series([None] * n)).str.split('—').str[0].str.strip()
+        low = tline.str.lower()
+        prim = pd.Series([None] * n, dtype=object)
+        for cand in reversed(_PRIMARY_TYPES):
+            prim = prim.mask(low.str.contains(cand.lower(), regex=False).fillna(False).astype(bool), cand)
+        first_word = tline.str.split().str[0]
+        prim = prim.where(prim.notna(), first_word.astype(object).where(first_word.notna(), None))
+
+        colors = _text_or_none(df['colorIdentity'] if 'colorIdentity' in df.columns else pd.Series([None] * n))
+        color_lists = colors.str.split(',').map(lambda parts: [c.strip() for c in parts if c.strip()] if isinstance(parts, list) else [])
+        mv = pd.to_numeric(df['manaValue'], errors='coerce') if 'manaValue' in df.columns else pd.Series([np.nan] * n)
+        power = _text_or_none(df['power']) if 'power' in df.columns else pd.Series([None] * n)
+        tough = _text_or_none(df['toughness']) if 'toughness' in df.columns else pd.Series([None] * n)
+
+        frame = pd.DataFrame({
+            '_key': df['_key'], 'name': df['name'].astype(str).str.strip(), 'type': prim,
+            'colors': color_lists.where(color_lists.map(len) > 0, None),
+            'manaValue': mv, 'power': power.astype(object), 'toughness': tough.astype(object),
+        })
+        firsts = frame.groupby('_key', sort=False).first()
+
+        tags_by_key: Dict[str, List[str]] = {}
+        if 'themeTags' in df.columns:
+            exploded = pd.DataFrame({'_key': df['_key'], 'tag': df['themeTags']}).explode('tag')
+            exploded['tag'] = exploded['tag'].astype('string').str.strip()
+            exploded = exploded[exploded['tag'].notna() & (exploded['tag'] != '')]
+            exploded = exploded.assign(_tl=exploded['tag'].str.lower()).drop_duplicates(['_key', '_tl'])
+            tags_by_key = {k: list(g) for k, g in exploded.groupby('_key', sort=False)['tag']}
+
+        for key, row in zip(firsts.index, firsts.itertuples(index=False)):
+            meta[key] = {
+                'name': row.name,
+                'tags': [str(t) for t in tags_by_key.get(key, [])],
+                'type': row.type if isinstance(row.type, str) else None,
+                'colors': list(row.colors) if isinstance(row.colors, list) else [],
+                'manaValue': None if pd.isna(row.manaValue) else float(row.manaValue),
+                'power': row.power if isinstance(row.power, str) else None,
+                'toughness': row.toughness if isinstance(row.toughness, str) else None,
+            }
     except Exception:
         # Defensive: return empty or partial meta
         pass
@@ -214,66 +336,68 @@ def _enrich_from_csvs(target_names: Iterable[str]) -> Dict[str, Dict[str, object
 
 
 def add_and_enrich(names: Iterable[str], user_id: str | None = None) -> Tuple[int, int]:
-    """Add names and enrich their metadata from Parquet (M4).
+    """Add names and enrich their metadata from Parquet (M4) in one transaction.
     Returns (added_count, total_after).
     """
-    data = _load_raw(user_id)
-    current_names = [str(x).strip() for x in (data.get("names") or []) if str(x).strip()]
-    cur_set = {n.lower() for n in current_names}
-    new_names: List[str] = []
-    for raw in names:
-        try:
-            s = str(raw).strip()
-            if not s:
-                continue
-            key = s.lower()
-            if key in cur_set:
-                continue
-            current_names.append(s)
-            cur_set.add(key)
-            new_names.append(s)
-        except Exception:
-            continue
-    # Enrich
-    meta = data.get("meta") or {}
-    now = int(time.time())
-    if new_names:
-        enriched = _enrich_from_csvs(new_names)
-        for nm, info in enriched.items():
-            meta[nm] = info
-        # Stamp added_at for new names if missing
-        for nm in new_names:
-            entry = meta.setdefault(nm, {})
-            if "added_at" not in entry:
-                entry["added_at"] = now
-    data["names"] = current_names
-    data["meta"] = meta
-    _save_raw(data, user_id)
-    return len(new_names), len(current_names)
+    cleaned = _clean_names(names)
+    with _connect(user_id) as conn:
+        if cleaned:
+            keys = [n.lower() for n in cleaned]
+            owned = set()
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                owned.update(r[0] for r in conn.execute(
+                    f"SELECT name_key FROM owned WHERE name_key IN ({','.join('?' * len(chunk))})", chunk
+                ))
+            new_names = [n for n in cleaned if n.lower() not in owned]
+        else:
+            new_names = []
+        added = 0
+        if new_names:
+            enriched = _enrich_from_csvs(new_names)
+            now = int(time.time())
+            rows = []
+            for nm in new_names:
+                info = dict(enriched.get(nm.lower()) or {})
+                info['name'] = nm
+                info['added_at'] = now
+                rows.append(info)
+            with conn:
+                added = _insert_rows(conn, rows)
+                if added:
+                    _bump_version(conn)
+        total = conn.execute("SELECT COUNT(*) FROM owned").fetchone()[0]
+    return added, int(total)
+
+
+def _json_list(raw: object) -> List[str]:
+    try:
+        val = json.loads(raw) if raw else []
+    except Exception:
+        return []
+    return [str(x) for x in val if str(x)] if isinstance(val, list) else []
 
 
 def get_enriched(user_id: str | None = None) -> Tuple[List[str], Dict[str, List[str]], Dict[str, str], Dict[str, List[str]]]:
     """Return names and metadata dicts (tags_by_name, type_by_name, colors_by_name).
     If metadata missing, returns empty for those entries.
     """
-    data = _load_raw(user_id)
-    names = [str(x).strip() for x in (data.get("names") or []) if str(x).strip()]
-    meta: Dict[str, Dict[str, object]] = data.get("meta") or {}
+    names: List[str] = []
     tags_by_name: Dict[str, List[str]] = {}
     type_by_name: Dict[str, str] = {}
     colors_by_name: Dict[str, List[str]] = {}
-    for n in names:
-        info = meta.get(n) or {}
-        tags = (info.get('tags') or [])
-    # user-defined tags are no longer supported; no merge
-        typ = info.get('type') or None
-        cols = info.get('colors') or []
+    with _connect_existing(user_id) as conn:
+        rows = conn.execute("SELECT name, tags, type, colors FROM owned ORDER BY rowid").fetchall() if conn else []
+    for n, tags_raw, typ, colors_raw in rows:
+        names.append(n)
+        tags = _json_list(tags_raw)
+        cols = _json_list(colors_raw)
         if tags:
-            tags_by_name[n] = [str(x) for x in tags if str(x)]
+            tags_by_name[n] = tags
         if typ:
             type_by_name[n] = str(typ)
         if cols:
-            colors_by_name[n] = [str(x).upper() for x in cols if str(x)]
+            colors_by_name[n] = [c.upper() for c in cols]
     return names, tags_by_name, type_by_name, colors_by_name
 
 
@@ -281,49 +405,28 @@ def get_stats_map(user_id: str | None = None) -> Dict[str, Dict[str, object]]:
     """Return {name: {manaValue, power, toughness}} for all owned names.
     Falls back to a parquet lookup for any entries missing numeric stats.
     """
-    data = _load_raw(user_id)
-    names: List[str] = [str(x).strip() for x in (data.get("names") or []) if str(x).strip()]
-    meta: Dict[str, Dict[str, object]] = data.get("meta") or {}
-
+    with _connect_existing(user_id) as conn:
+        rows = conn.execute("SELECT name, mana_value, power, toughness FROM owned ORDER BY rowid").fetchall() if conn else []
     result: Dict[str, Dict[str, object]] = {}
     missing: List[str] = []
-    for n in names:
-        info = meta.get(n) or {}
-        mv = info.get('manaValue')
-        entry: Dict[str, object] = {
-            'manaValue': float(mv) if mv is not None else None,
-            'power': info.get('power'),
-            'toughness': info.get('toughness'),
-        }
-        result[n] = entry
-        if entry['manaValue'] is None and entry['power'] is None:
+    for n, mv, pw, th in rows:
+        result[n] = {'manaValue': float(mv) if mv is not None else None, 'power': pw, 'toughness': th}
+        if mv is None and pw is None:
             missing.append(n)
 
     # Batch parquet lookup for cards that weren't enriched yet
     if missing:
-        try:
-            from deck_builder import builder_utils as bu
-            df = bu._load_all_cards_parquet()
-            if not df.empty:
-                want = {n.lower() for n in missing}
-                df['_nl'] = df['name'].str.lower()
-                for _, row in df[df['_nl'].isin(want)].iterrows():
-                    nm = str(row.get('name') or '').strip()
-                    if nm not in result:
-                        continue
-                    try:
-                        mv_raw = row.get('manaValue')
-                        result[nm]['manaValue'] = float(mv_raw) if mv_raw is not None else None
-                    except (ValueError, TypeError):
-                        pass
-                    pw = str(row.get('power') or '').strip()
-                    if pw and pw.lower() not in ('nan', 'none'):
-                        result[nm]['power'] = pw
-                    th = str(row.get('toughness') or '').strip()
-                    if th and th.lower() not in ('nan', 'none'):
-                        result[nm]['toughness'] = th
-        except Exception:
-            pass
+        enriched = _enrich_from_csvs(missing)
+        for n in missing:
+            info = enriched.get(n.lower())
+            if not info:
+                continue
+            entry = result[n]
+            entry['manaValue'] = info.get('manaValue')
+            if info.get('power'):
+                entry['power'] = info['power']
+            if info.get('toughness'):
+                entry['toughness'] = info['toughness']
     return result
 
 
@@ -332,45 +435,25 @@ def get_stats_map(user_id: str | None = None) -> Dict[str, Dict[str, object]]:
 
 def get_added_at_map(user_id: str | None = None) -> Dict[str, int]:
     """Return a mapping of name -> added_at unix timestamp (if known)."""
-    data = _load_raw(user_id)
-    meta: Dict[str, Dict[str, object]] = data.get("meta") or {}
-    out: Dict[str, int] = {}
-    for n, info in meta.items():
-        try:
-            ts = info.get("added_at")
-            if isinstance(ts, (int, float)):
-                out[n] = int(ts)
-        except Exception:
-            continue
-    return out
+    with _connect_existing(user_id) as conn:
+        rows = conn.execute("SELECT name, added_at FROM owned WHERE added_at IS NOT NULL").fetchall() if conn else []
+    return {n: int(ts) for n, ts in rows}
 
 
 def remove_names(names: Iterable[str], user_id: str | None = None) -> Tuple[int, int]:
     """Remove a batch of names; returns (removed_count, total_after)."""
-    target = {str(n).strip().lower() for n in (names or []) if str(n).strip()}
-    if not target:
-        return 0, len(get_names(user_id))
-    data = _load_raw(user_id)
-    cur = [str(x).strip() for x in (data.get("names") or []) if str(x).strip()]
-    before = len(cur)
-    cur_kept: List[str] = []
-    for s in cur:
-        if s.lower() in target:
-            continue
-        cur_kept.append(s)
-    removed = before - len(cur_kept)
-    data["names"] = cur_kept
-    meta = data.get("meta") or {}
-    # Drop meta entries for removed names
-    for s in list(meta.keys()):
-        try:
-            if s.lower() in target:
-                meta.pop(s, None)
-        except Exception:
-            continue
-    data["meta"] = meta
-    _save_raw(data, user_id)
-    return removed, len(cur_kept)
+    target = sorted({str(n).strip().lower() for n in (names or []) if str(n).strip()})
+    with _connect(user_id) as conn:
+        removed = 0
+        if target:
+            with conn:
+                before = conn.total_changes
+                conn.executemany("DELETE FROM owned WHERE name_key = ?", [(k,) for k in target])
+                removed = conn.total_changes - before
+                if removed:
+                    _bump_version(conn)
+        total = conn.execute("SELECT COUNT(*) FROM owned").fetchone()[0]
+    return removed, int(total)
 
 
 def get_user_tags_map() -> Dict[str, list[str]]:
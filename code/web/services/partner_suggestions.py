@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections import OrderedDict
 from dataclasses import dataclass
 import json
 import os
@@ -14,8 +15,11 @@ from code.logging_util import get_logger
 
 from deck_builder.combined_commander import CombinedCommander, PartnerMode, build_combined_commander
 from deck_builder.suggestions import (
+    ELIGIBILITY_ROLES,
     PartnerSuggestionContext,
     ScoreResult,
+    build_eligibility_buckets,
+    eligible_candidate_roles,
     is_noise_theme,
     score_partner_candidate,
 )
@@ -179,8 +183,17 @@ class PartnerSuggestionResult:
         return visible, hidden
 
 
+_RESULT_CACHE_SIZE = 512
+
+
 class PartnerSuggestionDataset:
-    """Cached partner synergy dataset accessor."""
+    """Cached partner synergy dataset accessor.
+
+    Besides the commander entries, a loaded dataset keeps per-role eligibility
+    buckets (from the dataset's ``eligibility`` block, or derived from the
+    entries for older files) and memoizes suggestion results per commander;
+    both are dropped when the file changes.
+    """
 
     def __init__(self, path: Path) -> None:
         self.path = path
@@ -191,6 +204,11 @@ class PartnerSuggestionDataset:
         self._pairing_counts: dict[tuple[str, str, str], int] = {}
         self._context: PartnerSuggestionContext = PartnerSuggestionContext()
         self._mtime_ns: int = -1
+        self._order: dict[str, int] = {}
+        self._buckets: dict[str, frozenset[str]] = {}
+        self._roles: dict[str, frozenset[str]] = {}
+        self._results: "OrderedDict[tuple, PartnerSuggestionResult]" = OrderedDict()
+        self._results_lock = Lock()
 
     @property
     def metadata(self) -> Mapping[str, Any]:
@@ -279,6 +297,15 @@ class PartnerSuggestionDataset:
         self._pairing_counts = pairings
         self._context = PartnerSuggestionContext.from_dataset(raw)
         self._mtime_ns = stat.st_mtime_ns
+        self._order = {key: index for index, key in enumerate(entries)}
+        self._buckets = _load_buckets(raw.get("eligibility"), commanders)
+        roles: dict[str, set[str]] = {}
+        for role, keys in self._buckets.items():
+            for key in keys:
+                roles.setdefault(key, set()).add(role)
+        self._roles = {key: frozenset(values) for key, values in roles.items()}
+        with self._results_lock:
+            self._results.clear()
 
     def lookup(self, name: str) -> Optional[CommanderEntry]:
         key = _normalize(name)
@@ -292,6 +319,34 @@ class PartnerSuggestionDataset:
     def entries(self) -> Iterable[CommanderEntry]:
         return self._entries.values()
 
+    def candidates(self, primary: CommanderEntry, modes: Iterable[PartnerMode]) -> list[CommanderEntry]:
+        """Entries that can legally pair with ``primary`` in one of ``modes``, in dataset order.
+
+        A superset of the pairings ``build_combined`` accepts, so scoring only
+        this list yields the same suggestions as scoring every entry.
+        """
+        wanted = eligible_candidate_roles(self._roles.get(primary.canonical, ()), modes)
+        keys: set[str] = set()
+        for role in wanted:
+            keys |= self._buckets.get(role, frozenset())
+        keys.discard(primary.canonical)
+        ordered = sorted((key for key in keys if key in self._order), key=self._order.__getitem__)
+        return [self._entries[key] for key in ordered]
+
+    def cached_result(self, key: tuple) -> Optional["PartnerSuggestionResult"]:
+        with self._results_lock:
+            result = self._results.get(key)
+            if result is not None:
+                self._results.move_to_end(key)
+            return result
+
+    def store_result(self, key: tuple, result: "PartnerSuggestionResult") -> None:
+        with self._results_lock:
+            self._results[key] = result
+            self._results.move_to_end(key)
+            while len(self._results) > _RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+
     def pairing_count(self, mode: PartnerMode, primary: CommanderEntry, secondary: CommanderEntry) -> int:
         return int(self._pairing_counts.get((mode.value, primary.canonical, secondary.canonical), 0))
 
@@ -306,6 +361,16 @@ class PartnerSuggestionDataset:
         return build_combined_commander(primary_src, candidate_src, mode)
 
 
+def _load_buckets(block: Any, commanders: Mapping[str, Any]) -> dict[str, frozenset[str]]:
+    """Eligibility buckets from the dataset, or derived from ``commanders`` when absent/malformed."""
+    if isinstance(block, Mapping) and all(
+        isinstance(block.get(role), list) for role in ELIGIBILITY_ROLES
+    ):
+        return {role: frozenset(str(key) for key in block[role]) for role in ELIGIBILITY_ROLES}
+    derived = build_eligibility_buckets(commanders)
+    return {role: frozenset(keys) for role, keys in derived.items()}
+
+
 ROOT_DIR = Path(__file__).resolve().parents[3]
 DEFAULT_DATASET_PATH = (ROOT_DIR / "config" / "analytics" / "partner_synergy.json").resolve()
 _DATASET_ENV_VAR = "PARTNER_SUGGESTIONS_DATASET"
@@ -553,13 +618,20 @@ def get_partner_suggestions(
         PartnerMode.DOCTOR_COMPANION.value: [],
     }
 
-    total = 0
+    cache_key = (
+        primary_entry.canonical,
+        int(limit_per_mode),
+        tuple(sorted(mode.value for mode in allowed_modes)),
+        float(min_score),
+    )
+    cached = dataset.cached_result(cache_key)
+    if cached is not None:
+        return cached
+
     primary_source = primary_entry.payload
     context = dataset.context
 
-    for candidate_entry in dataset.entries():
-        if candidate_entry.canonical == primary_entry.canonical:
-            continue
+    for candidate_entry in dataset.candidates(primary_entry, allowed_modes):
         try:
             result = score_partner_candidate(primary_source, candidate_entry.payload, context=context)
         except Exception:  # pragma: no cover - defensive scoring guard
@@ -578,14 +650,13 @@ def get_partner_suggestions(
         pairing_count = dataset.pairing_count(mode, primary_entry, candidate_entry)
         suggestion = _build_suggestion_payload(primary_entry, candidate_entry, mode, result, combined, pairing_count)
         grouped[mode.value].append(suggestion)
-        total += 1
 
     for mode_key, suggestions in grouped.items():
         suggestions.sort(key=lambda item: (-float(item.get("score", 0.0)), item.get("name", "").casefold()))
         if limit_per_mode > 0:
             grouped[mode_key] = suggestions[:limit_per_mode]
 
-    return PartnerSuggestionResult(
+    suggestion_result = PartnerSuggestionResult(
         commander=primary_entry.display_name,
         display_name=primary_entry.display_name,
         canonical=primary_entry.canonical,
@@ -593,3 +664,5 @@ def get_partner_suggestions(
         by_mode=grouped,
         total=sum(len(s) for s in grouped.values()),
     )
+    dataset.store_result(cache_key, suggestion_result)
+    return suggestion_result
@@ -46,6 +46,7 @@ _REDIS_GET_HITS = 0
 _REDIS_GET_ERRORS = 0
 _REDIS_STORE_ATTEMPTS = 0
 _REDIS_STORE_ERRORS = 0
+_PREVIEW_COALESCED = 0
 
 def record_redis_get(hit: bool, error: bool = False):
     global _REDIS_GET_ATTEMPTS, _REDIS_GET_HITS, _REDIS_GET_ERRORS
@@ -61,6 +62,11 @@ def record_redis_store(error: bool = False):
     if error:
         _REDIS_STORE_ERRORS += 1
 
+def record_coalesced() -> None:
+    """Count a cache miss served by waiting on a concurrent build of the same key."""
+    global _PREVIEW_COALESCED
+    _PREVIEW_COALESCED += 1
+
 # External state accessors (injected via set functions) to avoid import cycle
 _ttl_seconds_fn = None
 _recent_hit_window_fn = None
@@ -196,6 +202,7 @@ def preview_metrics() -> Dict[str, Any]:
     return {
         "preview_requests": _PREVIEW_REQUESTS,
         "preview_cache_hits": _PREVIEW_CACHE_HITS,
+        "preview_coalesced_requests": _PREVIEW_COALESCED,
         "preview_cache_entries": cache_len,
         "preview_cache_evictions": _EVICTION_TOTAL,
         "preview_cache_evictions_by_reason": dict(_EVICTION_BY_REASON),
@@ -242,6 +249,7 @@ __all__ = [
     "record_splash_analytics",
     "record_redis_get",
     "record_redis_store",
+    "record_coalesced",
 ]
 
 def record_per_theme_request(slug: str) -> None:
@@ -68,6 +68,8 @@ class PriceService(BaseService):
         self._last_refresh: float = 0.0
         self._hit_count = 0
         self._miss_count = 0
+        # Bumped whenever any price in self._cache changes (see data_version())
+        self._data_version = 0
         self._refresh_thread: Optional[threading.Thread] = None
 
         # CK price cache: {normalized_card_name: float (cheapest non-foil retail)}
@@ -244,6 +246,15 @@ class PriceService(BaseService):
             self._miss_count += misses
         return result
 
+    def data_version(self) -> int:
+        """Return a counter that changes whenever cached prices change.
+
+        Derived structures (e.g. the budget evaluator's price-sorted tag index)
+        key on this to know when to rebuild.
+        """
+        self._ensure_loaded()
+        return self._data_version
+
     def cache_stats(self) -> Dict[str, Any]:
         """Return telemetry snapshot about cache performance.
 
@@ -433,6 +444,8 @@ class PriceService(BaseService):
                 logger.debug("Lazy price fetch skipped for %s: %s", name, exc)
             time.sleep(0.1)  # 100 ms — Scryfall rate-limit guideline
         if updated:
+            with self._lock:
+                self._data_version += 1
             self._lazy_ts.update(updated)
             self._save_lazy_ts()
             # Also persist the updated in-memory cache to the JSON cache file
@@ -536,6 +549,7 @@ class PriceService(BaseService):
         with open(self._cache_path, "r", encoding="utf-8") as fh:
             data = json.load(fh)
         self._cache = data.get("prices", {})
+        self._data_version += 1
         self._last_refresh = data.get("built_at", 0.0)
         # Per-printing prices (see _price_by_printing_id) are persisted alongside
         # the by-name cache so a specific printing can still be priced after a
@@ -619,6 +633,7 @@ class PriceService(BaseService):
 
         with self._lock:
             self._cache = new_cache
+            self._data_version += 1
             self._scryfall_id_map = new_scryfall_id_map
             self._price_by_printing_id = new_price_by_printing_id
             self._last_refresh = built_at
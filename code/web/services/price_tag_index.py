@@ -0,0 +1,265 @@
+"""Price-sorted tag index for batched budget alternative lookups.
+
+``BudgetEvaluatorService.find_cheaper_alternatives`` assembles a candidate
+pool per over-budget card: union the tag pools, look up every candidate's
+price, filter and sort. A budget report on an expensive deck repeats that
+work for every flagged card.
+
+:class:`PriceTagIndex` does the per-tag work once per price-data version.
+Each tag pool is stored as numpy columns sorted by price (name id, rounded
+price, color-identity bitmask, broad-type bitmask, original pool position),
+so a query is a binary search for the price ceiling followed by bitmask
+checks on the slice below it. Tag pools are indexed lazily on first use.
+
+Results match the per-card path exactly: same candidates, same
+``(-shared tags, price)`` ranking, and the same tie order (first appearance
+in the card's tag order, then pool order).
+
+Usage::
+
+    index = get_price_tag_index(price_svc, region="usd", foil=False)
+    alts = index.query(["Ramp", "Mana Rock"], max_price=4.99, exclude_name="Mana Crypt")
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from code import logging_util
+
+logger = logging_util.logging.getLogger(__name__)
+logger.setLevel(logging_util.LOG_LEVEL)
+logger.addHandler(logging_util.file_handler)
+logger.addHandler(logging_util.stream_handler)
+
+# Ordered broad MTG card types — first match wins for type detection.
+BROAD_TYPES = ("Land", "Creature", "Planeswalker", "Battle", "Enchantment", "Artifact", "Instant", "Sorcery")
+_BROAD_TYPE_BITS = {t: 1 << i for i, t in enumerate(BROAD_TYPES)}
+
+
+@dataclass(frozen=True)
+class _TagBand:
+    """One tag pool sorted by price (entries without a price are dropped)."""
+
+    prices: np.ndarray       # float64, ascending
+    rounded: np.ndarray      # float64, round(price, 2) as reported
+    name_ids: np.ndarray     # int64 ids into PriceTagIndex.names
+    lower_ids: np.ndarray    # int64 ids of the lowercase name (self-exclusion)
+    colors: np.ndarray       # uint32 color-identity bitmask (0 = colorless)
+    types: np.ndarray        # uint16 broad-type bitmask
+    positions: np.ndarray    # int64 position in the original tag pool
+    cards: List[Dict[str, Any]]  # card dicts, aligned with the arrays
+
+
+class PriceTagIndex:
+    """Tag -> price-sorted card columns for one (price data, region, finish)."""
+
+    def __init__(self, price_svc: Any, *, region: str = "usd", foil: bool = False, version: Any = None) -> None:
+        self.price_svc = price_svc
+        self.region = region
+        self.foil = foil
+        self.version = version
+        self.names: List[str] = []
+        self._name_ids: Dict[str, int] = {}
+        self._lower_ids: Dict[str, int] = {}
+        self._color_bits: Dict[str, int] = {}
+        self._bands: Dict[str, _TagBand] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Building
+    # ------------------------------------------------------------------
+
+    def _name_id(self, name: str) -> int:
+        ident = self._name_ids.get(name)
+        if ident is None:
+            ident = self._name_ids[name] = len(self.names)
+            self.names.append(name)
+        return ident
+
+    def _lower_id(self, name: str) -> int:
+        key = name.lower()
+        ident = self._lower_ids.get(key)
+        if ident is None:
+            ident = self._lower_ids[key] = len(self._lower_ids)
+        return ident
+
+    def _color_mask(self, letters: Sequence[str]) -> int:
+        mask = 0
+        for letter in letters:
+            bit = self._color_bits.get(letter)
+            if bit is None:
+                bit = self._color_bits[letter] = 1 << len(self._color_bits)
+            mask |= bit
+        return mask
+
+    def _band(self, tag: str) -> _TagBand:
+        band = self._bands.get(tag)
+        if band is not None:
+            return band
+        with self._lock:
+            band = self._bands.get(tag)
+            if band is None:
+                band = self._build_band(tag)
+                self._bands[tag] = band
+        return band
+
+    def _build_band(self, tag: str) -> _TagBand:
+        from code.web.services import card_index
+
+        pool = [c for c in card_index.get_tag_pool(tag) if c.get("name", "")]
+        names = list(dict.fromkeys(c["name"] for c in pool))
+        prices = self.price_svc.get_prices_batch(names, region=self.region, foil=self.foil) if names else {}
+
+        kept: List[Tuple[float, int, Dict[str, Any]]] = []
+        for pos, card in enumerate(pool):
+            price = prices.get(card["name"])
+            if price is not None:
+                kept.append((price, pos, card))
+        # Stable sort keeps pool order among equal prices
+        kept.sort(key=lambda item: item[0])
+
+        cards = [card for _, _, card in kept]
+        type_masks = []
+        for card in cards:
+            type_line = card.get("type_line", "") or ""
+            mask = 0
+            for broad, bit in _BROAD_TYPE_BITS.items():
+                if broad in type_line:
+                    mask |= bit
+            type_masks.append(mask)
+        return _TagBand(
+            prices=np.array([p for p, _, _ in kept], dtype=np.float64),
+            rounded=np.array([round(p, 2) for p, _, _ in kept], dtype=np.float64),
+            name_ids=np.array([self._name_id(c["name"]) for c in cards], dtype=np.int64),
+            lower_ids=np.array([self._lower_id(c["name"]) for c in cards], dtype=np.int64),
+            colors=np.array([self._color_mask(c.get("color_identity_list", [])) for c in cards], dtype=np.uint32),
+            types=np.array(type_masks, dtype=np.uint16),
+            positions=np.array([pos for _, pos, _ in kept], dtype=np.int64),
+            cards=cards,
+        )
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def query(
+        self,
+        tags: Sequence[str],
+        max_price: float,
+        *,
+        exclude_name: str = "",
+        color_identity: Optional[Sequence[str]] = None,
+        require_type: Optional[str] = None,
+        limit: int = 5,
+    ) -> List[Dict[str, Any]]:
+        """Return up to *limit* ``{name, price, tags, shared_tags}`` dicts.
+
+        Ranking is most shared tags first, then price ascending, as in
+        ``BudgetEvaluatorService.find_cheaper_alternatives``.
+        """
+        ordered_tags = list(dict.fromkeys(tags))
+        bands = [self._band(tag) for tag in ordered_tags]
+
+        self_id = self._lower_ids.get(exclude_name.lower(), -1)
+        allowed: Optional[int] = None
+        if color_identity:
+            allowed = 0
+            for letter in {c.upper() for c in color_identity}:
+                allowed |= self._color_bits.get(letter, 0)
+        type_bit = _BROAD_TYPE_BITS.get(require_type) if require_type else None
+
+        parts = []
+        for tag_no, band in enumerate(bands):
+            if not len(band.prices):
+                continue
+            end = int(np.searchsorted(band.prices, max_price, side="right"))
+            if end == 0:
+                continue
+            keep = band.lower_ids[:end] != self_id
+            if require_type:
+                if type_bit is not None:
+                    keep &= (band.types[:end] & type_bit) != 0
+                else:
+                    keep &= np.array([require_type in (c.get("type_line", "") or "") for c in band.cards[:end]], dtype=bool)
+            if allowed is not None:
+                keep &= (band.colors[:end] & np.uint32(~allowed & 0xFFFFFFFF)) == 0
+            idx = np.flatnonzero(keep)
+            if len(idx):
+                parts.append((tag_no, band, idx))
+        if not parts:
+            return []
+
+        name_ids = np.concatenate([band.name_ids[idx] for _, band, idx in parts])
+        tag_nos = np.concatenate([np.full(len(idx), tag_no, dtype=np.int64) for tag_no, _, idx in parts])
+        positions = np.concatenate([band.positions[idx] for _, band, idx in parts])
+        rounded = np.concatenate([band.rounded[idx] for _, band, idx in parts])
+        entries = np.concatenate([idx for _, _, idx in parts])
+        n_tags = len(bands)
+
+        # First appearance per name: earliest tag in the card's tag order, then pool position
+        seen_key = tag_nos * (int(positions.max()) + 1) + positions
+        order = np.lexsort((seen_key, name_ids))
+        uniq_ids, first = np.unique(name_ids[order], return_index=True)
+        first_rows = order[first]
+
+        # Shared tags per name: distinct (name, tag) pairs
+        pair_ids = np.unique(name_ids * n_tags + tag_nos)
+        shared = np.bincount(np.searchsorted(uniq_ids, pair_ids // n_tags), minlength=len(uniq_ids))
+
+        ranking = np.lexsort((seen_key[first_rows], rounded[first_rows], -shared))[:limit]
+        picked = set(uniq_ids[ranking].tolist())
+        shared_tags: Dict[int, List[str]] = {}
+        for pair in pair_ids.tolist():
+            if pair // n_tags in picked:
+                shared_tags.setdefault(pair // n_tags, []).append(ordered_tags[pair % n_tags])
+
+        results = []
+        for rank in ranking.tolist():
+            row = int(first_rows[rank])
+            name_id = int(uniq_ids[rank])
+            card = bands[int(tag_nos[row])].cards[int(entries[row])]
+            results.append({
+                "name": self.names[name_id],
+                "price": float(rounded[row]),
+                "tags": card.get("tags", []),
+                "shared_tags": sorted(shared_tags.get(name_id, [])),
+            })
+        return results
+
+
+# (region, foil) -> index for the current price data and card index generation
+_INDEXES: Dict[Tuple[str, bool], PriceTagIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def _price_version(price_svc: Any) -> Any:
+    version = getattr(price_svc, "data_version", None)
+    try:
+        return version() if callable(version) else None
+    except Exception:
+        return None
+
+
+def get_price_tag_index(price_svc: Any, *, region: str = "usd", foil: bool = False) -> PriceTagIndex:
+    """Return the shared index for *price_svc*, rebuilding it when prices or tag pools change."""
+    from code.web.services import card_index
+
+    version = (_price_version(price_svc), card_index.index_generation())
+    key = (region, bool(foil))
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None or index.price_svc is not price_svc or index.version != version:
+            index = PriceTagIndex(price_svc, region=region, foil=foil, version=version)
+            _INDEXES[key] = index
+            logger.debug("Price tag index reset (region=%s foil=%s version=%s)", region, foil, version)
+    return index
+
+
+def clear_price_tag_index() -> None:
+    """Drop every cached index (tests, or after swapping price services)."""
+    with _INDEXES_LOCK:
+        _INDEXES.clear()
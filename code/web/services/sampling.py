@@ -15,8 +15,12 @@ use; they may change in subsequent refactor steps.
 from __future__ import annotations
 
 import random
+import threading
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional, TypedDict
 
+import numpy as np
+
 from .card_index import maybe_build_index, get_tag_pool, lookup_commander
 from .sampling_config import (
     COMMANDER_COLOR_FILTER_STRICT,
@@ -103,114 +107,235 @@ def _lookup_commander(commander: Optional[str]) -> Optional[Dict[str, Any]]:  #
     return lookup_commander(commander)
 
 
+_ROLES = ("payoff", "enabler", "support", "wildcard")
+_RANKING_CACHE_MAX = 256
+
+
+class _ThemeRanking:
+    """Commander-agnostic per-card features of one theme's tag pool.
+
+    Built once per (theme, synergies, pool) and reused by every preview
+    build for the theme: role, theme match, synergy overlap, rarity, color
+    identity group and first-occurrence name code per pool entry, plus a
+    CSR list of each card's synergy tags for the commander overlap bonus.
+    A miss then scores the whole pool with NumPy and only builds card dicts
+    for the top candidates of each role bucket.
+    """
+
+    def __init__(self, theme: str, synergies: List[str], pool: List[Dict[str, Any]]) -> None:
+        self.pool = pool
+        self.synergies = tuple(synergies)
+        synergy_ids = {tag: i for i, tag in enumerate(dict.fromkeys(synergies))}
+        self.synergy_tags = list(synergy_ids)
+        n = len(pool)
+        names: List[Any] = []
+        name_codes = np.full(n, -1, dtype=np.int64)
+        name_ids: Dict[Any, int] = {}
+        role_codes = np.zeros(n, dtype=np.int8)
+        has_theme = np.zeros(n, dtype=bool)
+        overlaps = np.zeros(n, dtype=np.int64)
+        identity_ids: Dict[Any, int] = {}
+        identity_codes = np.zeros(n, dtype=np.int64)
+        rarity_ids: Dict[str, int] = {}
+        rarity_codes = np.full(n, -1, dtype=np.int64)
+        syn_rows: List[int] = []
+        syn_cols: List[int] = []
+        for i, raw in enumerate(pool):
+            nm = raw.get("name")
+            names.append(nm)
+            if nm:
+                name_codes[i] = name_ids.setdefault(nm, len(name_ids))
+            tags = raw.get("tags", [])
+            tag_set = set(tags)
+            role = _classify_role(theme, synergies, tags)
+            role_codes[i] = _ROLES.index(role)
+            has_theme[i] = theme in tag_set
+            matched = tag_set.intersection(synergy_ids)
+            overlaps[i] = len(matched)
+            for tag in matched:
+                syn_rows.append(i)
+                syn_cols.append(synergy_ids[tag])
+            ident = raw.get("color_identity", "")
+            key = ident if isinstance(ident, str) else tuple(ident)
+            identity_codes[i] = identity_ids.setdefault(key, len(identity_ids))
+            rarity = raw.get("rarity") or ""
+            if rarity:
+                rarity_codes[i] = rarity_ids.setdefault(rarity, len(rarity_ids))
+        self.names = names
+        self.name_codes = name_codes
+        self.role_codes = role_codes
+        self.has_theme = has_theme
+        self.overlaps = overlaps
+        self.identities = [set(key) for key in identity_ids]
+        self.identity_keys = list(identity_ids)
+        self.identity_codes = identity_codes
+        self.rarities = list(rarity_ids)
+        self.rarity_codes = rarity_codes
+        self.syn_rows = np.asarray(syn_rows, dtype=np.int64)
+        self.syn_cols = np.asarray(syn_cols, dtype=np.int64)
+
+    def identity_mask(self, keep) -> np.ndarray:
+        """Per-card bool from ``keep(identity_set, raw_identity)`` evaluated once per distinct identity."""
+        per_identity = np.fromiter(
+            (bool(keep(ci, key)) for ci, key in zip(self.identities, self.identity_keys)),
+            dtype=bool, count=len(self.identities),
+        )
+        return per_identity[self.identity_codes]
+
+    def commander_overlap(self, commander_synergy: set[str]) -> np.ndarray:
+        """Per-card count of synergy tags shared with the commander."""
+        wanted = np.fromiter((tag in commander_synergy for tag in self.synergy_tags), dtype=bool, count=len(self.synergy_tags))
+        if not wanted.any():
+            return np.zeros(len(self.pool), dtype=np.int64)
+        return np.bincount(self.syn_rows[wanted[self.syn_cols]], minlength=len(self.pool))
+
+
+_RANKINGS: "OrderedDict[tuple, _ThemeRanking]" = OrderedDict()
+_RANKINGS_LOCK = threading.Lock()
+
+
+def _theme_ranking(theme: str, synergies: List[str], pool: List[Dict[str, Any]]) -> _ThemeRanking:
+    key = (theme, tuple(synergies))
+    with _RANKINGS_LOCK:
+        ranking = _RANKINGS.get(key)
+        if ranking is not None and ranking.pool is pool:
+            _RANKINGS.move_to_end(key)
+            return ranking
+    ranking = _ThemeRanking(theme, synergies, pool)
+    with _RANKINGS_LOCK:
+        _RANKINGS[key] = ranking
+        _RANKINGS.move_to_end(key)
+        while len(_RANKINGS) > _RANKING_CACHE_MAX:
+            _RANKINGS.popitem(last=False)
+    return ranking
+
+
+def _top_positions(positions: np.ndarray, scores: np.ndarray, names: List[Any], k: int) -> List[int]:
+    """First ``k`` of ``positions`` ordered by (-score, name); ties at the cut are kept for the name sort."""
+    if len(positions) > k:
+        neg = -scores[positions]
+        cut = np.partition(neg, k - 1)[k - 1]
+        positions = positions[neg <= cut]
+    ordered = sorted(positions.tolist(), key=lambda i: (-scores[i], names[i]))
+    return ordered[:k]
+
+
 def sample_real_cards_for_theme(theme: str, limit: int, colors_filter: Optional[str], *, synergies: List[str], commander: Optional[str]) -> List[SampledCard]:
     """Return scored, role-classified real cards for a theme.
 
-    Mirrors prior `_sample_real_cards_for_theme` behavior for parity.
+    Mirrors prior `_sample_real_cards_for_theme` behavior for parity. The
+    commander-agnostic features come from a cached `_ThemeRanking`; only the
+    color filters, rarity calibration and commander bonuses are evaluated per
+    call, and card dicts are built for at most ``limit`` cards per role.
     """
     maybe_build_index()
     pool = get_tag_pool(theme)
     if not pool:
         return []
+    ranking = _theme_ranking(theme, synergies, pool)
     commander_card = _lookup_commander(commander)
     commander_colors: set[str] = set(commander_card.get("color_identity", "")) if commander_card else set()
     commander_tags: set[str] = set(commander_card.get("tags", [])) if commander_card else set()
+    mask = np.ones(len(pool), dtype=bool)
     if colors_filter:
         allowed = {c.strip().upper() for c in colors_filter.split(',') if c.strip()}
         if allowed:
-            pool = [c for c in pool if set(c.get("color_identity", "")).issubset(allowed) or not c.get("color_identity")]
+            mask &= ranking.identity_mask(lambda ci, raw: ci.issubset(allowed) or not raw)
+    splash = np.zeros(len(pool), dtype=bool)
     if commander_card and COMMANDER_COLOR_FILTER_STRICT and commander_colors:
         allow_splash = len(commander_colors) >= 4
-        new_pool: List[Dict[str, Any]] = []
-        for c in pool:
-            ci = set(c.get("color_identity", ""))
-            if not ci or ci.issubset(commander_colors):
-                new_pool.append(c)
-                continue
-            if allow_splash:
-                off = ci - commander_colors
-                if len(off) == 1:
-                    c["_splash_off_color"] = True
-                    new_pool.append(c)
-                    continue
-        pool = new_pool
-    seen_names: set[str] = set()
-    payoff: List[SampledCard] = []
-    enabler: List[SampledCard] = []
-    support: List[SampledCard] = []
-    wildcard: List[SampledCard] = []
-    rarity_counts: Dict[str, int] = {}
-    rarity_diversity = parse_rarity_diversity_targets()
+        on_color = ranking.identity_mask(lambda ci, raw: not ci or ci.issubset(commander_colors))
+        if allow_splash:
+            splash = ~on_color & ranking.identity_mask(lambda ci, raw: len(ci - commander_colors) == 1)
+        mask &= on_color | splash
+
+    # First occurrence of each name among the surviving cards, in pool order.
+    positions = np.flatnonzero(mask & (ranking.name_codes >= 0))
+    _, first = np.unique(ranking.name_codes[positions], return_index=True)
+    positions = positions[np.sort(first)]
+
     synergy_set = set(synergies)
     rarity_weight_cfg = rarity_weight_base()
+    rarity_diversity = parse_rarity_diversity_targets()
     splash_scale = parse_splash_adaptive_scale() if SPLASH_ADAPTIVE_ENABLED else None
     commander_color_count = len(commander_colors) if commander_colors else 0
-    for raw in pool:
-        nm = raw.get("name")
-        if not nm or nm in seen_names:
+
+    # Score in the same addition order as the per-card pipeline so floats match exactly.
+    n = len(pool)
+    role_weights = np.array([ROLE_BASE_WEIGHTS.get(role, 0.5) for role in _ROLES])
+    scores = np.zeros(n)
+    scores += np.where(ranking.has_theme, 3.0, 0.0)
+    scores += ranking.overlaps * 1.2
+    scores += role_weights[ranking.role_codes]
+    commander_overlap = np.zeros(n, dtype=np.int64)
+    scaled = np.zeros(n)
+    if commander_card:
+        scores += np.where(ranking.has_theme, COMMANDER_THEME_MATCH_BONUS, 0.0)
+        if commander_tags and synergy_set:
+            commander_overlap = ranking.commander_overlap(commander_tags & synergy_set)
+            scaled = np.where(commander_overlap > 0, COMMANDER_OVERLAP_BONUS * (1 - (0.5 ** commander_overlap)), 0.0)
+            scores += scaled
+    increments = np.zeros(n)
+    overflow = np.zeros(n, dtype=bool)
+    rarity_at = ranking.rarity_codes[positions]
+    for code, rarity in enumerate(ranking.rarities):
+        hits = positions[rarity_at == code]
+        if not len(hits):
             continue
-        seen_names.add(nm)
+        counts = np.arange(len(hits))
+        increments[hits] = rarity_weight_cfg.get(rarity, 0.25) / (1 + 0.4 * counts)
+        if rarity_diversity and rarity in rarity_diversity:
+            overflow[hits] = (counts + 1) > rarity_diversity[rarity][1]
+    scores += increments
+    scores += np.where(overflow, RARITY_DIVERSITY_OVER_PENALTY, 0.0)
+    penalty = SPLASH_OFF_COLOR_PENALTY
+    adaptive = bool(splash_scale and commander_color_count)
+    if adaptive:
+        penalty = round(SPLASH_OFF_COLOR_PENALTY * splash_scale.get(commander_color_count, 1.0), 4)
+    scores += np.where(splash, penalty, 0.0)
+
+    def _item(i: int) -> SampledCard:
+        raw = pool[i]
+        role = _ROLES[ranking.role_codes[i]]
         tags = raw.get("tags", [])
-        role = _classify_role(theme, synergies, tags)
-        score = _score_card(theme, synergies, role, tags)
-        reasons = [f"role:{role}", f"synergy_overlap:{len(set(tags).intersection(synergies))}"]
+        reasons = [f"role:{role}", f"synergy_overlap:{int(ranking.overlaps[i])}"]
         if commander_card:
-            if theme in tags:
-                score += COMMANDER_THEME_MATCH_BONUS
+            if ranking.has_theme[i]:
                 reasons.append("commander_theme_match")
-            scaled = _commander_overlap_scale(commander_tags, tags, synergy_set)
-            if scaled:
-                score += scaled
-                reasons.append(f"commander_synergy_overlap:{len(commander_tags.intersection(synergy_set).intersection(tags))}:{round(scaled,2)}")
+            if scaled[i]:
+                reasons.append(f"commander_synergy_overlap:{int(commander_overlap[i])}:{round(float(scaled[i]), 2)}")
             reasons.append("commander_bias")
         rarity = raw.get("rarity") or ""
         if rarity:
-            base_rarity_weight = rarity_weight_cfg.get(rarity, 0.25)
-            count_so_far = rarity_counts.get(rarity, 0)
-            increment_weight = base_rarity_weight / (1 + 0.4 * count_so_far)
-            score += increment_weight
-            rarity_counts[rarity] = count_so_far + 1
-            reasons.append(f"rarity_weight_calibrated:{rarity}:{round(increment_weight,2)}")
-            if rarity_diversity and rarity in rarity_diversity:
-                lo, hi = rarity_diversity[rarity]
-                # Only enforce upper bound (overflow penalty)
-                if rarity_counts[rarity] > hi:
-                    score += RARITY_DIVERSITY_OVER_PENALTY
-                    reasons.append(f"rarity_diversity_overflow:{rarity}:{hi}:{RARITY_DIVERSITY_OVER_PENALTY}")
-        if raw.get("_splash_off_color"):
-            penalty = SPLASH_OFF_COLOR_PENALTY
-            if splash_scale and commander_color_count:
-                scale = splash_scale.get(commander_color_count, 1.0)
-                adaptive_penalty = round(penalty * scale, 4)
-                score += adaptive_penalty
-                reasons.append(f"splash_off_color_penalty_adaptive:{commander_color_count}:{adaptive_penalty}")
+            reasons.append(f"rarity_weight_calibrated:{rarity}:{round(float(increments[i]), 2)}")
+            if overflow[i]:
+                hi = rarity_diversity[rarity][1]
+                reasons.append(f"rarity_diversity_overflow:{rarity}:{hi}:{RARITY_DIVERSITY_OVER_PENALTY}")
+        if splash[i]:
+            if adaptive:
+                reasons.append(f"splash_off_color_penalty_adaptive:{commander_color_count}:{penalty}")
             else:
-                score += penalty  # negative value
                 reasons.append(f"splash_off_color_penalty:{penalty}")
-        item: SampledCard = {
-            "name": nm,
+        return {
+            "name": ranking.names[i],
             "colors": list(raw.get("color_identity", "")),
             "roles": [role],
             "tags": tags,
-            "score": score,
+            "score": float(scores[i]),
             "reasons": reasons,
             "mana_cost": raw.get("mana_cost"),
             "rarity": rarity,
             "color_identity_list": raw.get("color_identity_list", []),
             "pip_colors": raw.get("pip_colors", []),
         }
-        if role == "payoff":
-            payoff.append(item)
-        elif role == "enabler":
-            enabler.append(item)
-        elif role == "support":
-            support.append(item)
-        else:
-            wildcard.append(item)
-    seed = _seed_from(theme, commander)
-    for bucket in (payoff, enabler, support, wildcard):
-        _deterministic_shuffle(bucket, seed)
-        bucket.sort(key=lambda x: (-x["score"], x["name"]))
+
+    # No step below takes more than `limit` cards from one role bucket.
+    per_bucket = max(1, limit)
+    role_at = ranking.role_codes[positions]
+    payoff, enabler, support, wildcard = (
+        [_item(i) for i in _top_positions(positions[role_at == code], scores, ranking.names, per_bucket)]
+        for code in range(len(_ROLES))
+    )
     target_payoff = max(1, int(round(limit * 0.4)))
     target_enabler_support = max(1, int(round(limit * 0.4)))
     target_wild = max(0, limit - target_payoff - target_enabler_support)
@@ -0,0 +1,171 @@
+"""LRU cache of card search results keyed by query and data version.
+
+The card browser (`/cards`, `/cards/grid`), the public REST API
+(`/api/v1/cards`) and the theme autocomplete rerun their whole filter and
+sort pipeline for every request, including infinite-scroll requests that only
+move the cursor. A `SearchResultCache` keeps the sorted result as an array of
+row positions into the base frame, so a repeated query (or the next page of
+one) is a slice of the cached permutation.
+
+Callers key entries on ``(current_version(), ...)``: the version covers
+`all_cards.parquet` and `card_printings.parquet` (mtime + size), and every
+cache is cleared the first time a new version is seen. Each entry also
+remembers the frame it was computed from; a hit against a different frame
+(e.g. the loader reloaded) counts as a miss.
+
+Public API:
+    data_version(cards_path=None) -> tuple
+    current_version(cards_path=None) -> tuple   (clears caches on change)
+    get_search_cache(name) -> SearchResultCache
+    SearchResultCache.get_or_compute(key, source, compute)
+    search_cache_metrics() -> dict
+    clear_search_caches()
+
+Env:
+    SEARCH_RESULT_CACHE_SIZE  entries per cache (default 256; 0 disables)
+"""
+from __future__ import annotations
+
+import os
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from code.path_util import card_files_processed_dir, get_processed_cards_path
+
+_DEFAULT_SIZE = 256
+
+
+def _max_entries() -> int:
+    try:
+        return max(0, int(os.getenv("SEARCH_RESULT_CACHE_SIZE", str(_DEFAULT_SIZE))))
+    except ValueError:
+        return _DEFAULT_SIZE
+
+
+def _stat_key(path: str) -> Tuple[str, int, int]:
+    try:
+        st = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return (str(path), 0, -1)
+    return (str(path), st.st_mtime_ns, st.st_size)
+
+
+def data_version(cards_path: Optional[str] = None) -> Tuple[Tuple[str, int, int], ...]:
+    """Identity of the card data a cached result was computed from."""
+    return (
+        _stat_key(cards_path or get_processed_cards_path()),
+        _stat_key(os.path.join(card_files_processed_dir(), "card_printings.parquet")),
+    )
+
+
+def _source_ref(source: Any) -> Callable[[], Any]:
+    try:
+        return weakref.ref(source)
+    except TypeError:
+        return lambda: source
+
+
+class SearchResultCache:
+    """Thread-safe LRU of computed search results with hit/miss counters."""
+
+    def __init__(self, name: str, max_entries: Optional[int] = None) -> None:
+        self.name = name
+        self.max_entries = _max_entries() if max_entries is None else max(0, int(max_entries))
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[Callable[[], Any], Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, source: Any) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0]() is source:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, value: Any, source: Any) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (_source_ref(source), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key: Hashable, source: Any, compute: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key`` computed from ``source``, computing it on a miss.
+
+        ``compute`` runs outside the lock; two concurrent misses on the same
+        key both compute and the later one wins, which is harmless here.
+        """
+        value = self.get(key, source)
+        if value is None:
+            value = compute()
+            self.put(key, value, source)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+_registry_lock = threading.Lock()
+_CACHES: Dict[str, SearchResultCache] = {}
+_last_version: Optional[Tuple[Any, ...]] = None
+
+
+def get_search_cache(name: str) -> SearchResultCache:
+    with _registry_lock:
+        cache = _CACHES.get(name)
+        if cache is None:
+            cache = _CACHES[name] = SearchResultCache(name)
+        return cache
+
+
+def current_version(cards_path: Optional[str] = None) -> Tuple[Any, ...]:
+    """`data_version()`, clearing every cache the first time it changes."""
+    global _last_version
+    version = data_version(cards_path)
+    if version != _last_version:
+        with _registry_lock:
+            if version != _last_version:
+                if _last_version is not None:
+                    for cache in _CACHES.values():
+                        cache.clear()
+                _last_version = version
+    return version
+
+
+def clear_search_caches() -> None:
+    with _registry_lock:
+        for cache in _CACHES.values():
+            cache.clear()
+
+
+def search_cache_metrics() -> Dict[str, Any]:
+    with _registry_lock:
+        caches = dict(_CACHES)
+    return {name: cache.stats() for name, cache in sorted(caches.items())}
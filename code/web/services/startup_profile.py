@@ -0,0 +1,207 @@
+"""Startup timeline and background warmup scheduling for the web app.
+
+`StartupTimeline` records how long each router import and warm step took so
+`/status/sys` (and the log) can show where container start time goes.
+`WarmupScheduler` runs the lifespan warm steps on a small thread pool after
+the app has started accepting traffic; steps declare the steps they must run
+after, independent steps run concurrently. Readiness (all warm steps
+finished) is reported separately from liveness on `/healthz`.
+
+Public API:
+    StartupTimeline.span(kind, name)      context manager recording one event
+    StartupTimeline.snapshot() -> dict
+    WarmupScheduler.add(name, fn, after=())
+    WarmupScheduler.start() / run_blocking()
+    WarmupScheduler.ready -> bool
+    WarmupScheduler.snapshot() -> dict
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+logger = logging.getLogger("web.startup")
+
+
+class StartupTimeline:
+    """Thread-safe list of timed startup events relative to process start."""
+
+    def __init__(self) -> None:
+        self._t0 = time.perf_counter()
+        self._lock = threading.Lock()
+        self._events: List[Dict[str, Any]] = []
+
+    def record(self, kind: str, name: str, start: float, end: float, error: Optional[str] = None) -> None:
+        event = {
+            "kind": kind,
+            "name": name,
+            "start_ms": round((start - self._t0) * 1000.0, 1),
+            "duration_ms": round((end - start) * 1000.0, 1),
+            "ok": error is None,
+            "thread": threading.current_thread().name,
+        }
+        if error is not None:
+            event["error"] = error
+        with self._lock:
+            self._events.append(event)
+
+    @contextmanager
+    def span(self, kind: str, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException as ex:
+            self.record(kind, name, start, time.perf_counter(), error=f"{type(ex).__name__}: {ex}")
+            raise
+        self.record(kind, name, start, time.perf_counter())
+
+    def events(self, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [dict(e) for e in self._events if kind is None or e["kind"] == kind]
+
+    def snapshot(self) -> Dict[str, Any]:
+        events = self.events()
+        totals: Dict[str, float] = {}
+        for e in events:
+            totals[e["kind"]] = round(totals.get(e["kind"], 0.0) + e["duration_ms"], 1)
+        return {"totals_ms": totals, "events": events}
+
+    def log_summary(self, top: int = 10) -> None:
+        events = sorted(self.events(), key=lambda e: e["duration_ms"], reverse=True)
+        totals = self.snapshot()["totals_ms"]
+        logger.info(
+            "startup timeline: %s",
+            ", ".join(f"{k}={v:.0f}ms" for k, v in sorted(totals.items())) or "empty",
+        )
+        for e in events[:top]:
+            logger.info(
+                "  %-6s %-36s %8.1fms%s",
+                e["kind"], e["name"], e["duration_ms"], "" if e["ok"] else f"  FAILED ({e.get('error')})",
+            )
+
+
+@dataclass
+class _WarmTask:
+    name: str
+    fn: Callable[[], Any]
+    after: Sequence[str] = ()
+    state: str = "pending"  # pending | running | done | failed
+    error: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+class WarmupScheduler:
+    """Run warm steps concurrently, honouring `after` ordering between them.
+
+    Failures are logged and recorded but never block other steps (dependents
+    still run), matching the previous best-effort lifespan warmers.
+    """
+
+    def __init__(self, timeline: StartupTimeline, max_workers: int = 4) -> None:
+        self._timeline = timeline
+        self._max_workers = max(1, int(max_workers))
+        self._tasks: Dict[str, _WarmTask] = {}
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def add(self, name: str, fn: Callable[[], Any], after: Sequence[str] = ()) -> None:
+        if name in self._tasks:
+            raise ValueError(f"duplicate warm task: {name}")
+        self._tasks[name] = _WarmTask(name=name, fn=fn, after=tuple(after))
+
+    @property
+    def ready(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        return self._done.wait(timeout)
+
+    def start(self) -> threading.Thread:
+        """Run all tasks on a background thread and return immediately."""
+        self._thread = threading.Thread(target=self.run_blocking, daemon=True, name="web-warmup")
+        self._thread.start()
+        return self._thread
+
+    def _run_one(self, task: _WarmTask) -> None:
+        with self._lock:
+            task.state = "running"
+        try:
+            with self._timeline.span("warm", task.name):
+                task.fn()
+        except Exception as ex:
+            with self._lock:
+                task.state = "failed"
+                task.error = f"{type(ex).__name__}: {ex}"
+            logger.debug("warm task %s failed", task.name, exc_info=True)
+            return
+        with self._lock:
+            task.state = "done"
+
+    def run_blocking(self) -> None:
+        """Run all tasks to completion on the calling thread's pool."""
+        self._started_at = time.time()
+        unknown = {dep for t in self._tasks.values() for dep in t.after if dep not in self._tasks}
+        if unknown:
+            logger.warning("warm tasks reference unknown steps: %s", sorted(unknown))
+        pending = dict(self._tasks)
+        finished: set[str] = set(unknown)
+        running: Dict[Future, str] = {}
+        try:
+            with ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="warm") as pool:
+                while pending or running:
+                    runnable = [t for t in pending.values() if all(d in finished for d in t.after)]
+                    for task in runnable:
+                        del pending[task.name]
+                        running[pool.submit(self._run_one, task)] = task.name
+                    if not running:
+                        # Dependency cycle: run the rest in insertion order rather than hang
+                        logger.warning("warm task cycle among %s; running serially", sorted(pending))
+                        for task in list(pending.values()):
+                            self._run_one(task)
+                        pending.clear()
+                        break
+                    done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                    for fut in done:
+                        finished.add(running.pop(fut))
+        finally:
+            self._finished_at = time.time()
+            self._done.set()
+        failed = [t.name for t in self._tasks.values() if t.state == "failed"]
+        logger.info(
+            "warmup complete in %.0fms (%d steps, %d failed%s)",
+            (self._finished_at - self._started_at) * 1000.0,
+            len(self._tasks), len(failed), f": {', '.join(failed)}" if failed else "",
+        )
+        self._timeline.log_summary()
+
+    def snapshot(self) -> Dict[str, Any]:
+        durations = {e["name"]: e["duration_ms"] for e in self._timeline.events("warm")}
+        with self._lock:
+            tasks = {
+                t.name: {
+                    "state": t.state,
+                    "after": list(t.after),
+                    "duration_ms": durations.get(t.name),
+                    **({"error": t.error} if t.error else {}),
+                }
+                for t in self._tasks.values()
+            }
+        elapsed = None
+        if self._started_at is not None:
+            end = self._finished_at if self._finished_at is not None else time.time()
+            elapsed = round((end - self._started_at) * 1000.0, 1)
+        return {
+            "ready": self.ready,
+            "workers": self._max_workers,
+            "elapsed_ms": elapsed,
+            "pending": sorted(n for n, t in tasks.items() if t["state"] in {"pending", "running"}),
+            "tasks": tasks,
+        }
@@ -14,7 +14,7 @@ def _owned_set_helper() -> set[str]:
         try:
             from . import owned_store
 
-            return {str(n).strip().lower() for n in owned_store.get_names()}
+            return set(owned_store.get_owned_set())
         except Exception:
             return set()
 
@@ -22,6 +22,8 @@ _FRONTEND_LOGGER = logging.getLogger("web.frontend_events")
 
 
 def _emit(logger: logging.Logger, payload: Dict[str, Any]) -> None:
+    if not logger.isEnabledFor(logging.INFO):
+        return
     try:
         logger.info(json.dumps(payload, separators=(",", ":"), ensure_ascii=False))
     except Exception:
@@ -9,6 +9,7 @@ pipeline, metrics aggregation, and cache usage. Public API (`get_theme_preview`,
 from __future__ import annotations
 
 from pathlib import Path
+import threading
 import time
 from typing import List, Dict, Any, Optional
 import os
@@ -29,6 +30,7 @@ from .preview_metrics import (
     preview_metrics,
     configure_external_access,
     record_splash_analytics,
+    record_coalesced,
 )
 
 from .theme_catalog_loader import load_index, slugify, project_detail
@@ -68,6 +70,11 @@ __all__ = ["get_theme_preview", "preview_metrics", "bust_preview_cache"]
 # Legacy constant alias retained for any external references; now a function in cache module.
 TTL_SECONDS = ttl_seconds
 
+# In-flight preview builds keyed by cache key (single-flight coalescing).
+_INFLIGHT: Dict[tuple, threading.Event] = {}
+_INFLIGHT_LOCK = threading.Lock()
+_SINGLE_FLIGHT_WAIT_S = 30.0
+
 # Per-theme error histogram (P2 observability)
 _PREVIEW_PER_THEME_ERRORS: Dict[str, int] = {}
 
@@ -279,6 +286,38 @@ def get_theme_preview(theme_id: str, *, limit: int = 12, colors: Optional[str] =
         except Exception:
             record_redis_get(hit=False, error=True)
 
+    # Single-flight: concurrent misses for the same key wait on one build
+    # instead of each sampling the pool themselves.
+    with _INFLIGHT_LOCK:
+        pending = _INFLIGHT.get(cache_key)
+        if pending is None:
+            _INFLIGHT[cache_key] = threading.Event()
+    if pending is not None:
+        pending.wait(_SINGLE_FLIGHT_WAIT_S)
+        built = PREVIEW_CACHE.get(cache_key)
+        if built:
+            record_request(hit=True)
+            record_request_hit(True)
+            record_per_theme_request(slug)
+            record_coalesced()
+            register_cache_hit(cache_key)
+            payload_cached = dict(built["payload"])
+            payload_cached["cache_hit"] = True
+            payload_cached["coalesced"] = True
+            return payload_cached
+        # Leader failed or timed out; build independently.
+        return _build_preview(slug, detail, idx, limit, colors_key, commander_key, cache_key)
+    try:
+        return _build_preview(slug, detail, idx, limit, colors_key, commander_key, cache_key)
+    finally:
+        with _INFLIGHT_LOCK:
+            event = _INFLIGHT.pop(cache_key, None)
+        if event is not None:
+            event.set()
+
+
+def _build_preview(slug: str, detail: Dict[str, Any], idx: Any, limit: int, colors_key: Optional[str], commander_key: Optional[str], cache_key: tuple) -> Dict[str, Any]:
+    """Cache-miss path of `get_theme_preview`: sample, annotate, store and return the payload."""
     # Cache miss path
     record_request(hit=False)
     record_request_hit(False)
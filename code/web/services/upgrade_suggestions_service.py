@@ -18,6 +18,7 @@ import threading
 from dataclasses import dataclass, field
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 
 from code.path_util import card_files_raw_dir, get_processed_cards_path
@@ -181,6 +182,144 @@ def _is_land_type(type_val: object) -> bool:
     return "land" in primary
 
 
+class _CardPool:
+    """Non-land rows of ``all_cards.parquet`` as per-row arrays.
+
+    Built once per data version (see ``_load_card_pool``) so the per-deck
+    filters in ``get_new_card_pool`` / ``get_general_suggestions`` are NumPy
+    mask operations instead of a parquet read plus row-wise ``apply`` calls.
+
+    Tags are stored CSR-style: ``tag_rows[i]`` is the row of entry ``i`` and
+    ``tag_ids[i]`` its lowercased tag id (deduplicated per row, matching the
+    set semantics of the old per-row code).  Color identities are factorized
+    so the subset check runs once per distinct identity string.
+    """
+
+    def __init__(self, df: pd.DataFrame) -> None:
+        if "type" in df.columns:
+            df = df[~df["type"].map(_is_land_type).astype(bool)]
+        df = df.reset_index(drop=True)
+        n = len(df)
+        self.size = n
+
+        def _col(name: str) -> list:
+            return df[name].tolist() if name in df.columns else [None] * n
+
+        self.has_is_new = "isNew" in df.columns
+        self.is_new = (
+            df["isNew"].fillna(False).astype(bool).to_numpy()
+            if self.has_is_new else np.zeros(n, dtype=bool)
+        )
+
+        raw_names = [_str_val(v) for v in _col("name")]
+        raw_faces = [_str_val(v) for v in _col("faceName")]
+        self.names = [face if face else name for face, name in zip(raw_faces, raw_names)]
+        self.name_lower = pd.Series([s.lower() for s in raw_names], dtype=object)
+        self.face_lower = pd.Series([s.lower() for s in raw_faces], dtype=object)
+
+        codes, uniques = pd.factorize(pd.Series([_str_val(v) for v in _col("colorIdentity")], dtype=object))
+        self.identity_codes = codes
+        self.identity_sets: list[Optional[frozenset[str]]] = [
+            frozenset(c.strip() for c in s.split(",") if c.strip()) if s else None
+            for s in uniques
+        ]
+
+        self.roles = [_parse_tags(v) for v in _col("themeTags")]
+        vocab: dict[str, int] = {}
+        tag_rows: list[int] = []
+        tag_ids: list[int] = []
+        for row, roles in enumerate(self.roles):
+            for tag in {t.lower() for t in roles}:
+                tag_rows.append(row)
+                tag_ids.append(vocab.setdefault(tag, len(vocab)))
+        self.tag_vocab = vocab
+        self.tag_rows = np.asarray(tag_rows, dtype=np.int64)
+        self.tag_ids = np.asarray(tag_ids, dtype=np.int64)
+
+        self.has_rank = "edhrecRank" in df.columns
+        rank = (
+            pd.to_numeric(df["edhrecRank"], errors="coerce").to_numpy(dtype=float)
+            if self.has_rank else np.full(n, np.nan)
+        )
+        # Stable ascending order with NaN last (numpy sorts NaN to the end).
+        self.rank_order = np.argsort(rank, kind="stable")
+        self.quality = np.array(
+            [1.0 / math.log10((30000.0 if math.isnan(r) else r) + 10) for r in rank.tolist()],
+            dtype=float,
+        )
+
+        self.cmc = [float(v or 0.0) for v in _col("manaValue")]
+        self.set_codes = []
+        for v in _col("printings"):
+            codes_list = [s.strip() for s in _str_val(v).split(",") if s.strip()]
+            self.set_codes.append(codes_list[0] if codes_list else "")
+
+        price_col = "price" if "price" in df.columns else ("usd" if "usd" in df.columns else None)
+        self.prices: list[Optional[float]] = []
+        for v in (_col(price_col) if price_col else [None] * n):
+            price: Optional[float] = None
+            try:
+                if v is not None and str(v) != "nan":
+                    price = float(v)
+            except (TypeError, ValueError):
+                price = None
+            self.prices.append(price)
+
+    def color_mask(self, color_identity: list[str]) -> np.ndarray:
+        """Rows whose color identity is a subset of ``color_identity`` (empty = any deck)."""
+        allowed = set(color_identity)
+        ok = np.fromiter(
+            (s is None or s <= allowed for s in self.identity_sets),
+            dtype=bool, count=len(self.identity_sets),
+        )
+        return ok[self.identity_codes] if self.size else np.zeros(0, dtype=bool)
+
+    def deck_mask(self, deck_card_names: set[str]) -> np.ndarray:
+        """Rows whose name or face name (case-insensitive) is in the deck."""
+        lower_deck = {n.lower() for n in deck_card_names}
+        return (self.name_lower.isin(lower_deck) | self.face_lower.isin(lower_deck)).to_numpy()
+
+    def tag_weights(self, weights: dict[str, float]) -> np.ndarray:
+        """Per-row sum of ``weights`` over the row's distinct lowercased tags."""
+        per_tag = np.zeros(len(self.tag_vocab), dtype=float)
+        for tag, weight in weights.items():
+            tag_id = self.tag_vocab.get(tag)
+            if tag_id is not None:
+                per_tag[tag_id] = weight
+        return np.bincount(self.tag_rows, weights=per_tag[self.tag_ids], minlength=self.size)
+
+
+_POOL_LOCK = threading.Lock()
+_POOL_CACHE: dict[str, tuple[tuple[int, int], _CardPool]] = {}
+
+
+def _load_card_pool(processed_path: str) -> Optional[_CardPool]:
+    """Return the cached ``_CardPool`` for ``processed_path``, rebuilding when the file changes.
+
+    The cache key is the file's ``(mtime_ns, size)``, so a re-tag or data
+    refresh is picked up on the next call.  Returns ``None`` (after logging)
+    when the parquet can't be read.
+    """
+    try:
+        st = os.stat(processed_path)
+    except OSError as exc:
+        logger.warning("Error reading parquet: %s", exc)
+        return None
+    version = (st.st_mtime_ns, st.st_size)
+    with _POOL_LOCK:
+        cached = _POOL_CACHE.get(processed_path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        try:
+            pool = _CardPool(pd.read_parquet(processed_path))
+        except Exception as exc:
+            logger.warning("Error reading parquet: %s", exc)
+            return None
+        _POOL_CACHE.clear()
+        _POOL_CACHE[processed_path] = (version, pool)
+        return pool
+
+
 class UpgradeSuggestionsService:
     """Service for generating card upgrade suggestions from the new-card window.
 
@@ -374,56 +513,21 @@ class UpgradeSuggestionsService:
             logger.warning("Parquet not found — returning empty pool: %s", processed_path)
             return []
 
-        try:
-            df = pd.read_parquet(processed_path)
-        except Exception as exc:
-            logger.warning("Error reading parquet: %s", exc)
+        pool = _load_card_pool(processed_path)
+        if pool is None:
             return []
 
-        if "isNew" not in df.columns:
+        if not pool.has_is_new:
             logger.warning("isNew column missing from parquet — returning empty pool")
             return []
 
-        # Filter to new cards only.
-        new_df = df[df["isNew"].fillna(False).astype(bool)].copy()
-        if new_df.empty:
-            return []
-
-        # Filter out land-type cards.  Non-land faces of MDFCs are kept because
-        # their own parquet row has a non-Land primary type.
-        if "type" in new_df.columns:
-            new_df = new_df[~new_df["type"].apply(_is_land_type)]
-        if new_df.empty:
-            return []
-
-        # Color-identity filter: card's colors must be a subset of allowed.
-        allowed = set(color_identity)
-
-        def _color_ok(ci_str: object) -> bool:
-            s = _str_val(ci_str)
-            if not s:
-                return True  # colorless/no-identity cards fit any deck
-            card_colors = {c.strip() for c in s.split(",") if c.strip()}
-            return card_colors <= allowed
-
-        new_df = new_df[new_df["colorIdentity"].apply(_color_ok)]
-        if new_df.empty:
-            return []
+        # New, non-land cards whose color identity is a subset of the
+        # commander's (colorless/no-identity cards fit any deck).
+        mask = pool.is_new & pool.color_mask(color_identity)
 
         # Exclude cards already in the deck (case-insensitive on both name and faceName).
         if deck_card_names:
-            lower_deck = {n.lower() for n in deck_card_names}
-            new_df = new_df[
-                ~new_df.apply(
-                    lambda r: (
-                        _str_val(r.get("faceName")).lower() in lower_deck
-                        or _str_val(r.get("name")).lower() in lower_deck
-                    ),
-                    axis=1,
-                )
-            ]
-            if new_df.empty:
-                return []
+            mask &= ~pool.deck_mask(deck_card_names)
 
         # Compute theme-relevance set — used for both filtering and matched_tags display.
         if deck_themes is not None:
@@ -437,38 +541,27 @@ class UpgradeSuggestionsService:
         # Theme relevance filter: when deck_themes are provided, only keep cards that
         # share at least min_tag_overlap tags with the deck's chosen themes OR cover a
         # standard utility role (ramp, removal, wipes, card draw, protection).
-        if theme_allowed_lower and "themeTags" in new_df.columns:
-            new_df = new_df[new_df["themeTags"].apply(
-                lambda raw: len({t.lower() for t in _parse_tags(raw)} & theme_allowed_lower) >= min_tag_overlap
-            )]
-            if new_df.empty:
-                return []
+        if theme_allowed_lower:
+            overlap = pool.tag_weights({t: 1.0 for t in theme_allowed_lower})
+            mask &= overlap >= min_tag_overlap
 
-        if "edhrecRank" in new_df.columns:
-            new_df = new_df.sort_values("edhrecRank", na_position="last")
+        # Most popular first (edhrecRank ascending, unranked last).
+        positions = pool.rank_order[mask[pool.rank_order]] if pool.has_rank else np.flatnonzero(mask)
 
         results: list[UpgradeCandidate] = []
         seen_names: set[str] = set()
-        for _, row in new_df.iterrows():
-            face = _str_val(row.get("faceName"))
-            name = face if face else _str_val(row.get("name"))
+        for pos in positions.tolist():
+            name = pool.names[pos]
             if not name:
                 continue
             if name in seen_names:
                 continue
             seen_names.add(name)
 
-            # Parse roles from comma-separated themeTags.
-            roles = _parse_tags(row.get("themeTags", ""))
+            roles = pool.roles[pos]
             matched_tags = [t for t in roles if t.lower() in theme_allowed_lower] if theme_allowed_lower else []
 
-            cmc = float(row.get("manaValue") or 0.0)
-
-            # Use the first printings entry as the set code.
-            printings_raw = _str_val(row.get("printings"))
-            set_codes_list = [s.strip() for s in printings_raw.split(",") if s.strip()]
-            set_code = set_codes_list[0] if set_codes_list else ""
-
+            set_code = pool.set_codes[pos]
             sm = self._set_meta.get(set_code, {})
             set_name = sm.get("name", set_code.upper() if set_code else "Unknown")
             released_at = sm.get("released_at", "")
@@ -481,19 +574,14 @@ class UpgradeSuggestionsService:
                 except ValueError:
                     pass
 
-            rank = row.get("edhrecRank")
-            try:
-                rank_f = float(rank) if rank is not None and str(rank) != "nan" else 30000.0
-            except (TypeError, ValueError):
-                rank_f = 30000.0
-            fit_score = round(2.0 * len(matched_tags) + 1.0 / math.log10(rank_f + 10), 1)
+            fit_score = round(2.0 * len(matched_tags) + float(pool.quality[pos]), 1)
 
             results.append(
                 UpgradeCandidate(
                     name=name,
-                    roles=roles,
+                    roles=list(roles),
                     matched_tags=matched_tags,
-                    cmc=cmc,
+                    cmc=pool.cmc[pos],
                     set_code=set_code,
                     set_name=set_name,
                     released_at=released_at,
@@ -793,51 +881,17 @@ class UpgradeSuggestionsService:
             logger.warning("Parquet not found — returning empty general suggestions: %s", processed_path)
             return {}
 
-        try:
-            df = pd.read_parquet(processed_path)
-        except Exception as exc:
-            logger.warning("Error reading parquet for general suggestions: %s", exc)
+        pool = _load_card_pool(processed_path)
+        if pool is None:
             return {}
 
-        # Exclude new cards (handled by new-card pool).
-        if "isNew" in df.columns:
-            df = df[~df["isNew"].fillna(False).astype(bool)]
-
-        # Filter out land-type cards.  Non-land faces of MDFCs are kept because
+        # Exclude new cards (handled by new-card pool), off-identity cards and
+        # cards already in the deck (case-insensitive).  Lands are already
+        # dropped from the pool; non-land faces of MDFCs are kept because
         # their own parquet row has a non-Land primary type.
-        if "type" in df.columns:
-            df = df[~df["type"].apply(_is_land_type)]
-
-        # Color-identity filter.
-        allowed = set(color_identity)
-
-        def _color_ok(ci_str: object) -> bool:
-            s = _str_val(ci_str)
-            if not s:
-                return True
-            card_colors = {c.strip() for c in s.split(",") if c.strip()}
-            return card_colors <= allowed
-
-        df = df[df["colorIdentity"].apply(_color_ok)]
-        if df.empty:
-            return {}
-
-        # Exclude cards already in the deck (case-insensitive).
-        lower_deck = {n.lower() for n in deck_card_names}
-        if "faceName" in df.columns:
-            df = df[
-                ~df.apply(
-                    lambda r: (
-                        _str_val(r.get("faceName")).lower() in lower_deck
-                        or _str_val(r.get("name")).lower() in lower_deck
-                    ),
-                    axis=1,
-                )
-            ]
-        else:
-            df = df[~df["name"].apply(lambda n: _str_val(n).lower() in lower_deck)]
-
-        if df.empty:
+        mask = ~pool.is_new & pool.color_mask(color_identity)
+        mask &= ~pool.deck_mask(deck_card_names)
+        if not mask.any():
             return {}
 
         # Priority tiers, in order (highest weight first): the deck's primary
@@ -866,92 +920,65 @@ class UpgradeSuggestionsService:
             if cnt < 5 and role.lower() in ideal_roles_lower
         }
 
-        def _score_row(row: pd.Series) -> float:
-            card_tags_lower = {t.lower() for t in _parse_tags(row.get("themeTags", ""))}
-
-            primary_theme_match = 5.0 * len(primary_lower & card_tags_lower)
-            secondary_theme_match = 3.0 * len(secondary_lower & card_tags_lower)
-            generalized_role_match = 2.0 * len(generalized_lower & card_tags_lower)
-            tertiary_theme_match = 1.5 * len(tertiary_lower & card_tags_lower)
-            synergy_match = 1.0 * len(synergy_lower & card_tags_lower)
-            role_gap_bonus = 1.5 * len(under_rep_roles & card_tags_lower)
-
-            rank = row.get("edhrecRank")
-            try:
-                rank_f = float(rank) if rank is not None and str(rank) != "nan" else 30000.0
-            except (TypeError, ValueError):
-                rank_f = 30000.0
-            quality = 1.0 / math.log10(rank_f + 10)
-
-            return (
-                primary_theme_match + secondary_theme_match + generalized_role_match
-                + tertiary_theme_match + synergy_match + role_gap_bonus + quality
-            )
-
-        df = df.copy()
-        df["_score"] = df.apply(_score_row, axis=1)
-        df = df.sort_values("_score", ascending=False)
+        # Each tag lands in exactly one tier; the role-gap bonus stacks on top.
+        weights: dict[str, float] = {}
+        for tier, weight in (
+            (primary_lower, 5.0),
+            (secondary_lower, 3.0),
+            (generalized_lower, 2.0),
+            (tertiary_lower, 1.5),
+            (synergy_lower, 1.0),
+        ):
+            for tag in tier:
+                weights[tag] = weight
+        for tag in under_rep_roles:
+            weights[tag] = weights.get(tag, 0.0) + 1.5
+        scores = pool.tag_weights(weights) + pool.quality
+
+        positions = np.flatnonzero(mask)
+        # Stable sort: equal scores keep parquet order.
+        ordered = positions[np.argsort(-scores[positions], kind="stable")].tolist()
 
         self._ensure_set_meta()
 
-        def _to_candidate(row: pd.Series) -> Optional[UpgradeCandidate]:
-            face = _str_val(row.get("faceName"))
-            name = face if face else _str_val(row.get("name"))
+        # Only surface high-priority tags (deck's primary/secondary/tertiary
+        # theme or a generalized role) as "matched" — weak incidental synergy
+        # tags (e.g. a lone Blink card elsewhere in the deck) contributed to
+        # the score but shouldn't be shown as the reason a card fits.
+        high_priority = primary_lower | secondary_lower | generalized_lower | tertiary_lower
+
+        def _to_candidate(pos: int) -> Optional[UpgradeCandidate]:
+            name = pool.names[pos]
             if not name:
                 return None
-
-            roles = _parse_tags(row.get("themeTags", ""))
-
-            cmc = float(row.get("manaValue") or 0.0)
-            printings_raw = _str_val(row.get("printings"))
-            set_codes_list = [s.strip() for s in printings_raw.split(",") if s.strip()]
-            set_code = set_codes_list[0] if set_codes_list else ""
+            roles = list(pool.roles[pos])
+            set_code = pool.set_codes[pos]
             sm = self._set_meta.get(set_code, {})
-            set_name = sm.get("name", set_code.upper() if set_code else "Unknown")
-            released_at = sm.get("released_at", "")
-
-            # Only surface high-priority tags (deck's primary/secondary/
-            # tertiary theme or a generalized role) as "matched" — weak
-            # incidental synergy tags (e.g. a lone Blink card elsewhere in
-            # the deck) contributed to the score but shouldn't be shown as
-            # the reason a card fits.
-            high_priority = primary_lower | secondary_lower | generalized_lower | tertiary_lower
-            matched = [t for t in roles if t.lower() in high_priority]
-            fit_score = round(float(row.get("_score", 0.0)), 1)
             return UpgradeCandidate(
                 name=name,
                 roles=roles,
-                matched_tags=matched,
-                cmc=cmc,
+                matched_tags=[t for t in roles if t.lower() in high_priority],
+                cmc=pool.cmc[pos],
                 set_code=set_code,
-                set_name=set_name,
-                released_at=released_at,
+                set_name=sm.get("name", set_code.upper() if set_code else "Unknown"),
+                released_at=sm.get("released_at", ""),
                 is_new_card=False,
-                fit_score=fit_score,
+                fit_score=round(float(scores[pos]), 1),
             )
 
-
         if budget_per_card and budget_per_card > 0:
             tiers: dict[str, list[UpgradeCandidate]] = {
                 "Within Budget": [],
                 "Slightly Out of Budget": [],
                 "Out of Budget": [],
             }
-            price_col = "price" if "price" in df.columns else ("usd" if "usd" in df.columns else None)
-            for _, row in df.iterrows():
+            for pos in ordered:
                 if all(len(v) >= max_per_tier for v in tiers.values()):
                     break
-                candidate = _to_candidate(row)
+                candidate = _to_candidate(pos)
                 if candidate is None:
                     continue
-                price: Optional[float] = None
-                if price_col:
-                    try:
-                        raw_price = row.get(price_col)
-                        if raw_price is not None and str(raw_price) != "nan":
-                            price = float(raw_price)
-                    except (TypeError, ValueError):
-                        price = None
+                price = pool.prices[pos]
 
                 if price is None:
                     if len(tiers["Within Budget"]) < max_per_tier:
@@ -970,10 +997,10 @@ class UpgradeSuggestionsService:
             return {k: v for k, v in tiers.items() if v}
         else:
             general: list[UpgradeCandidate] = []
-            for _, row in df.iterrows():
+            for pos in ordered:
                 if len(general) >= max_per_tier:
                     break
-                candidate = _to_candidate(row)
+                candidate = _to_candidate(pos)
                 if candidate is not None:
                     general.append(candidate)
             return {"General Upgrades": general} if general else {}
@@ -3,14 +3,22 @@
 Uses WAL mode for light concurrent access. Passwords are bcrypt-hashed via
 passlib; plain-text passwords are never stored.
 
+Connections are pooled per thread (one open connection per thread for the
+current DB path), and API-key verification is served from a short-TTL
+in-memory cache with ``last_used`` writes coalesced and flushed in one
+transaction every few seconds (see ``verify_api_key``).
+
 The `data/` directory (and `users.db` inside it) are gitignored and
 Docker-volume-mounted so they persist across container restarts.
 """
 from __future__ import annotations
 
+import atexit
 import hashlib
 import logging
+import os
 import sqlite3
+import threading
 import time
 import uuid
 from pathlib import Path
@@ -45,11 +53,26 @@ def verify_password(plain: str, hashed: str) -> bool:
 # DB helpers
 # ---------------------------------------------------------------------------
 
+_POOL = threading.local()
+
+
 def _connect() -> sqlite3.Connection:
-    conn = sqlite3.connect(str(_DB_PATH), check_same_thread=False)
+    """Return this thread's connection to the current DB path, opening it on first use.
+
+    Callers keep using ``with _connect() as conn:``; the context manager only
+    commits/rolls back, so the connection stays open for the thread's next call.
+    """
+    path = str(_DB_PATH)
+    conn = getattr(_POOL, "conn", None)
+    if conn is not None and getattr(_POOL, "path", None) == path:
+        return conn
+    if conn is not None:
+        conn.close()
+    conn = sqlite3.connect(path, check_same_thread=False)
     conn.row_factory = sqlite3.Row
     conn.execute("PRAGMA journal_mode=WAL")
     conn.execute("PRAGMA foreign_keys=ON")
+    _POOL.conn, _POOL.path = conn, path
     return conn
 
 
@@ -231,6 +254,7 @@ def set_user_admin(user_id: str, is_admin_flag: bool) -> None:
             (1 if is_admin_flag else 0, time.time(), user_id),
         )
         conn.commit()
+    _invalidate_api_key_cache(user_id=user_id)
     logger.info("user_db: set is_admin=%s for user %s", is_admin_flag, user_id)
 
 
@@ -247,6 +271,7 @@ def set_user_active(user_id: str, active: bool) -> None:
             (1 if active else 0, time.time(), user_id),
         )
         conn.commit()
+    _invalidate_api_key_cache(user_id=user_id)
     logger.info("user_db: set is_active=%s for user %s", active, user_id)
 
 
@@ -263,6 +288,7 @@ def delete_user(user_id: str) -> None:
             raise ValueError("Cannot delete the admin account.")
         conn.execute("DELETE FROM users WHERE id = ?", (user_id,))
         conn.commit()
+    _invalidate_api_key_cache(user_id=user_id)
     logger.info("user_db: deleted user %s", user_id)
 
 
@@ -278,6 +304,7 @@ def update_password(user_id: str, new_password: str) -> None:
             (new_hash, now, user_id),
         )
         conn.commit()
+    _invalidate_api_key_cache(user_id=user_id)
 
 
 _VALID_DEFAULT_VISIBILITIES = ("public", "unlisted", "private")
@@ -308,6 +335,7 @@ def set_default_visibility(user_id: str, visibility: str) -> None:
             (visibility, now, user_id),
         )
         conn.commit()
+    _invalidate_api_key_cache(user_id=user_id)
 
 
 def set_reset_token_hash(user_id: str, token_hash: str) -> None:
@@ -341,6 +369,82 @@ def consume_reset_token(user_id: str, token_hash: str) -> bool:
 # Public API keys (R28)
 # ---------------------------------------------------------------------------
 
+def _api_key_cache_ttl() -> float:
+    try:
+        return max(0.0, float(os.getenv("API_KEY_CACHE_TTL", "15")))
+    except ValueError:
+        return 15.0
+
+
+# Seconds between batched ``last_used`` flushes
+_LAST_USED_FLUSH_INTERVAL = 5.0
+
+# (db_path, key_hash) -> (expires_at, key_id, User)
+_API_KEY_CACHE: dict[tuple[str, str], tuple[float, str, User]] = {}
+# (db_path, key_id) -> most recent use timestamp not yet written
+_PENDING_LAST_USED: dict[tuple[str, str], float] = {}
+_API_KEY_LOCK = threading.Lock()
+# Bumped on every invalidation; a lookup only caches its row if no
+# invalidation happened between its SELECT and the insert.
+_api_key_generation = 0
+_last_used_flushed_at = time.monotonic()
+
+
+def _invalidate_api_key_cache(*, user_id: Optional[str] = None, key_id: Optional[str] = None) -> None:
+    """Drop cached verifications for a user or key (after revoke, deactivate, delete or edits)."""
+    global _api_key_generation
+    with _API_KEY_LOCK:
+        _api_key_generation += 1
+        for cache_key, (_, cached_key_id, user) in list(_API_KEY_CACHE.items()):
+            if (user_id is not None and user["id"] == user_id) or (key_id is not None and cached_key_id == key_id):
+                del _API_KEY_CACHE[cache_key]
+
+
+def clear_api_key_cache() -> None:
+    global _api_key_generation
+    with _API_KEY_LOCK:
+        _api_key_generation += 1
+        _API_KEY_CACHE.clear()
+
+
+def flush_last_used() -> None:
+    """Write all coalesced ``last_used`` timestamps, one transaction per DB."""
+    global _last_used_flushed_at
+    with _API_KEY_LOCK:
+        pending = dict(_PENDING_LAST_USED)
+        _PENDING_LAST_USED.clear()
+        _last_used_flushed_at = time.monotonic()
+    by_path: dict[str, list[tuple[float, str]]] = {}
+    for (path, key_id), used_at in pending.items():
+        by_path.setdefault(path, []).append((used_at, key_id))
+    for path, rows in by_path.items():
+        pooled = path == str(_DB_PATH)
+        try:
+            conn = _connect() if pooled else sqlite3.connect(path)
+            try:
+                with conn:
+                    conn.executemany(
+                        "UPDATE api_keys SET last_used = MAX(COALESCE(last_used, 0), ?) WHERE id = ?", rows
+                    )
+            finally:
+                if not pooled:
+                    conn.close()
+        except sqlite3.Error as exc:
+            logger.warning("user_db: could not flush api key last_used (%s): %s", path, exc)
+
+
+atexit.register(flush_last_used)
+
+
+def _record_key_use(path: str, key_id: str) -> None:
+    now = time.time()
+    with _API_KEY_LOCK:
+        _PENDING_LAST_USED[(path, key_id)] = now
+        due = time.monotonic() - _last_used_flushed_at >= _LAST_USED_FLUSH_INTERVAL
+    if due:
+        flush_last_used()
+
+
 def _hash_api_key(key_plain: str) -> str:
     return hashlib.sha256(key_plain.encode()).hexdigest()
 
@@ -397,6 +501,7 @@ def get_or_create_api_key(user_id: str, label: str) -> tuple[Optional[str], ApiK
 
 def list_api_keys(user_id: str) -> list[ApiKey]:
     """Return the user's active API keys, oldest first. Never includes the key itself."""
+    flush_last_used()
     with _connect() as conn:
         rows = conn.execute(
             "SELECT * FROM api_keys WHERE user_id = ? AND is_active = 1 ORDER BY created_at ASC",
@@ -416,29 +521,47 @@ def revoke_api_key(key_id: str, user_id: str) -> None:
             raise ValueError("API key not found.")
         conn.execute("UPDATE api_keys SET is_active = 0 WHERE id = ?", (key_id,))
         conn.commit()
+    _invalidate_api_key_cache(key_id=key_id)
 
 
 def verify_api_key(key_plain: str) -> Optional[User]:
     """Return the User owning *key_plain* if it's a valid, active key; else None.
 
-    Updates ``last_used`` on success as a side effect.
+    Successful lookups are cached for ``API_KEY_CACHE_TTL`` seconds (default
+    15, 0 disables); revoking the key or deactivating, deleting or editing
+    the user drops the entry immediately. ``last_used`` is recorded in memory
+    and written in a batch by ``flush_last_used()`` (at most every few
+    seconds, and at exit).
     """
     if not key_plain:
         return None
     key_hash = _hash_api_key(key_plain)
+    path = str(_DB_PATH)
+    now = time.monotonic()
+    with _API_KEY_LOCK:
+        cached = _API_KEY_CACHE.get((path, key_hash))
+        generation = _api_key_generation
+    if cached is not None and cached[0] > now:
+        _record_key_use(path, cached[1])
+        return User(**cached[2])  # callers get their own copy
     with _connect() as conn:
         row = conn.execute(
-            "SELECT * FROM api_keys WHERE key_hash = ? AND is_active = 1", (key_hash,)
+            "SELECT api_keys.id AS key_id, users.* FROM api_keys JOIN users ON users.id = api_keys.user_id"
+            " WHERE api_keys.key_hash = ? AND api_keys.is_active = 1",
+            (key_hash,),
         ).fetchone()
-        if not row:
-            return None
-        conn.execute(
-            "UPDATE api_keys SET last_used = ? WHERE id = ?", (time.time(), row["id"])
-        )
-        conn.commit()
-    user = get_user_by_id(row["user_id"])
-    if not user or not user["is_active"]:
+    if not row:
+        return None
+    _record_key_use(path, row["key_id"])
+    user = _row_to_user(row)
+    if not user["is_active"]:
         return None
+    ttl = _api_key_cache_ttl()
+    if ttl > 0:
+        with _API_KEY_LOCK:
+            # A revoke/deactivate committed after our SELECT must win
+            if generation == _api_key_generation:
+                _API_KEY_CACHE[(path, key_hash)] = (now + ttl, row["key_id"], User(**user))
     return user
 
 
@@ -459,5 +582,6 @@ def revoke_api_key_by_plain(key_plain: str) -> bool:
             return False
         conn.execute("UPDATE api_keys SET is_active = 0 WHERE id = ?", (row["id"],))
         conn.commit()
+    _invalidate_api_key_cache(key_id=row["id"])
     return True
 